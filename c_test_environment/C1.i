@@ -0,0 +1,30 @@
+0
+1
+2
+3
+4
+5
+1
+6
+7
+0
+4
+1
+7
+4
+5
+2
+8
+0
+7
+7
+3
+8
+4
+2
+4
+7
+2
+4
+3
+2
@@ -0,0 +1,30 @@
+0 1
+2 3
+4 5
+6 7
+6 8
+9 10
+11 12
+13 14
+15 16
+13 17
+9 18
+19 20
+21 22
+11 23
+0 5
+2 24
+19 25
+21 26
+4 27
+9 28
+0 29
+2 30
+11 31
+13 32
+2 33
+4 34
+21 35
+9 36
+2 37
+38 39
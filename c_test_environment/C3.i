@@ -0,0 +1,30 @@
+0 1 2
+3 4 5
+6 7 8
+9 10 11
+12 13 14
+9 15 16
+17 18 19
+6 20 21
+0 22 23
+24 25 26
+24 27 28
+29 30 31
+24 32 33
+17 34 35
+12 36 37
+29 38 39
+3 40 41
+12 42 43
+6 44 45
+0 46 47
+6 48 49
+0 50 51
+52 53 54
+9 55 56
+57 58 59
+57 60 61
+62 63 64
+0 65 66
+3 67 68
+9 69 70
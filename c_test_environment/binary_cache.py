@@ -0,0 +1,109 @@
+import hashlib
+import os
+import shutil
+
+import osutils
+
+
+def default_cache_dir():
+    return os.environ.get('RACO_BINARY_CACHE',
+                          os.path.join(os.path.expanduser('~'),
+                                       '.raco', 'binary_cache'))
+
+
+class BinaryCache(object):
+    """
+    Content-addressed cache of generated query source and the
+    executables compiled from it.
+
+    Entries are keyed by a hash of the generated code plus everything
+    else that determines the executable (compiler, flags, support
+    library sources), so an identical plan compiled with identical
+    flags is only ever built once. Input relation paths are passed to
+    the executable at runtime, so a cached binary serves many inputs.
+    """
+
+    SOURCE_NAME = 'query.cpp'
+    EXE_NAME = 'query.exe'
+
+    def __init__(self, path=None):
+        self.path = path or default_cache_dir()
+
+    @staticmethod
+    def key(source, flags=()):
+        """
+        @param source: generated code
+        @param flags: strings that also determine the executable
+        @return hex digest identifying the entry
+        """
+        h = hashlib.sha1()
+        h.update(source)
+        for f in flags:
+            # separate so that ('ab', 'c') and ('a', 'bc') differ
+            h.update('\0')
+            h.update(f)
+        return h.hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.path, key[:2], key)
+
+    def lookup(self, key):
+        """
+        @return path of the cached executable, or None on a miss
+        """
+        exe = os.path.join(self._entry(key), self.EXE_NAME)
+        if os.path.isfile(exe):
+            return exe
+        return None
+
+    def insert(self, key, source, exe_path):
+        """
+        Store source and the executable built from it
+
+        @return path of the cached executable
+        """
+        entry = self._entry(key)
+        osutils.mkdir_p(entry)
+        with open(os.path.join(entry, self.SOURCE_NAME), 'w') as f:
+            f.write(source)
+
+        # copy then rename so concurrent readers never see a partial file
+        exe = os.path.join(entry, self.EXE_NAME)
+        tmp = '%s.%d.tmp' % (exe, os.getpid())
+        shutil.copy2(exe_path, tmp)
+        os.rename(tmp, exe)
+        return exe
+
+    def fetch(self, key, exe_path):
+        """
+        Copy a cached executable to exe_path
+
+        @return True on a hit, False on a miss
+        """
+        cached = self.lookup(key)
+        if cached is None:
+            return False
+        shutil.copy2(cached, exe_path)
+        return True
+
+
+def file_digests(paths):
+    """
+    @return digest strings for the contents of paths, suitable as
+    BinaryCache.key flags
+    """
+    digests = []
+    for p in sorted(paths):
+        with open(p, 'rb') as f:
+            digests.append('%s:%s' % (os.path.basename(p),
+                                      hashlib.sha1(f.read()).hexdigest()))
+    return digests
+
+
+def input_file_args(input_files):
+    """
+    @param input_files: dict of relation name -> path
+    @return command line arguments overriding the compiled-in paths
+    """
+    return ['--input_file_{0}={1}'.format(name, path)
+            for name, path in sorted(input_files.items())]
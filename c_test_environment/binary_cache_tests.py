@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from binary_cache import BinaryCache, input_file_args
+from testquery import GrappalangRunner
+
+
+class BinaryCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = BinaryCache(os.path.join(self.dir, 'cache'))
+        self.exe = os.path.join(self.dir, 'q.exe')
+        with open(self.exe, 'w') as f:
+            f.write('binary')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_miss_then_hit(self):
+        key = BinaryCache.key('int main() {}', ['g++', '-O3'])
+        self.assertIsNone(self.cache.lookup(key))
+
+        self.cache.insert(key, 'int main() {}', self.exe)
+        out = os.path.join(self.dir, 'out.exe')
+        self.assertTrue(self.cache.fetch(key, out))
+        with open(out) as f:
+            self.assertEqual(f.read(), 'binary')
+
+    def test_key_depends_on_flags(self):
+        src = 'int main() {}'
+        self.assertEqual(BinaryCache.key(src, ['-O3']),
+                         BinaryCache.key(src, ['-O3']))
+        self.assertNotEqual(BinaryCache.key(src, ['-O3']),
+                            BinaryCache.key(src, ['-O0']))
+        self.assertNotEqual(BinaryCache.key(src, ['ab', 'c']),
+                            BinaryCache.key(src, ['a', 'bc']))
+        self.assertNotEqual(BinaryCache.key(src, ['-O3']),
+                            BinaryCache.key(src + ' ', ['-O3']))
+
+    def test_grappa_flags_depend_on_support_sources(self):
+        envir = {'GRAPPA_HOME': self.dir}
+        join_dir = os.path.join(self.dir, 'applications', 'join')
+        os.makedirs(join_dir)
+        header = os.path.join(join_dir, 'relation.hpp')
+        with open(header, 'w') as f:
+            f.write('struct A;')
+        flags = GrappalangRunner._build_flags(envir)
+
+        # generated queries do not change the support code
+        with open(os.path.join(join_dir, 'grappa_q.cpp'), 'w') as f:
+            f.write('int main() {}')
+        self.assertEqual(GrappalangRunner._build_flags(envir), flags)
+
+        with open(header, 'w') as f:
+            f.write('struct B;')
+        self.assertNotEqual(GrappalangRunner._build_flags(envir), flags)
+
+    def test_input_file_args(self):
+        self.assertEqual(input_file_args({'R2': '/data/r', 'A': 'a'}),
+                         ['--input_file_A=a', '--input_file_R2=/data/r'])
+
+
+if __name__ == '__main__':
+    unittest.main()
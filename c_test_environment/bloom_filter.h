@@ -0,0 +1,55 @@
+#pragma once
+
+#include <cstdint>
+#include <vector>
+
+// Bloom filter of integer keys: may_contain is true for every inserted key
+// and, at a rate set by the number of bits and hashes, for other keys
+class BloomFilter {
+  private:
+    std::vector<uint64_t> words;
+    uint64_t nbits;
+    int nhashes;
+
+    // splitmix64 finalizer
+    static uint64_t mix(uint64_t h) {
+      h = (h ^ (h >> 30)) * 0xbf58476d1ce4e5b9ULL;
+      h = (h ^ (h >> 27)) * 0x94d049bb133111ebULL;
+      return h ^ (h >> 31);
+    }
+
+  public:
+    BloomFilter(uint64_t num_bits, int num_hashes)
+      : words((num_bits + 63) / 64, 0)
+      , nbits(words.size() * 64)
+      , nhashes(num_hashes) { }
+
+    void insert(uint64_t key) {
+      uint64_t h1 = mix(key);
+      uint64_t h2 = mix(h1) | 1;
+      for (int i = 0; i < nhashes; i++) {
+        uint64_t bit = (h1 + i * h2) % nbits;
+        words[bit / 64] |= 1ULL << (bit % 64);
+      }
+    }
+
+    bool may_contain(uint64_t key) const {
+      uint64_t h1 = mix(key);
+      uint64_t h2 = mix(h1) | 1;
+      for (int i = 0; i < nhashes; i++) {
+        uint64_t bit = (h1 + i * h2) % nbits;
+        if (!(words[bit / 64] & (1ULL << (bit % 64)))) return false;
+      }
+      return true;
+    }
+
+    uint64_t num_bits() const { return nbits; }
+};
+
+// combines the values of the key columns of a tuple into one key
+inline uint64_t bloom_key() { return 0; }
+
+template <typename T, typename... Ts>
+uint64_t bloom_key(const T& v, const Ts&... vs) {
+  return static_cast<uint64_t>(v) * 0x9e3779b97f4a7c15ULL + bloom_key(vs...);
+}
@@ -42,6 +42,33 @@ def indexing(inputf, delim_in):
     return intfile, indexf
 
 
+def dictionary_encode(inputf, dictionaries, delim_in):
+    """
+    Replace the strings in some columns with integer codes, for
+    relations whose catalog entry lists the dictionaries of the columns
+
+    @param dictionaries: dict of column index -> dictionary file;
+        columns given the same file share a dictionary
+    """
+    encodedf = inputf + '.encoded'
+    delim_out = ' '
+
+    indexers = dict((f, WordIndexer(f)) for f in set(dictionaries.values()))
+    with open(inputf, 'r') as ins:
+        reader = csv.reader(ins, delimiter=delim_in)
+        with open(encodedf, 'w') as outs:
+            writer = csv.writer(outs, delimiter=delim_out)
+            for row in reader:
+                cols = [indexers[dictionaries[i]].add_word(w)
+                        if i in dictionaries else w
+                        for i, w in enumerate(row)]
+                writer.writerow(cols)
+
+    for wi in indexers.values():
+        wi.close()
+    return encodedf
+
+
 if __name__ == '__main__':
     if len(sys.argv) < 2:
         raise Exception("usage: %s inputfile [delim]" % sys.argv[0])
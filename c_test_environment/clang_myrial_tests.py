@@ -1,11 +1,21 @@
+import collections
 import unittest
 from testquery import checkquery
 from testquery import ClangRunner
 from generate_test_relations import generate_default
 from generate_test_relations import need_generate
 from raco.backends.cpp import CCAlgebra
+from raco.backends.cpp.cpp import CFileScan, CStore, DictionaryEncodedStrings
+from raco.backends.cpp.cpp import BatchedSelects, CDictionaryDecode, \
+    CMemoryScan, CSelect
+from raco.expression import LT, NumericLiteral, UnnamedAttributeRef
+from raco.backends.cpp.cppcommon import EMIT_FILE
+from raco.relation_key import RelationKey
+from raco.catalog import FromFileCatalog
+import raco.types as types
 from raco.platform_tests import MyriaLPlatformTestHarness, MyriaLPlatformTests
 from raco.compile import compile
+from raco import profiling
 
 import sys
 sys.path.append('./examples')
@@ -19,15 +29,16 @@ import raco.viz as viz
 
 
 class MyriaLClangTest(MyriaLPlatformTestHarness, MyriaLPlatformTests):
-    def check(self, query, name, **kwargs):
-        kwargs['target_alg'] = CCAlgebra()
+    def check(self, query, name, profile=False, catalog=None,
+              input_files=None, **kwargs):
+        kwargs['target_alg'] = CCAlgebra(catalog=catalog)
         plan = self.get_physical_plan(query, **kwargs)
         physical_dot = viz.operator_to_dot(plan)
         with open(os.path.join("c_test_environment", "%s.physical.dot"%(name)), 'w') as dwf:
             dwf.write(physical_dot)
 
         # generate code in the target language
-        code = compile(plan)
+        code = compile(plan, profile=profile)
 
         fname = os.path.join("c_test_environment", "{name}.cpp".format(name=name))
         if os.path.exists(fname):
@@ -36,7 +47,223 @@ class MyriaLClangTest(MyriaLPlatformTestHarness, MyriaLPlatformTests):
             f.write(code)
 
         with Chdir("c_test_environment") as d:
-            checkquery(name, ClangRunner())
+            checkquery(name, ClangRunner(input_files=input_files))
+
+        return plan
+
+    def test_profile(self):
+        plan = self.check_sub_tables("""
+        T3 = SCAN(%(T3)s);
+        R3 = SCAN(%(R3)s);
+        out = JOIN(T3, b, R3, b);
+        out2 = [FROM out WHERE $3 = $5 EMIT $0, $3];
+        STORE(out2, OUTPUT);
+        """, "join", profile="join.profile.json")
+
+        with Chdir("c_test_environment") as d:
+            values = profiling.load_profile("join.profile.json")
+            with open("tmp/join.sqlite.csv") as f:
+                num_results = len(f.readlines())
+        profile = profiling.annotate_plan(plan, values)
+
+        self.assertTrue(profile.pipelines)
+        store = profiling.profiled_operators(plan)[0]
+        self.assertEqual(store.observed['tuples_in'], num_results)
+        join = [op for op in plan.walk() if op.opname() == 'CHashJoin'][0]
+        self.assertIn('hash_table_size', join.observed)
+        self.assertIn('estimated=', viz.operator_to_dot(plan))
+
+    def test_profile_batched(self):
+        plan = self.check_sub_tables("""
+        T2 = SCAN(%(T2)s);
+        out = [FROM T2 WHERE a < 5 EMIT a+b, b];
+        STORE(out, OUTPUT);
+        """, "batched_select_apply", profile="batched.profile.json",
+            batched=True)
+
+        with Chdir("c_test_environment") as d:
+            values = profiling.load_profile("batched.profile.json")
+            with open("tmp/batched_select_apply.sqlite.csv") as f:
+                num_results = len(f.readlines())
+            with open("T2") as f:
+                num_inputs = len(f.readlines())
+        profiling.annotate_plan(plan, values)
+
+        ops = dict((op.opname(), op) for op in plan.walk())
+        self.assertEqual(ops['CBatchedSelect'].observed['tuples_in'],
+                         num_inputs)
+        self.assertEqual(ops['CBatchedApply'].observed['tuples_in'],
+                         num_results)
+        self.assertEqual(ops['CStore'].observed['tuples_in'], num_results)
+
+    def ingest_generated(self, name):
+        """Load a generated relation into the catalog, so that the
+        optimizer estimates with its real statistics"""
+        sch = self.db.get_scheme(self.tables[name])
+        with open(os.path.join("c_test_environment", name)) as f:
+            tuples = [tuple(int(v) for v in line.split()) for line in f]
+        self.db.ingest(self.tables[name], collections.Counter(tuples), sch)
+
+    def test_bloom_filter_join(self):
+        for name in ['R3', 'S3']:
+            self.ingest_generated(name)
+        plan = self.check_sub_tables("""
+        R3 = SCAN(%(R3)s);
+        S3 = SCAN(%(S3)s);
+        small = [FROM S3 WHERE b < 2 EMIT *];
+        J = [FROM R3, small WHERE R3.a = small.a
+             EMIT R3.a, R3.b, small.c];
+        STORE(J, OUTPUT);
+        """, "bloom_filter_join", bloom_filters=True)
+        self.assertTrue(any(op.opname() == 'CBloomFilterProbe'
+                            for op in plan.walk()))
+
+    def test_memory_budget_join(self):
+        for name in ['R3', 'S3']:
+            self.ingest_generated(name)
+        # without OrderJoins, the large R3 is the build side until the
+        # memory budget swaps the join inputs
+        plan = self.check_sub_tables("""
+        R3 = SCAN(%(R3)s);
+        S3 = SCAN(%(S3)s);
+        small = [FROM S3 WHERE b < 2 EMIT *];
+        J = [FROM small, R3 WHERE R3.a = small.a
+             EMIT R3.a, R3.b, small.c];
+        STORE(J, OUTPUT);
+        """, "memory_budget_join", memory_budget=1, no_OrderJoins=True)
+        join = [op for op in plan.walk() if op.opname() == 'CHashJoin'][0]
+        self.assertTrue(any(op.opname() == 'CSelect'
+                            for op in join.right.walk()))
+
+    def test_columnar_scan_attributes(self):
+        self.ingest_generated('T3')
+        query = """
+        T3 = SCAN(%(T3)s);
+        out = [FROM T3 WHERE b < 4 EMIT c, SUM(b)];
+        STORE(out, OUTPUT);
+        """ % dict((k, str(v)) for k, v in self.tables.items())
+        plan = self.get_physical_plan(query, target_alg=CCAlgebra(),
+                                      columnar=True)
+        [scan] = [op for op in plan.walk()
+                  if op.opname() == 'CColumnarFileScan']
+        self.assertEqual(scan.num_tuples(),
+                         self.db.num_tuples(self.tables['T3']))
+
+    def batched_select_conditions(self, condition):
+        query = """
+        T2 = SCAN(%(T2)s);
+        out = [FROM T2 WHERE {0} EMIT a, b];
+        STORE(out, OUTPUT);
+        """.format(condition) % dict((k, str(v))
+                                     for k, v in self.tables.items())
+        plan = self.get_physical_plan(query, target_alg=CCAlgebra(),
+                                      batched=True)
+        code = compile(plan)
+        return [line for line in code.splitlines()
+                if "static_cast<uint64_t>" in line]
+
+    def test_batched_select_branch_free(self):
+        [line] = self.batched_select_conditions("a < 9 and (b < 9 or b > 20)")
+        self.assertIn(" & ", line)
+        self.assertIn(" | ", line)
+        self.assertNotIn(" and ", line)
+        self.assertNotIn(" or ", line)
+
+    def test_batched_select_short_circuit(self):
+        # divisions are not evaluated eagerly
+        [line] = self.batched_select_conditions("b != 0 and a / b < 2")
+        self.assertIn(" and ", line)
+        self.assertNotIn(" & ", line)
+
+    def encoded_strings(self):
+        """
+        @return catalog and input files for reading C2 and C3 with their
+        string columns dictionary encoded
+        """
+        entries = {}
+        input_files = {}
+        for name in ['C2', 'C3']:
+            sch = self.db.get_scheme(self.tables[name])
+            dictionary = os.path.abspath(
+                os.path.join("c_test_environment", name + ".dict"))
+            entries[self.tables[name]] = (
+                sch.attributes, 30,
+                dict((n, dictionary) for n in sch.get_names()[1:]))
+            input_files[name] = name + ".encoded"
+        return FromFileCatalog(entries, None), input_files
+
+    def check_encoded(self, query, name):
+        catalog, input_files = self.encoded_strings()
+        plan = self.check_sub_tables(query, name, catalog=catalog,
+                                     input_files=input_files)
+        for op in plan.walk():
+            if op.opname() == 'CFileScan':
+                self.assertNotIn(types.STRING_TYPE, op.scheme().get_types())
+
+    def test_encoded_scan_not_changed(self):
+        catalog, _ = self.encoded_strings()
+        key = self.tables['C3']
+        scan = CFileScan(key, self.db.get_scheme(key))
+        plan = DictionaryEncodedStrings(catalog).fire(
+            CStore(EMIT_FILE, RelationKey('OUTPUT'), scan))
+
+        self.assertIn(types.STRING_TYPE, scan.scheme().get_types())
+        encoded_scan = plan.input.input
+        self.assertIsNot(encoded_scan, scan)
+        self.assertEqual(encoded_scan.relation_key, key)
+        self.assertNotIn(types.STRING_TYPE,
+                         encoded_scan.scheme().get_types())
+
+    def test_batched_selects_keep_dictionary_decode(self):
+        key = self.tables['C3']
+        select = CSelect(LT(UnnamedAttributeRef(0), NumericLiteral(5)),
+                         CMemoryScan(CFileScan(key, self.db.get_scheme(key))))
+        decode = CDictionaryDecode({1: 'C3.dict'}, select)
+
+        plan = BatchedSelects().fire(decode)
+        self.assertIs(plan, decode)
+
+    def test_encoded_select_string_literal(self):
+        self.check_encoded("""
+        C3 = SCAN(%(C3)s);
+        P = [FROM C3 WHERE $1 = "coffee" EMIT *];
+        STORE(P, OUTPUT);
+        """, "select_string_literal")
+
+    def test_encoded_join_string_key(self):
+        self.check_encoded("""
+        C3 = SCAN(%(C3)s);
+        J = [FROM C3 AS r1, C3 AS r2 WHERE r1.b = r2.c EMIT r1.a, r2.a];
+        STORE(J, OUTPUT);
+        """, "join_string_key")
+
+    def test_encoded_groupby_string_multi_key(self):
+        self.check_encoded("""
+        C3 = SCAN(%(C3)s);
+        P = [FROM C3 EMIT SUM($0), $1, $2];
+        STORE(P, OUTPUT);
+        """, "groupby_string_multi_key")
+
+    def test_flatmap_sequence(self):
+        self.check_sub_tables("""
+        T2 = SCAN(%(T2)s);
+        F = [FROM T2 EMIT a, SEQUENCE(b %% 4) AS k];
+        STORE(F, OUTPUT);
+        """, "flatmap_sequence")
+
+    def test_flatmap_ngram(self):
+        self.check_sub_tables("""
+        C2 = SCAN(%(C2)s);
+        F = [FROM C2 EMIT a, NGRAM(b, 3) AS g];
+        STORE(F, OUTPUT);
+        """, "flatmap_ngram")
+
+    def test_flatmap_split(self):
+        self.check_sub_tables("""
+        C2 = SCAN(%(C2)s);
+        F = [FROM C2 EMIT a, SPLIT(b, "A") AS tok];
+        STORE(F, OUTPUT);
+        """, "flatmap_split")
 
     def setUp(self):
         super(MyriaLClangTest, self).setUp()
@@ -23,12 +23,12 @@ class ClangProcessor:
         return self.get_plan(query, **kwargs)
 
     def get_source_code(self, query, **kwargs):
-        plan = self.get_physical_plan(query, kwargs)
+        plan = self.get_physical_plan(query, **kwargs)
 
         # generate code in the target language
         return raco.compile.compile(plan)
 
     def write_source_code(self, query, basename, **kwargs):
-        code = self.get_source_code(query, kwargs)
+        code = self.get_source_code(query, **kwargs)
         with open(basename+'.cpp', 'w') as f:
             f.write(code)
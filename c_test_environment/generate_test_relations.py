@@ -2,7 +2,7 @@ import random
 import string
 import os
 from subprocess import check_call
-from c_index_strings import indexing
+from c_index_strings import indexing, dictionary_encode
 
 
 def get_name(basename, fields):
@@ -70,6 +70,9 @@ def generate_strings(basename, fields, tuples, datarange):
             f.write("\n")
 
     indexing(fn, ' ')
+    # string columns of a relation share one dictionary
+    dictionary_encode(fn, dict((j, fn + '.dict') for j in range(1, fields)),
+                      ' ')
 
 
 def generate_last_sequential(basename, fields, tuples, datarange):
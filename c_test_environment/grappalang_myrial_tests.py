@@ -100,6 +100,37 @@ class MyriaLGrappaTest(MyriaLPlatformTestHarness, MyriaLPlatformTests):
             return ro.read()
 
     # Grappa-only tests
+    def test_profile_metrics(self):
+        query = """
+        T3 = SCAN(%(T3)s);
+        R3 = SCAN(%(R3)s);
+        out = JOIN(T3, b, R3, b);
+        STORE(out, OUTPUT);
+        """ % self.tables
+        plan = self._get_grappa_physical_plan(query)
+        code = compile(plan, profile=True)
+
+        self.assertIn(
+            "GRAPPA_DEFINE_METRIC(SimpleMetric<int64_t>, raco_prof_op0_in_1",
+            code)
+        self.assertIn("raco_prof_op0_in_1++;", code)
+
+    def test_profile_metrics_not_kept(self):
+        query = """
+        T3 = SCAN(%(T3)s);
+        R3 = SCAN(%(R3)s);
+        out = JOIN(T3, b, R3, b);
+        STORE(out, OUTPUT);
+        """ % self.tables
+        plan = self._get_grappa_physical_plan(query)
+        code = compile(plan, profile=True)
+
+        # profiling again counts each tuple once; compiling without
+        # profiling counts nothing
+        self.assertEqual(compile(plan, profile=True).count("_in_1++;"),
+                         code.count("_in_1++;"))
+        self.assertNotIn("raco_prof_", compile(plan))
+
     def test_argmax_uda(self):
         # test depends on determinism in
         # argmax_uda.sql. To do this we
@@ -27,6 +27,7 @@ typedef long int int64;
 typedef long unsigned uint64;
 #endif
 
+#include <map>
 #include "io_util.h"
 
 // How to use the I/O utilities:
@@ -282,3 +283,26 @@ void write_count(const char* path, uint64_t count) {
   o << count << std::endl;
   o.close();
 }
+
+static std::map<std::string, std::string> input_path_overrides;
+
+void parse_input_paths(int argc, char **argv) {
+  const std::string prefix("--input_file_");
+  for (int i=1; i<argc; i++) {
+    std::string arg(argv[i]);
+    if (arg.compare(0, prefix.size(), prefix) != 0) continue;
+
+    size_t eq = arg.find('=', prefix.size());
+    ASSERT(eq != std::string::npos, "expected --input_file_NAME=PATH");
+    input_path_overrides[arg.substr(prefix.size(), eq-prefix.size())]
+      = arg.substr(eq+1);
+  }
+}
+
+const char *input_path(const char *name) {
+  auto it = input_path_overrides.find(name);
+  if (it == input_path_overrides.end()) {
+    return name;
+  }
+  return it->second.c_str();
+}
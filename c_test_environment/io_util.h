@@ -81,7 +81,30 @@ std::vector<T> tuplesFromAscii(const char *path) {
   return tuples;
 }
 
+// read tuples of type T into the struct-of-arrays C
+template <typename T, typename C>
+C columnsFromAscii(const char *path) {
+  std::string pathst(path);
+  std::ifstream testfile(pathst, std::ifstream::in);
+
+  C columns;
+
+  std::string line;
+  while (std::getline(testfile,line)) {
+    std::istringstream ss(line);
+    columns.push_back(T::fromIStream(ss));
+  }
+
+  return columns;
+}
+
 void write_count(const char* path, uint64_t count);
+
+// Input relations are found at the path compiled into the query
+// unless overridden on the command line with --input_file_NAME=PATH,
+// so one executable can be run against many inputs.
+void parse_input_paths(int argc, char **argv);
+const char *input_path(const char *name);
     
 
 #define ZAPPA
@@ -20,6 +20,13 @@ def parse_options(args):
     parser.add_argument('file', help='File containing platform source program')
     parser.add_argument('--query', help='File containing myrial query')
     parser.add_argument('--catalog', help='File containing catalog')
+    parser.add_argument('--input_file', action='append', default=[],
+                        metavar='NAME=PATH',
+                        help='Read relation NAME from PATH instead of the '
+                             'path compiled into the program')
+    parser.add_argument('--no_cache', action='store_true',
+                        help='Always recompile instead of reusing a '
+                             'cached executable')
 
     ns = parser.parse_args(args)
     return ns
@@ -51,12 +58,17 @@ def main(args):
         ClangProcessor(FromFileCatalog.load_from_file(opt.catalog))\
             .write_source_code(qt, name, target_alg=target_alg)
 
+    input_files = dict(f.split('=', 1) for f in opt.input_file)
+    binary_cache = not opt.no_cache
+
     if opt.platform == 'grappa':
-        runner = GrappalangRunner()
+        runner = GrappalangRunner(binary_cache=binary_cache,
+                                  input_files=input_files)
         runner.run(name, abspath)
     elif opt.platform == 'cpp':
         try:
-            runner = ClangRunner()
+            runner = ClangRunner(binary_cache=binary_cache,
+                                 input_files=input_files)
             runner.run(name, abspath)
         except subprocess.CalledProcessError as e:
             print 'cpp runner for %s failed' % (name)
@@ -45,6 +45,23 @@ StringIndex build_string_index(const std::string& indexfn) {
 
   return StringIndex(str2int);
 }
+
+StringDictionary::StringDictionary() : strings() {}
+
+StringDictionary::StringDictionary(const std::string& dictfn) : strings() {
+  std::ifstream file( dictfn );
+  if (!file) {
+    throw std::runtime_error("could not open dictionary " + dictfn);
+  }
+  std::string line;
+  while (getline( file, line )) {
+    strings.push_back(line);
+  }
+}
+
+size_t StringDictionary::size() const {
+  return strings.size();
+}
   
 std::regex compile_like_pattern(const std::string& pattern) {
   // compile regex
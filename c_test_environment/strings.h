@@ -23,6 +23,21 @@ class StringIndex {
 
 StringIndex build_string_index(const std::string& indexfn);
 
+// Strings of a dictionary encoded column, where the code of
+// a string is its line number in the dictionary file
+class StringDictionary {
+  private:
+    std::vector<std::string> strings;
+
+  public:
+    StringDictionary();
+    StringDictionary(const std::string& dictfn);
+    size_t size() const;
+    const std::string& decode(int64_t code) const {
+      return strings[code];
+    }
+};
+
 namespace QueryUtils {
 
   template <typename Iter, typename T>
@@ -166,3 +181,13 @@ template <size_t N>
 std::string substr(const std::array<char, N>& s, uint64_t pos, uint64_t len) {
   return std::string(s.data()).substr(pos, len);
 }
+
+// string value of a character array or a string literal
+template <size_t N>
+std::string as_string(const std::array<char, N>& s) {
+  return std::string(s.data());
+}
+
+inline std::string as_string(const std::string& s) {
+  return s;
+}
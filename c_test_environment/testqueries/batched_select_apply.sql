@@ -0,0 +1 @@
+select a+b, b from T2 where a < 5;
@@ -0,0 +1 @@
+select R3.a, R3.b, S3.c from R3, S3 where R3.a=S3.a and S3.b<2;
@@ -0,0 +1 @@
+select c, sum(b) from T3 where b < 4 group by c;
@@ -0,0 +1,2 @@
+with recursive pos(i) as (select 1 union all select i + 1 from pos where i < 30)
+select a, substr(b, i, 3) from C2, pos where i + 2 <= length(b);
@@ -0,0 +1,2 @@
+with recursive seq(k) as (select 0 union all select k + 1 from seq where k < 3)
+select a, k from T2, seq where k < b % 4;
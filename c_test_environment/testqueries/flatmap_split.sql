@@ -0,0 +1,8 @@
+with recursive sp(a, i, tok, rest) as (
+  select a, 0, substr(b, 1, instr(b || 'A', 'A') - 1),
+         substr(b || 'A', instr(b || 'A', 'A') + 1) from C2
+  union all
+  select a, i + 1, substr(rest, 1, instr(rest, 'A') - 1),
+         substr(rest, instr(rest, 'A') + 1) from sp where rest != '')
+select a, tok from sp
+where tok != '' or i = 0 or replace(rest, 'A', '') != '';
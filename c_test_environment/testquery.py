@@ -1,3 +1,4 @@
+import glob
 import os
 import subprocess
 import sys
@@ -5,6 +6,7 @@ import sqlite3
 import csv
 from verifier import verify, verify_store
 import osutils
+from binary_cache import BinaryCache, file_digests, input_file_args
 
 def testdbname():
     return 'test.db'
@@ -48,17 +50,27 @@ class PlatformRunner:
 
 
 class ClangRunner(PlatformRunner):
-    def __init__(self):
-        pass
-
-    def run(self, name, tmppath):
+    def __init__(self, binary_cache=True, input_files=None):
         """
-        Expects the #{name}.cpp file to already exist.
+        @param binary_cache: BinaryCache to reuse executables from;
+            True for the default cache, False to always recompile
+        @param input_files: dict of relation name -> path that overrides
+            the input paths compiled into the query
         """
-
-        envir = os.environ.copy()
-        # cpp -> exe
-        exe_name = './%s.exe' % (name)
+        if binary_cache is True:
+            binary_cache = BinaryCache()
+        self.binary_cache = binary_cache or None
+        self.input_files = input_files or {}
+
+    @staticmethod
+    def _build_flags(envir):
+        """Everything besides the source that determines the executable"""
+        support = glob.glob('*.h') + glob.glob('*.cc') + ['Makefile']
+        return [envir.get('CXX', 'g++'),
+                envir.get('CXXFLAGS', ''),
+                envir.get('LDFLAGS', '')] + file_digests(support)
+
+    def _build(self, exe_name, envir):
         try:
             subprocess.check_output(['make', 'clean'],
                                     stderr=subprocess.STDOUT,
@@ -71,11 +83,31 @@ class ClangRunner(PlatformRunner):
             print e.output
             raise
 
+    def run(self, name, tmppath):
+        """
+        Expects the #{name}.cpp file to already exist.
+        """
+
+        envir = os.environ.copy()
+        # cpp -> exe
+        exe_name = './%s.exe' % (name)
+        if self.binary_cache is None:
+            self._build(exe_name, envir)
+        else:
+            with open('%s.cpp' % (name)) as f:
+                source = f.read()
+            key = BinaryCache.key(source, self._build_flags(envir))
+            if not self.binary_cache.fetch(key, exe_name):
+                self._build(exe_name, envir)
+                self.binary_cache.insert(key, source, exe_name)
+
         # run cpp
         testoutfn = '%s/%s.out' % (tmppath, name)
         try:
             with open(testoutfn, 'w') as outs:
-                subprocess.check_call([exe_name], stdout=outs, env=envir)
+                subprocess.check_call(
+                    [exe_name] + input_file_args(self.input_files),
+                    stdout=outs, env=envir)
         except subprocess.CalledProcessError:
             print "see executable %s" % (os.path.abspath(exe_name))
             print subprocess.check_output(['ls', '-l', exe_name], env=envir)
@@ -89,21 +121,38 @@ from osutils import Chdir
 
 
 class GrappalangRunner(PlatformRunner):
-    def __init__(self, binary_input=True):
+    def __init__(self, binary_input=True, binary_cache=True,
+                 input_files=None):
+      """
+      @param binary_cache: BinaryCache to reuse executables from;
+          True for the default cache, False to always recompile
+      @param input_files: dict of relation name -> path that overrides
+          the default --input_file_NAME flags
+      """
       self.binary_input = binary_input
-
-    def run(self, name, tmppath):
-        """
-        Expects the #{name}.cpp file to already exist in
-        $GRAPPA_HOME/applications/join.
-        """
-
-        gname = 'grappa_%s' % name
-
-        envir = os.environ.copy()
-
-        # cpp -> exe
-
+      if binary_cache is True:
+          binary_cache = BinaryCache()
+      self.binary_cache = binary_cache or None
+      self.input_files = input_files or {}
+
+    @staticmethod
+    def _build_flags(envir):
+      """Everything besides the source that determines the executable,
+      including the Grappa runtime and the support code of the join
+      application, but not the generated grappa_*.cpp queries"""
+      home = envir['GRAPPA_HOME']
+      support = [p for d in ['system', 'applications/join']
+                 for ext in ['*.h', '*.hpp', '*.cpp', '*.cc']
+                 for p in glob.glob(os.path.join(home, d, ext))
+                 if not os.path.basename(p).startswith('grappa_')]
+      support += glob.glob(os.path.join(
+          home, 'build/Make+Release/system/libGrappa*'))
+      return [home,
+              envir.get('CXX', ''),
+              envir.get('CXXFLAGS', ''),
+              envir.get('LDFLAGS', '')] + file_digests(support)
+
+    def _build(self, gname, envir):
         # call configure only if a previous version does not exist
         # (i.e., the cmake target likely does not exist yet)
         need_configure = not os.path.isfile(
@@ -140,7 +189,32 @@ class GrappalangRunner(PlatformRunner):
             #                        '%s.exe' % gname,
             #                        ], env=envir)
 
+    def run(self, name, tmppath):
+        """
+        Expects the #{name}.cpp file to already exist in
+        $GRAPPA_HOME/applications/join.
+        """
+
+        gname = 'grappa_%s' % name
+
+        envir = os.environ.copy()
+
+        # cpp -> exe
+        exe_path = os.path.join(envir['GRAPPA_HOME'],
+                                'build/Make+Release/applications/join',
+                                '%s.exe' % gname)
+        if self.binary_cache is None:
+            self._build(gname, envir)
+        else:
+            with open('%s.cpp' % gname) as f:
+                source = f.read()
+            key = BinaryCache.key(source, self._build_flags(envir))
+            if not self.binary_cache.fetch(key, exe_path):
+                self._build(gname, envir)
+                self.binary_cache.insert(key, source, exe_path)
 
+        with Chdir(envir['GRAPPA_HOME']) as grappa_dir:
+          with Chdir('build/Make+Release/applications/join') as appdir:
             # run the application
             testoutfn = "%s/%s.out" % (tmppath, gname)
             with open(testoutfn, 'w') as outf:
@@ -151,7 +225,7 @@ class GrappalangRunner(PlatformRunner):
                                        '%s.exe' % gname,
                                        '--bin={0}'.format(self.binary_input),
                                        '--vmodule=%s=2' % gname  # result out
-                                       ],
+                                       ] + input_file_args(self.input_files),
                                         stderr=outf,
                                         stdout=outf,
                                         env=envir)
@@ -10,13 +10,15 @@ class RACompiler(object):
     """Thin wrapper interface for lower level functions parse, optimize,
     compile"""
 
-    def fromDatalog(self, program):
-        """Parse datalog and convert to RA"""
+    def fromDatalog(self, program, **kwargs):
+        """Parse datalog and convert to RA
+
+        kwargs are passed to raco.datalog.model.Program.toRA"""
         self.physicalplan = None
         self.source = program
         self.parsed = parse(program)
         LOG.debug("parser output: %s", self.parsed)
-        self.logicalplan = self.parsed.toRA()
+        self.logicalplan = self.parsed.toRA(**kwargs)
 
     def optimize(self, target, **kwargs):
         """Convert logical plan to physical plan"""
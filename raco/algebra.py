@@ -1,5 +1,8 @@
 from raco import expression
 from raco import scheme
+from raco import statistics
+from raco import types
+from raco import bloomfilter
 from raco.utility import Printable, real_str
 
 from abc import ABCMeta, abstractmethod
@@ -79,6 +82,18 @@ class Operator(Printable):
     def num_tuples(self):
         """Return the expected number of tuples output by this operator."""
 
+    def column_statistics(self):
+        """Return the statistics of each column output by this operator, as
+        a list of raco.statistics.ColumnStatistics with None for unknown
+        columns, or None if nothing is known."""
+        return None
+
+    def memory_estimate(self, num_servers=1):
+        """Return the estimated peak number of bytes this operator holds in
+        memory on each of num_servers servers. Default implementation
+        assumes the operator streams its input."""
+        return 0
+
     @abstractmethod
     def partitioning(self):
         """Return the partitioning of the tuples output by this operator.
@@ -691,6 +706,18 @@ class CompositeBinaryOperator(BinaryOperator):
         """Return the scheme of the result."""
         return self.left.scheme() + self.right.scheme()
 
+    def input_statistics(self):
+        """Column statistics of the concatenated inputs"""
+        left = self.left.column_statistics()
+        right = self.right.column_statistics()
+        if left is None and right is None:
+            return None
+        return ((left or [None] * len(self.left.scheme())) +
+                (right or [None] * len(self.right.scheme())))
+
+    def column_statistics(self):
+        return self.input_statistics()
+
 
 class CrossProduct(CompositeBinaryOperator):
 
@@ -728,8 +755,18 @@ class Join(CompositeBinaryOperator):
                 and self.condition == other.condition)
 
     def num_tuples(self):
-        # this is black magic
-        return int(self.left.num_tuples() * self.right.num_tuples() / 10)
+        selectivity = statistics.estimate_selectivity(
+            self.condition, self.input_statistics(),
+            self.left.scheme() + self.right.scheme())
+        if selectivity is None:
+            # this is black magic
+            return int(self.left.num_tuples() * self.right.num_tuples() / 10)
+        return int(self.left.num_tuples() * self.right.num_tuples() *
+                   selectivity)
+
+    def memory_estimate(self, num_servers=1):
+        """A hash table of the right input, which hash joins build"""
+        return hash_table_memory(self.right, num_servers)
 
     def copy(self, other):
         """deep copy"""
@@ -842,6 +879,15 @@ class Apply(UnaryOperator):
     def num_tuples(self):
         return self.input.num_tuples()
 
+    def column_statistics(self):
+        stats = self.input.column_statistics()
+        if stats is None:
+            return None
+        input_scheme = self.input.scheme()
+        return [stats[sexpr.get_position(input_scheme)]
+                if isinstance(sexpr, expression.AttributeRef) else None
+                for _, sexpr in self.emitters]
+
     def copy(self, other):
         """deep copy"""
         self.emitters = other.emitters
@@ -887,6 +933,70 @@ class Apply(UnaryOperator):
                                                inp=self.input)
 
 
+class FlatMap(UnaryOperator):
+
+    def __init__(self, emitters=None, input=None):
+        """Create new attributes from expressions, some of which return
+        many values per input tuple.
+
+        An emit expression that is a flatmap function, such as SPLIT or
+        SEQUENCE, emits each of its values; each input tuple produces the
+        cross product of the values of the emit expressions.
+
+        :param emitters: list of tuples of the form:
+            (column_name, raco.expression.Expression).
+            column_name can be None, in which case the system will infer a
+            name based on the expression
+        :type emitters: list of tuples
+        """
+
+        if emitters is not None:
+            in_scheme = input.scheme()
+            self.emitters = \
+                [(resolve_attribute_name(name, in_scheme, sexpr, index), sexpr)
+                 for index, (name, sexpr) in enumerate(emitters)]
+        UnaryOperator.__init__(self, input)
+
+    def __eq__(self, other):
+        return (UnaryOperator.__eq__(self, other) and
+                self.emitters == other.emitters)
+
+    def num_tuples(self):
+        return self.input.num_tuples()
+
+    def partitioning(self):
+        # TODO pass on partitioning for easy cases like renames
+        return RepresentationProperties()
+
+    def copy(self, other):
+        """deep copy"""
+        self.emitters = other.emitters
+        UnaryOperator.copy(self, other)
+
+    def scheme(self):
+        """scheme of the result."""
+        input_scheme = self.input.scheme()
+        new_attrs = [(name, expr.typeof(input_scheme, None))
+                     for (name, expr) in self.emitters]
+        return scheme.Scheme(new_attrs)
+
+    def shortStr(self):
+        estrs = ",".join(["%s=%s" % (name, str(ex))
+                          for name, ex in self.emitters])
+        return "%s(%s)" % (self.opname(), estrs)
+
+    def get_unnamed_emit_exprs(self):
+        """Get the emit expressions for this FlatMap after ensuring that all
+        attribute references are UnnamedAttributeRefs."""
+        emits = [e[1] for e in self.emitters]
+        return expression.ensure_unnamed(emits, self.input)
+
+    def __repr__(self):
+        return "{op}({emt!r}, {inp!r})".format(op=self.opname(),
+                                               emt=self.emitters,
+                                               inp=self.input)
+
+
 class StatefulApply(UnaryOperator):
     inits = None
     updaters = None
@@ -966,17 +1076,68 @@ class StatefulApply(UnaryOperator):
         return "%s(%s)" % (self.opname(), estrs)
 
 
+def servers_holding(op, num_servers):
+    """The number of servers that the tuples of op are spread over evenly
+    enough to share the memory of an operator over them"""
+    if num_servers > 1 and op.partitioning().hash_partitioned:
+        return num_servers
+    return 1
+
+
+def relation_bytes(op, num_servers=1):
+    """Estimated bytes of the tuples of op materialized on each server"""
+    tuples = math.ceil(float(op.num_tuples()) /
+                       servers_holding(op, num_servers))
+    return int(tuples) * statistics.tuple_width(op.scheme())
+
+
+def hash_table_memory(op, num_servers=1):
+    """Estimated bytes of a hash table of the tuples of op on each server"""
+    tuples = math.ceil(float(op.num_tuples()) /
+                       servers_holding(op, num_servers))
+    return statistics.hash_table_bytes(tuples, op.scheme())
+
+
 # TODO: Non-scheme-mutating operators
 class Distinct(UnaryOperator):
 
     """Remove duplicates from the child operator"""
 
-    def __init__(self, input=None):
+    def __init__(self, input=None, strategy=None):
         UnaryOperator.__init__(self, input)
+        self.strategy = strategy or self.Strategy.Hash
+
+    def __eq__(self, other):
+        return UnaryOperator.__eq__(self, other) and \
+            self.strategy == other.strategy
+
+    def __repr__(self):
+        return "{op}({inp!r}, {st!r})".format(op=self.opname(),
+                                              inp=self.input,
+                                              st=self.strategy)
+
+    def copy(self, other):
+        self.strategy = other.strategy
+        UnaryOperator.copy(self, other)
+
+    def memory_estimate(self, num_servers=1):
+        if self.strategy == self.Strategy.Sort:
+            return min(relation_bytes(self.input, num_servers),
+                       statistics.SORT_BUFFER_BYTES)
+        servers = servers_holding(self.input, num_servers)
+        return statistics.hash_table_bytes(
+            math.ceil(float(self.num_tuples()) / servers), self.scheme())
 
     def num_tuples(self):
-        # TODO: better heuristics?
-        return self.input.num_tuples()
+        stats = self.input.column_statistics()
+        distinct = statistics.distinct_values(
+            stats, range(len(self.scheme())))
+        if distinct is None:
+            return self.input.num_tuples()
+        return min(distinct, self.input.num_tuples())
+
+    def column_statistics(self):
+        return self.input.column_statistics()
 
     def partitioning(self):
         return self.input.partitioning()
@@ -986,7 +1147,16 @@ class Distinct(UnaryOperator):
         return self.input.scheme()
 
     def shortStr(self):
-        return self.opname()
+        if self.strategy == self.Strategy.Hash:
+            return self.opname()
+        return "%s(%s)" % (self.opname(), self.strategy)
+
+    class Strategy(object):
+        """Enum of duplicate elimination algorithms: a hash table of the
+        distinct tuples, an external sort that drops adjacent duplicates,
+        or a hash table per partition of an input already hash partitioned
+        on a subset of its columns."""
+        Hash, Sort, Partitioned = ('Hash', 'Sort', 'Partitioned')
 
 
 class Limit(UnaryOperator):
@@ -1033,7 +1203,15 @@ class Select(UnaryOperator):
                 and self.condition == other.condition)
 
     def num_tuples(self):
-        return int(self.input.num_tuples() * 0.5)
+        selectivity = statistics.estimate_selectivity(
+            self.condition, self.input.column_statistics(),
+            self.input.scheme())
+        if selectivity is None:
+            selectivity = 0.5
+        return int(self.input.num_tuples() * selectivity)
+
+    def column_statistics(self):
+        return self.input.column_statistics()
 
     def shortStr(self):
         if isinstance(self.condition, dict):
@@ -1147,7 +1325,15 @@ class GroupBy(UnaryOperator):
     def num_tuples(self):
         if not self.grouping_list:
             return 1
-        return self.input.num_tuples()
+        input_scheme = self.input.scheme()
+        columns = [g.get_position(input_scheme)
+                   if isinstance(g, expression.AttributeRef) else None
+                   for g in self.grouping_list]
+        groups = statistics.distinct_values(self.input.column_statistics(),
+                                            columns)
+        if groups is None:
+            return self.input.num_tuples()
+        return min(groups, self.input.num_tuples())
 
     def partitioning(self):
         ip = self.input.partitioning()
@@ -1156,6 +1342,13 @@ class GroupBy(UnaryOperator):
         else:
             return RepresentationProperties()
 
+    def memory_estimate(self, num_servers=1):
+        if not self.grouping_list:
+            return statistics.hash_table_bytes(1, self.scheme())
+        groups = math.ceil(float(self.num_tuples()) /
+                           servers_holding(self.input, num_servers))
+        return statistics.hash_table_bytes(groups, self.scheme())
+
     def shortStr(self):
         return "%s(%s; %s)" % (self.opname(),
                                real_str(self.grouping_list, skip_out=True),
@@ -1247,6 +1440,9 @@ class OrderBy(UnaryOperator):
         # TODO set sorted
         return RepresentationProperties()
 
+    def memory_estimate(self, num_servers=1):
+        return relation_bytes(self.input, num_servers)
+
     def shortStr(self):
         ascend_string = ['+' if a else '-' for a in self.ascending]
         sort_string = ','.join('{col}{asc}'.format(col=c, asc=a)
@@ -1301,6 +1497,13 @@ class ProjectingJoin(Join):
 
         return project_partitioning(self.output_columns, joinp)
 
+    def column_statistics(self):
+        stats = self.input_statistics()
+        if stats is None or self.output_columns is None:
+            return stats
+        combined = self.left.scheme() + self.right.scheme()
+        return [stats[p.get_position(combined)] for p in self.output_columns]
+
     def scheme(self):
         """Return the scheme of the result."""
         if self.output_columns is None:
@@ -1331,21 +1534,39 @@ class Shuffle(UnaryOperator):
 
     """Send the input to the specified servers"""
 
-    def __init__(self, child=None, columnlist=None, shuffle_type=None):
+    def __init__(self, child=None, columnlist=None, shuffle_type=None,
+                 heavy_hitters=None, broadcast_heavy_hitters=False):
+        """
+        @param heavy_hitters: for a SkewedHash shuffle, the values of
+            columnlist that are sent round robin, or to every server if
+            broadcast_heavy_hitters, instead of by their hash
+        """
         UnaryOperator.__init__(self, child)
         self.columnlist = columnlist
         self.shuffle_type = shuffle_type or self.ShuffleType.Hash
-        if shuffle_type == self.ShuffleType.Hash:
+        self.heavy_hitters = heavy_hitters or []
+        self.broadcast_heavy_hitters = broadcast_heavy_hitters
+        if shuffle_type in (self.ShuffleType.Hash,
+                            self.ShuffleType.SkewedHash):
             assert columnlist, \
                 "column list for hash shuffle must be non-null and non-empty"
 
     def num_tuples(self):
         return self.input.num_tuples()
 
+    def column_statistics(self):
+        return self.input.column_statistics()
+
     def shortStr(self):
         if self.shuffle_type == self.ShuffleType.Hash:
             return "%s(%s(%s))" % (self.opname(), self.shuffle_type,
                                    real_str(self.columnlist, skip_out=True))
+        if self.shuffle_type == self.ShuffleType.SkewedHash:
+            return "%s(%s(%s; %s %s))" % (
+                self.opname(), self.shuffle_type,
+                real_str(self.columnlist, skip_out=True),
+                "broadcast" if self.broadcast_heavy_hitters else "split",
+                real_str(self.heavy_hitters, skip_out=True))
         return "%s(%s)" % (self.opname(), self.shuffle_type)
 
     def partitioning(self):
@@ -1363,12 +1584,14 @@ class Shuffle(UnaryOperator):
     def copy(self, other):
         self.columnlist = other.columnlist
         self.shuffle_type = other.shuffle_type
+        self.heavy_hitters = other.heavy_hitters
+        self.broadcast_heavy_hitters = other.broadcast_heavy_hitters
         UnaryOperator.copy(self, other)
 
     class ShuffleType(object):
         """Enum of supported shuffling types."""
-        Hash, Identity, HyperCube, RoundRobin = (
-            'Hash', 'Identity', 'HyperCube', 'RoundRobin')
+        Hash, Identity, HyperCube, RoundRobin, SkewedHash = (
+            'Hash', 'Identity', 'HyperCube', 'RoundRobin', 'SkewedHash')
 
 
 class HyperCubeShuffle(UnaryOperator):
@@ -1398,6 +1621,9 @@ class HyperCubeShuffle(UnaryOperator):
     def num_tuples(self):
         return self.input.num_tuples()
 
+    def column_statistics(self):
+        return self.input.column_statistics()
+
     def shortStr(self):
         return "%s(%s)" % (self.opname(), real_str(self.hashed_columns,
                                                    skip_out=True))
@@ -1421,6 +1647,9 @@ class Collect(UnaryOperator):
     def num_tuples(self):
         return self.input.num_tuples()
 
+    def column_statistics(self):
+        return self.input.column_statistics()
+
     def partitioning(self):
         # TODO: implement one-partition partitioning?
         return RepresentationProperties()
@@ -1440,6 +1669,9 @@ class Broadcast(UnaryOperator):
     def num_tuples(self):
         return self.input.num_tuples()
 
+    def column_statistics(self):
+        return self.input.column_statistics()
+
     def shortStr(self):
         return self.opname()
 
@@ -1498,6 +1730,106 @@ class PartitionBy(UnaryOperator):
         return self.input.scheme()
 
 
+class BloomFilterBuild(UnaryOperator):
+
+    """Build a Bloom filter of the values of columns of the input. The
+    filter is output as (word, bits) tuples of its nonzero 64-bit words;
+    see raco.bloomfilter."""
+
+    def __init__(self, columnlist=None, num_bits=None, num_hashes=None,
+                 input=None):
+        self.columnlist = columnlist
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        UnaryOperator.__init__(self, input)
+
+    def __eq__(self, other):
+        return (UnaryOperator.__eq__(self, other)
+                and self.columnlist == other.columnlist
+                and self.num_bits == other.num_bits
+                and self.num_hashes == other.num_hashes)
+
+    def __repr__(self):
+        return "{op}({cols!r}, {m!r}, {k!r}, {inp!r})".format(
+            op=self.opname(), cols=self.columnlist, m=self.num_bits,
+            k=self.num_hashes, inp=self.input)
+
+    def num_tuples(self):
+        return self.num_bits // bloomfilter.WORD_BITS
+
+    def partitioning(self):
+        return RepresentationProperties()
+
+    def shortStr(self):
+        return "%s(%s; %d bits, %d hashes)" % (
+            self.opname(), real_str(self.columnlist, skip_out=True),
+            self.num_bits, self.num_hashes)
+
+    def copy(self, other):
+        """deep copy"""
+        self.columnlist = other.columnlist
+        self.num_bits = other.num_bits
+        self.num_hashes = other.num_hashes
+        UnaryOperator.copy(self, other)
+
+    def scheme(self):
+        return scheme.Scheme([('word', types.LONG_TYPE),
+                              ('bits', types.LONG_TYPE)])
+
+
+class BloomFilterProbe(BinaryOperator):
+
+    """Keep the tuples of the left input whose values of columns may be in
+    the Bloom filter output by a BloomFilterBuild on the right"""
+
+    def __init__(self, columnlist=None, num_bits=None, num_hashes=None,
+                 left=None, right=None, selectivity=1.0):
+        """
+        @param selectivity: estimated fraction of the left input kept
+        """
+        self.columnlist = columnlist
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.selectivity = selectivity
+        BinaryOperator.__init__(self, left, right)
+
+    def __eq__(self, other):
+        return (BinaryOperator.__eq__(self, other)
+                and self.columnlist == other.columnlist
+                and self.num_bits == other.num_bits
+                and self.num_hashes == other.num_hashes
+                and self.selectivity == other.selectivity)
+
+    def __repr__(self):
+        return "{op}({cols!r}, {m!r}, {k!r}, {l!r}, {r!r}, {s!r})".format(
+            op=self.opname(), cols=self.columnlist, m=self.num_bits,
+            k=self.num_hashes, l=self.left, r=self.right, s=self.selectivity)
+
+    def num_tuples(self):
+        return int(self.left.num_tuples() * self.selectivity)
+
+    def column_statistics(self):
+        return self.left.column_statistics()
+
+    def partitioning(self):
+        return self.left.partitioning()
+
+    def shortStr(self):
+        return "%s(%s)" % (self.opname(),
+                           real_str(self.columnlist, skip_out=True))
+
+    def copy(self, other):
+        """deep copy"""
+        self.columnlist = other.columnlist
+        self.num_bits = other.num_bits
+        self.num_hashes = other.num_hashes
+        self.selectivity = other.selectivity
+        BinaryOperator.copy(self, other)
+
+    def scheme(self):
+        return self.left.scheme()
+
+
 class Fixpoint(Operator):
 
     def __init__(self, body=None):
@@ -1729,17 +2061,19 @@ class Scan(ZeroaryOperator):
     def __init__(self, relation_key=None, _scheme=None,
                  cardinality=DEFAULT_CARDINALITY,
                  partitioning=RepresentationProperties(),
-                 debroadcast=False):
+                 debroadcast=False, statistics=None):
         """Initialize a scan operator.
 
         relation_key is a string of the form "user:program:relation"
         scheme is the schema of the relation.
+        statistics is a list of the ColumnStatistics of its columns.
         """
         self.relation_key = relation_key
         self._scheme = _scheme
         self._cardinality = cardinality
         self._partitioning = partitioning
         self._debroadcast = debroadcast
+        self._statistics = statistics
 
         ZeroaryOperator.__init__(self)
 
@@ -1763,6 +2097,9 @@ class Scan(ZeroaryOperator):
     def num_tuples(self):
         return self._cardinality
 
+    def column_statistics(self):
+        return self._statistics
+
     def partitioning(self):
         if self._debroadcast:
             assert self._partitioning.broadcasted
@@ -1785,6 +2122,7 @@ class Scan(ZeroaryOperator):
         self._cardinality = other._cardinality
         self._partitioning = other._partitioning
         self._debroadcast = other._debroadcast
+        self._statistics = getattr(other, '_statistics', None)
 
         # TODO: need a cleaner and more general way of tracing information
         # through the compilation process for debugging purposes
@@ -1853,6 +2191,10 @@ class StoreTemp(UnaryOperator):
     def partitioning(self):
         return self.input.partitioning()
 
+    def memory_estimate(self, num_servers=1):
+        """The temporary relation held for the rest of the query"""
+        return relation_bytes(self.input, num_servers)
+
     def shortStr(self):
         return '{op}({name})'.format(op=self.opname(), name=self.name)
 
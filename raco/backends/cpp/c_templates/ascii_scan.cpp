@@ -1,2 +1,2 @@
-auto {{resultsym}} = tuplesFromAscii<{{result_type}}>("{{name}}");
+auto {{resultsym}} = tuplesFromAscii<{{result_type}}>(input_path("{{name}}"));
 
@@ -39,6 +39,7 @@ typedef uint64_t uint64;
 
 #include "io_util.h"
 #include "hash.h"
+#include "bloom_filter.h"
 #include "radish_utils.h"
 #include "strings.h"
 #include "timing.h"
@@ -87,6 +88,7 @@ int main(int argc, char **argv) {
 
   struct relationInfo resultInfo;
 
+  parse_input_paths(argc, argv);
   init();
 
     printf("post-init stdout\n");fflush(stdout);
@@ -0,0 +1,5 @@
+for (uint64_t {{index}} = 0; {{index}} < {{count}}; {{index}}++) {
+    auto& {{tuple_name}} = {{row}};
+    {{inner_code}}
+}
+
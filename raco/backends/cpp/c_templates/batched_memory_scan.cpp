@@ -0,0 +1,4 @@
+for (uint64_t {{base}} = 0; {{base}} < {{inputsym}}.size(); {{base}} += {{batch_size}}) {
+    const uint64_t {{count}} = std::min<uint64_t>({{batch_size}}, {{inputsym}}.size() - {{base}});
+    {{inner_plan_compiled}}
+} // end batched scan over {{inputsym}}
@@ -0,0 +1,4 @@
+uint32_t {{sel}}[{{batch_size}}];
+uint64_t {{selcount}} = 0;
+{{select_loop}}
+{{inner_code_compiled}}
@@ -0,0 +1,3 @@
+// branch-free: always write the offset, only count it if selected
+{{sel}}[{{selcount}}] = {{offset}};
+{{selcount}} += static_cast<uint64_t>({{conditioncode}});
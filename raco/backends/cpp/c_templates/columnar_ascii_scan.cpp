@@ -0,0 +1,2 @@
+auto {{resultsym}} = columnsFromAscii<{{result_type}}, {{result_type}}_columns>(input_path("{{name}}"));
+
@@ -0,0 +1,3 @@
+for (uint64_t {{tuple_name}} = 0; {{tuple_name}} < {{inputsym}}.size(); {{tuple_name}}++) {
+    {{inner_plan_compiled}}
+} // end columnar scan over {{inputsym}}
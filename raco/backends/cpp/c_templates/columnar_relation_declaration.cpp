@@ -0,0 +1 @@
+{{tuple_type}}_columns {{resultsym}};
@@ -0,0 +1,18 @@
+  // struct-of-arrays layout of {{tupletypename}}, one vector per field,
+  // so that loops touching few fields stream only those fields
+  class {{tupletypename}}_columns {
+    public:
+    {% for ft in fieldtypes %}
+        std::vector<{{ft}}> f{{loop.index - 1}};
+    {% endfor %}
+
+    size_t size() const {
+      return f0.size();
+    }
+
+    void push_back(const {{tupletypename}}& t) {
+      {% for i in range(numfields) %}
+        f{{i}}.push_back(t.f{{i}});
+      {% endfor %}
+    }
+  };
@@ -0,0 +1,8 @@
+{
+  const std::string {{sym}}_str = as_string({{args[0]}});
+  const int64_t {{sym}}_n = {{args[1]}};
+  for (int64_t {{sym}}_i = 0; {{sym}}_i + {{sym}}_n <= static_cast<int64_t>({{sym}}_str.size()); {{sym}}_i++) {
+    const auto {{value}} = to_array<MAX_STR_LEN, std::string, true>({{sym}}_str.substr({{sym}}_i, {{sym}}_n));
+    {{inner_code_compiled}}
+  }
+}
@@ -0,0 +1,3 @@
+for (int64_t {{value}} = 0; {{value}} < {{args[0]}}; {{value}}++) {
+  {{inner_code_compiled}}
+}
@@ -0,0 +1,18 @@
+{
+  const std::string {{sym}}_str = as_string({{args[0]}});
+  {% if constant_args[1] %}static {% endif %}const std::regex {{sym}}_regex(as_string({{args[1]}}));
+  std::vector<std::string> {{sym}}_tokens(
+      std::sregex_token_iterator({{sym}}_str.begin(), {{sym}}_str.end(), {{sym}}_regex, -1),
+      std::sregex_token_iterator());
+  // like String.split, drop trailing empty tokens but keep at least one
+  while (!{{sym}}_tokens.empty() && {{sym}}_tokens.back().empty()) {
+    {{sym}}_tokens.pop_back();
+  }
+  if ({{sym}}_tokens.empty()) {
+    {{sym}}_tokens.emplace_back();
+  }
+  for (const auto& {{sym}}_tok : {{sym}}_tokens) {
+    const auto {{value}} = to_array<MAX_STR_LEN, std::string, true>({{sym}}_tok);
+    {{inner_code_compiled}}
+  }
+}
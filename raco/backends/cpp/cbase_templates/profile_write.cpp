@@ -0,0 +1,8 @@
+{
+  std::ofstream _profile("{{path}}");
+  _profile << "{" << std::endl;
+  {% for name, code in values %}
+  _profile << "  \"{{name}}\": " << ({{code}}){% if not loop.last %} << ","{% endif %} << std::endl;
+  {% endfor %}
+  _profile << "}" << std::endl;
+}
@@ -2,10 +2,14 @@
 # where you plugin in the sequential shared memory language specific codegen
 
 from raco import algebra
+from raco import catalog
 from raco import expression
 from raco.backends import Algebra
+from raco.backends.backend_common import CompileExpressionVisitor
 from raco.backends.cpp import cppcommon
 from raco import rules
+from raco import scheme
+from raco import types
 from raco.pipelines import Pipelined
 from raco.backends.cpp.cppcommon import StagedTupleRef, CBaseLanguage
 
@@ -15,6 +19,8 @@ import logging
 
 _LOG = logging.getLogger(__name__)
 
+import abc
+import copy
 import itertools
 
 
@@ -27,6 +33,28 @@ class CStagedTupleRef(StagedTupleRef):
         return constructor_template.render(locals())
 
 
+class CColumnarTupleRef(CStagedTupleRef):
+    """
+    A tuple of a relation materialized as one array per field.
+    The name of the tuple is the row index, so the tuple is
+    never assembled and a scan reads only the fields it uses.
+    """
+
+    def get_code(self, position):
+        return "{relsym}.f{position}[{name}]".format(relsym=self.relsym,
+                                                     position=position,
+                                                     name=self.name)
+
+    def generateDefinition(self):
+        code = super(CColumnarTupleRef, self).generateDefinition()
+
+        columns_template = CC.cgenv().get_template('materialized_columns.cpp')
+        tupletypename = self.getTupleTypename()
+        numfields = len(self.scheme)
+        fieldtypes = [CC.typename(t) for t in self.scheme.get_types()]
+        return code + columns_template.render(locals())
+
+
 class CC(CBaseLanguage):
     _template_path = 'cpp/c_templates'
     _cgenv = CBaseLanguage.__get_env_for_template_libraries__(_template_path)
@@ -60,6 +88,11 @@ class CC(CBaseLanguage):
         code = timing_template.render(locals())
         return code
 
+    @staticmethod
+    def profile_pipeline_runtime(ident):
+        # declared by clang_pipeline_timing.cpp
+        return "runtime_{0}".format(ident)
+
     @staticmethod
     def log(txt):
         return """std::cout << "%s" << std::endl;
@@ -116,7 +149,7 @@ class CMemoryScan(algebra.UnaryOperator, CCOperator):
         tuple_type = stagedTuple.getTupleTypename()
         tuple_name = stagedTuple.name
 
-        inner_plan_compiled = self.parent().consume(stagedTuple, self, state)
+        inner_plan_compiled = self.consumeInParent(stagedTuple, state)
 
         code = memory_scan_template.render(locals())
         state.setPipelineProperty("type", "in_memory")
@@ -124,7 +157,11 @@ class CMemoryScan(algebra.UnaryOperator, CCOperator):
         return None
 
     def num_tuples(self):
-        raise NotImplementedError("{}.num_tuples()".format(op=self.opname()))
+        return self.input.num_tuples()
+
+    def memory_estimate(self, num_servers=1):
+        """The relation, loaded into memory"""
+        return algebra.relation_bytes(self, num_servers)
 
     def shortStr(self):
         return "%s" % (self.opname())
@@ -144,6 +181,158 @@ class CMemoryScan(algebra.UnaryOperator, CCOperator):
         return UnaryOperator.__eq__(self, other)
 
 
+class CColumnarMemoryScan(CMemoryScan):
+    """Scan over a relation materialized by CColumnarFileScan"""
+
+    def consume(self, inputsym, src, state):
+        memory_scan_template = self.language().cgenv().get_template(
+            'columnar_memory_scan.cpp')
+
+        stagedTuple = state.lookupTupleDef(inputsym)
+        assert isinstance(stagedTuple, CColumnarTupleRef), \
+            "{0} requires a columnar input".format(self.opname())
+        tuple_name = stagedTuple.name
+
+        inner_plan_compiled = self.consumeInParent(stagedTuple, state)
+
+        code = memory_scan_template.render(locals())
+        state.setPipelineProperty("type", "in_memory")
+        state.addPipeline(code)
+        return None
+
+
+class Batch(object):
+    """
+    Code-generation time description of a batch of tuples:
+    rows[base + offset(i)] for 0 <= i < count, where offset(i) is
+    sel[i] given a selection vector, else i
+    """
+
+    def __init__(self, rows, count, capacity, base=None, sel=None):
+        self.rows = rows
+        self.count = count
+        self.capacity = capacity
+        self.base = base
+        self.sel = sel
+
+    def offset(self, index):
+        if self.sel is None:
+            return index
+        return "{0}[{1}]".format(self.sel, index)
+
+    def row(self, index):
+        offset = self.offset(index)
+        if self.base is not None:
+            offset = "{0} + {1}".format(self.base, offset)
+        return "{0}[{1}]".format(self.rows, offset)
+
+    def loop(self, t, body):
+        """
+        @param t: tuple ref bound to each tuple of the batch
+        @param body: function from the loop index symbol to the loop body
+        """
+        index = gensym()
+        return CC.cgenv().get_template('batch_loop.cpp').render(
+            index=index,
+            count=self.count,
+            tuple_name=t.name,
+            row=self.row(index),
+            inner_code=body(index))
+
+
+class CBatched(object):
+    """Operator that can consume a whole Batch at a time"""
+
+    __metaclass__ = abc.ABCMeta
+
+    @abc.abstractmethod
+    def consume_batch(self, batch, t, src, state):
+        """
+        @param batch: Batch of tuples of the type of t
+        @return code processing the batch
+        """
+
+    def _consume_batch_above(self, batch, t, state):
+        parent = self.parent()
+        if isinstance(parent, CBatched):
+            return self.profileTuplesOut(state, batch.count) + \
+                parent.consume_batch(batch, t, self, state)
+
+        # parent works a tuple at a time
+        return batch.loop(t, lambda index: self.consumeInParent(t, state))
+
+
+class CBatchedMemoryScan(CBatched, CMemoryScan):
+    """Scan over a relation in fixed size batches"""
+
+    batch_size = 1024
+
+    def consume(self, inputsym, src, state):
+        stagedTuple = state.lookupTupleDef(inputsym)
+        base = gensym()
+        count = gensym()
+        batch_size = self.batch_size
+        batch = Batch(inputsym, count, batch_size, base=base)
+
+        inner_plan_compiled = self._consume_batch_above(
+            batch, stagedTuple, state)
+
+        code = self.language().cgenv().get_template(
+            'batched_memory_scan.cpp').render(locals())
+        state.setPipelineProperty("type", "in_memory")
+        state.addPipeline(code)
+        return None
+
+    def consume_batch(self, batch, t, src, state):
+        assert False, "as a source, no need for consume_batch"
+
+
+class CBloomFilterBuild(algebra.BloomFilterBuild, CCOperator):
+    """Inserts the keys of its input into a BloomFilter, which the
+    CBloomFilterProbe above reads once this pipeline has run"""
+    _i = 0
+
+    @staticmethod
+    def __genFilterName__():
+        name = "bloom_%03d" % CBloomFilterBuild._i
+        CBloomFilterBuild._i += 1
+        return name
+
+    def produce(self, state):
+        self._filtername = CBloomFilterBuild.__genFilterName__()
+        state.addDeclarations(["BloomFilter {0}({1}, {2});\n".format(
+            self._filtername, self.num_bits, self.num_hashes)])
+        self.input.produce(state)
+
+    def consume(self, t, src, state):
+        return "{0}.insert({1});\n".format(
+            self._filtername, bloom_key_code(t, self.columnlist))
+
+    def profile_sizes(self):
+        return [("bits", "{0}.num_bits()".format(self._filtername))]
+
+
+class CBloomFilterProbe(algebra.BloomFilterProbe, CCOperator):
+    """Passes on the tuples of its left input whose keys may be in the
+    filter built by its right input"""
+
+    def produce(self, state):
+        self.right.produce(state)
+        self.left.produce(state)
+
+    def consume(self, t, src, state):
+        inner_code_compiled = self.consumeInParent(t, state)
+        return "if ({0}.may_contain({1})) {{\n{2}\n}}\n".format(
+            self.right._filtername, bloom_key_code(t, self.columnlist),
+            inner_code_compiled)
+
+
+def bloom_key_code(t, columnlist):
+    """Code combining the key columns of tuple t for a BloomFilter"""
+    return "bloom_key({0})".format(
+        ", ".join(t.get_code(c.position) for c in columnlist))
+
+
 class CGroupBy(cppcommon.BaseCGroupby, CCOperator):
     _i = 0
 
@@ -238,7 +427,7 @@ class CGroupBy(cppcommon.BaseCGroupby, CCOperator):
         output_tuple_type = output_tuple.getTupleTypename()
         state.addDeclarations([output_tuple.generateDefinition()])
 
-        inner_code = self.parent().consume(output_tuple, self, state)
+        inner_code = self.consumeInParent(output_tuple, state)
         code = produce_template.render(locals())
         state.setPipelineProperty("type", "in_memory")
         state.addPipeline(code)
@@ -286,6 +475,11 @@ class CGroupBy(cppcommon.BaseCGroupby, CCOperator):
         code = materialize_template.render(locals())
         return code
 
+    def profile_sizes(self):
+        if self.useMap:
+            return [('hash_table_size', '{0}.size()'.format(self.hashname))]
+        return []
+
 
 class CHashJoin(algebra.Join, CCOperator):
     _i = 0
@@ -416,13 +610,16 @@ class CHashJoin(algebra.Join, CCOperator):
 
             state.addDeclarations([out_tuple_type_def, combine_function_def])
 
-            inner_plan_compiled = self.parent().consume(outTuple, self, state)
+            inner_plan_compiled = self.consumeInParent(outTuple, state)
 
             code = left_template.render(locals())
             return code
 
         assert False, "src not equal to left or right"
 
+    def profile_sizes(self):
+        return [('hash_table_size', '{0}.size()'.format(self._hashname))]
+
 
 def indentby(code, level):
     indent = " " * ((level + 1) * 6)
@@ -439,6 +636,10 @@ class CApply(cppcommon.CBaseApply, CCOperator):
     pass
 
 
+class CFlatMap(cppcommon.CBaseFlatMap, CCOperator):
+    pass
+
+
 class CProject(cppcommon.CBaseProject, CCOperator):
     pass
 
@@ -447,6 +648,87 @@ class CSelect(cppcommon.CBaseSelect, CCOperator):
     pass
 
 
+# expressions that are safe to evaluate for every tuple, whether or not
+# the conditions around them hold
+_EAGER_EXPRESSIONS = (expression.AttributeRef, expression.Literal,
+                      expression.BinaryComparisonOperator, expression.AND,
+                      expression.OR, expression.NOT, expression.PLUS,
+                      expression.MINUS, expression.TIMES, expression.NEG)
+
+
+class BranchFreeExpressionVisitor(CompileExpressionVisitor):
+    """Compiles AND and OR to & and |, which evaluate both sides
+    instead of branching on the left one"""
+
+    def visit_AND(self, binaryexpr):
+        self.appendbinop(binaryexpr, "&")
+
+    def visit_OR(self, binaryexpr):
+        self.appendbinop(binaryexpr, "|")
+
+
+class CBatchedSelect(CBatched, CSelect):
+    """Select that evaluates its condition for a whole batch,
+    producing a selection vector. The loop has no branches unless the
+    condition needs short-circuiting, e.g., to guard a division."""
+
+    def _compile_condition(self, t, state):
+        condition = expression.ensure_unnamed(self.condition, self)
+        if not all(isinstance(e, _EAGER_EXPRESSIONS)
+                   for e in condition.walk()):
+            return super(CBatchedSelect, self)._compile_condition(t, state)
+
+        visitor = BranchFreeExpressionVisitor(self.language(), tupleref=t)
+        condition.accept(visitor)
+        conditioncode, cond_decls, cond_inits = visitor.getresult()
+        state.addInitializers(cond_inits)
+        state.addDeclarations(cond_decls)
+        return conditioncode
+
+    def consume_batch(self, batch, t, src, state):
+        conditioncode = self._compile_condition(t, state)
+
+        sel = gensym()
+        selcount = gensym()
+        batch_size = batch.capacity
+        row_template = self.language().cgenv().get_template(
+            'batched_select_row.cpp')
+        select_loop = batch.loop(t, lambda index: row_template.render(
+            sel=sel,
+            selcount=selcount,
+            offset=batch.offset(index),
+            conditioncode=conditioncode))
+
+        selected = Batch(batch.rows, selcount, batch.capacity,
+                         base=batch.base, sel=sel)
+        inner_code_compiled = self._consume_batch_above(selected, t, state)
+
+        return self.language().cgenv().get_template(
+            'batched_select.cpp').render(locals())
+
+
+class CBatchedApply(CBatched, CApply):
+    """Apply that computes its output for a whole batch
+    before passing it on"""
+
+    def consume_batch(self, batch, t, src, state):
+        out = gensym()
+        state.addDeclarations(["{0} {1}[{2}];\n".format(
+            self.newtuple.getTupleTypename(), out, batch.capacity)])
+
+        def apply_to_row(index):
+            code = "auto& {0} = {1}[{2}];\n".format(
+                self.newtuple.name, out, index)
+            return code + self._apply_statements(t, state)
+
+        code = self.language().comment(self.shortStr())
+        code += batch.loop(t, apply_to_row)
+
+        applied = Batch(out, batch.count, batch.capacity)
+        code += self._consume_batch_above(applied, self.newtuple, state)
+        return code
+
+
 class CFileScan(cppcommon.CBaseFileScan, CCOperator):
 
     def __get_ascii_scan_template__(self):
@@ -460,6 +742,25 @@ class CFileScan(cppcommon.CBaseFileScan, CCOperator):
         return CC.cgenv().get_template('relation_declaration.cpp')
 
 
+class CColumnarFileScan(CFileScan):
+
+    def __get_ascii_scan_template__(self):
+        return CC.cgenv().get_template('columnar_ascii_scan.cpp')
+
+    def __get_binary_scan_template__(self):
+        # like CFileScan, read a relation named by a RelationKey as ASCII
+        if isinstance(self.relation_key, catalog.FileRelation):
+            raise NotImplementedError(
+                "columnar scan of binary input {}".format(self.relation_key))
+        return CC.cgenv().get_template('columnar_ascii_scan.cpp')
+
+    def __get_relation_decl_template__(self, name):
+        return CC.cgenv().get_template('columnar_relation_declaration.cpp')
+
+    def new_tuple_ref_for_filescan(self, resultsym, scheme):
+        return CColumnarTupleRef(resultsym, scheme)
+
+
 class CSink(cppcommon.CBaseSink, CCOperator):
     pass
 
@@ -522,6 +823,65 @@ class CStore(cppcommon.CBaseStore, CCOperator):
         return code
 
 
+class CDictionaryDecode(CApply):
+    """Replaces the integer codes of dictionary encoded string columns
+    with their strings, passing other columns through"""
+
+    def __init__(self, dictionaries=None, input=None):
+        """
+        @param dictionaries: dict of column index -> dictionary file
+        """
+        self.dictionaries = dictionaries or {}
+        emitters = None
+        if input is not None:
+            emitters = [(name, expression.UnnamedAttributeRef(i))
+                        for i, name in enumerate(input.scheme().get_names())]
+        super(CDictionaryDecode, self).__init__(emitters, input)
+
+    def copy(self, other):
+        self.dictionaries = other.dictionaries
+        super(CDictionaryDecode, self).copy(other)
+
+    def scheme(self):
+        sch = self.input.scheme()
+        return scheme.Scheme(
+            [(name, types.STRING_TYPE if i in self.dictionaries else typ)
+             for i, (name, typ) in enumerate(sch.attributes)])
+
+    def shortStr(self):
+        return "%s(%s)" % (self.opname(), ",".join(
+            "$%d" % i for i in sorted(self.dictionaries)))
+
+    def __repr__(self):
+        return "{op}({d!r}, {pl!r})".format(op=self.opname(),
+                                            d=self.dictionaries,
+                                            pl=self.input)
+
+    def _dictionary_symbol(self, dictionary, state):
+        # load each dictionary once
+        key = ('dictionary', dictionary)
+        sym = state.lookupExpr(key)
+        if not sym:
+            sym = gensym()
+            state.saveExpr(key, sym)
+            state.addDeclarations(["StringDictionary {0};\n".format(sym)])
+            state.addInitializers(['{0} = StringDictionary("{1}");\n'.format(
+                sym, dictionary)])
+        return sym
+
+    def _apply_statements(self, t, state):
+        code = ""
+        for i in range(len(self.scheme())):
+            src = t.get_code(i)
+            if i in self.dictionaries:
+                dictsym = self._dictionary_symbol(self.dictionaries[i], state)
+                src = "to_array<MAX_STR_LEN, std::string, true>(" \
+                      "{0}.decode({1}))".format(dictsym, src)
+            code += "{0} = {1};\n".format(self.newtuple.set_func_code(i),
+                                          src)
+        return code
+
+
 class MemoryScanOfFileScan(rules.Rule):
 
     """A rewrite rule for making a scan into
@@ -529,13 +889,384 @@ class MemoryScanOfFileScan(rules.Rule):
 
     def fire(self, expr):
         if isinstance(expr, algebra.Scan) and not isinstance(expr, CFileScan):
-            return CMemoryScan(CFileScan(expr.relation_key, expr.scheme()))
+            scan = CFileScan()
+            scan.copy(expr)
+            return CMemoryScan(scan)
         return expr
 
     def __str__(self):
         return "Scan => MemoryScan[FileScan]"
 
 
+class ColumnarMemoryScans(rules.Rule):
+
+    """Materialize a relation as per-column arrays instead of an array of
+    tuples when every scan of it reads only some of its columns and
+    needs no whole tuples. Decided per relation, so this rule analyzes
+    the whole plan when it fires on the root."""
+
+    def __init__(self):
+        self._fired = False
+        super(ColumnarMemoryScans, self).__init__()
+
+    @classmethod
+    def _accessed_columns(cls, op, parents):
+        """
+        @return set of positions of op's output read by the pipeline
+        above op, or None if the pipeline needs whole tuples
+        """
+        ps = parents.get(id(op), [])
+        if len(ps) != 1:
+            return None
+        p = ps[0]
+
+        # Select passes its input tuple through unchanged
+        if isinstance(p, CSelect):
+            above = cls._accessed_columns(p, parents)
+            if above is None:
+                return None
+            return above | expression.accessed_columns(
+                p.get_unnamed_condition())
+
+        if isinstance(p, CApply):
+            return set().union(*[expression.accessed_columns(e)
+                                 for e in p.get_unnamed_emit_exprs()])
+
+        if isinstance(p, CGroupBy):
+            accessed = set([g.position
+                            for g in p.get_unnamed_grouping_list()])
+            for a in p.get_unnamed_aggregate_list():
+                if isinstance(a, expression.ZeroaryOperator):
+                    # CGroupBy reads the first column for COUNTALL
+                    accessed.add(0)
+                else:
+                    accessed |= expression.accessed_columns(a)
+            return accessed
+
+        # joins, stores, etc. copy whole tuples
+        return None
+
+    def fire(self, expr):
+        if self._fired:
+            return expr
+        self._fired = True
+
+        parents = {}
+        expr.collectParents(parents)
+
+        scans = {}
+        for op in expr.walk():
+            if isinstance(op, CMemoryScan):
+                scans.setdefault(op.input.relation_key, []).append(op)
+
+        # leave binary inputs alone; CColumnarFileScan reads ASCII only
+        for key in scans.keys():
+            if isinstance(key, catalog.FileRelation) and \
+                    not isinstance(key, catalog.ASCIIFile):
+                del scans[key]
+
+        for key, ops in scans.items():
+            width = len(ops[0].scheme())
+            accessed = set()
+            for op in ops:
+                cols = self._accessed_columns(op, parents)
+                if cols is None:
+                    accessed = None
+                    break
+                accessed |= cols
+
+            if accessed is None or len(accessed) >= width:
+                continue
+
+            _LOG.debug("columnar materialization of %s (reads %s of %d)",
+                       key, sorted(accessed), width)
+            for op in ops:
+                scan = CColumnarFileScan()
+                scan.copy(op.input)
+                new_op = CColumnarMemoryScan(scan)
+                for p in parents[id(op)]:
+                    p.apply(lambda c: new_op if c is op else c)
+
+        return expr
+
+    def __str__(self):
+        return "MemoryScan[FileScan] => " \
+               "ColumnarMemoryScan[ColumnarFileScan] for narrow scans"
+
+
+class BatchedSelects(rules.Rule):
+
+    """Evaluate Selects directly over a memory scan, and Applies
+    of their output, a batch of tuples at a time"""
+
+    @staticmethod
+    def _is_select_of_scan(op):
+        return isinstance(op, CSelect) \
+            and not isinstance(op, CBatchedSelect) \
+            and type(op.input) == CMemoryScan
+
+    @staticmethod
+    def _batched_select(select):
+        return CBatchedSelect(select.condition,
+                              CBatchedMemoryScan(select.input.input))
+
+    def fire(self, expr):
+        # not subclasses of CApply, such as CDictionaryDecode, which
+        # compute more than their emitters
+        if type(expr) == CApply and self._is_select_of_scan(expr.input):
+            return CBatchedApply(expr.emitters,
+                                 self._batched_select(expr.input))
+
+        if self._is_select_of_scan(expr):
+            return self._batched_select(expr)
+
+        return expr
+
+    def __str__(self):
+        return "Apply[Select[MemoryScan]] => " \
+               "BatchedApply[BatchedSelect[BatchedMemoryScan]]"
+
+
+class DictionaryEncodedStrings(rules.Rule):
+
+    """Keep the string columns the catalog lists as dictionary encoded
+    as integer codes through the plan: equality filters, joins, and
+    groupings compare codes, string literals compared to them are
+    translated to codes now, and the codes are decoded just before
+    the results are stored. Columns used in any other way (string
+    functions, ordering, Apply expressions, etc.) are read as strings
+    instead. Decided per relation, so this rule analyzes the whole
+    plan when it fires on the root."""
+
+    # code of strings not in the dictionary
+    MISSING_CODE = -1
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._fired = False
+        self._dictionaries = {}
+        super(DictionaryEncodedStrings, self).__init__()
+
+    def _codes(self, dictionary):
+        if dictionary not in self._dictionaries:
+            with open(dictionary) as f:
+                self._dictionaries[dictionary] = dict(
+                    (line.rstrip('\n'), code)
+                    for code, line in enumerate(f))
+        return self._dictionaries[dictionary]
+
+    @staticmethod
+    def _column_dictionary(sources, encoded):
+        """@return the dictionary a column is encoded with, if any"""
+        dictionaries = set(encoded[s] for s in sources)
+        if len(dictionaries) == 1:
+            return dictionaries.pop()
+        return None
+
+    def _is_encoded_comparison(self, expr, cols, encoded):
+        """Is expr an (in)equality of an encoded column with a string
+        literal or with a column encoded with the same dictionary?"""
+        if not isinstance(expr, (expression.EQ, expression.NEQ)):
+            return False
+
+        sides = [expr.left, expr.right]
+        refs = [e for e in sides
+                if isinstance(e, expression.UnnamedAttributeRef)
+                and cols[e.position]]
+        if len(refs) == 2:
+            return self._column_dictionary(cols[refs[0].position],
+                                           encoded) is not None \
+                and self._column_dictionary(cols[refs[0].position], encoded) \
+                == self._column_dictionary(cols[refs[1].position], encoded)
+        return len(refs) == 1 \
+            and any(isinstance(e, expression.StringLiteral) for e in sides)
+
+    def _check_expression(self, expr, cols, encoded, invalid,
+                          comparisons=True):
+        """Add the sources of encoded columns expr reads as strings to
+        invalid"""
+        if comparisons and self._is_encoded_comparison(expr, cols, encoded):
+            return
+        if isinstance(expr, expression.UnnamedAttributeRef):
+            invalid |= cols[expr.position]
+            return
+        for c in expr.get_children():
+            self._check_expression(c, cols, encoded, invalid, comparisons)
+
+    def _translate_literals(self, expr, cols, encoded):
+        """@return copy of expr with the string literals compared to
+        encoded columns replaced by their codes"""
+        return self._translate(copy.deepcopy(expr), cols, encoded)
+
+    def _translate(self, expr, cols, encoded):
+        if self._is_encoded_comparison(expr, cols, encoded):
+            for side, other in [('left', expr.right), ('right', expr.left)]:
+                lit = getattr(expr, side)
+                if isinstance(lit, expression.StringLiteral):
+                    dictionary = self._column_dictionary(
+                        cols[other.position], encoded)
+                    code = self._codes(dictionary).get(lit.value,
+                                                       self.MISSING_CODE)
+                    setattr(expr, side, expression.NumericLiteral(code))
+            return expr
+        expr.apply(lambda c: self._translate(c, cols, encoded))
+        return expr
+
+    def _sources(self, op, encoded, invalid, inputs):
+        """
+        @return for each column of op's output, the set of encoded
+        (relation, column) pairs its values may come from
+        """
+        kids = [self._sources(c, encoded, invalid, inputs)
+                for c in op.children()]
+        if kids:
+            inputs[id(op)] = kids[0]
+
+        if isinstance(op, CFileScan):
+            key = str(op.relation_key)
+            return [frozenset([(key, i)]) if (key, i) in encoded
+                    else frozenset() for i in range(len(op.scheme()))]
+
+        if isinstance(op, (algebra.Sequence, algebra.Parallel)):
+            return []
+
+        if isinstance(op, (CMemoryScan, CStore, CSink)):
+            return kids[0]
+
+        if isinstance(op, CSelect):
+            self._check_expression(op.get_unnamed_condition(), kids[0],
+                                   encoded, invalid)
+            return kids[0]
+
+        if isinstance(op, CHashJoin):
+            cols = kids[0] + kids[1]
+            inputs[id(op)] = cols
+            self._check_expression(
+                expression.ensure_unnamed(op.condition, op), cols,
+                encoded, invalid)
+            return cols
+
+        if isinstance(op, CApply):
+            out = []
+            for e in op.get_unnamed_emit_exprs():
+                if isinstance(e, expression.UnnamedAttributeRef):
+                    out.append(kids[0][e.position])
+                else:
+                    self._check_expression(e, kids[0], encoded, invalid)
+                    out.append(frozenset())
+            return out
+
+        if isinstance(op, CProject):
+            return [kids[0][c.position]
+                    for c in op.get_unnamed_column_list()]
+
+        if isinstance(op, CGroupBy):
+            out = []
+            for g in op.get_unnamed_grouping_list():
+                if isinstance(g, expression.UnnamedAttributeRef):
+                    out.append(kids[0][g.position])
+                else:
+                    self._check_expression(g, kids[0], encoded, invalid,
+                                           comparisons=False)
+                    out.append(frozenset())
+            for a in op.get_unnamed_aggregate_list():
+                # counting does not look at the values
+                if not isinstance(a, (expression.COUNT,
+                                      expression.COUNTALL)):
+                    self._check_expression(a, kids[0], encoded, invalid,
+                                           comparisons=False)
+                out.append(frozenset())
+            return out
+
+        if isinstance(op, CUnionAll):
+            out = [l | r for l, r in zip(kids[0], kids[1])]
+            for l, r, col in zip(kids[0], kids[1], out):
+                if col and (not l or not r or
+                            self._column_dictionary(col, encoded) is None):
+                    invalid |= col
+            return out
+
+        # operators that may look at the strings
+        for cols in kids:
+            invalid.update(*cols)
+        return [frozenset()] * len(op.scheme())
+
+    def fire(self, expr):
+        if self._fired:
+            return expr
+        self._fired = True
+
+        encoded = {}
+        for op in expr.walk():
+            if isinstance(op, CFileScan):
+                key = str(op.relation_key)
+                for i, dictionary in \
+                        self.catalog.dictionary_encoded_columns(key).items():
+                    encoded[(key, i)] = dictionary
+
+        # stop encoding columns that are read as strings
+        # until the remaining ones are consistent
+        while encoded:
+            invalid = set()
+            inputs = {}
+            self._sources(expr, encoded, invalid, inputs)
+            if not invalid:
+                break
+            for s in invalid:
+                del encoded[s]
+
+        if not encoded:
+            return expr
+
+        _LOG.debug("dictionary encoded columns %s", sorted(encoded))
+
+        # {id(scan): scan of the codes}; scans are replaced rather than
+        # changed, since other plans may share them
+        scans = {}
+        for op in list(expr.walk()):
+            cols = inputs.get(id(op), [])
+            if isinstance(op, CFileScan):
+                key = str(op.relation_key)
+                scan = op.__class__()
+                scan.copy(op)
+                scan._scheme = scheme.Scheme(
+                    [(name, types.LONG_TYPE if (key, i) in encoded else typ)
+                     for i, (name, typ)
+                     in enumerate(op.scheme().attributes)])
+                scans[id(op)] = scan
+
+            elif not any(cols):
+                continue
+
+            elif isinstance(op, CSelect):
+                op.condition = self._translate_literals(
+                    op.get_unnamed_condition(), cols, encoded)
+
+            elif isinstance(op, CHashJoin):
+                op.condition = self._translate_literals(
+                    expression.ensure_unnamed(op.condition, op), cols,
+                    encoded)
+
+            elif isinstance(op, CApply):
+                op.emitters = [
+                    (name, self._translate_literals(e, cols, encoded))
+                    for (name, _), e in zip(op.emitters,
+                                            op.get_unnamed_emit_exprs())]
+
+            elif isinstance(op, (CStore, CSink)):
+                op.input = CDictionaryDecode(
+                    dict((i, self._column_dictionary(col, encoded))
+                         for i, col in enumerate(cols) if col),
+                    op.input)
+
+        for op in list(expr.walk()):
+            op.apply(lambda child: scans.get(id(child), child))
+        return expr
+
+    def __str__(self):
+        return "FileScan => FileScan of dictionary encoded strings"
+
+
 def clangify(emit_print):
     return [
         rules.ProjectingJoinToProjectOfJoin(),
@@ -543,10 +1274,13 @@ def clangify(emit_print):
         rules.OneToOne(algebra.Select, CSelect),
         MemoryScanOfFileScan(),
         rules.OneToOne(algebra.Apply, CApply),
+        rules.OneToOne(algebra.FlatMap, CFlatMap),
         rules.OneToOne(algebra.Join, CHashJoin),
         rules.OneToOne(algebra.GroupBy, CGroupBy),
         rules.OneToOne(algebra.Project, CProject),
         rules.OneToOne(algebra.UnionAll, CUnionAll),
+        rules.OneToOne(algebra.BloomFilterBuild, CBloomFilterBuild),
+        rules.OneToOne(algebra.BloomFilterProbe, CBloomFilterProbe),
         cppcommon.StoreToBaseCStore(emit_print, CStore),
         rules.OneToOne(algebra.Sink, CSink),
 
@@ -556,9 +1290,13 @@ def clangify(emit_print):
 
 class CCAlgebra(Algebra):
 
-    def __init__(self, emit_print=cppcommon.EMIT_CONSOLE):
-        """ To store results into a file or onto console """
+    def __init__(self, emit_print=cppcommon.EMIT_CONSOLE, catalog=None):
+        """ To store results into a file or onto console
+        @param catalog: if given, its dictionary encoded string columns
+            are compared and grouped on their integer codes
+        """
         self.emit_print = emit_print
+        self.catalog = catalog
 
     def opt_rules(self, **kwargs):
         # Sequence that works for datalog
@@ -577,11 +1315,18 @@ class CCAlgebra(Algebra):
         # rules.FreeMemory()
         # ]
 
+        # build the smaller input of joins whose hash tables would exceed
+        # the memory budget, after OrderJoins has picked the build sides
+        swap_over_budget = [] if kwargs.get('memory_budget') is None \
+            else [rules.SwapJoinSidesOverMemoryBudget(kwargs['memory_budget'])]
+
         # sequence that works for myrial
         rule_grps_sequence = [
             rules.remove_trivial_sequences,
             rules.simple_group_by,
             cppcommon.clang_push_select,
+            [rules.OrderJoins()],
+            swap_over_budget,
             [rules.ProjectToDistinctColumnSelect(),
              rules.JoinToProjectingJoin()],
             rules.push_apply,
@@ -592,6 +1337,24 @@ class CCAlgebra(Algebra):
         if kwargs.get('SwapJoinSides'):
             rule_grps_sequence.insert(0, [rules.SwapJoinSides()])
 
+        # semi-join reduction of the larger inputs of selective joins,
+        # on keys that BloomFilter hashes as integers
+        if kwargs.get('bloom_filters'):
+            rule_grps_sequence.insert(-2, [rules.BloomFilterSemiJoin(
+                key_types=(types.LONG_TYPE, types.INT_TYPE,
+                           types.BOOLEAN_TYPE))])
+
+        if self.catalog is not None:
+            rule_grps_sequence.append([DictionaryEncodedStrings(self.catalog)])
+
+        # lay out relations as per-column arrays where scans are narrow
+        if kwargs.get('columnar'):
+            rule_grps_sequence.append([ColumnarMemoryScans()])
+
+        # process selects over scans in batches
+        if kwargs.get('batched'):
+            rule_grps_sequence.append([BatchedSelects()])
+
         # set external indexing on (replacing strings with ints)
         if kwargs.get('external_indexing'):
             CBaseLanguage.set_external_indexing(True)
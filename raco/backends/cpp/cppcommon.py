@@ -86,6 +86,32 @@ class CBaseLanguage(Language):
     def comment(txt):
         return "// %s\n" % txt
 
+    @staticmethod
+    def profile_counter_declaration(name):
+        return "uint64_t {0} = 0;\n".format(name)
+
+    @staticmethod
+    def profile_increment(name, count=None):
+        if count is None:
+            return "{0}++;\n".format(name)
+        return "{0} += {1};\n".format(name, count)
+
+    @staticmethod
+    def profile_pipeline_runtime(ident):
+        """
+        @return code for the runtime of pipeline ident,
+        or None if the pipeline is not timed
+        """
+        return None
+
+    @classmethod
+    def profile_write(cls, path, values):
+        """
+        @param values: [(name, code)] to write to the profile at path
+        """
+        return cls.cgenv().get_template('profile_write.cpp').render(
+            path=path, values=values)
+
     nextstrid = 0
 
     @classmethod
@@ -428,7 +454,7 @@ class CBaseSelect(Pipelined, algebra.Select):
 
         conditioncode = self._compile_condition(t, state)
 
-        inner_code_compiled = self.parent().consume(t, self, state)
+        inner_code_compiled = self.consumeInParent(t, state)
 
         code = basic_select_template.render(locals())
         return code
@@ -473,7 +499,7 @@ class CBaseUnionAll(Pipelined, algebra.UnionAll):
                                       unified_tuple)
 
         inner_plan_compiled = \
-            self.parent().consume(self.unifiedTupleType, self, state)
+            self.consumeInParent(self.unifiedTupleType, state)
         return assignment_code + inner_plan_compiled
 
 
@@ -522,12 +548,68 @@ class CBaseApply(Pipelined, algebra.Apply):
 
         code += self._apply_statements(t, state)
 
-        innercode = self.parent().consume(self.newtuple, self, state)
+        innercode = self.consumeInParent(self.newtuple, state)
         code += innercode
 
         return code
 
 
+class CBaseFlatMap(Pipelined, algebra.FlatMap):
+
+    def produce(self, state):
+        self.newtuple = self.new_tuple_ref(gensym(), self.scheme())
+        state.addDeclarations([self.newtuple.generateDefinition()])
+
+        self.input.produce(state)
+
+    def _compile(self, expr, t, state):
+        compiled, decls, inits = self.language().compile_expression(
+            expr, tupleref=t)
+        state.addInitializers(inits)
+        state.addDeclarations(decls)
+        return compiled
+
+    def consume(self, t, src, state):
+        code = self.language().comment(self.shortStr())
+
+        dst_name = self.newtuple.name
+        dst_type_name = self.newtuple.getTupleTypename()
+        code += _cgenv.get_template('tuple_declaration.cpp').render(locals())
+
+        # nest a loop over the values of each flatmap emit expression
+        # around the assignments and the code of the operators above
+        inner_code_compiled = self.consumeInParent(self.newtuple, state)
+        assignment_template = _cgenv.get_template('assignment.cpp')
+        emits = self.get_unnamed_emit_exprs()
+        for dst_fieldnum in reversed(range(len(emits))):
+            expr = emits[dst_fieldnum]
+            dst_set_func = self.newtuple.set_func_code(dst_fieldnum)
+            if not isinstance(expr, expression.FlatmapFunction):
+                src_expr_compiled = self._compile(expr, t, state)
+                inner_code_compiled = \
+                    assignment_template.render(locals()) + inner_code_compiled
+                continue
+
+            try:
+                template = _cgenv.get_template(
+                    'flatmap_{0}.cpp'.format(expr.opname().lower()))
+            except jinja2.TemplateNotFound:
+                raise NotImplementedError(
+                    "flatmap function {0}".format(expr.opname()))
+            children = expr.get_children()
+            src_expr_compiled = gensym()
+            inner_code_compiled = template.render(
+                value=src_expr_compiled,
+                sym=gensym(),
+                args=[self._compile(c, t, state) for c in children],
+                constant_args=[isinstance(c, expression.Literal)
+                               for c in children],
+                inner_code_compiled=assignment_template.render(locals()) +
+                inner_code_compiled)
+
+        return code + inner_code_compiled
+
+
 class CBaseProject(Pipelined, algebra.Project):
 
     def produce(self, state):
@@ -559,7 +641,7 @@ class CBaseProject(Pipelined, algebra.Project):
                 assert False, "Unsupported Project expression"
             code += assignment_template.render(locals())
 
-        innercode = self.parent().consume(self.newtuple, self, state)
+        innercode = self.consumeInParent(self.newtuple, state)
         code += innercode
 
         return code
@@ -636,7 +718,7 @@ class CBaseFileScan(Pipelined, algebra.Scan):
                 fstemplate.render(fsbindings, result_type=tuple_type))
 
         # no return value used because parent is a new pipeline
-        self.parent().consume(resultsym, self, state)
+        self.consumeInParent(resultsym, state)
 
     def new_tuple_ref_for_filescan(self, resultsym, scheme):
         """instance version of new_tuple_ref.
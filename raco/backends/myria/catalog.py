@@ -3,13 +3,21 @@ import raco.scheme as scheme
 from raco.representation import RepresentationProperties
 from raco.expression import UnnamedAttributeRef as AttIndex
 from raco.catalog import DEFAULT_CARDINALITY
+from raco.statistics import collect_statistics, reservoir_sample
 from .errors import MyriaError
 
 
 class MyriaCatalog(Catalog):
 
-    def __init__(self, connection):
+    def __init__(self, connection, statistics_sample_size=None):
+        """
+        @param statistics_sample_size: if given, column statistics are
+            collected from a uniform random sample of this many tuples of
+            each scanned relation
+        """
         self.connection = connection
+        self.statistics_sample_size = statistics_sample_size
+        self._statistics = {}
 
     def get_scheme(self, rel_key):
         relation_args = {
@@ -92,3 +100,24 @@ class MyriaCatalog(Catalog):
                 return RepresentationProperties(
                     hash_partitioned=tuple(AttIndex(i) for i in indexes))
         return RepresentationProperties()
+
+    def column_statistics(self, rel_key):
+        if not self.statistics_sample_size or not self.connection:
+            return None
+        if rel_key not in self._statistics:
+            relation_args = {
+                'userName': rel_key.user,
+                'programName': rel_key.program,
+                'relationName': rel_key.relation
+            }
+            sch = self.get_scheme(rel_key)
+            try:
+                sample, _ = reservoir_sample(
+                    self.connection.iter_dataset(relation_args, sch),
+                    self.statistics_sample_size)
+            except MyriaError as e:
+                raise ValueError('No statistics of {}: {}'.format(rel_key,
+                                                                  e))
+            self._statistics[rel_key] = collect_statistics(
+                sample, sch, total=self.num_tuples(rel_key))
+        return self._statistics[rel_key]
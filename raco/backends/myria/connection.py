@@ -1,8 +1,12 @@
-import base64
 import ConfigParser
 import json
 import csv
-from time import sleep
+import struct
+import threading
+import uuid
+from time import sleep, time
+from collections import OrderedDict
+import copy
 import logging
 from urlparse import urlparse, ParseResult
 
@@ -12,14 +16,17 @@ from raco.backends.myria import MyriaHyperCubeAlgebra, MyriaLeftDeepTreeAlgebra,
 from raco.backends.myria.catalog import MyriaCatalog
 from raco.myrial import interpreter
 from raco.myrial.parser import Parser
+from raco.scheme import Scheme
 
 from .errors import MyriaError
+from .futures import QueryFuture, QueryPoller, backoff_delays
 
 import requests
 
 from raco import compile, RACompiler
+from raco.compile import optimize
 
-__all__ = ['MyriaConnection']
+__all__ = ['MyriaConnection', 'CompilationSession']
 
 # String constants used in forming requests
 JSON = 'application/json'
@@ -37,6 +44,151 @@ class FunctionTypes(object):
     PYTHON = 1
 
 
+# Uploads are read and sent in pieces of at most this many bytes
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+# struct formats of the types in Myria's binary format, as read by its
+# BinaryFileScan; strings are a 4-byte length followed by UTF-8 bytes
+_BINARY_FORMATS = {
+    'BOOLEAN_TYPE': '?',
+    'INT_TYPE': 'i',
+    'LONG_TYPE': 'q',
+    'FLOAT_TYPE': 'f',
+    'DOUBLE_TYPE': 'd',
+}
+
+
+def read_chunks(fp, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Iterate over the contents of a file in chunks of chunk_size bytes"""
+    while True:
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def binary_chunks(tuples, schema, is_little_endian=False,
+                  buffer_size=DEFAULT_CHUNK_SIZE):
+    """Serialize tuples into Myria's binary format.
+
+    Args:
+        tuples: an iterable of tuples of Python values.
+        schema: a dictionary containing the schema of the tuples.
+        is_little_endian: encode numbers in little- rather than big-endian.
+        buffer_size: the number of bytes to collect before yielding them.
+    """
+    order = '<' if is_little_endian else '>'
+    length = struct.Struct(order + 'i')
+    columns = []
+    for typ in schema['columnTypes']:
+        if typ == 'STRING_TYPE':
+            columns.append(None)
+        elif typ in _BINARY_FORMATS:
+            columns.append(struct.Struct(order + _BINARY_FORMATS[typ]))
+        else:
+            raise NotImplementedError(
+                'binary upload of {} is not supported'.format(typ))
+
+    buf = []
+    size = 0
+    for tup in tuples:
+        for packer, value in zip(columns, tup):
+            if packer is None:
+                if isinstance(value, unicode):
+                    value = value.encode('utf-8')
+                buf.append(length.pack(len(value)))
+                buf.append(value)
+                size += length.size + len(value)
+            else:
+                buf.append(packer.pack(value))
+                size += packer.size
+        if size >= buffer_size:
+            yield ''.join(buf)
+            buf = []
+            size = 0
+    if buf:
+        yield ''.join(buf)
+
+
+def _parse_boolean(s):
+    return s.lower() == 'true'
+
+
+# parse the text of a value of each type; other types are left as strings
+_TEXT_PARSERS = {
+    'BOOLEAN_TYPE': _parse_boolean,
+    'INT_TYPE': int,
+    'LONG_TYPE': int,
+    'FLOAT_TYPE': float,
+    'DOUBLE_TYPE': float,
+}
+
+
+def _decode_text(lines, scheme, delimiter):
+    """Decode the lines of a delimited text download into typed tuples"""
+    parsers = [_TEXT_PARSERS.get(t, str) for t in scheme.get_types()]
+    rows = csv.reader((line + '\n' for line in lines), delimiter=delimiter)
+    for i, row in enumerate(rows):
+        # skip the header
+        if i == 0 and row == scheme.get_names():
+            continue
+        yield tuple(parse(v) for parse, v in zip(parsers, row))
+
+
+def _decode_binary(chunks, types, is_little_endian=False):
+    """Decode tuples in Myria's binary format from a stream of chunks"""
+    order = '<' if is_little_endian else '>'
+    length = struct.Struct(order + 'i')
+    columns = [None if t == 'STRING_TYPE'
+               else struct.Struct(order + _BINARY_FORMATS[t])
+               for t in types]
+
+    buf = ''
+    pos = 0
+    row = []
+    for chunk in chunks:
+        buf = buf[pos:] + chunk
+        pos = 0
+        while True:
+            packer = columns[len(row)]
+            if packer is None:
+                if len(buf) - pos < length.size:
+                    break
+                n, = length.unpack_from(buf, pos)
+                if len(buf) - pos < length.size + n:
+                    break
+                start = pos + length.size
+                row.append(buf[start:start + n])
+                pos = start + n
+            else:
+                if len(buf) - pos < packer.size:
+                    break
+                row.append(packer.unpack_from(buf, pos)[0])
+                pos += packer.size
+            if len(row) == len(columns):
+                yield tuple(row)
+                row = []
+    if row or pos < len(buf):
+        raise MyriaError('binary data ends in the middle of a tuple')
+
+
+def _multipart_chunks(boundary, fields, data_chunks, data_type):
+    """Encode a multipart/form-data body of JSON fields followed by
+    a data part that is streamed from data_chunks"""
+    header = ('--{b}\r\nContent-Disposition: form-data; name="{n}"; '
+              'filename="{n}"\r\nContent-Type: {t}\r\n\r\n')
+    for name, value in fields:
+        yield header.format(b=boundary, n=name, t=JSON)
+        yield json.dumps(value) + '\r\n'
+
+    # data must be last
+    yield header.format(b=boundary, n='data', t=data_type)
+    for chunk in data_chunks:
+        if chunk:
+            yield chunk
+    yield '\r\n--{b}--\r\n'.format(b=boundary)
+
+
 class MyriaConnection(object):
     """Contains a connection the Myria REST server."""
 
@@ -64,7 +216,10 @@ class MyriaConnection(object):
                  ssl=False,
                  rest_url=None,
                  execution_url=None,
-                 timeout=None):
+                 timeout=None,
+                 max_connections=None,
+                 poll_interval=0.1,
+                 max_poll_interval=5.0):
         """Initializes a connection to the Myria REST server.
            (And optionally a Myria program execution URI.)
 
@@ -81,6 +236,11 @@ class MyriaConnection(object):
             rest_url: a URL pointing to a Myria REST endpoint
             execution_url: a URL pointing to a Myria webserver for program
                 execution
+            max_connections: the number of connections each thread keeps
+                open to each host; default is the requests default.
+            poll_interval: the first delay before polling the status of
+                a running query; later delays double, with jitter.
+            max_poll_interval: the longest delay between polls.
         """
         # Parse the deployment file and, if present, override the hostname and
         # port with any provided values from deployment.
@@ -106,15 +266,40 @@ class MyriaConnection(object):
                                         query="", fragment="").geturl()
 
         self._url_start = '{}://{}:{}'.format(uri_scheme, hostname, port)
-        self._session = requests.Session()
-        self._session.headers.update(self._DEFAULT_HEADERS)
+        self._max_connections = max_connections
+        # requests sessions are not thread safe, so each thread
+        # (e.g., the query pollers) has its own
+        self._local = threading.local()
         self.execution_url = execution_url
         self._udfs = None
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._poller = None
+        self._poller_lock = threading.Lock()
+
+    @property
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self._DEFAULT_HEADERS)
+            if self._max_connections is not None:
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self._max_connections,
+                    pool_maxsize=self._max_connections)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def _poll_delays(self):
+        return backoff_delays(self._poll_interval, self._max_poll_interval)
 
     def _finish_async_request(self, method, url, body=None, accept=JSON):
         headers = {
             'Accept': accept
         }
+        delays = self._poll_delays()
         try:
             while True:
                 if '://' not in url:
@@ -135,8 +320,8 @@ class MyriaConnection(object):
                     body = None
                     # Read and ignore the body
                     # response.read()
-                    # Sleep 100 ms before re-issuing the request
-                    sleep(0.1)
+                    # Back off before re-issuing the request
+                    sleep(next(delays))
                 else:
                     raise MyriaError('Error %d: %s'
                                      % (r.status_code, r.text))
@@ -244,6 +429,78 @@ class MyriaConnection(object):
                                       relation_key['relationName']),
                               params={'format': 'json'})
 
+    def iter_dataset(self, relation_key, scheme=None, format='csv',
+                     columns=None, limit=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Stream the tuples of a dataset, decoding them as they arrive so
+        that memory use does not depend on the size of the dataset.
+
+        Args:
+            relation_key: A dictionary containing the relation key.
+            scheme: the raco.scheme.Scheme of the relation; fetched from
+                Myria if not given.
+            format: 'csv', 'tsv', or 'binary' (see binary_chunks).
+            columns: optional list of the names or positions of the
+                columns to return, in order.
+            limit: optional maximum number of tuples to return; the
+                download stops after reading them.
+            chunk_size: the number of bytes read at a time.
+        """
+        if scheme is None:
+            schema = self.dataset(relation_key)['schema']
+            scheme = Scheme(zip(schema['columnNames'],
+                                schema['columnTypes']))
+        if columns is not None:
+            positions = [c if isinstance(c, int) else scheme.getPosition(c)
+                         for c in columns]
+
+        r = self._session.get(self._dataset_data_url(relation_key),
+                              params={'format': format}, stream=True)
+        if r.status_code != 200:
+            raise MyriaError('Error %d: %s' % (r.status_code, r.text))
+
+        try:
+            if format == 'binary':
+                rows = _decode_binary(r.iter_content(chunk_size),
+                                      scheme.get_types())
+            else:
+                rows = _decode_text(r.iter_lines(chunk_size),
+                                    scheme, ',' if format == 'csv' else '\t')
+            for i, row in enumerate(rows):
+                if limit is not None and i >= limit:
+                    break
+                if columns is not None:
+                    row = tuple(row[p] for p in positions)
+                yield row
+        finally:
+            r.close()
+
+    def download_to_file(self, relation_key, fp, format='csv',
+                         chunk_size=DEFAULT_CHUNK_SIZE):
+        """Write the data in a dataset to a file object without
+        holding it in memory.
+
+        Args:
+            relation_key: A dictionary containing the relation key.
+            fp: the file object to write to.
+            format: a format Myria can write the dataset in, e.g. 'csv'.
+        """
+        r = self._session.get(self._dataset_data_url(relation_key),
+                              params={'format': format}, stream=True)
+        if r.status_code != 200:
+            raise MyriaError('Error %d: %s' % (r.status_code, r.text))
+        try:
+            for chunk in r.iter_content(chunk_size):
+                fp.write(chunk)
+        finally:
+            r.close()
+
+    def _dataset_data_url(self, relation_key):
+        return self._url_start + \
+            '/dataset/user-{}/program-{}/relation-{}/data'.format(
+                relation_key['userName'],
+                relation_key['programName'],
+                relation_key['relationName'])
+
     @staticmethod
     def _ensure_schema(schema):
         return {'columnTypes': schema['columnTypes'],
@@ -260,18 +517,15 @@ class MyriaConnection(object):
 
     def upload_fp(self, relation_key, schema, fp):
         """Upload the data in the supplied fp to the specified user and
-        relation.
+        relation. The data is streamed, so it need not fit in memory.
 
         Args:
             relation_key: A dictionary containing the destination relation key.
             schema: A dictionary containing the schema,
             fp: A file pointer containing the data to be uploaded.
         """
-
-        data = base64.b64encode(fp.read())
-        source = {'dataType': 'Bytes',
-                  'bytes': data}
-        return self.upload_source(relation_key, schema, source)
+        return self.upload_file(self._ensure_relation_key(relation_key),
+                                self._ensure_schema(schema), fp)
 
     def upload_source(self, relation_key, schema, source):
         body = {'relationKey': self._ensure_relation_key(relation_key),
@@ -291,22 +545,7 @@ class MyriaConnection(object):
                       (default: MyriaL).
         """
 
-        body = {"query": program, "language": language}
-        r = requests.post((server or self.execution_url) + '/execute',
-                          data=body)
-        if r.status_code != 201:
-            raise MyriaError(r)
-
-        query_uri = r.json()['url']
-        while True:
-            r = requests.get(query_uri)
-            if r.status_code == 200:
-                return r.json()
-            elif r.status_code == 202:
-                # Sleep 100 ms before re-checking the status
-                sleep(0.1)
-                continue
-            raise MyriaError(r)
+        return self.submit_program(program, language, server).result()
 
     def compile_program(self, program, language="MyriaL", **kwargs):
         """Get a compiled plan for a given program.
@@ -316,13 +555,24 @@ class MyriaConnection(object):
             language: the language in which the program is written
                       (default: MyriaL).
         """
-        logical = self._get_plan(program, language, 'logical', **kwargs)
-        physical = self._get_plan(program, language, 'physical', **kwargs)
-        compiled = compile_to_json(program, logical, physical, language)
+        session = self.compile_session(program, language, **kwargs)
+        compiled = session.to_json()
+        logging.debug("compiled %s program in %s", language, session.timings)
         compiled['profilingMode'] = ["QUERY", "RESOURCE"] \
             if kwargs.get('profile', False) else []
         return compiled
 
+    def compile_session(self, program, language="MyriaL", **kwargs):
+        """Parse and plan a program once, keeping its plans and the time
+        each phase of compilation took.
+
+        Args:
+            program: a Myria program as a string.
+            language: the language in which the program is written
+                      (default: MyriaL).
+        """
+        return CompilationSession(self, program, language, **kwargs)
+
     def submit_query(self, query):
         """Submit the query to Myria, and return the status including the URL
         to be polled.
@@ -340,9 +590,81 @@ class MyriaConnection(object):
         Args:
             query: a Myria physical plan as a Python object.
         """
+        return self.submit_query_async(query).result()
 
-        body = json.dumps(query)
-        return self._finish_async_request(POST, '/query', body)
+    def submit_query_async(self, query):
+        """Submit the query to Myria without waiting for it to finish.
+        Returns a QueryFuture whose result is the final query status.
+
+        Args:
+            query: a Myria physical plan as a Python object.
+        """
+        try:
+            r = self._session.post(self._url_start + '/query',
+                                   data=json.dumps(query))
+        except requests.RequestException as e:
+            raise MyriaError(e)
+        if r.status_code in [200, 201]:
+            future = QueryFuture(r.headers.get('Location'))
+            future._finish(result=r.json())
+            return future
+        elif r.status_code == 202:
+            return self._poll_query(r.headers['Location'])
+        raise MyriaError(r)
+
+    def submit_queries(self, queries):
+        """Submit many queries to Myria at once.
+        Returns a list of QueryFutures, in the order of the queries."""
+        return [self.submit_query_async(q) for q in queries]
+
+    def submit_program(self, program, language="MyriaL", server=None):
+        """Execute the program in the specified language on Myria without
+        waiting for it to finish. Returns a QueryFuture whose result is
+        the final query status.
+
+        Args:
+            program: a Myria program as a string.
+            language: the language in which the program is written
+                      (default: MyriaL).
+        """
+        body = {"query": program, "language": language}
+        try:
+            r = self._session.post(
+                (server or self.execution_url) + '/execute', data=body,
+                headers={'Content-Type': 'application/x-www-form-urlencoded'})
+        except requests.RequestException as e:
+            raise MyriaError(e)
+        if r.status_code != 201:
+            raise MyriaError(r)
+        return self._poll_query(r.json()['url'])
+
+    def _poll_query(self, url):
+        with self._poller_lock:
+            if self._poller is None:
+                self._poller = QueryPoller(self._query_status,
+                                           self._poll_delays)
+        future = QueryFuture(url, self._kill_query)
+        self._poller.add(future)
+        return future
+
+    def _query_status(self, future):
+        """@return the status of a finished query, or None if it is
+        still running"""
+        r = self._session.get(future.url)
+        if r.status_code in [200, 201]:
+            return r.json()
+        elif r.status_code == 202:
+            future.url = r.headers.get('Location', future.url)
+            return None
+        raise MyriaError(r)
+
+    def _kill_query(self, future):
+        try:
+            r = self._session.delete(future.url)
+        except requests.RequestException as e:
+            raise MyriaError(e)
+        if r.status_code not in [200, 204]:
+            raise MyriaError(r)
 
     def validate_query(self, query):
         """Submit the query to Myria for validation only.
@@ -457,13 +779,16 @@ class MyriaConnection(object):
         return r.json()
 
     def upload_file(self, relation_key, schema, data, overwrite=None,
-                    delimiter=None, binary=None, is_little_endian=None):
+                    delimiter=None, binary=None, is_little_endian=None,
+                    chunk_size=DEFAULT_CHUNK_SIZE, retries=0):
         """Upload a file in a streaming manner to Myria.
 
         Args:
             relation_key: relation to be created.
             schema: schema of the relation.
-            data: the bytes to be uploaded.
+            data: the bytes to be uploaded, as a string, a file object, or
+                an iterable of strings. Only chunk_size bytes of a file
+                object are held in memory at a time.
             overwrite: optional boolean indicating that an existing relation
                 should be overwritten. Myria default is False.
             delimiter: optional character which delimits a CSV file. Only valid
@@ -472,25 +797,126 @@ class MyriaConnection(object):
                 a packed binary. Myria default is False.
             is_little_endian: optional boolean indicating that the binary data
                 is in little-Endian. Myria default is False.
+            chunk_size: the number of bytes read from a file object at a time.
+            retries: the number of times to resend the data after a failed
+                upload that overwrites the relation. Only data that can be
+                read again, a string or a seekable file object, is resent.
+                Appends are not resent, since a failed one may have added
+                some of the tuples.
         """
-
-        from requests_toolbelt import MultipartEncoder
-
         fields = [('relationKey', relation_key), ('schema', schema),
                   ('overwrite', overwrite), ('delimiter', delimiter),
                   ('binary', binary), ('isLittleEndian', is_little_endian)]
-        fields = [(name, (name, json.dumps(value), 'application/json'))
-                  for (name, value) in fields]
-        # data must be last
+        if not overwrite:
+            retries = 0
         if binary:
             data_type = 'application/octet-stream'
         else:
-            data_type = 'text/plain'
-        fields.append(('data', ('data', data, data_type)))
+            data_type = CSV
+
+        if isinstance(data, basestring):
+            def data_chunks():
+                return [data]
+        elif hasattr(data, 'read'):
+            try:
+                start = data.tell()
+            except (AttributeError, IOError):
+                start = None
+                retries = 0
+
+            def data_chunks():
+                if start is not None:
+                    data.seek(start)
+                return read_chunks(data, chunk_size)
+        else:
+            # an iterator can only be sent once
+            retries = 0
+
+            def data_chunks():
+                return data
+
+        attempt = 0
+        while True:
+            try:
+                return self._post_multipart('/dataset', fields, data_chunks(),
+                                            data_type)
+            except (MyriaError, requests.ConnectionError) as e:
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                logging.warning("upload of %s failed (%s), retrying",
+                                relation_key, e)
+                sleep(0.1 * attempt)
+
+    def upload_tuples(self, relation_key, schema, tuples, overwrite=None,
+                      is_little_endian=False, buffer_size=DEFAULT_CHUNK_SIZE):
+        """Upload Python tuples to Myria, serializing them into Myria's
+        binary format as they are sent.
+
+        Args:
+            relation_key: relation to be created.
+            schema: schema of the relation.
+            tuples: an iterable of tuples.
+            overwrite: optional boolean indicating that an existing relation
+                should be overwritten. Myria default is False.
+            is_little_endian: encode numbers in little-Endian.
+            buffer_size: the number of bytes serialized before sending them.
+        """
+        return self.upload_file(
+            relation_key, schema,
+            binary_chunks(tuples, schema, is_little_endian, buffer_size),
+            overwrite=overwrite, binary=True,
+            is_little_endian=is_little_endian)
+
+    def upload_shards(self, relation_key, schema, shards, overwrite=None,
+                      parallelism=None, retries=2, **kwargs):
+        """Upload a relation that has been split into several files,
+        sending the shards in parallel.
+
+        The first shard creates (or, with overwrite, replaces) the relation
+        and the others are appended to it. With overwrite, a failed first
+        shard is resent up to retries times; see upload_file.
+
+        Args:
+            relation_key: relation to be created.
+            schema: schema of the relation.
+            shards: paths of the files to upload.
+            overwrite: optional boolean indicating that an existing relation
+                should be overwritten. Myria default is False.
+            parallelism: the number of shards to send at a time; default is
+                all of them.
+            retries: the number of times to resend the first shard.
+            kwargs: passed to upload_file.
+        """
+        from multiprocessing.pool import ThreadPool
+
+        def upload(shard, overwrite):
+            with open(shard, 'rb') as fp:
+                return self.upload_file(relation_key, schema, fp,
+                                        overwrite=overwrite, retries=retries,
+                                        **kwargs)
 
-        m = MultipartEncoder(fields=fields)
-        r = self._session.post(self._url_start + '/dataset', data=m,
-                               headers={'Content-Type': m.content_type})
+        if not shards:
+            return []
+        results = [upload(shards[0], overwrite)]
+        rest = shards[1:]
+        if rest:
+            pool = ThreadPool(parallelism or len(rest))
+            try:
+                results += pool.map(lambda shard: upload(shard, False), rest)
+            finally:
+                pool.close()
+        return results
+
+    def _post_multipart(self, selector, fields, data_chunks, data_type):
+        """POST a multipart form whose last part is streamed from
+        data_chunks, using chunked transfer encoding"""
+        boundary = uuid.uuid4().hex
+        body = _multipart_chunks(boundary, fields, data_chunks, data_type)
+        r = self._session.post(
+            self._url_start + selector, data=body,
+            headers={'Content-Type':
+                     'multipart/form-data; boundary={}'.format(boundary)})
         if r.status_code not in (200, 201):
             raise MyriaError('Error %d: %s'
                              % (r.status_code, r.text))
@@ -511,56 +937,72 @@ class MyriaConnection(object):
         """ List all the user defined functions in Myria """
         return self._wrap_get('/function')
 
-    def _get_plan(self, query, language, plan_type, **kwargs):
-        catalog = MyriaCatalog(self)
-        algebra = MyriaHyperCubeAlgebra(catalog) \
-            if kwargs.get('multiway_jon', False) \
-            else MyriaLeftDeepTreeAlgebra()
+    def _get_udfs(self):
+        if self._udfs is None:
+            self._udfs = [self.get_function(name)
+                          for name in self.get_functions()]
+        return self._udfs
+
+
+class CompilationSession(object):
+    """One compilation of a program against a Myria deployment.
+
+    The program is parsed and interpreted once; the optimized logical plan
+    and the physical plan are both derived from a copy of the resulting
+    logical plan. timings maps each phase to the seconds it took.
+    """
+
+    def __init__(self, connection, program, language="MyriaL", **kwargs):
+        self.program = program
+        self.language = language
+        self.timings = OrderedDict()
+
+        self.catalog = MyriaCatalog(connection)
+        self.algebra = MyriaHyperCubeAlgebra(self.catalog) \
+            if kwargs.get('multiway_join', False) \
+            else MyriaLeftDeepTreeAlgebra(self.catalog)
 
         if language.lower() == "datalog":
-            return self._get_datalog_plan(query, plan_type, algebra, **kwargs)
+            self.logical_plan = self._datalog_logical_plan()
+            self.optimized_logical_plan = self.logical_plan
         elif language.lower() in ["myrial", "sql"]:
-            return self._get_myrial_or_sql_plan(query, plan_type,
-                                                catalog, algebra, **kwargs)
+            self.logical_plan = self._myrial_logical_plan(connection)
+            self.optimized_logical_plan = self._timed(
+                'optimize_logical', optimize,
+                copy.deepcopy(self.logical_plan), OptLogicalAlgebra())
         else:
             raise NotImplementedError('Language %s not supported' % language)
 
-    def _get_myrial_or_sql_plan(self, query, plan_type, catalog, algebra,
-                                **kwargs):
-        parsed = Parser().parse(query, udas=[(udf['name'], udf['outputType'])
-                                             for udf in self._get_udfs()])
-        processor = interpreter.StatementProcessor(catalog)
-        processor.evaluate(parsed)
-
-        if plan_type == 'logical':
-            return processor.get_physical_plan(
-                target_alg=OptLogicalAlgebra())
-        elif plan_type == 'physical':
-            return processor.get_physical_plan(
-                target_alg=algebra,
-                multiway_join=kwargs.get('multiway_join', False),
-                push_sql=kwargs.get('push_sql', True))
-        else:
-            raise NotImplementedError('Myria plan type %s' % plan_type)
+        self.physical_plan = self._timed(
+            'optimize_physical', optimize,
+            copy.deepcopy(self.logical_plan), self.algebra,
+            multiway_join=kwargs.get('multiway_join', False),
+            push_sql=kwargs.get('push_sql', True))
 
-    @staticmethod
-    def _get_datalog_plan(query, plan_type, algebra, **kwargs):
-        datalog = RACompiler()
-        datalog.fromDatalog(query)
+    def _timed(self, phase, f, *args, **kwargs):
+        start = time()
+        result = f(*args, **kwargs)
+        self.timings[phase] = time() - start
+        return result
 
+    def _myrial_logical_plan(self, connection):
+        udas = self._timed('udfs', connection._get_udfs)
+        parsed = self._timed(
+            'parse', Parser().parse, self.program,
+            udas=[(udf['name'], udf['outputType']) for udf in udas])
+        processor = interpreter.StatementProcessor(self.catalog)
+        self._timed('interpret', processor.evaluate, parsed)
+        return self._timed('logical', processor.get_logical_plan)
+
+    def _datalog_logical_plan(self):
+        datalog = RACompiler()
+        self._timed('parse', datalog.fromDatalog, self.program)
         if not datalog.logicalplan:
             raise SyntaxError("Unable to parse Datalog")
-        elif plan_type == 'logical':
-            return datalog.logicalplan
-        elif plan_type == 'physical':
-            datalog.optimize(target=algebra,
-                             push_sql=kwargs.get('push_sql', True))
-            return datalog.physicalplan
-        else:
-            raise NotImplementedError('Datalog plan type %s' % plan_type)
+        return datalog.logicalplan
 
-    def _get_udfs(self):
-        if not self._udfs:
-            self._udfs = [self.get_function(name)
-                          for name in self.get_functions()]
-        return self._udfs
\ No newline at end of file
+    def to_json(self):
+        """The compiled program, as submitted to Myria"""
+        return self._timed('json', compile_to_json, self.program,
+                           self.optimized_logical_plan, self.physical_plan,
+                           self.language)
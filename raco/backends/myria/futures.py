@@ -0,0 +1,174 @@
+"""Futures for queries running on Myria, and the poller that completes
+them. A few background threads poll the status of the outstanding queries
+of a connection, backing off exponentially while a query is running."""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+from time import time
+
+from .errors import MyriaError
+
+__all__ = ['QueryFuture', 'CancelledError', 'backoff_delays']
+
+LOG = logging.getLogger(__name__)
+
+
+class CancelledError(MyriaError):
+    pass
+
+
+def backoff_delays(initial=0.1, maximum=5.0, factor=2.0, jitter=0.5):
+    """Exponentially growing delays between polls, each shortened by a
+    random fraction up to jitter so that concurrent pollers spread out"""
+    delay = initial
+    while True:
+        yield delay * (1 - random.uniform(0, jitter))
+        delay = min(delay * factor, maximum)
+
+
+class QueryFuture(object):
+    """The eventual status of a query submitted to Myria"""
+
+    def __init__(self, url, cancel_func=None):
+        """
+        @param url: the URL that reports the status of the query
+        @param cancel_func: called with the future to stop the query
+        """
+        self.url = url
+        self._cancel_func = cancel_func
+        self._done = threading.Event()
+        self._result = None
+        self._exception = None
+        self._cancelled = False
+        self._callbacks = []
+        self._lock = threading.Lock()
+
+    def done(self):
+        return self._done.is_set()
+
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """Kill the query, unless it already finished.
+        @return whether the query was cancelled
+        """
+        with self._lock:
+            if self.done():
+                return False
+        if self._cancel_func is not None:
+            self._cancel_func(self)
+        self._cancelled = True
+        self._finish(exception=CancelledError(
+            'query {} was cancelled'.format(self.url)))
+        return True
+
+    def result(self, timeout=None):
+        """Wait for the query to finish and return its status"""
+        if not self._done.wait(timeout):
+            raise MyriaError('timed out waiting for query {}'
+                             .format(self.url))
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+    def exception(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise MyriaError('timed out waiting for query {}'
+                             .format(self.url))
+        return self._exception
+
+    def add_done_callback(self, fn):
+        """Call fn with this future when it is done"""
+        with self._lock:
+            if not self.done():
+                self._callbacks.append(fn)
+                return
+        fn(self)
+
+    def _finish(self, result=None, exception=None):
+        with self._lock:
+            if self.done():
+                return
+            self._result = result
+            self._exception = exception
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn(self)
+            except Exception:
+                LOG.exception('callback of query %s failed', self.url)
+
+
+class QueryPoller(object):
+    """Polls outstanding queries from a few daemon threads, each query on
+    its own exponential backoff schedule, so that a slow status request
+    does not hold up the polls of the other queries"""
+
+    def __init__(self, poll, delays=backoff_delays, num_threads=4):
+        """
+        @param poll: called with a QueryFuture; returns the status of the
+            query if it finished, or None if it is still running. Called
+            from several threads at once.
+        @param delays: returns an iterator of the delays between polls
+        @param num_threads: the number of threads polling
+        """
+        self._poll = poll
+        self._delays = delays
+        self._num_threads = num_threads
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._threads = []
+
+    def add(self, future):
+        delays = self._delays()
+        with self._condition:
+            heapq.heappush(self._queue, (time() + next(delays),
+                                         next(self._counter), future, delays))
+            if not self._threads:
+                for i in range(self._num_threads):
+                    thread = threading.Thread(
+                        target=self._run,
+                        name='myria-query-poller-{}'.format(i))
+                    thread.daemon = True
+                    thread.start()
+                    self._threads.append(thread)
+            self._condition.notify()
+
+    def _next_due(self):
+        """Wait for the next query due to be polled"""
+        with self._condition:
+            while True:
+                if not self._queue:
+                    self._condition.wait()
+                    continue
+                due = self._queue[0][0]
+                now = time()
+                if due <= now:
+                    return heapq.heappop(self._queue)
+                self._condition.wait(due - now)
+
+    def _run(self):
+        while True:
+            due, count, future, delays = self._next_due()
+            if future.done():
+                continue
+            try:
+                status = self._poll(future)
+            except Exception as e:
+                future._finish(exception=e
+                               if isinstance(e, MyriaError)
+                               else MyriaError(e))
+                continue
+
+            if status is not None:
+                future._finish(result=status)
+            else:
+                with self._condition:
+                    heapq.heappush(self._queue, (time() + next(delays),
+                                                 count, future, delays))
@@ -169,6 +169,8 @@ class MyriaLanguage(Language):
 
 class MyriaOperator(object):
     language = MyriaLanguage
+    # run by every worker on its partitions; see raco.fakedb
+    partitioned = True
 
 
 def relation_key_to_json(relation_key):
@@ -462,6 +464,17 @@ class MyriaSymmetricHashJoin(algebra.ProjectingJoin, MyriaOperator):
 
         return join
 
+    def memory_estimate(self, num_servers=1):
+        """Hash tables of both inputs, except that pulling one input to its
+        end first builds only the hash table of that input"""
+        left = algebra.hash_table_memory(self.left, num_servers)
+        right = algebra.hash_table_memory(self.right, num_servers)
+        if self.pull_order_policy == 'LEFT_EOS':
+            return left
+        if self.pull_order_policy == 'RIGHT_EOS':
+            return right
+        return left + right
+
 
 class MyriaIDBController(algebra.IDBController, MyriaOperator):
 
@@ -526,6 +539,11 @@ class MyriaLeapFrogJoin(algebra.NaryJoin, MyriaOperator):
             "argChildren": args
         }
 
+    def memory_estimate(self, num_servers=1):
+        """Every input, sorted in memory"""
+        return sum(algebra.relation_bytes(child, num_servers)
+                   for child in self.children())
+
 
 class MyriaGroupBy(algebra.GroupBy, MyriaOperator):
 
@@ -644,6 +662,31 @@ class MyriaDupElim(algebra.Distinct, MyriaOperator):
         }
 
 
+class MyriaBloomFilterBuild(algebra.BloomFilterBuild, MyriaOperator):
+
+    def compileme(self, inputid):
+        return {
+            "opType": "BloomFilterBuild",
+            "argChild": inputid,
+            "argColumns": [c.position for c in self.columnlist],
+            "numBits": self.num_bits,
+            "numHashes": self.num_hashes,
+        }
+
+
+class MyriaBloomFilterProbe(algebra.BloomFilterProbe, MyriaOperator):
+
+    def compileme(self, leftid, rightid):
+        return {
+            "opType": "BloomFilterProbe",
+            "argChild1": leftid,
+            "argChild2": rightid,
+            "argColumns": [c.position for c in self.columnlist],
+            "numBits": self.num_bits,
+            "numHashes": self.num_hashes,
+        }
+
+
 class MyriaApply(algebra.Apply, MyriaOperator):
 
     """Represents a simple apply operator"""
@@ -659,6 +702,23 @@ class MyriaApply(algebra.Apply, MyriaOperator):
         }
 
 
+class MyriaFlatMap(algebra.FlatMap, MyriaOperator):
+
+    """Represents an apply operator with flatmap emit expressions; Myria's
+    Apply emits the cross product of the values of multivalued
+    expressions"""
+
+    def compileme(self, inputid):
+        child_scheme = self.input.scheme()
+        emitters = [compile_mapping(x, child_scheme, None)
+                    for x in self.emitters]
+        return {
+            'opType': 'Apply',
+            'argChild': inputid,
+            'emitExpressions': emitters
+        }
+
+
 class MyriaStatefulApply(algebra.StatefulApply, MyriaOperator):
 
     """Represents a stateful apply operator"""
@@ -704,11 +764,17 @@ class MyriaBroadcastProducer(algebra.UnaryOperator, MyriaOperator):
             "argChild": inputid,
         }
 
+    @staticmethod
+    def destinations(tpl, index, num_workers):
+        return range(num_workers)
+
 
 class MyriaBroadcastConsumer(algebra.UnaryOperator, MyriaOperator):
 
     """A Myria BroadcastConsumer"""
 
+    receives_tuples = True
+
     def __init__(self, input):
         algebra.UnaryOperator.__init__(self, input)
 
@@ -787,7 +853,8 @@ class MyriaShuffleProducer(algebra.UnaryOperator, MyriaOperator):
 
     """A Myria ShuffleProducer"""
 
-    def __init__(self, input, hash_columns, shuffle_type=None):
+    def __init__(self, input, hash_columns, shuffle_type=None,
+                 heavy_hitters=None, broadcast_heavy_hitters=False):
         algebra.UnaryOperator.__init__(self, input)
         # If no specified shuffle type, it's a hash.
         # TODO: add support for more types, do not use None for Hash
@@ -797,6 +864,8 @@ class MyriaShuffleProducer(algebra.UnaryOperator, MyriaOperator):
             assert len(hash_columns) == 1
         self.hash_columns = hash_columns
         self.shuffle_type = shuffle_type
+        self.heavy_hitters = heavy_hitters or []
+        self.broadcast_heavy_hitters = broadcast_heavy_hitters
         self.buffer_type = None
 
     def shortStr(self):
@@ -807,11 +876,18 @@ class MyriaShuffleProducer(algebra.UnaryOperator, MyriaOperator):
         if self.shuffle_type == Shuffle.ShuffleType.Hash:
             hash_string = ','.join([str(x) for x in self.hash_columns])
             return "%s(h(%s))" % (self.opname(), hash_string)
+        if self.shuffle_type == Shuffle.ShuffleType.SkewedHash:
+            hash_string = ','.join([str(x) for x in self.hash_columns])
+            return "%s(h(%s); %s %s)" % (
+                self.opname(), hash_string,
+                "broadcast" if self.broadcast_heavy_hitters else "split",
+                self.heavy_hitters)
 
     def __repr__(self):
-        return "{op}({inp!r}, {hc!r}, {st!r})".format(
+        return "{op}({inp!r}, {hc!r}, {st!r}, {hh!r}, {bh!r})".format(
             op=self.opname(), inp=self.input, hc=self.hash_columns,
-            st=self.shuffle_type)
+            st=self.shuffle_type, hh=self.heavy_hitters,
+            bh=self.broadcast_heavy_hitters)
 
     def partitioning(self):
         return Shuffle(
@@ -819,6 +895,21 @@ class MyriaShuffleProducer(algebra.UnaryOperator, MyriaOperator):
             self.hash_columns,
             self.shuffle_type).partitioning()
 
+    def destinations(self, tpl, index, num_workers):
+        """The workers that the index-th tuple of the input is sent to,
+        simulating the distribute function with Python's hash"""
+        if self.shuffle_type == Shuffle.ShuffleType.RoundRobin:
+            return [index % num_workers]
+        key = tuple(tpl[c.position] for c in self.hash_columns)
+        if self.shuffle_type == Shuffle.ShuffleType.SkewedHash and \
+                key in self.heavy_hitters:
+            if self.broadcast_heavy_hitters:
+                return range(num_workers)
+            return [index % num_workers]
+        if self.shuffle_type == Shuffle.ShuffleType.Identity:
+            return [key[0] % num_workers]
+        return [hash(key) % num_workers]
+
     def set_buffer_type(self, buffer_type):
         self.buffer_type = buffer_type
 
@@ -840,6 +931,15 @@ class MyriaShuffleProducer(algebra.UnaryOperator, MyriaOperator):
             df = {
                 "type": "RoundRobin"
             }
+        elif self.shuffle_type == Shuffle.ShuffleType.SkewedHash:
+            df = {
+                "type": "SkewedHash",
+                "indexes": [x.position for x in self.hash_columns],
+                "heavyHitters": [list(k) for k in self.heavy_hitters],
+                "heavyHitterDistribution":
+                    "Broadcast" if self.broadcast_heavy_hitters
+                    else "RoundRobin"
+            }
         else:
             # TODO: merge HyperCubeShuffleProducer
             raise ValueError("Invalid ShuffleType")
@@ -859,6 +959,8 @@ class MyriaShuffleConsumer(algebra.UnaryOperator, MyriaOperator):
 
     """A Myria ShuffleConsumer"""
 
+    receives_tuples = True
+
     def __init__(self, input):
         algebra.UnaryOperator.__init__(self, input)
 
@@ -935,6 +1037,10 @@ class MyriaCollectProducer(algebra.UnaryOperator, MyriaOperator):
             "argChild": inputid,
         }
 
+    @staticmethod
+    def destinations(tpl, index, num_workers):
+        return [0]
+
     def __repr__(self):
         return "{op}({inp!r}, {svr!r})".format(op=self.opname(),
                                                inp=self.input,
@@ -945,6 +1051,9 @@ class MyriaCollectConsumer(algebra.UnaryOperator, MyriaOperator):
 
     """A Myria CollectConsumer"""
 
+    receives_tuples = True
+    collects_tuples = True
+
     def __init__(self, input):
         algebra.UnaryOperator.__init__(self, input)
 
@@ -1003,6 +1112,16 @@ class MyriaHyperCubeShuffleProducer(algebra.UnaryOperator, MyriaOperator):
         hash_string = ','.join(s for m, s in sorted(mapping.items()))
         return "%s(%s)" % (self.opname(), hash_string)
 
+    def destinations(self, tpl, index, num_workers):
+        """The workers of the hypercube cells that the hashed columns of a
+        tuple are mapped to, hashing each column with Python's hash"""
+        voxel = 0
+        for column, dim in zip(self.hashed_columns,
+                               self.mapped_hc_dimensions):
+            size = self.hyper_cube_dimensions[dim]
+            voxel = voxel * size + hash(tpl[column]) % size
+        return self.cell_partition[voxel]
+
     def compileme(self, inputsym):
         return {
             "opType": "HyperCubeShuffleProducer",
@@ -1020,6 +1139,8 @@ class MyriaHyperCubeShuffleConsumer(algebra.UnaryOperator, MyriaOperator):
 
     """A Myria HyperCubeShuffleConsumer"""
 
+    receives_tuples = True
+
     def __init__(self, input):
         algebra.UnaryOperator.__init__(self, input)
 
@@ -1212,7 +1333,9 @@ class BreakShuffle(rules.Rule):
             return expr
 
         producer = MyriaShuffleProducer(expr.input, expr.columnlist,
-                                        expr.shuffle_type)
+                                        expr.shuffle_type,
+                                        expr.heavy_hitters,
+                                        expr.broadcast_heavy_hitters)
         consumer = MyriaShuffleConsumer(producer)
         return consumer
 
@@ -1328,16 +1451,21 @@ class ShuffleBeforeJoin(rules.Rule):
         right_cols = [expression.UnnamedAttributeRef(i)
                       for i in right_cols]
 
+        # every worker has all of a broadcast input, so the other input
+        # can be joined wherever it is
+        left_broadcast = expr.left.partitioning().broadcasted
+        right_broadcast = expr.right.partitioning().broadcasted
+
         if check_partition_equality(expr.left, left_cols):
             new_left = expr.left
-        elif expr.left.partitioning().broadcasted:
+        elif left_broadcast or right_broadcast:
             new_left = expr.left
         else:
             new_left = algebra.Shuffle(expr.left, left_cols)
 
         if check_partition_equality(expr.right, right_cols):
             new_right = expr.right
-        elif expr.right.partitioning().broadcasted:
+        elif left_broadcast or right_broadcast:
             new_right = expr.right
         else:
             new_right = algebra.Shuffle(expr.right, right_cols)
@@ -1353,6 +1481,151 @@ class ShuffleBeforeJoin(rules.Rule):
         return "Join => Shuffle(Join)"
 
 
+class BroadcastBeforeJoin(rules.Rule):
+
+    """Broadcast the smaller input of a join instead of shuffling both
+    inputs when that sends fewer tuples over the network"""
+
+    def __init__(self, catalog):
+        assert isinstance(catalog, Catalog)
+        self.catalog = catalog
+        super(BroadcastBeforeJoin, self).__init__()
+
+    @staticmethod
+    def shuffle_cost(op, cols):
+        """Tuples sent to shuffle op on cols"""
+        if check_partition_equality(op, cols):
+            return 0
+        return op.num_tuples()
+
+    def fire(self, expr):
+        if not isinstance(expr, algebra.Join):
+            return expr
+        if expr.left.partitioning().broadcasted or \
+                expr.right.partitioning().broadcasted:
+            return expr
+
+        left_cols, right_cols = \
+            convertcondition(expr.condition,
+                             len(expr.left.scheme()),
+                             expr.left.scheme() + expr.right.scheme())
+        left_cols = [expression.UnnamedAttributeRef(i) for i in left_cols]
+        right_cols = [expression.UnnamedAttributeRef(i) for i in right_cols]
+
+        try:
+            left_num = expr.left.num_tuples()
+            right_num = expr.right.num_tuples()
+            shuffle = (self.shuffle_cost(expr.left, left_cols) +
+                       self.shuffle_cost(expr.right, right_cols))
+        except NotImplementedError:
+            # without cardinalities, shuffle both inputs
+            return expr
+
+        num_servers = self.catalog.get_num_servers()
+        if min(left_num, right_num) * num_servers >= shuffle:
+            return expr
+
+        if left_num < right_num:
+            expr.left = algebra.Broadcast(expr.left)
+        else:
+            expr.right = algebra.Broadcast(expr.right)
+        return expr
+
+    def __str__(self):
+        return "Join(small, large) => Join(Broadcast(small), large)"
+
+
+class BroadcastBloomFilter(rules.Rule):
+
+    """Send the Bloom filter built on each worker to every worker that
+    probes it"""
+
+    def fire(self, expr):
+        if isinstance(expr, algebra.BloomFilterProbe) and \
+                not expr.right.partitioning().broadcasted:
+            expr.right = algebra.Broadcast(expr.right)
+        return expr
+
+    def __str__(self):
+        return "BloomFilterProbe(left, right) => " \
+               "BloomFilterProbe(left, Broadcast(right))"
+
+
+class SkewedShuffleBeforeJoin(rules.Rule):
+
+    """Spread the tuples of a join with heavy hitters, join keys so frequent
+    that hashing sends more than a server's share of tuples to one server.
+    The input with more tuples of heavy hitters sends them round robin
+    and the other input broadcasts them; other keys are hashed.
+
+    Heavy hitters are the most common values in the column statistics of
+    the join keys."""
+
+    def __init__(self, catalog, threshold=1.0):
+        """
+        @param threshold: a key is a heavy hitter if its fraction of the
+            tuples of an input, times the number of servers, exceeds this
+        """
+        assert isinstance(catalog, Catalog)
+        self.catalog = catalog
+        self.threshold = threshold
+        super(SkewedShuffleBeforeJoin, self).__init__()
+
+    @staticmethod
+    def is_hash_shuffle(op):
+        return isinstance(op, algebra.Shuffle) and \
+            op.shuffle_type == Shuffle.ShuffleType.Hash and \
+            len(op.columnlist) == 1
+
+    def key_statistics(self, shuffle):
+        stats = shuffle.input.column_statistics()
+        if stats is None:
+            return None
+        return stats[shuffle.columnlist[0].get_position(
+            shuffle.input.scheme())]
+
+    def fire(self, expr):
+        if not isinstance(expr, algebra.Join) or \
+                not all(self.is_hash_shuffle(c) for c in expr.children()):
+            return expr
+        num_servers = self.catalog.get_num_servers()
+        if num_servers < 2:
+            return expr
+
+        stats = [self.key_statistics(c) for c in expr.children()]
+        try:
+            sizes = [c.num_tuples() for c in expr.children()]
+        except NotImplementedError:
+            return expr
+
+        heavy = set()
+        for s in stats:
+            if s is not None:
+                heavy.update(v for v, fraction in s.most_common
+                             if fraction * num_servers > self.threshold)
+        if not heavy:
+            return expr
+
+        def heavy_tuples(side):
+            if stats[side] is None:
+                return 0
+            return sum(stats[side].eq_selectivity(v) for v in heavy) * \
+                sizes[side]
+
+        # split the input with more tuples of heavy hitters
+        split = 0 if heavy_tuples(0) >= heavy_tuples(1) else 1
+        heavy_hitters = sorted((v,) for v in heavy)
+        for side, child in enumerate(expr.children()):
+            child.shuffle_type = Shuffle.ShuffleType.SkewedHash
+            child.heavy_hitters = heavy_hitters
+            child.broadcast_heavy_hitters = side != split
+        return expr
+
+    def __str__(self):
+        return "Join(Shuffle(A), Shuffle(B)) => " \
+               "Join(SkewedShuffle(A), SkewedShuffle(B))"
+
+
 class ShuffleBeforeIDBController(rules.Rule):
     def fire(self, expr):
         if not isinstance(expr, algebra.IDBController):
@@ -1733,11 +2006,28 @@ class PushIntoSQL(rules.Rule):
 class InsertSplit(rules.Rule):
 
     """Inserts an algebra.Split operator in every fragment that has multiple
-    heavy-weight operators."""
+    heavy-weight operators, or only in those estimated to hold more than
+    memory_budget bytes on each of num_servers servers."""
     heavy_ops = (algebra.Store, algebra.StoreTemp,
                  algebra.CrossProduct, algebra.Join, algebra.NaryJoin,
                  algebra.GroupBy, algebra.OrderBy)
 
+    def __init__(self, num_servers=1, memory_budget=None):
+        self.num_servers = num_servers
+        self.memory_budget = memory_budget
+        super(InsertSplit, self).__init__()
+
+    def subtree_memory(self, op):
+        """Estimated memory of op and the operators below it in its
+        fragment, down to the splits already inserted"""
+        if isinstance(op, (algebra.Split,) + MyriaAlgebra.fragment_leaves):
+            return 0
+        total = fragment_memory([op], self.num_servers)
+        if op.stop_recursion:
+            return total
+        return total + sum(self.subtree_memory(child)
+                           for child in op.children())
+
     def insert_split_before_heavy(self, op):
         """Walk the tree starting from op and insert a split when we
         encounter a heavyweight operator."""
@@ -1751,11 +2041,45 @@ class InsertSplit(rules.Rule):
 
     def fire(self, op):
         if isinstance(op, InsertSplit.heavy_ops):
+            if self.memory_budget is not None and \
+                    self.subtree_memory(op) <= self.memory_budget:
+                return op
             return op.apply(self.insert_split_before_heavy)
 
         return op
 
 
+class BuildSmallerJoinSide(rules.Rule):
+
+    """Pulls the smaller input of a symmetric hash join to its end first, so
+    that the join builds only its hash table, when the hash tables of both
+    inputs are estimated to exceed memory_budget bytes per server"""
+
+    def __init__(self, num_servers, memory_budget):
+        self.num_servers = num_servers
+        self.memory_budget = memory_budget
+        super(BuildSmallerJoinSide, self).__init__()
+
+    def fire(self, op):
+        if not isinstance(op, MyriaSymmetricHashJoin) or \
+                op.pull_order_policy != 'ALTERNATE':
+            return op
+
+        try:
+            if op.memory_estimate(self.num_servers) <= self.memory_budget:
+                return op
+            left = algebra.hash_table_memory(op.left, self.num_servers)
+            right = algebra.hash_table_memory(op.right, self.num_servers)
+        except NotImplementedError:
+            return op
+
+        op.pull_order_policy = 'LEFT_EOS' if left <= right else 'RIGHT_EOS'
+        return op
+
+    def __str__(self):
+        return "SymmetricHashJoin => SymmetricHashJoin(build smaller side)"
+
+
 class MergeToNaryJoin(rules.Rule):
 
     """Merge consecutive binary join into a single multiway join
@@ -1853,6 +2177,7 @@ class GetCardinalities(rules.Rule):
 left_deep_tree_shuffle_logic = [
     ShuffleBeforeSetop(),
     ShuffleBeforeJoin(),
+    BroadcastBloomFilter(),
     ShuffleBeforeIDBController(),
     BroadcastBeforeCross(),
     ShuffleAfterSingleton(),
@@ -1870,8 +2195,11 @@ myriafy = [
     rules.OneToOne(algebra.Export, MyriaExport),
     rules.OneToOne(algebra.StatefulApply, MyriaStatefulApply),
     rules.OneToOne(algebra.Apply, MyriaApply),
+    rules.OneToOne(algebra.FlatMap, MyriaFlatMap),
     rules.OneToOne(algebra.Select, MyriaSelect),
     rules.OneToOne(algebra.Distinct, MyriaDupElim),
+    rules.OneToOne(algebra.BloomFilterBuild, MyriaBloomFilterBuild),
+    rules.OneToOne(algebra.BloomFilterProbe, MyriaBloomFilterProbe),
     rules.OneToOne(algebra.Shuffle, MyriaShuffle),
     rules.OneToOne(algebra.HyperCubeShuffle, MyriaHyperCubeShuffle),
     rules.OneToOne(algebra.Collect, MyriaCollect),
@@ -2167,9 +2495,32 @@ class MyriaLeftDeepTreeAlgebra(MyriaAlgebra):
 
     """Myria physical algebra using left deep tree pipeline and 1-D shuffle"""
 
+    def __init__(self, catalog=None):
+        """
+        @param catalog: if given, its number of servers and the estimated
+            cardinalities decide whether to broadcast join inputs
+        """
+        self.catalog = catalog
+
     def opt_rules(self, **kwargs):
+        # catalog aware join distribution
+        broadcast_before_join = [] if self.catalog is None \
+            else [BroadcastBeforeJoin(self.catalog)]
+        # spread the heavy hitters of skewed joins across servers
+        skewed_shuffle = [] if self.catalog is None \
+            else [SkewedShuffleBeforeJoin(self.catalog)]
+
+        num_servers = 1 if self.catalog is None \
+            else self.catalog.get_num_servers()
+        memory_budget = kwargs.get('memory_budget')
+
+        # semi-join reduction of the larger inputs of selective joins
+        bloom_filters = [rules.BloomFilterSemiJoin()] \
+            if kwargs.get('bloom_filters') else []
+
         opt_grps_sequence = [
             rules.remove_trivial_sequences,
+            [rules.CommonSubexpressionElimination()],
             [
                 rules.SimpleGroupBy(),
                 rules.CountToCountall(),  # TODO revisit when we have NULLs
@@ -2178,9 +2529,14 @@ class MyriaLeftDeepTreeAlgebra(MyriaAlgebra):
                 rules.DedupGroupBy(),
             ],
             rules.push_select,
+            [rules.OrderJoins(bushy=False)],
+            [rules.PreAggregateBelowJoin()],
             rules.push_project,
             rules.push_apply,
+            broadcast_before_join,
+            bloom_filters,
             left_deep_tree_shuffle_logic,
+            skewed_shuffle,
             [PushSelectThroughShuffle()],
             rules.push_select,
             distributed_group_by(MyriaGroupBy),
@@ -2203,8 +2559,16 @@ class MyriaLeftDeepTreeAlgebra(MyriaAlgebra):
             idb_until_convergence(kwargs.get('async_ft')),
         ]
 
+        if memory_budget is not None:
+            compile_grps_sequence.append(
+                [BuildSmallerJoinSide(num_servers, memory_budget)])
+
         if kwargs.get('add_splits', True):
             compile_grps_sequence.append([InsertSplit()])
+        elif memory_budget is not None:
+            # split the fragments that would exceed the budget anyway
+            compile_grps_sequence.append(
+                [InsertSplit(num_servers, memory_budget)])
         # Even when false, plans may already include (manually added) Splits,
         # so we always need BreakSplit
         compile_grps_sequence.append([BreakSplit()])
@@ -2236,9 +2600,13 @@ class MyriaHyperCubeAlgebra(MyriaAlgebra):
             HCShuffleBeforeNaryJoin(self.catalog),
             OrderByBeforeNaryJoin(),
         ]
+        num_servers = 1 if self.catalog is None \
+            else self.catalog.get_num_servers()
+        memory_budget = kwargs.get('memory_budget')
 
         opt_grps_sequence = [
             rules.remove_trivial_sequences,
+            [rules.CommonSubexpressionElimination()],
             [
                 rules.SimpleGroupBy(),
                 # TODO revisit when we have NULL support.
@@ -2267,8 +2635,16 @@ class MyriaHyperCubeAlgebra(MyriaAlgebra):
             break_communication
         ]
 
+        if memory_budget is not None:
+            compile_grps_sequence.append(
+                [BuildSmallerJoinSide(num_servers, memory_budget)])
+
         if kwargs.get('add_splits', True):
             compile_grps_sequence.append([InsertSplit()])
+        elif memory_budget is not None:
+            # split the fragments that would exceed the budget anyway
+            compile_grps_sequence.append(
+                [InsertSplit(num_servers, memory_budget)])
         # Even when false, plans may already include (manually added) Splits,
         # so we always need BreakSplit
         compile_grps_sequence.append([BreakSplit()])
@@ -2312,62 +2688,64 @@ def ensure_store_temp(label, op):
     return MyriaStoreTemp(input=op, name=label)
 
 
+def one_fragment(rootOp):
+    """Given an operator that is the root of a query fragment/plan, extract
+    the operators in the fragment. Assembles a list cur_frag of the
+    operators in the current fragment, in preorder from the root.
+
+    This operator also assembles a queue of the discovered roots of later
+    fragments, e.g., when there is a ShuffleProducer below. The list of
+    operators that should be treated as fragment leaves is given by
+    MyriaAlgebra.fragment_leaves. """
+
+    # The current fragment starts with the current root
+    cur_frag = [rootOp]
+    # Initially, there are no new roots discovered below leaves of this
+    # fragment.
+    queue = []
+    if rootOp.stop_recursion:
+        pass
+    elif isinstance(rootOp, MyriaAlgebra.fragment_leaves):
+        # The current root operator is a fragment leaf, such as a
+        # ShuffleProducer. Append its children to the queue of new roots.
+        for child in rootOp.children():
+            queue.append(child)
+    else:
+        # Otherwise, the children belong in this fragment. Recursively go
+        # discover their fragments, including the queue of roots below
+        # their children.
+        for child in rootOp.children():
+            (child_frag, child_queue) = one_fragment(child)
+            # Add their fragment onto this fragment
+            cur_frag += child_frag
+            # Add their roots-of-next-fragments into our queue
+            queue += child_queue
+    return (cur_frag, queue)
+
+
+def fragments(rootOp):
+    """Given the root of a query plan, recursively determine all the
+    fragments in it."""
+    # The queue of fragment roots. Initially, just the root of this query
+    queue = [rootOp]
+    ret = []
+    while len(queue) > 0:
+        # Get the next fragment root
+        rootOp = queue.pop(0)
+        # .. recursively learn the entire fragment, and any newly
+        # discovered roots.
+        (op_frag, op_queue) = one_fragment(rootOp)
+        # .. Myria JSON expects the fragment operators in reverse order,
+        # i.e., root at the bottom.
+        ret.append(list(reversed(op_frag)))
+        # .. and collect the newly discovered fragment roots.
+        queue.extend(op_queue)
+    return ret
+
+
 def compile_fragment(frag_root, op_ids):
     """Given a root operator, produce a SubQueryEncoding."""
 
-    def one_fragment(rootOp):
-        """Given an operator that is the root of a query fragment/plan, extract
-        the operators in the fragment. Assembles a list cur_frag of the
-        operators in the current fragment, in preorder from the root.
-
-        This operator also assembles a queue of the discovered roots of later
-        fragments, e.g., when there is a ShuffleProducer below. The list of
-        operators that should be treated as fragment leaves is given by
-        MyriaAlgebra.fragment_leaves. """
-
-        # The current fragment starts with the current root
-        cur_frag = [rootOp]
-        # Initially, there are no new roots discovered below leaves of this
-        # fragment.
-        queue = []
-        if rootOp.stop_recursion:
-            pass
-        elif isinstance(rootOp, MyriaAlgebra.fragment_leaves):
-            # The current root operator is a fragment leaf, such as a
-            # ShuffleProducer. Append its children to the queue of new roots.
-            for child in rootOp.children():
-                queue.append(child)
-        else:
-            # Otherwise, the children belong in this fragment. Recursively go
-            # discover their fragments, including the queue of roots below
-            # their children.
-            for child in rootOp.children():
-                (child_frag, child_queue) = one_fragment(child)
-                # Add their fragment onto this fragment
-                cur_frag += child_frag
-                # Add their roots-of-next-fragments into our queue
-                queue += child_queue
-        return (cur_frag, queue)
-
-    def fragments(rootOp):
-        """Given the root of a query plan, recursively determine all the
-        fragments in it."""
-        # The queue of fragment roots. Initially, just the root of this query
-        queue = [rootOp]
-        ret = []
-        while len(queue) > 0:
-            # Get the next fragment root
-            rootOp = queue.pop(0)
-            # .. recursively learn the entire fragment, and any newly
-            # discovered roots.
-            (op_frag, op_queue) = one_fragment(rootOp)
-            # .. Myria JSON expects the fragment operators in reverse order,
-            # i.e., root at the bottom.
-            ret.append(list(reversed(op_frag)))
-            # .. and collect the newly discovered fragment roots.
-            queue.extend(op_queue)
-        return ret
-
     def call_compile_me(op, op_ids):
         "A shortcut to call the operator's compile_me function."
         op_id = op_ids[id(op)]
@@ -2388,6 +2766,33 @@ def compile_fragment(frag_root, op_ids):
     return results
 
 
+def fragment_memory(frag, num_servers=1):
+    """Estimated peak bytes held on each server by the operators of a
+    fragment, which run at once. Operators without cardinality estimates
+    are not counted."""
+    total = 0
+    for op in frag:
+        try:
+            total += op.memory_estimate(num_servers)
+        except NotImplementedError:
+            pass
+    return total
+
+
+def fragment_memory_estimates(plan_op, num_servers=1):
+    """Given a physical plan, return a list of (fragment, bytes) pairs of
+    the fragments compile_fragment finds in it and their estimated memory
+    on each server"""
+    subplan_ops = (algebra.Parallel, algebra.Sequence, algebra.DoWhile,
+                   algebra.UntilConvergence)
+    if isinstance(plan_op, subplan_ops):
+        return list(itertools.chain(*[
+            fragment_memory_estimates(op, num_servers)
+            for op in plan_op.children()]))
+    return [(frag, fragment_memory(frag, num_servers))
+            for frag in fragments(plan_op)]
+
+
 def compile_plan(plan_op):
     """Given a root operator in MyriaX physical algebra,
     produce the dictionary encoding of the physical plan, in other words, a
@@ -0,0 +1,127 @@
+from httmock import urlmatch, HTTMock
+import requests
+import threading
+import unittest
+
+from raco.backends.myria.connection import MyriaConnection
+from raco.backends.myria.errors import MyriaError
+from raco.backends.myria.futures import backoff_delays, CancelledError
+
+
+class FakeMyria(object):
+    """A Myria REST server whose queries finish after some polls"""
+
+    def __init__(self, polls_to_finish):
+        self.polls_to_finish = polls_to_finish
+        self.queries = {}
+        self.killed = []
+        self.lock = threading.Lock()
+
+    def status(self, query_id, status):
+        return {'queryId': query_id, 'status': status,
+                'url': 'http://localhost:12345/query/query-%d' % query_id}
+
+    def running(self, query_id):
+        return {'status_code': 202,
+                'content': self.status(query_id, 'RUNNING'),
+                'headers': {'Location': 'http://localhost:12345/query/'
+                                        'query-%d' % query_id}}
+
+    def __call__(self, url, request):
+        with self.lock:
+            if url.path in ['/query', '/execute'] \
+                    and request.method == 'POST':
+                query_id = len(self.queries) + 1
+                self.queries[query_id] = 0
+                if url.path == '/execute':
+                    return {'status_code': 201,
+                            'content': self.status(query_id, 'ACCEPTED')}
+                return self.running(query_id)
+
+            query_id = int(url.path.split('-')[-1])
+            if request.method == 'DELETE':
+                self.killed.append(query_id)
+                return {'status_code': 204, 'content': ''}
+
+            self.queries[query_id] += 1
+            if self.queries[query_id] < self.polls_to_finish:
+                return self.running(query_id)
+            return {'status_code': 201,
+                    'content': self.status(query_id, 'SUCCESS')}
+
+
+def fake_myria(fake):
+    @urlmatch(netloc=r'localhost:12345')
+    def mock(url, request):
+        return fake(url, request)
+    return mock
+
+
+class TestQueryFutures(unittest.TestCase):
+    def setUp(self):
+        self.connection = MyriaConnection(
+            hostname='localhost', port=12345,
+            execution_url='http://localhost:12345',
+            poll_interval=0.001, max_poll_interval=0.01)
+
+    def test_backoff_delays(self):
+        delays = backoff_delays(initial=1, maximum=8, jitter=0.5)
+        bounds = [1, 2, 4, 8, 8]
+        for bound in bounds:
+            delay = next(delays)
+            self.assertTrue(bound / 2.0 <= delay <= bound)
+
+    def test_submit_queries(self):
+        fake = FakeMyria(polls_to_finish=3)
+        threads = threading.active_count()
+        with HTTMock(fake_myria(fake)):
+            futures = self.connection.submit_queries([{}] * 20)
+            statuses = [f.result(timeout=10) for f in futures]
+
+        self.assertEqual(sorted(s['queryId'] for s in statuses),
+                         range(1, 21))
+        self.assertTrue(all(s['status'] == 'SUCCESS' for s in statuses))
+        self.assertTrue(all(polls == 3 for polls in fake.queries.values()))
+        # a fixed set of threads polls all the queries
+        pollers = len(self.connection._poller._threads)
+        self.assertLess(pollers, len(futures))
+        self.assertEqual(threading.active_count(), threads + pollers)
+
+    def test_cancel(self):
+        fake = FakeMyria(polls_to_finish=10 ** 6)
+        with HTTMock(fake_myria(fake)):
+            future = self.connection.submit_query_async({})
+            done = []
+            future.add_done_callback(done.append)
+            self.assertTrue(future.cancel())
+
+        self.assertTrue(future.cancelled())
+        self.assertEqual(fake.killed, [1])
+        self.assertEqual(done, [future])
+        with self.assertRaises(CancelledError):
+            future.result()
+        self.assertFalse(future.cancel())
+
+    def test_execute_program(self):
+        fake = FakeMyria(polls_to_finish=2)
+        with HTTMock(fake_myria(fake)):
+            status = self.connection.execute_program("x = [1];")
+        self.assertEqual(status['status'], 'SUCCESS')
+
+    def test_execute_query_connection_error(self):
+        @urlmatch(netloc=r'localhost:12345')
+        def refused(url, request):
+            raise requests.ConnectionError('connection refused')
+
+        with HTTMock(refused):
+            with self.assertRaisesRegexp(MyriaError, 'connection refused'):
+                self.connection.execute_query({})
+
+    def test_session_per_thread(self):
+        sessions = []
+        thread = threading.Thread(
+            target=lambda: sessions.append(self.connection._session))
+        thread.start()
+        thread.join()
+        self.assertIs(self.connection._session, self.connection._session)
+        self.assertIsNot(sessions[0], self.connection._session)
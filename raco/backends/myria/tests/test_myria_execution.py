@@ -10,8 +10,17 @@ from raco.representation import RepresentationProperties
 import raco.myrial.interpreter as interpreter
 import raco.myrial.parser as myrialparser
 from raco.backends.myria import MyriaLeftDeepTreeAlgebra
-from raco.backends.myria.connection import FunctionTypes
+from raco.backends.myria.connection import FunctionTypes, binary_chunks
+from raco.backends.myria.errors import MyriaError
+from raco.fakedb import FakeDatabase
+from raco.scheme import Scheme
+from collections import Counter
+from StringIO import StringIO
+import csv
 import os
+import random
+import struct
+import tempfile
 
 
 def is_skipping():
@@ -147,6 +156,9 @@ def local_mock(url, request):
     elif url.path == '/function' and request.method == 'POST':
         return {'status_code': 200, 'content': json.dumps([5])}
 
+    elif url.path == '/function' and request.method == 'GET':
+        return {'status_code': 200, 'content': json.dumps([])}
+
     elif url.path == '/function/test' and request.method == 'GET':
         return {'status_code': 200, 'content': json.dumps(['test'])}
 
@@ -156,12 +168,60 @@ def local_mock(url, request):
     return None
 
 
+# bodies of the uploads the upload stub received, as lists of the chunks sent
+uploads = []
+# number of uploads the upload stub fails before accepting one
+upload_failures = 0
+
+
+@urlmatch(netloc=r'localhost:12345', path=r'/dataset$', method='POST')
+def upload_mock(url, request):
+    global upload_failures
+    uploads.append(list(request.body))
+    if upload_failures:
+        upload_failures -= 1
+        return {'status_code': 503, 'content': 'unavailable'}
+    return {'status_code': 201, 'content': json.dumps({'numTuples': 2})}
+
+
+books_key = {'userName': 'Brandon', 'programName': 'Demo',
+             'relationName': 'MoreBooks'}
+books = [('Moby Dick', 635), ('Dune, Part 1', 412), ('Ulysses', 730)]
+
+
+@urlmatch(netloc=r'localhost:12345', path=r'.*/data$', method='GET')
+def download_mock(url, request):
+    if 'format=binary' in url.query:
+        content = ''.join(binary_chunks(
+            books, {'columnTypes': ['STRING_TYPE', 'LONG_TYPE']}))
+    else:
+        out = StringIO()
+        writer = csv.writer(out)
+        writer.writerow(['name', 'pages'])
+        writer.writerows(books)
+        content = out.getvalue()
+    return {'status_code': 200, 'content': content}
+
+
+def multipart_field(body, name):
+    """value of a field of a multipart form"""
+    text = ''.join(body)
+    start = text.index('name="{}"'.format(name))
+    start = text.index('\r\n\r\n', start) + 4
+    return text[start:text.index('\r\n--', start)]
+
+
 class TestQuery(unittest.TestCase):
     def __init__(self, args):
         with HTTMock(local_mock):
             self.connection = get_connection()
         unittest.TestCase.__init__(self, args)
 
+    def setUp(self):
+        global upload_failures
+        del uploads[:]
+        upload_failures = 0
+
     def test_num_tuples(self):
         with HTTMock(local_mock):
             i = rel_info(self.connection)
@@ -196,13 +256,103 @@ class TestQuery(unittest.TestCase):
     # query_request["rawQuery"])
     #         self.assertNotEquals(status, None)
 
-    # def test_compile_program(self):
-    #     global query_request
-    #     with HTTMock(local_mock):
-    #         query_request = query(self.connection)
-    #         status = self.connection.compile_program(
-    # query_request["rawQuery"])
-    #         self.assertNotEquals(status, None)
+    def test_compile_session(self):
+        program = """
+        books = scan(Brandon:Demo:MoreBooks);
+        longerBooks = [from books where pages > 300 emit name];
+        store(longerBooks, Brandon:Demo:LongerBooks);
+        """
+        with HTTMock(local_mock):
+            session = self.connection.compile_session(program)
+            compiled = session.to_json()
+
+        self.assertEqual(compiled['rawQuery'], program)
+        self.assertEqual(compiled['logicalRa'],
+                         str(session.optimized_logical_plan))
+        # optimizing did not change the logical plan it started from
+        self.assertNotIn('Myria', str(session.logical_plan))
+        self.assertIn('MyriaStore', str(session.physical_plan))
+        self.assertEqual(session.timings.keys(),
+                         ['udfs', 'parse', 'interpret', 'logical',
+                          'optimize_logical', 'optimize_physical', 'json'])
+
+    def test_compile_program(self):
+        with HTTMock(local_mock):
+            compiled = self.connection.compile_program(
+                "x = scan(Brandon:Demo:MoreBooks); store(x, OUTPUT);",
+                profile=True)
+        self.assertEqual(compiled['profilingMode'], ["QUERY", "RESOURCE"])
+        self.assertIn('plan', compiled)
+
+    def test_iter_dataset(self):
+        with HTTMock(download_mock, local_mock):
+            # scheme from the dataset info
+            self.assertEqual(list(self.connection.iter_dataset(books_key)),
+                             books)
+            self.assertEqual(list(self.connection.iter_dataset(
+                books_key, columns=['pages', 0], limit=2)),
+                [(635, 'Moby Dick'), (412, 'Dune, Part 1')])
+
+    def test_iter_dataset_binary(self):
+        scheme = Scheme([('name', 'STRING_TYPE'), ('pages', 'LONG_TYPE')])
+        with HTTMock(download_mock):
+            # small chunks split tuples and values
+            rows = self.connection.iter_dataset(
+                books_key, scheme=scheme, format='binary', chunk_size=3)
+            self.assertEqual(list(rows), books)
+
+    def test_download_to_fakedb(self):
+        db = FakeDatabase()
+        scheme = Scheme([('name', 'STRING_TYPE'), ('pages', 'LONG_TYPE')])
+        with HTTMock(download_mock):
+            db.ingest('Brandon:Demo:MoreBooks',
+                      Counter(self.connection.iter_dataset(books_key,
+                                                           scheme=scheme)),
+                      scheme)
+        self.assertEqual(
+            sorted(db.get_table('Brandon:Demo:MoreBooks').elements()),
+            sorted(books))
+
+    def test_catalog_statistics(self):
+        catalog = MyriaCatalog(self.connection, statistics_sample_size=2)
+        key = RelationKey('Brandon', 'Demo', 'MoreBooks')
+        with HTTMock(download_mock, local_mock):
+            name, pages = catalog.column_statistics(key)
+        self.assertIn(pages.min, [p for _, p in books])
+        self.assertIn(pages.max, [p for _, p in books])
+        # the two sampled names stand for the 50 tuples of the dataset
+        self.assertEqual(name.distinct, 10)
+        self.assertIsNone(MyriaCatalog(self.connection)
+                          .column_statistics(key))
+
+    def test_catalog_statistics_sample_whole_relation(self):
+        key = RelationKey('Brandon', 'Demo', 'MoreBooks')
+        maxima = set()
+        random.seed(1)
+        with HTTMock(download_mock, local_mock):
+            for _ in range(20):
+                catalog = MyriaCatalog(self.connection,
+                                       statistics_sample_size=2)
+                maxima.add(catalog.column_statistics(key)[1].max)
+        # the last tuple is sampled, not only the first two
+        self.assertEqual(maxima, {635, 730})
+
+    def test_catalog_statistics_error(self):
+        @urlmatch(netloc=r'localhost:12345', path=r'.*/data$')
+        def error_mock(url, request):
+            return {'status_code': 500, 'content': 'disk on fire'}
+
+        catalog = MyriaCatalog(self.connection, statistics_sample_size=2)
+        key = RelationKey('Brandon', 'Demo', 'MoreBooks')
+        with HTTMock(error_mock, local_mock):
+            with self.assertRaisesRegexp(ValueError, 'disk on fire'):
+                catalog.column_statistics(key)
+
+    def test_download_to_file(self):
+        out = StringIO()
+        with HTTMock(download_mock):
+            self.connection.download_to_file(books_key, out, chunk_size=5)
+        self.assertEqual(out.getvalue().splitlines()[1], 'Moby Dick,635')
 
     def test_get_query_plan(self):
         with HTTMock(local_mock):
@@ -245,6 +395,95 @@ class TestQuery(unittest.TestCase):
             status = self.connection.upload_file("", [], "Hello")
             self.assertNotEquals(status, None)
 
+    def test_upload_fp_streams(self):
+        data = "1,a\n2,b\n" * 100
+        with HTTMock(upload_mock):
+            self.connection.upload_file(
+                {'relationName': 'R'}, {'columnNames': ['x']},
+                StringIO(data), chunk_size=64)
+        self.assertEqual(len(uploads), 1)
+        # the data was sent in chunk_size pieces
+        self.assertIn(data[:64], uploads[0])
+        self.assertGreater(len(uploads[0]), len(data) / 64)
+        self.assertEqual(multipart_field(uploads[0], 'data'), data)
+        self.assertEqual(json.loads(multipart_field(uploads[0],
+                                                    'relationKey')),
+                         {'relationName': 'R'})
+
+    def test_binary_chunks(self):
+        schema = {'columnTypes': ['LONG_TYPE', 'STRING_TYPE', 'DOUBLE_TYPE']}
+        tuples = [(1, 'ab', 2.5), (2, u'c', 0.0)]
+        expected = (struct.pack('>qi', 1, 2) + 'ab' + struct.pack('>d', 2.5) +
+                    struct.pack('>qi', 2, 1) + 'c' + struct.pack('>d', 0.0))
+        self.assertEqual(''.join(binary_chunks(tuples, schema)), expected)
+
+        chunks = list(binary_chunks(tuples, schema, buffer_size=1))
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(''.join(chunks), expected)
+
+        little = ''.join(binary_chunks([(1,)], {'columnTypes': ['INT_TYPE']},
+                                       is_little_endian=True))
+        self.assertEqual(little, struct.pack('<i', 1))
+
+    def test_upload_tuples(self):
+        schema = {'columnTypes': ['LONG_TYPE'], 'columnNames': ['x']}
+        with HTTMock(upload_mock):
+            self.connection.upload_tuples({'relationName': 'R'}, schema,
+                                          ((i,) for i in range(10)))
+        self.assertEqual(multipart_field(uploads[0], 'binary'), 'true')
+        self.assertEqual(multipart_field(uploads[0], 'data'),
+                         ''.join(struct.pack('>q', i) for i in range(10)))
+
+    def test_upload_retry(self):
+        global upload_failures
+        upload_failures = 1
+        with HTTMock(upload_mock):
+            status = self.connection.upload_file(
+                {'relationName': 'R'}, {}, StringIO("1\n2\n"),
+                overwrite=True, retries=1)
+        self.assertEqual(status['numTuples'], 2)
+        self.assertEqual(len(uploads), 2)
+        self.assertEqual(multipart_field(uploads[1], 'data'), "1\n2\n")
+
+        upload_failures = 1
+        with HTTMock(upload_mock):
+            with self.assertRaises(MyriaError):
+                self.connection.upload_file({'relationName': 'R'}, {},
+                                            iter(["1\n"]), overwrite=True,
+                                            retries=1)
+
+    def test_upload_append_not_retried(self):
+        global upload_failures
+        upload_failures = 1
+        with HTTMock(upload_mock):
+            with self.assertRaises(MyriaError):
+                self.connection.upload_file({'relationName': 'R'}, {},
+                                            StringIO("1\n2\n"), retries=1)
+        self.assertEqual(len(uploads), 1)
+
+    def test_upload_shards(self):
+        shards = []
+        for i in range(3):
+            f = tempfile.NamedTemporaryFile(delete=False)
+            f.write("{}\n".format(i))
+            f.close()
+            shards.append(f.name)
+        try:
+            with HTTMock(upload_mock):
+                statuses = self.connection.upload_shards(
+                    {'relationName': 'R'}, {}, shards, overwrite=True)
+        finally:
+            for shard in shards:
+                os.remove(shard)
+
+        self.assertEqual(len(statuses), 3)
+        self.assertEqual(sorted(multipart_field(u, 'data') for u in uploads),
+                         ["0\n", "1\n", "2\n"])
+        # the first shard replaces the relation, the others append to it
+        self.assertEqual(multipart_field(uploads[0], 'overwrite'), 'true')
+        self.assertEqual([multipart_field(u, 'overwrite')
+                          for u in uploads[1:]], ['false', 'false'])
+
     def test_validate(self):
         global query_request
         with HTTMock(local_mock):
@@ -0,0 +1,7 @@
+{% extends "define_metric.cpp" %}
+
+{% block type %}SimpleMetric<int64_t>{% endblock %}
+
+{% block name %}{{name}}{% endblock %}
+
+{% block init %}0{% endblock %}
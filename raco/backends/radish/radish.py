@@ -61,6 +61,17 @@ class GrappaLanguage(CBaseLanguage):
     def cgenv(cls):
         return cls._cgenv
 
+    @classmethod
+    def profile_counter_declaration(cls, name):
+        # metrics are summed over all cores
+        return cls.cgenv().get_template('profile_metric.cpp').render(
+            name=name)
+
+    @staticmethod
+    def profile_write(path, values):
+        # counters are metrics, printed by Metrics::merge_and_print
+        return ""
+
     @classmethod
     def base_template(cls):
         return cls.cgenv().get_template('base_query.cpp')
@@ -217,7 +228,7 @@ class GrappaSingletonRelation(algebra.SingletonRelation, GrappaOperator):
                                    type=stagedTuple.getTupleTypename(),
                                    name=stagedTuple.name
         )])
-        inner_code = self.parent().consume(stagedTuple, self, state)
+        inner_code = self.consumeInParent(stagedTuple, state)
 
         get_pipeline_task_name(state)
         state.setPipelineProperty('type', 'in_memory')
@@ -301,7 +312,7 @@ class GrappaMemoryScan(algebra.UnaryOperator, GrappaOperator):
         tuple_type = stagedTuple.getTupleTypename()
         tuple_name = stagedTuple.name
 
-        inner_code = self.parent().consume(stagedTuple, self, state)
+        inner_code = self.consumeInParent(stagedTuple, state)
 
         code = memory_scan_template.render(locals())
         state.setPipelineProperty('type', 'in_memory')
@@ -444,7 +455,7 @@ class GrappaSymmetricHashJoin(GrappaJoin, GrappaOperator):
             self.right_in_tuple_type = t.getTupleTypename()
             state.resolveSymbol(self.rightTypeRef, self.right_in_tuple_type)
 
-            inner_plan_compiled = self.parent().consume(outTuple, self, state)
+            inner_plan_compiled = self.consumeInParent(outTuple, state)
 
             keyval = CKeyUtils._aggregate_val(t, self.rightcols)
 
@@ -487,7 +498,7 @@ class GrappaSymmetricHashJoin(GrappaJoin, GrappaOperator):
 
             keyval = CKeyUtils._aggregate_val(t, self.leftcols)
 
-            inner_plan_compiled = self.parent().consume(outTuple, self, state)
+            inner_plan_compiled = self.consumeInParent(outTuple, state)
 
             left_type = left_in_tuple_type
             right_type = self.right_in_tuple_type
@@ -642,7 +653,7 @@ class GrappaShuffleHashJoin(algebra.Join, GrappaOperator):
 #
 #        state.addPostCode(delete_template.render(locals()))
 #
-#        inner_code_compiled = self.parent().consume(outTuple, self, state)
+#        inner_code_compiled = self.consumeInParent(outTuple, state)
 #
 #        code = iterate_template % locals()
 #        state.setPipelineProperty('type', 'in_memory')
@@ -797,7 +808,7 @@ class GrappaGroupBy(cppcommon.BaseCGroupby, GrappaOperator):
         output_tuple_set_func = output_tuple.set_func_code(0)  # UNUSED??
         state.addDeclarations([output_tuple.generateDefinition()])
 
-        inner_code = self.parent().consume(output_tuple, self, state)
+        inner_code = self.consumeInParent(output_tuple, state)
         comment = self.language().comment("scan of " + str(self))
 
         assignmentcode = self._assignment_code(output_tuple)
@@ -1376,7 +1387,7 @@ class GrappaHashJoin(GrappaJoin, GrappaOperator):
 
             state.addDeclarations([out_tuple_type_def, combine_function_def])
 
-            inner_plan_compiled = self.parent().consume(outTuple, self, state)
+            inner_plan_compiled = self.consumeInParent(outTuple, state)
 
             code = left_template.render(locals())
             return code
@@ -1593,7 +1604,7 @@ class GrappaNullInput(cppcommon.CBaseFileScan, GrappaOperator):
         sym = TempRelationSymbol(self.relation_key)
         assert state.lookupTupleDef(sym.symbol()) is not None, \
             "Expected {} to already exist".format(sym.symbol())
-        self.parent().consume(sym, self, state)
+        self.consumeInParent(sym, state)
 
     def consume(self, t, src, state):
         assert False, "as a source, no need for consume"
@@ -1605,7 +1616,7 @@ class GrappaShuffle(algebra.Shuffle, GrappaOperator):
         self.input.produce(state)
 
     def consume(self, t, src, state):
-        inner_plan_compiled = self.parent().consume(t, self, state)
+        inner_plan_compiled = self.consumeInParent(t, state)
 
         columnlist_nums = [c.position for c in self.columnlist]
 
@@ -1745,7 +1756,7 @@ class GrappaBroadcastCrossProduct(algebra.CrossProduct, GrappaOperator):
                          left_name=t.name,
                          right_name=self.broadcast_tuple.name)
 
-            inner_plan_compiled = self.parent().consume(output, self, state)
+            inner_plan_compiled = self.consumeInParent(output, state)
 
             return code + inner_plan_compiled
 
@@ -1803,7 +1814,7 @@ class IGrappaMemoryScan(GrappaMemoryScan, Iterator):
             symbol=self.symbol,
             call_constructor=self._constructor(inputsym, state)
         ))
-        self.parent().consume(stagedTuple, self, state)
+        self.consumeInParent(stagedTuple, state)
 
         state.addPipeline()
         return None
@@ -1828,7 +1839,7 @@ class IGrappaSelect(GrappaSelect, Iterator):
             inputsym=src.symbol,
             class_symbol=class_symbol
         ))
-        self.parent().consume(t, self, state)
+        self.consumeInParent(t, state)
         return None
 
 
@@ -1871,7 +1882,7 @@ class IGrappaApply(GrappaApply, Iterator):
             inputsym=src.symbol
         ))
 
-        self.parent().consume(self.newtuple, self, state)
+        self.consumeInParent(self.newtuple, state)
 
         return None
 
@@ -1933,7 +1944,7 @@ class IGrappaHashJoin(GrappaSymmetricHashJoin, Iterator):
                 hashname=self._hashname)
         ))
 
-        self.parent().consume(self.outTuple, self, state)
+        self.consumeInParent(self.outTuple, state)
         state.addPipeline()
 
     def consume(self, t, src, state):
@@ -2060,7 +2071,7 @@ class IGrappaGroupBy(GrappaGroupBy, Iterator):
                     class_symbol=class_symbol,
                     hashname=self._hashname)))
 
-        self.parent().consume(output_tuple, self, state)
+        self.consumeInParent(output_tuple, state)
 
         state.setPipelineProperty("type", "in_memory")
         state.addPipeline()
@@ -2216,7 +2227,7 @@ class IGrappaBroadcastCrossProduct(GrappaBroadcastCrossProduct, Iterator):
                         broadcast_tuple=self.broadcast_tuple.name,
                         inputsym=src.symbol)))
 
-            self.parent().consume(output, self, state)
+            self.consumeInParent(output, state)
             return None
 
         else:
@@ -2536,6 +2547,7 @@ class GrappaAlgebra(Algebra):
             [GrappaWhileCondition()],
             rules.simple_group_by,
             cppcommon.clang_push_select,
+            [rules.OrderJoins()],
             rules.push_project,
             rules.push_apply,
             groupby_rules,
@@ -0,0 +1,90 @@
+"""
+Bloom filters for semi-join reduction.
+
+A join whose smaller input matches only a small part of its larger input
+can filter the larger input by a Bloom filter of the join keys of the
+smaller one (BloomFilterBuild), before the larger input is shuffled or
+joined (BloomFilterProbe). The filter is passed between the two operators
+as (word, bits) tuples: the index and the value of each nonzero 64-bit
+word of its bit array. Filters built in parallel are combined by OR-ing
+their words.
+"""
+
+import math
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+WORD_BITS = 64
+
+_MASK = (1 << 64) - 1
+
+
+def filter_size(num_keys, false_positive_rate=DEFAULT_FALSE_POSITIVE_RATE):
+    """The number of bits (a multiple of WORD_BITS) and of hash functions of
+    the smallest filter of num_keys keys with at most false_positive_rate
+    false positives
+
+    @return (num_bits, num_hashes)
+    """
+    num_keys = max(num_keys, 1)
+    bits = -num_keys * math.log(false_positive_rate) / math.log(2) ** 2
+    words = max(int(math.ceil(bits / WORD_BITS)), 1)
+    num_bits = words * WORD_BITS
+    num_hashes = max(int(round(float(num_bits) / num_keys * math.log(2))), 1)
+    return num_bits, num_hashes
+
+
+def false_positive_rate(num_keys, num_bits, num_hashes):
+    """Expected fraction of keys not in a filter that it may contain"""
+    return (1 - math.exp(-float(num_hashes) * num_keys / num_bits)) \
+        ** num_hashes
+
+
+def _mix(h):
+    """The finalizer of splitmix64, which spreads the bits of h"""
+    h = ((h ^ (h >> 30)) * 0xbf58476d1ce4e5b9) & _MASK
+    h = ((h ^ (h >> 27)) * 0x94d049bb133111eb) & _MASK
+    return h ^ (h >> 31)
+
+
+def bit_positions(key, num_bits, num_hashes):
+    """The bits set for key, by double hashing"""
+    h1 = _mix(hash(key) & _MASK)
+    h2 = _mix(h1) | 1
+    return [(h1 + i * h2) % num_bits for i in range(num_hashes)]
+
+
+def _signed(word):
+    """A 64-bit word as a LONG value"""
+    return word - (1 << 64) if word >= 1 << 63 else word
+
+
+class BloomFilter(object):
+
+    """A set of keys that may report false positives"""
+
+    def __init__(self, num_bits, num_hashes):
+        assert num_bits % WORD_BITS == 0
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = 0
+
+    def add(self, key):
+        for pos in bit_positions(key, self.num_bits, self.num_hashes):
+            self.bits |= 1 << pos
+
+    def __contains__(self, key):
+        return all(self.bits >> pos & 1
+                   for pos in bit_positions(key, self.num_bits,
+                                            self.num_hashes))
+
+    def words(self):
+        """(word, bits) pairs of the nonzero words of the filter"""
+        for word in range(self.num_bits // WORD_BITS):
+            bits = self.bits >> (word * WORD_BITS) & _MASK
+            if bits:
+                yield word, _signed(bits)
+
+    def add_words(self, words):
+        """OR the (word, bits) pairs of another filter into this one"""
+        for word, bits in words:
+            self.bits |= (bits & _MASK) << (word * WORD_BITS)
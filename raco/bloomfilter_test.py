@@ -0,0 +1,104 @@
+import collections
+import copy
+import unittest
+
+from raco import bloomfilter
+from raco.algebra import (BloomFilterBuild, BloomFilterProbe, Join, Scan,
+                          Select)
+from raco.expression import EQ, LT, NumericLiteral, UnnamedAttributeRef
+from raco.fakedb import FakeDatabase
+from raco.relation_key import RelationKey
+from raco.rules import BloomFilterSemiJoin
+from raco.scheme import Scheme
+import raco.types as types
+
+
+class BloomFilterTest(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        bloom = bloomfilter.BloomFilter(*bloomfilter.filter_size(100))
+        for i in range(100):
+            bloom.add((i,))
+        self.assertTrue(all((i,) in bloom for i in range(100)))
+
+    def test_false_positive_rate(self):
+        num_bits, num_hashes = bloomfilter.filter_size(1000, 0.01)
+        self.assertLess(bloomfilter.false_positive_rate(
+            1000, num_bits, num_hashes), 0.011)
+
+        bloom = bloomfilter.BloomFilter(num_bits, num_hashes)
+        for i in range(1000):
+            bloom.add((i,))
+        positives = sum(1 for i in range(1000, 11000) if (i,) in bloom)
+        self.assertLess(positives, 300)
+
+    def test_combine_words(self):
+        size = bloomfilter.filter_size(50)
+        parts = [bloomfilter.BloomFilter(*size) for _ in range(2)]
+        for i in range(100):
+            parts[i % 2].add((i, 'x'))
+        words = list(parts[0].words()) + list(parts[1].words())
+        self.assertTrue(all(-2 ** 63 <= bits < 2 ** 63 for _, bits in words))
+
+        combined = bloomfilter.BloomFilter(*size)
+        combined.add_words(words)
+        self.assertTrue(all((i, 'x') in combined for i in range(100)))
+
+
+class BloomFilterSemiJoinTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDatabase()
+        sch = Scheme([('a', types.LONG_TYPE), ('b', types.LONG_TYPE)])
+        self.big = self.relation('big', sch, [(i, i % 7) for i in range(200)])
+        self.small = self.relation('small', sch,
+                                   [(i, i) for i in range(0, 400, 20)])
+
+    def relation(self, name, sch, tuples):
+        key = RelationKey('public', 'adhoc', name)
+        self.db.ingest(key, collections.Counter(tuples), sch)
+        return Scan(key, sch, len(tuples),
+                    statistics=self.db.column_statistics(key))
+
+    @staticmethod
+    def join(left, right):
+        return Join(EQ(UnnamedAttributeRef(0), UnnamedAttributeRef(2)),
+                    left, right)
+
+    def test_filter_larger_input(self):
+        op = self.join(self.big, self.small)
+        expected = self.db.evaluate_to_bag(op)
+
+        op = BloomFilterSemiJoin()(op)
+        self.assertIsInstance(op.left, BloomFilterProbe)
+        self.assertEqual(op.right, self.small)
+        probe = op.left
+        self.assertIsInstance(probe.right, BloomFilterBuild)
+        self.assertEqual(probe.right.input, self.small)
+        self.assertLess(probe.num_tuples(), self.big.num_tuples())
+        self.assertEqual(self.db.evaluate_to_bag(op), expected)
+        self.assertLessEqual(len(list(self.db.evaluate(probe))), 20)
+
+        # filtered once
+        self.assertIs(BloomFilterSemiJoin()(op), op)
+
+    def test_filter_right_input(self):
+        op = self.join(self.small, self.big)
+        expected = self.db.evaluate_to_bag(op)
+        op = BloomFilterSemiJoin()(op)
+        self.assertIsInstance(op.right, BloomFilterProbe)
+        self.assertEqual(self.db.evaluate_to_bag(op), expected)
+
+    def test_unselective_join(self):
+        # every tuple of big matches
+        small = Select(LT(UnnamedAttributeRef(0), NumericLiteral(200)),
+                       self.big)
+        op = self.join(self.big, copy.deepcopy(self.big))
+        self.assertIs(BloomFilterSemiJoin()(op).left, self.big)
+        op = self.join(self.big, small)
+        self.assertIs(BloomFilterSemiJoin()(op).left, self.big)
+
+    def test_key_types(self):
+        op = self.join(self.big, self.small)
+        rule = BloomFilterSemiJoin(key_types=(types.STRING_TYPE,))
+        self.assertIs(rule(op).left, self.big)
@@ -7,6 +7,7 @@ from raco.algebra import DEFAULT_CARDINALITY
 from raco.representation import RepresentationProperties
 from raco.relation_key import RelationKey
 from raco.scheme import Scheme
+from raco.statistics import ColumnStatistics
 
 
 class Relation(object):
@@ -57,13 +58,34 @@ class Catalog(object):
         # default is to return no information
         return RepresentationProperties()
 
+    def dictionary_encoded_columns(self, rel_key):
+        """
+        Return dict of column index -> dictionary file for the string
+        columns of rel_key that are stored as integer codes. A dictionary
+        file has one string per line; the code of a string is its line
+        number. Columns may share a dictionary, in which case their codes
+        are comparable.
+        """
+        # default is no encoded columns
+        return {}
+
+    def column_statistics(self, rel_key):
+        """
+        Return a list of raco.statistics.ColumnStatistics, one per column
+        of rel_key with None for columns without statistics, or None if
+        there are no statistics for rel_key.
+        """
+        # default is no statistics
+        return None
+
 
 # Some useful Catalog implementations
 class FakeCatalog(Catalog):
     """ fake catalog, should only be used in test """
 
     def __init__(self, num_servers, child_sizes=None,
-                 child_partitionings=None, child_functions=None):
+                 child_partitionings=None, child_functions=None,
+                 child_statistics=None):
         self.num_servers = num_servers
         # default sizes
         self.sizes = {}
@@ -71,6 +93,8 @@ class FakeCatalog(Catalog):
         self.partitionings = {}
         # overwrite default sizes if necessary
         self.functions = {}
+        # column statistics
+        self.statistics = {}
 
         if child_sizes:
             for child, size in child_sizes.items():
@@ -81,6 +105,9 @@ class FakeCatalog(Catalog):
         if child_functions:
             for child, typ in child_functions.items():
                 self.functions[child] = funcObj
+        if child_statistics:
+            for child, stats in child_statistics.items():
+                self.statistics[RelationKey(child)] = stats
 
     def get_num_servers(self):
         return self.num_servers
@@ -99,6 +126,9 @@ class FakeCatalog(Catalog):
     def get_scheme(self, rel_key):
         raise NotImplementedError()
 
+    def column_statistics(self, rel_key):
+        return self.statistics.get(rel_key)
+
     def get_function(self, funcName):
         """Return UDF with name = funcName"""
         if funcName in self.functions:
@@ -117,6 +147,17 @@ class FromFileCatalog(Catalog):
     {'relation1' : ([('a', 'LONG_TYPE'), ('b', 'STRING_TYPE')], 10),
      'relation2' : [('y', 'STRING_TYPE'), ('z', 'DATETIME_TYPE')]}
 
+     The cardinality can be followed by the dictionary files of
+     dictionary encoded string columns, which hold integer codes
+     (see Catalog.dictionary_encoded_columns)
+    {'relation1' : ([('a', 'LONG_TYPE'), ('b', 'STRING_TYPE')], 10,
+                    {'b': 'relation1.b.dict'})}
+
+     and then by statistics of any of the columns, with the keys of
+     raco.statistics.ColumnStatistics.to_dict
+    {'relation1' : ([('a', 'LONG_TYPE'), ('b', 'STRING_TYPE')], 10, {},
+                    {'a': {'distinct': 5, 'min': 1, 'max': 9}})}
+
      Or it can be a single relation, using filename as basename
      [('a', 'LONG_TYPE'), ('b', 'STRING_TYPE')]
 
@@ -215,3 +256,20 @@ class FromFileCatalog(Catalog):
     def partitioning(self, rel_key):
         # TODO allow specifying an optional list of attributes
         return RepresentationProperties()
+
+    def dictionary_encoded_columns(self, rel_key):
+        entry = self.__get_catalog_entry__(rel_key)
+        if len(entry) < 3:
+            return {}
+        names = self.get_scheme(rel_key).get_names()
+        return dict((names.index(name), dictionary)
+                    for name, dictionary in entry[2].items())
+
+    def column_statistics(self, rel_key):
+        entry = self.__get_catalog_entry__(rel_key)
+        if len(entry) < 4:
+            return None
+        stats = entry[3]
+        return [ColumnStatistics.from_dict(stats[name])
+                if name in stats else None
+                for name in self.get_scheme(rel_key).get_names()]
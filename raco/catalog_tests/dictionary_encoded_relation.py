@@ -0,0 +1,4 @@
+{'A': [('b', 'STRING_TYPE')],
+ 'E': ([('a', 'LONG_TYPE'), ('b', 'STRING_TYPE'), ('c', 'STRING_TYPE')], 12,
+       {'b': 'E.dict', 'c': 'E.dict'})
+ }
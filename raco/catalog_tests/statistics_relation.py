@@ -0,0 +1,6 @@
+{'A': [('b', 'STRING_TYPE')],
+ 'S': ([('a', 'LONG_TYPE'), ('b', 'STRING_TYPE')], 100, {},
+       {'a': {'distinct': 10, 'min': 0, 'max': 9,
+              'histogram': [0, 2, 5, 9],
+              'most_common': [(1, 0.5)]}})
+ }
@@ -2,6 +2,7 @@ import unittest
 
 from raco.catalog import FromFileCatalog
 from raco.catalog import DEFAULT_CARDINALITY
+from raco.statistics import ColumnStatistics
 import os
 
 test_file_path = "raco/catalog_tests"
@@ -30,6 +31,27 @@ class TestFromFileCatalog(unittest.TestCase):
         self.assertEqual(cut.num_tuples('B'), DEFAULT_CARDINALITY)
         self.assertEqual(cut.num_tuples('C'), 12)
 
+    def test_dictionary_encoded_relation(self):
+        cut = FromFileCatalog.load_from_file(
+            "{p}/dictionary_encoded_relation.py".format(p=test_file_path))
+
+        self.assertEqual(cut.num_tuples('E'), 12)
+        self.assertEqual(cut.dictionary_encoded_columns('E'),
+                         {1: 'E.dict', 2: 'E.dict'})
+        self.assertEqual(cut.dictionary_encoded_columns('A'), {})
+
+    def test_statistics_relation(self):
+        cut = FromFileCatalog.load_from_file(
+            "{p}/statistics_relation.py".format(p=test_file_path))
+
+        self.assertEqual(cut.num_tuples('S'), 100)
+        self.assertEqual(cut.dictionary_encoded_columns('S'), {})
+        a, b = cut.column_statistics('S')
+        self.assertEqual(a, ColumnStatistics(10, 0, 9, 0.0, [0, 2, 5, 9],
+                                             [(1, 0.5)]))
+        self.assertIsNone(b)
+        self.assertIsNone(cut.column_statistics('A'))
+
     def test_missing_relation(self):
         cut = FromFileCatalog.load_from_file(
             "{p}/set_cardinality_relation.py".format(p=test_file_path))
@@ -0,0 +1 @@
+{"public:adhoc:test": [["grpID", "LONG_TYPE"]]}
@@ -36,8 +36,9 @@ def emitCode(query, name, algType, plan=None, emit_print=None, dir='.'):
     # Create a compiler object
     dlog = RACompiler()
 
-    # parse the query
-    dlog.fromDatalog(query)
+    # parse the query; compile() below takes a single statement, so the
+    # plans of shared idbs are copied rather than stored in temporaries
+    dlog.fromDatalog(query, materialize_idbs=False)
     # print dlog.parsed
     LOG.info("logical: %s", dlog.logicalplan)
 
@@ -5,9 +5,14 @@ classes for representing and manipulating Datalog programs.
 In particular, they can be compiled to (iterative) relational algebra
 expressions.
 """
+import collections
+import copy
+import itertools
+
 import networkx as nx
-from raco import expression
+from raco import expression, joinorder, statistics
 import raco.algebra as algebra
+from raco.algebra import DEFAULT_CARDINALITY
 from raco.expression.visitor import SimpleExpressionVisitor
 from raco.scheme import Scheme
 import raco.catalog
@@ -32,6 +37,14 @@ class Program(object):
     def __init__(self, rules):
         self.rules = rules
         self.compiledidbs = {}
+        # number of references to each compiled idb
+        self.references = collections.Counter()
+        # compiled idbs, each after the idbs it refers to
+        self.compileorder = []
+        # how rules choose their join orders
+        self.planner = BFSLeftDeepPlanner
+        self.catalog = None
+        self.costfunc = None
 
     def isIDB(self, term):
         """Is this term also an IDB?"""
@@ -64,32 +77,96 @@ class Program(object):
                 return True
         return False
 
-    def toRA(self):
+    def toRA(self, materialize_idbs=True, planner=None, catalog=None,
+             costfunc=None):
         """Return a set of relational algebra expressions implementing this
-        program."""
+        program.
+
+        :param materialize_idbs: If True, store the idbs that are referenced
+        more than once into temporary relations; otherwise copy their plans
+        to each reference, for backends without temporary relations.
+        :param planner: The Planner subclass that chooses the join order of
+        each rule, BFSLeftDeepPlanner by default
+        :param catalog: The catalog that the planner estimates the sizes of
+        relations from
+        :param costfunc: The cost function passed to the planner"""
+        self.planner = planner or BFSLeftDeepPlanner
+        self.catalog = catalog
+        self.costfunc = costfunc
         self.idbs = {}
+        self.compiledidbs = {}
+        self.references = collections.Counter()
+        self.compileorder = []
         for rule in self.rules:
             block = self.idbs.setdefault(rule.head.name, [])
             block.append(rule)
 
-        return algebra.Parallel([algebra.Store(RelationKey(idb),
-                                               self.compileIDB(idb))
-                                 for (idb, rules) in self.idbs.items()
-                                 if any([not self.intermediateRule(r)
-                                         for r in rules])])
+        stores = [algebra.Store(RelationKey(idb), self.compileIDB(idb))
+                  for (idb, rules) in self.idbs.items()
+                  if any([not self.intermediateRule(r) for r in rules])]
+        return self.shareIDBs(stores, materialize_idbs)
 
     def compileIDB(self, idb):
         """Compile an idb by name.  Uses the self.idbs data structure created
-        in self.toRA"""
+        in self.toRA
 
-        if idb in self.compiledidbs:
-            return self.compiledidbs[idb]
-        else:
-            rules = self.idbs[idb]
+        An idb is compiled once, and each reference to it returns the same
+        plan, except for recursive idbs, which are compiled at each
+        reference."""
+
+        rules = self.idbs[idb]
+        if any(r.compiling for r in rules):
+            # a recursive reference, which compiles to State operators
+            return algebra.UnionAll([r.toRA(self) for r in rules])
+
+        if idb not in self.compiledidbs:
             plans = [r.toRA(self) for r in rules]
             ra = algebra.UnionAll(plans)
-            self.compiledidbs[self] = ra
-            return ra
+            if any(isinstance(op, (algebra.Fixpoint, algebra.State))
+                   for op in ra.walk()):
+                return ra
+            self.compiledidbs[idb] = ra
+            self.compileorder.append(idb)
+
+        self.references[idb] += 1
+        return self.compiledidbs[idb]
+
+    def shareIDBs(self, stores, materialize=True):
+        """Materialize each idb that stores refer to more than once in a
+        StoreTemp, and scan it at each reference. If not materialize, copy
+        its plan to each reference after the first instead.
+
+        :returns: The Parallel of the stores, preceded by a Sequence of the
+        StoreTemps if there are any."""
+
+        shared = dict((id(self.compiledidbs[idb]), idb)
+                      for idb in self.compileorder
+                      if self.references[idb] > 1)
+        visited = set()
+
+        def share(op):
+            if id(op) in shared:
+                if materialize:
+                    return algebra.ScanTemp(shared[id(op)], op.scheme())
+                if id(op) in visited:
+                    return copy.deepcopy(op)
+            if id(op) not in visited:
+                visited.add(id(op))
+                op.apply(share)
+            return op
+
+        temps = []
+        if materialize:
+            for idb in self.compileorder:
+                if self.references[idb] > 1:
+                    plan = self.compiledidbs[idb]
+                    plan.apply(share)
+                    temps.append(algebra.StoreTemp(idb, plan))
+
+        plan = algebra.Parallel([share(store) for store in stores])
+        if not temps:
+            return plan
+        return algebra.Sequence(temps + [plan])
 
     def __repr__(self):
         return "\n".join([str(r) for r in self.rules])
@@ -168,8 +245,18 @@ class Planner(object):
     with respect to some cost function.  Subclasses can implement this however
     they want."""
 
-    def __init__(self, joingraph):
+    def __init__(self, joingraph, conditions=None, program=None,
+                 catalog=None):
+        """
+        :param conditions: the explicit conditions of the rule, like X=3
+        :param program: the Program that the rule belongs to
+        :param catalog: a raco.catalog.Catalog of the relations that the
+        terms scan, or None
+        """
         self.joingraph = joingraph
+        self.conditions = conditions or []
+        self.program = program
+        self.catalog = catalog
 
     def joininfo(self, joinedge):
         """Given a join edge, return a pair of terms and the metadata for the
@@ -254,6 +341,154 @@ class BFSLeftDeepPlanner(Planner):
         return joinsequence
 
 
+def build_cost(left_cardinality, right_cardinality, result_cardinality):
+    """The cost of a join: the size of its result plus the size of the hash
+    table built on its right input"""
+    return result_cardinality + right_cardinality
+
+
+class CostBasedLeftDeepPlanner(Planner):
+    """Choose the left-deep join order of least estimated cost, by dynamic
+    programming over the connected sets of terms (greedily for more than
+    raco.joinorder.DP_LIMIT terms).
+
+    Each term is estimated to have the cardinality of its relation in the
+    catalog, reduced by the selectivity of its implicit and explicit
+    selection conditions, and each join edge the selectivity of its
+    conditions. The cost of a plan is the sum of the costs of its joins."""
+
+    def __init__(self, joingraph, conditions=None, program=None,
+                 catalog=None):
+        Planner.__init__(self, joingraph, conditions, program, catalog)
+        self.terms = sorted(joingraph.nodes(), key=lambda t: t.originalorder)
+        self.index = dict((t, i) for i, t in enumerate(self.terms))
+        self.neighbors = [sum(1 << self.index[n]
+                              for n in joingraph.neighbors(t))
+                          for t in self.terms]
+        self.statistics = [self.column_statistics(t) for t in self.terms]
+        self.cardinalities = [self.term_cardinality(i)
+                              for i in range(len(self.terms))]
+        self.edges = [(1 << self.index[t1] | 1 << self.index[t2],
+                       self.edge_selectivity(data["condition"]))
+                      for t1, t2, data in joingraph.edges(data=True)]
+        self._cardinality = {}
+
+    def relation_key(self, term):
+        if self.catalog is None or \
+                (self.program is not None and self.program.isIDB(term)):
+            return None
+        return RelationKey.from_string(term.name)
+
+    def column_statistics(self, term):
+        key = self.relation_key(term)
+        if key is None:
+            return None
+        return self.catalog.column_statistics(key)
+
+    def term_cardinality(self, i):
+        """Estimated number of tuples of a term that satisfy its selection
+        conditions"""
+        term = self.terms[i]
+        key = self.relation_key(term)
+        card = DEFAULT_CARDINALITY if key is None \
+            else self.catalog.num_tuples(key)
+        for condition in itertools.chain(
+                term.implicitconditions(),
+                term.explicitconditions(self.conditions)):
+            sel = statistics.estimate_selectivity(condition,
+                                                  self.statistics[i])
+            card *= joinorder.DEFAULT_SELECTIVITY if sel is None else sel
+        return max(card, 1.0)
+
+    def distinct_values(self, attr):
+        """Estimated number of distinct values of a column of a term"""
+        i = self.index[attr.myTerm]
+        stats = self.statistics[i]
+        if stats is not None and attr.position < len(stats) and \
+                stats[attr.position] is not None:
+            return stats[attr.position].distinct
+        return self.cardinalities[i]
+
+    def edge_selectivity(self, condition):
+        sel = 1.0
+        for conjunct in expression.extract_conjuncs(condition):
+            refs = [conjunct.left, conjunct.right] \
+                if isinstance(conjunct, expression.EQ) else []
+            if all(isinstance(r, expression.UnnamedAttributeRef) and
+                   getattr(r, 'myTerm', None) in self.index for r in refs):
+                sel /= max([self.distinct_values(r) for r in refs] + [1])
+            else:
+                sel *= joinorder.DEFAULT_SELECTIVITY
+        return sel
+
+    def cardinality(self, mask):
+        """Estimated number of tuples in the join of a set of terms"""
+        if mask not in self._cardinality:
+            card = 1.0
+            for i in joinorder.bits(mask):
+                card *= self.cardinalities[i]
+            for edge, sel in self.edges:
+                if edge & mask == edge:
+                    card *= sel
+            self._cardinality[mask] = max(card, 1.0)
+        return self._cardinality[mask]
+
+    def order(self, costfunc):
+        """The terms in the join order of least cost, as indexes"""
+        n = len(self.terms)
+
+        def extend(mask, cost, i):
+            return cost + costfunc(self.cardinality(mask),
+                                   self.cardinalities[i],
+                                   self.cardinality(mask | 1 << i))
+
+        if n > joinorder.DP_LIMIT:
+            # start with the smallest term, add the cheapest neighbor
+            order = [min(range(n), key=lambda i: self.cardinalities[i])]
+            mask, cost = 1 << order[0], 0
+            while len(order) < n:
+                i = min((i for i in range(n) if not mask & 1 << i and
+                         self.neighbors[i] & mask),
+                        key=lambda i: extend(mask, cost, i))
+                cost = extend(mask, cost, i)
+                order.append(i)
+                mask |= 1 << i
+            return order
+
+        best = dict((1 << i, (0, [i])) for i in range(n))
+        for size in range(2, n + 1):
+            for subset in itertools.combinations(range(n), size):
+                mask = sum(1 << i for i in subset)
+                for i in subset:
+                    rest = mask ^ 1 << i
+                    if rest not in best or not self.neighbors[i] & rest:
+                        continue
+                    cost = extend(rest, best[rest][0], i)
+                    if mask not in best or cost < best[mask][0]:
+                        best[mask] = (cost, best[rest][1] + [i])
+        return best[(1 << n) - 1][1]
+
+    def chooseplan(self, costfunc=None):
+        """Return a join sequence object of the join order of least cost.
+
+        :param costfunc: a function of the estimated cardinalities of the
+        left input, the right input and the result of a join that returns
+        its cost; build_cost by default"""
+        order = self.order(costfunc or build_cost)
+        LOG.debug("cost based: order: %s", [self.terms[i] for i in order])
+
+        # join each term to the one term before it that it is adjacent to
+        edgesequence = []
+        for k, i in enumerate(order[1:]):
+            [j] = [j for j in order[:k + 1]
+                   if self.neighbors[i] & 1 << j]
+            edgesequence.append((self.terms[j], self.terms[i]))
+
+        joinsequence = self.toJoinSequence(edgesequence)
+        LOG.debug("cost based: joinsequence: %s", joinsequence)
+        return joinsequence
+
+
 class Rule(object):
     def __init__(self, headbody):
         self.head = headbody[0]
@@ -364,9 +599,10 @@ class Rule(object):
                 LOG.debug("component: %s", component)
                 # TODO: clean this up.
                 # joingraph -> joinsequence -> relational plan
-                planner = BFSLeftDeepPlanner(component)
+                planner = program.planner(component, conditions, program,
+                                          program.catalog)
 
-                joinsequence = planner.chooseplan()
+                joinsequence = planner.chooseplan(program.costfunc)
                 LOG.debug("join sequence: %s", joinsequence)
 
                 # create a relational plan, finally
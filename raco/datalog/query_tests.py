@@ -2,8 +2,12 @@ import collections
 
 import raco.scheme as scheme
 import raco.datalog.datalog_test as datalog_test
-from raco import types
-from raco.backends.myria import MyriaHyperCubeAlgebra
+from raco import RACompiler, types
+from raco.algebra import Join, Scan, StoreTemp
+from raco.backends.myria import (MyriaHyperCubeAlgebra,
+                                 MyriaLeftDeepTreeAlgebra)
+from raco.catalog import FakeCatalog
+from raco.datalog.model import BFSLeftDeepPlanner, CostBasedLeftDeepPlanner
 
 
 class TestQueryFunctions(datalog_test.DatalogTestCase):
@@ -288,3 +292,68 @@ class TestQueryFunctions(datalog_test.DatalogTestCase):
         expected = collections.Counter([(z + 1,)
                                         for (z, _) in self.edge_table])
         self.check_result(query, expected)
+
+    def test_shared_intermediate_idbs(self):
+        query = """
+        Hop1(x, y) :- Edge(x, y), x < 12
+        Hop2(x, z) :- Hop1(x, y), Hop1(y, z)
+        Hop4(x, w) :- Hop2(x, y), Hop2(y, w)
+        OUTPUT(x, w) :- Hop4(x, w)
+        """
+        hop1 = [(x, y) for (x, y) in self.edge_table.elements() if x < 12]
+        hop2 = [(x, z) for (x, y) in hop1 for (y2, z) in hop1 if y == y2]
+        expected = collections.Counter(
+            [(x, w) for (x, y) in hop2 for (y2, w) in hop2 if y == y2])
+        self.check_result(query, expected)
+
+        # each idb is compiled and computed once
+        dlog = RACompiler()
+        dlog.fromDatalog(query)
+        plan = dlog.logicalplan
+        self.assertEquals([op.name for op in plan.walk()
+                           if isinstance(op, StoreTemp)], ['Hop1', 'Hop2'])
+        self.assertEquals(len([op for op in plan.walk()
+                               if isinstance(op, Scan)]), 1)
+
+        dlog.fromDatalog(query, materialize_idbs=False)
+        self.assertEquals(len([op for op in dlog.logicalplan.walk()
+                               if isinstance(op, Scan)]), 4)
+
+    def test_cost_based_join_order(self):
+        query = """
+        OUTPUT(name, dname, z) :- Edge(id, z), employee(id, d, name, s),
+                                  department(d, dname, m), s > 10000
+        """
+        expected = collections.Counter(
+            [(name, dname, z)
+             for (src, z) in self.edge_table.elements()
+             for (id, d, name, s) in self.emp_table.elements()
+             for (d2, dname, m) in self.dept_table.elements()
+             if src == id and d == d2 and s > 10000])
+
+        catalog = FakeCatalog(1, {'Edge': 1000000,
+                                  'employee': 100,
+                                  'department': 10})
+        dlog = RACompiler()
+        dlog.fromDatalog(query, planner=CostBasedLeftDeepPlanner,
+                         catalog=catalog)
+
+        # the largest relation is probed, never built into a hash table
+        [join] = [op for op in dlog.logicalplan.walk()
+                  if isinstance(op, Join) and isinstance(op.left, Scan)]
+        self.assertEquals(str(join.left.relation_key), 'public:adhoc:Edge')
+
+        dlog.optimize(MyriaLeftDeepTreeAlgebra())
+        self.db.evaluate(dlog.physicalplan)
+        self.assertEquals(self.db.get_table('OUTPUT'), expected)
+
+        # counting only intermediate results, Edge is joined last
+        dlog.fromDatalog(query, planner=CostBasedLeftDeepPlanner,
+                         catalog=catalog, costfunc=lambda l, r, out: out)
+        [join] = [op for op in dlog.logicalplan.walk()
+                  if isinstance(op, Join) and isinstance(op.left, Join)]
+        self.assertEquals(str(join.right.relation_key), 'public:adhoc:Edge')
+
+        # the planner is chosen per compilation
+        dlog.parsed.toRA()
+        self.assertIs(dlog.parsed.planner, BFSLeftDeepPlanner)
@@ -51,6 +51,7 @@ class NOT(UnaryBooleanOperator):
 
 class AND(BinaryBooleanOperator):
     literals = ["and", "AND"]
+    conditional = True
 
     def evaluate(self, _tuple, scheme, state=None):
         return (self.left.evaluate(_tuple, scheme, state) and
@@ -59,6 +60,7 @@ class AND(BinaryBooleanOperator):
 
 class OR(BinaryBooleanOperator):
     literals = ["or", "OR"]
+    conditional = True
 
     def evaluate(self, _tuple, scheme, state=None):
         return (self.left.evaluate(_tuple, scheme, state) or
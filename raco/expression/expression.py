@@ -4,6 +4,7 @@ An expression language for Raco: functions, booleans, aggregates, etc.
 Most non-trivial operators and functions are in separate files in this package.
 """
 from abc import ABCMeta, abstractmethod
+import copy
 import logging
 
 from raco.utility import Printable
@@ -55,6 +56,43 @@ class Expression(Printable):
         This is used for unit tests written against the fake database.
         """
 
+    # whether some children are evaluated only for some tuples
+    conditional = False
+
+    def evaluate_batch(self, tuples, scheme, state=None):
+        """Evaluate an expression on each tuple of a list of tuples.
+
+        Subexpressions that evaluate batches, such as vectorized Python
+        UDFs, are evaluated once for the whole batch; their results are
+        appended to the tuples for the evaluation of the rest of the tree.
+        Subexpressions of conditional expressions (CASE, AND, OR) are
+        evaluated tuple at a time, as they may not apply to every tuple.
+        """
+        if not tuples or not any(batched_subexpressions(self)):
+            return [self.evaluate(t, scheme, state) for t in tuples]
+
+        width = len(tuples[0])
+        columns = []
+
+        def extract(ex):
+            if evaluates_batches(ex):
+                columns.append(ex.evaluate_batch(tuples, scheme, state))
+                return UnnamedAttributeRef(width + len(columns) - 1)
+            if not ex.conditional:
+                ex.apply(extract)
+            return ex
+
+        expr = copy.deepcopy(self)
+        expr.apply(extract)
+        return [expr.evaluate(t + tuple(col[i] for col in columns),
+                              scheme, state)
+                for i, t in enumerate(tuples)]
+
+    def batches(self):
+        """Whether evaluate_batch evaluates this expression on a whole batch
+        at once rather than tuple at a time"""
+        return False
+
     @abstractmethod
     def get_children(self):
         """Return a list of child expressions."""
@@ -104,6 +142,24 @@ class Expression(Printable):
         visitor.visit(self)
 
 
+def evaluates_batches(expr):
+    """Whether an expression is evaluated on a whole batch at once"""
+    return expr.batches()
+
+
+def batched_subexpressions(expr):
+    """The subexpressions of an expression that evaluate batches and are
+    evaluated for every tuple, i.e., not under a conditional expression"""
+    if expr.conditional:
+        return
+    for child in expr.get_children():
+        if evaluates_batches(child):
+            yield child
+        else:
+            for ex in batched_subexpressions(child):
+                yield ex
+
+
 class ZeroaryOperator(Expression):
 
     def __init__(self):
@@ -659,6 +715,7 @@ class Unbox(DottedRef):
 
 
 class Case(Expression):
+    conditional = True
 
     def __init__(self, when_tuples, else_expr):
         """Initialize a Case expression.
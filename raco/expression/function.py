@@ -2,9 +2,13 @@
 Functions (unary and binary) for use in Raco.
 """
 
+import atexit
+import itertools
 import math
 import md5
+import multiprocessing
 import random
+import re
 
 from raco.expression.udf import Function
 
@@ -350,7 +354,47 @@ class LEN(UnaryFunction):
         return types.LONG_TYPE
 
 
+# compiled Python UDFs, by source code
+_compiled_udfs = {}
+
+# process pools for scalar Python UDFs, by number of processes
+_udf_pools = {}
+
+
+def compile_udf(source):
+    """Return the function object of the source code of a Python UDF,
+    evaluating each distinct source only once"""
+    if isinstance(source, unicode):
+        source = source.encode('utf-8')
+    key = md5.new(source).hexdigest()
+    if key not in _compiled_udfs:
+        _compiled_udfs[key] = eval(source)
+    return _compiled_udfs[key]
+
+
+@atexit.register
+def close_udf_pools():
+    """Close the process pools of Python UDFs and wait for their processes"""
+    while _udf_pools:
+        _, pool = _udf_pools.popitem()
+        pool.close()
+        pool.join()
+
+
+def _call_udf(source_rows):
+    """Call a Python UDF on rows of arguments in a pool process"""
+    source, rows = source_rows
+    func = compile_udf(source)
+    return [func(*row) for row in rows]
+
+
 class PYUDF(NaryFunction):
+    """A Python user-defined function.
+
+    A vectorized UDF is called once per batch of tuples with a list of
+    values for each argument, and returns a list (or NumPy array) of
+    results. A scalar UDF is called once per tuple; with processes set,
+    batches of calls are spread over a pool of that many processes."""
 
     literals = []
 
@@ -358,7 +402,9 @@ class PYUDF(NaryFunction):
         super(PYUDF, self).__init__(tuple(args))
         self.name = name
         self.source = kwargs.get('source', None)
-        self.func = eval(self.source) if self.source else None
+        self.func = compile_udf(self.source) if self.source else None
+        self.vectorized = kwargs.get('vectorized', False)
+        self.processes = kwargs.get('processes', None)
         self.typ = typ
 
     def __str__(self):
@@ -368,12 +414,14 @@ class PYUDF(NaryFunction):
                                    self.typ)
 
     def __repr__(self):
-        return "{op}({n!r},{t!r},*{a!r}, source={s!r})".format(
-            op=self.opname(),
-            n=self.name,
-            a=self.arguments,
-            t=self.typ,
-            s=self.source)
+        return ("{op}({n!r},{t!r},*{a!r}, source={s!r}, vectorized={v!r}, "
+                "processes={p!r})").format(op=self.opname(),
+                                           n=self.name,
+                                           a=self.arguments,
+                                           t=self.typ,
+                                           s=self.source,
+                                           v=self.vectorized,
+                                           p=self.processes)
 
     @property
     def arguments(self):
@@ -394,20 +442,71 @@ class PYUDF(NaryFunction):
         self.typ = typ
 
     def evaluate(self, _tuple, scheme, state=None):
-        if self.func:
-            return self.func(*map(lambda a: a.evaluate(_tuple, scheme, state),
-                                  self.arguments))
-        else:
+        if not self.func:
             raise NotImplementedError()
+        args = [a.evaluate(_tuple, scheme, state) for a in self.arguments]
+        if self.vectorized:
+            return self.func(*[[arg] for arg in args])[0]
+        return self.func(*args)
 
+    def batches(self):
+        return self.vectorized or (self.processes or 1) > 1
 
-class SPLIT(BinaryFunction):
-    literals = ["SPLIT"]
+    def evaluate_batch(self, tuples, scheme, state=None):
+        if not self.func:
+            raise NotImplementedError()
+        if not self.batches():
+            return super(PYUDF, self).evaluate_batch(tuples, scheme, state)
+        columns = [a.evaluate_batch(tuples, scheme, state)
+                   for a in self.arguments]
+        if self.vectorized:
+            results = self.func(*columns)
+            if hasattr(results, 'tolist'):
+                return results.tolist()
+            return list(results)
+
+        rows = zip(*columns) if columns else [()] * len(tuples)
+        if self.processes and self.processes > 1 and len(rows) > 1:
+            if self.processes not in _udf_pools:
+                _udf_pools[self.processes] = \
+                    multiprocessing.Pool(self.processes)
+            size = -(-len(rows) // self.processes)
+            chunks = [(self.source, rows[i:i + size])
+                      for i in range(0, len(rows), size)]
+            return list(itertools.chain.from_iterable(
+                _udf_pools[self.processes].map(_call_udf, chunks)))
+        return [self.func(*row) for row in rows]
+
+
+class FlatmapFunction(object):
+    """Mixin of a function that returns zero or more values for each tuple.
+
+    Flatmap functions are evaluated by the FlatMap operator, and must be the
+    outermost expression of its emit expressions."""
 
-    # TODO: implement once fakedb can handle flatmap functions
     def evaluate(self, _tuple, scheme, state=None):
+        raise NotImplementedError(
+            "%s returns many values; evaluate it in a FlatMap" %
+            self.__class__.__name__)
+
+    def evaluate_values(self, _tuple, scheme, state=None):
+        """Return an iterator over the values of the function"""
         raise NotImplementedError()
 
+
+class SPLIT(FlatmapFunction, BinaryFunction):
+    """The substrings of a string around matches of a regular expression,
+    without trailing empty strings (like Java's String.split)"""
+    literals = ["SPLIT"]
+
+    def evaluate_values(self, _tuple, scheme, state=None):
+        s = self.left.evaluate(_tuple, scheme, state)
+        pattern = self.right.evaluate(_tuple, scheme, state)
+        tokens = re.split(pattern, s)
+        while len(tokens) > 1 and not tokens[-1]:
+            tokens.pop()
+        return iter(tokens)
+
     def typeof(self, scheme, state_scheme):
         lt = self.left.typeof(scheme, state_scheme)
         check_type(lt, types.STRING_TYPE)
@@ -416,12 +515,12 @@ class SPLIT(BinaryFunction):
         return types.STRING_TYPE
 
 
-class SEQUENCE(UnaryFunction):
+class SEQUENCE(FlatmapFunction, UnaryFunction):
+    """The integers from 0 to n - 1"""
     literals = ["SEQUENCE"]
 
-    # TODO: implement once fakedb can handle flatmap functions
-    def evaluate(self, _tuple, scheme, state=None):
-        raise NotImplementedError()
+    def evaluate_values(self, _tuple, scheme, state=None):
+        return iter(xrange(self.input.evaluate(_tuple, scheme, state)))
 
     def typeof(self, scheme, state_scheme):
         input_type = self.input.typeof(scheme, state_scheme)
@@ -431,12 +530,14 @@ class SEQUENCE(UnaryFunction):
         return types.LONG_TYPE
 
 
-class NGRAM(BinaryFunction):
+class NGRAM(FlatmapFunction, BinaryFunction):
+    """The substrings of length n of a string"""
     literals = ["NGRAM"]
 
-    # TODO: implement once fakedb can handle flatmap functions
-    def evaluate(self, _tuple, scheme, state=None):
-        raise NotImplementedError()
+    def evaluate_values(self, _tuple, scheme, state=None):
+        s = self.left.evaluate(_tuple, scheme, state)
+        n = self.right.evaluate(_tuple, scheme, state)
+        return (s[i:i + n] for i in xrange(len(s) - n + 1))
 
     def typeof(self, scheme, state_scheme):
         lt = self.left.typeof(scheme, state_scheme)
@@ -446,12 +547,13 @@ class NGRAM(BinaryFunction):
         return types.STRING_TYPE
 
 
-class BITSET(UnaryFunction):
+class BITSET(FlatmapFunction, UnaryFunction):
+    """The bits of a blob, least significant bit of each byte first"""
     literals = ["BITSET"]
 
-    # TODO: implement once fakedb can handle flatmap functions
-    def evaluate(self, _tuple, scheme, state=None):
-        raise NotImplementedError()
+    def evaluate_values(self, _tuple, scheme, state=None):
+        blob = bytearray(self.input.evaluate(_tuple, scheme, state))
+        return (bool(byte >> i & 1) for byte in blob for i in xrange(8))
 
     def typeof(self, scheme, state_scheme):
         input_type = self.input.typeof(scheme, state_scheme)
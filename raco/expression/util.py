@@ -6,6 +6,7 @@ from .expression import (Expression, BinaryOperator, AttributeRef,
                          NamedAttributeRef, UnnamedAttributeRef,
                          NamedStateAttributeRef)
 from .aggregate import BuiltinAggregateExpression, AggregateExpression
+from .function import FlatmapFunction
 
 import copy
 import inspect
@@ -209,6 +210,11 @@ def expression_contains_aggregate(ex):
     return any(isinstance(sx, AggregateExpression) for sx in ex.walk())
 
 
+def expression_contains_flatmap(ex):
+    """Return True if the expression contains a flatmap function."""
+    return any(isinstance(sx, FlatmapFunction) for sx in ex.walk())
+
+
 def check_no_aggregate(ex, lineno):
     """Raise an exception if the provided expression contains an aggregate."""
     if expression_contains_aggregate(ex):
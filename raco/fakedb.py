@@ -2,17 +2,84 @@
 import collections
 import itertools
 import csv
+import multiprocessing
+import os
 import random
 
 from raco.dbconn import DBConnection
-from raco import relation_key, types
-from raco.algebra import StoreTemp, DEFAULT_CARDINALITY
+from raco import bloomfilter, relation_key, statistics, types
+from raco.algebra import (AppendTemp, Distinct, Scan, ScanTemp, Sink, Store,
+                          StoreTemp, ZeroaryOperator, DEFAULT_CARDINALITY)
 from raco.catalog import Catalog
-from raco.expression import AND, EQ, BuiltinAggregateExpression
+from raco.expression import (AND, EQ, BuiltinAggregateExpression,
+                             FlatmapFunction)
 from raco.representation import RepresentationProperties
 
 debug = False
 
+# number of tuples per call of Expression.evaluate_batch
+BATCH_SIZE = 1024
+
+
+def batches(iterable, size=BATCH_SIZE):
+    """Split an iterator of tuples into lists of at most size tuples"""
+    it = iter(iterable)
+    while True:
+        batch = list(itertools.islice(it, size))
+        if not batch:
+            return
+        yield batch
+
+
+def tuple_bytes(tpl):
+    """The size of a tuple sent between workers: 8 bytes per number, 1 per
+    boolean and the length of each string"""
+    size = 0
+    for value in tpl:
+        if isinstance(value, bool):
+            size += 1
+        elif isinstance(value, unicode):
+            size += len(value.encode('utf-8'))
+        elif isinstance(value, basestring):
+            size += len(value)
+        else:
+            size += 8
+    return size
+
+
+def is_partitioned(op):
+    """Is op evaluated by each worker on its partitions of the relations,
+    like the operators of the Myria backend?"""
+    return getattr(op, 'partitioned', False)
+
+
+def receives_tuples(op):
+    """Does op receive the tuples sent from other workers, starting a
+    fragment, like a Myria consumer?"""
+    return getattr(op, 'receives_tuples', False)
+
+
+def collects_tuples(op):
+    """Does op receive tuples on one worker only?"""
+    return getattr(op, 'collects_tuples', False)
+
+
+# The database and the writes that forked processes evaluate. Pool workers
+# see it only because they are forked after it is set, so concurrent
+# evaluation requires the fork start method (os.fork); elsewhere the writes
+# are evaluated sequentially.
+_forked = None
+
+
+def _evaluate_forked(index):
+    """Evaluate the input of a write in a process forked from the database,
+    returning its tuples on each worker and what the workers received"""
+    db, writes = _forked
+    db.received_tuples = [0] * db.workers
+    db.received_bytes = [0] * db.workers
+    parts = db._evaluate_parts(writes[index])
+    return parts, db.received_tuples, db.received_bytes
+
 
 class State(object):
     def __init__(self, op_scheme, state_scheme, init_exprs):
@@ -31,9 +98,18 @@ class State(object):
 
 
 class FakeDatabase(Catalog):
-    """An in-memory implementation of relational algebra operators"""
-
-    def __init__(self):
+    """An in-memory implementation of relational algebra operators
+
+    With workers > 1, the database simulates a Myria cluster: every
+    relation is partitioned among the workers according to its
+    partitioning, the input of each write is evaluated on each worker's
+    partitions, and Myria consumers receive the tuples that their producers
+    send them from all workers. Sources that are not partitioned, such as
+    file scans and singleton relations, are read by the first worker, which
+    alone evaluates the fragments that collect tuples. Writes of plans
+    without Myria operators read whole relations, as with one worker."""
+
+    def __init__(self, processes=1, workers=1):
         # Persistent tables, identified by RelationKey
         self.tables = DBConnection()
 
@@ -43,8 +119,33 @@ class FakeDatabase(Catalog):
         # partitionings
         self.partitionings = {}
 
+        # column statistics of persistent tables, until they are rewritten
+        self.statistics = {}
+
+        # number of processes that evaluate independent writes of a
+        # Sequence or Parallel concurrently; the results are pickled back,
+        # so more processes than cores only add overhead
+        self.processes = processes
+
+        # number of simulated workers
+        self.workers = workers
+
+        # the worker that is evaluating, while writes are evaluated on each
+        self.worker = None
+
+        # the bag of tuples of each relation on each worker, by _target
+        self.partitions = {}
+
+        # the tuples each worker receives from each producer, for the write
+        # being evaluated
+        self.exchanges = {}
+
+        # tuples and bytes each worker received from producers
+        self.received_tuples = [0] * workers
+        self.received_bytes = [0] * workers
+
     def get_num_servers(self):
-        return 1
+        return self.workers
 
     def num_tuples(self, rel_key):
         try:
@@ -52,6 +153,17 @@ class FakeDatabase(Catalog):
         except KeyError:
             return DEFAULT_CARDINALITY
 
+    def column_statistics(self, rel_key):
+        """Statistics of the current contents of a relation"""
+        if rel_key not in self.statistics:
+            try:
+                table = self.tables.get_table(rel_key)
+            except KeyError:
+                return None
+            self.statistics[rel_key] = statistics.collect_statistics(
+                list(table.elements()), self.tables.get_scheme(rel_key))
+        return self.statistics[rel_key]
+
     def partitioning(self, rel_key):
         """get fake metadata for relation.
         This has no effect on query evaluation
@@ -64,6 +176,11 @@ class FakeDatabase(Catalog):
         For "query-type" operators, return a tuple iterator.
         For store queries, the return value is None.
         """
+        # sources that are not partitioned are read by the first worker
+        if self.worker is not None and self.worker > 0 and \
+                isinstance(op, ZeroaryOperator) and \
+                not isinstance(op, (Scan, ScanTemp)):
+            return iter([])
         method = getattr(self, op.opname().lower())
         return method(op)
 
@@ -78,7 +195,29 @@ class FakeDatabase(Catalog):
             rel_key = relation_key.RelationKey.from_string(rel_key)
         assert isinstance(rel_key, relation_key.RelationKey)
         self.tables.add_table(rel_key, scheme, contents.elements())
+        self.statistics.pop(rel_key, None)
         self.partitionings[rel_key] = partitioning
+        if self.workers > 1:
+            self.partitions[('table', rel_key)] = \
+                self._place(contents, partitioning)
+
+    def _place(self, contents, partitioning):
+        """Partition a bag of tuples among the workers like a relation with
+        the given partitioning: hashed like MyriaShuffleProducer does,
+        broadcast, or round robin"""
+        parts = [collections.Counter() for _ in range(self.workers)]
+        columns = [c.position for c in partitioning.hash_partitioned]
+        for index, tpl in enumerate(contents.elements()):
+            if partitioning.broadcasted:
+                workers = range(self.workers)
+            elif columns:
+                key = tuple(tpl[c] for c in columns)
+                workers = [hash(key) % self.workers]
+            else:
+                workers = [index % self.workers]
+            for worker in workers:
+                parts[worker][tpl] += 1
+        return parts
 
     def add_function(self, tup):
         print ("added function")
@@ -114,6 +253,7 @@ class FakeDatabase(Catalog):
 
     def delete_temp_table(self, key):
         self.temp_tables.delete_table(key)
+        self.partitions.pop(('temp', key), None)
 
     def dump_all(self):
         for key, val in self.tables.iteritems():
@@ -125,6 +265,9 @@ class FakeDatabase(Catalog):
 
     def scan(self, op):
         assert isinstance(op.relation_key, relation_key.RelationKey)
+        if self.worker is not None:
+            key = ('table', op.relation_key)
+            return self.partitions[key][self.worker].elements()
         return self.tables.get_table(op.relation_key).elements()
 
     def calculatesamplingdistribution(self, op):
@@ -182,24 +325,54 @@ class FakeDatabase(Catalog):
 
     def select(self, op):
         child_it = self.evaluate(op.input)
+        scheme = op.scheme()
 
-        def filter_func(_tuple):
+        def filter_batches():
             # Note: this implicitly uses python truthiness rules for
             # interpreting non-boolean expressions.
             # TODO: Is this the the right semantics here?
-            return op.condition.evaluate(_tuple, op.scheme())
+            for batch in batches(child_it):
+                keep = op.condition.evaluate_batch(batch, scheme)
+                for _tuple, k in zip(batch, keep):
+                    if k:
+                        yield _tuple
 
-        return itertools.ifilter(filter_func, child_it)
+        return filter_batches()
 
     def apply(self, op):
         child_it = self.evaluate(op.input)
         scheme = op.input.scheme()
 
-        def make_tuple(input_tuple):
-            ls = [colexpr.evaluate(input_tuple, scheme)
-                  for (_, colexpr) in op.emitters]
-            return tuple(ls)
-        return (make_tuple(t) for t in child_it)
+        def apply_batches():
+            for batch in batches(child_it):
+                columns = [colexpr.evaluate_batch(batch, scheme)
+                           for (_, colexpr) in op.emitters]
+                for _tuple in zip(*columns):
+                    yield _tuple
+
+        return apply_batches()
+
+    def flatmap(self, op):
+        child_it = self.evaluate(op.input)
+        scheme = op.input.scheme()
+        exprs = [colexpr for (_, colexpr) in op.emitters]
+
+        def values(colexpr, _tuple):
+            if isinstance(colexpr, FlatmapFunction):
+                return colexpr.evaluate_values(_tuple, scheme)
+            return [colexpr.evaluate(_tuple, scheme)]
+
+        def expand(_tuple, i=0):
+            # the cross product of the values of the emit expressions from
+            # i on, evaluating them lazily
+            if i == len(exprs):
+                yield ()
+                return
+            for value in values(exprs[i], _tuple):
+                for rest in expand(_tuple, i + 1):
+                    yield (value,) + rest
+
+        return (t for input_tuple in child_it for t in expand(input_tuple))
 
     def statefulapply(self, op):
         child_it = self.evaluate(op.input)
@@ -253,8 +426,22 @@ class FakeDatabase(Catalog):
         p1 = itertools.product(left_it, right_it)
         return (x + y for (x, y) in p1)
 
+    def bloomfilterbuild(self, op):
+        bloom = bloomfilter.BloomFilter(op.num_bits, op.num_hashes)
+        for t in self.evaluate(op.input):
+            bloom.add(tuple(t[c.position] for c in op.columnlist))
+        return bloom.words()
+
+    def bloomfilterprobe(self, op):
+        bloom = bloomfilter.BloomFilter(op.num_bits, op.num_hashes)
+        bloom.add_words(self.evaluate(op.right))
+        return (t for t in self.evaluate(op.left)
+                if tuple(t[c.position] for c in op.columnlist) in bloom)
+
     def distinct(self, op):
         it = self.evaluate(op.input)
+        if getattr(op, 'strategy', None) == Distinct.Strategy.Sort:
+            return (t for t, _ in itertools.groupby(sorted(it)))
         s = set(it)
         return iter(s)
 
@@ -345,14 +532,145 @@ class FakeDatabase(Catalog):
                     agg_fields.append(expr.evaluate(None, None, state))
             yield(key + tuple(agg_fields))
 
+    @staticmethod
+    def _target(op):
+        """The relation a write operator writes"""
+        if isinstance(op, (StoreTemp, AppendTemp)):
+            return ('temp', op.name)
+        if isinstance(op, Sink):
+            return ('table', relation_key.RelationKey("OUTPUT"))
+        return ('table', op.relation_key)
+
+    @staticmethod
+    def _sources(op):
+        """The relations an operator reads"""
+        sources = set()
+        for child in op.walk():
+            if isinstance(child, ScanTemp):
+                sources.add(('temp', child.name))
+            elif isinstance(child, Scan):
+                sources.add(('table', child.relation_key))
+        return sources
+
+    @classmethod
+    def _independent_writes(cls, ops):
+        """Split a list of operators into groups of consecutive writes, none
+        of which reads a relation written before it in its group, and
+        single other operators"""
+        writes = (Store, Sink, StoreTemp, AppendTemp)
+        group, written = [], set()
+        for op in ops:
+            if isinstance(op, writes) and \
+                    not cls._sources(op.input) & written:
+                group.append(op)
+                written.add(cls._target(op))
+                continue
+            if group:
+                yield group
+            if isinstance(op, writes):
+                group, written = [op], set([cls._target(op)])
+            else:
+                group, written = [], set()
+                yield [op]
+        if group:
+            yield group
+
+    @staticmethod
+    def _fragment(op):
+        """The operators of the fragment of a Myria plan rooted at op"""
+        yield op
+        if not receives_tuples(op):
+            for child in op.children():
+                for fragment_op in FakeDatabase._fragment(child):
+                    yield fragment_op
+
+    def _fragment_workers(self, op):
+        """The workers that evaluate the fragment rooted at op"""
+        if any(collects_tuples(fragment_op)
+               for fragment_op in self._fragment(op)):
+            return [0]
+        return range(self.workers)
+
+    def _evaluate_parts(self, op):
+        """Evaluate the input of a write operator on each worker
+
+        @return a list of the tuples of each worker
+        """
+        if self.workers <= 1:
+            return [list(self.evaluate(op.input))]
+        if not any(is_partitioned(child) for child in op.input.walk()):
+            tuples = collections.Counter(self.evaluate(op.input))
+            return [list(part.elements()) for part in
+                    self._place(tuples, RepresentationProperties())]
+
+        self.exchanges = {}
+        parts = [[] for _ in range(self.workers)]
+        try:
+            for worker in self._fragment_workers(op.input):
+                self.worker = worker
+                parts[worker] = list(self.evaluate(op.input))
+        finally:
+            self.worker = None
+            self.exchanges = {}
+        return parts
+
+    def _write(self, op, parts):
+        """Write the tuples of the input of a write operator, given as a
+        list of the tuples of each worker"""
+        kind, target = self._target(op)
+        if self.workers > 1:
+            bags = [collections.Counter(part) for part in parts]
+            if isinstance(op, AppendTemp) and \
+                    (kind, target) in self.partitions:
+                for bag, new in zip(self.partitions[(kind, target)], bags):
+                    bag.update(new)
+            else:
+                self.partitions[(kind, target)] = bags
+        tuples = itertools.chain.from_iterable(parts)
+        if isinstance(op, AppendTemp):
+            self.temp_tables.append_table(target, tuples)
+        elif kind == 'temp':
+            self.temp_tables.add_table(target, op.input.scheme(), tuples)
+        else:
+            assert isinstance(target, relation_key.RelationKey)
+            self.tables.add_table(target, op.input.scheme(), tuples)
+            self.statistics.pop(target, None)
+
+    def _evaluate_steps(self, ops):
+        """Evaluate the children of a Sequence or Parallel in order,
+        computing the inputs of independent writes concurrently in forked
+        processes, which read a copy-on-write snapshot of the database"""
+        global _forked
+        if self.processes <= 1 or not hasattr(os, 'fork'):
+            for op in ops:
+                self.evaluate(op)
+            return
+
+        for group in self._independent_writes(ops):
+            if len(group) < 2:
+                for op in group:
+                    self.evaluate(op)
+                continue
+
+            _forked = (self, group)
+            pool = multiprocessing.Pool(min(self.processes, len(group)))
+            try:
+                results = pool.map(_evaluate_forked, range(len(group)))
+            finally:
+                pool.terminate()
+                _forked = None
+            for op, (parts, tuples, bytes) in zip(group, results):
+                self._write(op, parts)
+                for worker in range(self.workers):
+                    self.received_tuples[worker] += tuples[worker]
+                    self.received_bytes[worker] += bytes[worker]
+
     def sequence(self, op):
-        for child_op in op.children():
-            self.evaluate(child_op)
+        self._evaluate_steps(op.children())
         return None
 
     def parallel(self, op):
-        for child_op in op.children():
-            self.evaluate(child_op)
+        self._evaluate_steps(op.children())
         return None
 
     def dowhile(self, op):
@@ -369,8 +687,7 @@ class FakeDatabase(Catalog):
             self.dump_all()
 
         while True:
-            for op in body_ops:
-                self.evaluate(op)
+            self._evaluate_steps(body_ops)
             result_iterator = self.evaluate(term_op)
 
             if debug:
@@ -396,17 +713,11 @@ class FakeDatabase(Catalog):
         return self.evaluate(op.input)
 
     def store(self, op):
-        assert isinstance(op.relation_key, relation_key.RelationKey)
-
-        scheme = op.input.scheme()
-        self.tables.add_table(op.relation_key, scheme, self.evaluate(op.input))
+        self._write(op, self._evaluate_parts(op))
         return None
 
     def sink(self, op):
-        scheme = op.input.scheme()
-        self.tables.add_table(
-            relation_key.RelationKey("OUTPUT"),
-            scheme, self.evaluate(op.input))
+        self._write(op, self._evaluate_parts(op))
         return None
 
     def dump(self, op):
@@ -415,13 +726,14 @@ class FakeDatabase(Catalog):
         return None
 
     def storetemp(self, op):
-        scheme = op.input.scheme()
-        self.temp_tables.add_table(op.name, scheme, self.evaluate(op.input))
+        self._write(op, self._evaluate_parts(op))
 
     def appendtemp(self, op):
-        self.temp_tables.append_table(op.name, self.evaluate(op.input))
+        self._write(op, self._evaluate_parts(op))
 
     def scantemp(self, op):
+        if self.worker is not None:
+            return self.partitions[('temp', op.name)][self.worker].elements()
         return self.temp_tables.get_table(op.name).elements()
 
     def myriascan(self, op):
@@ -457,7 +769,7 @@ class FakeDatabase(Catalog):
         return self.orderby(op)
 
     def myriahypercubeshuffleconsumer(self, op):
-        return self.evaluate(op.input)
+        return self._receive(op)
 
     def myriahypercubeshuffleproducer(self, op):
         return self.evaluate(op.input)
@@ -480,12 +792,21 @@ class FakeDatabase(Catalog):
     def myriaapply(self, op):
         return self.apply(op)
 
+    def myriaflatmap(self, op):
+        return self.flatmap(op)
+
     def myriastatefulapply(self, op):
         return self.statefulapply(op)
 
     def myriadupelim(self, op):
         return self.distinct(op)
 
+    def myriabloomfilterbuild(self, op):
+        return self.bloomfilterbuild(op)
+
+    def myriabloomfilterprobe(self, op):
+        return self.bloomfilterprobe(op)
+
     def myriaselect(self, op):
         return self.select(op)
 
@@ -495,20 +816,58 @@ class FakeDatabase(Catalog):
     def myriagroupby(self, op):
         return self.groupby(op)
 
+    def distribute(self, producer, num_workers):
+        """Simulate how a Myria producer distributes its input among
+        num_workers workers
+
+        @return a bag of the tuples each worker receives
+        """
+        parts = [collections.Counter() for _ in range(num_workers)]
+        for index, tpl in enumerate(self.evaluate(producer.input)):
+            for worker in producer.destinations(tpl, index, num_workers):
+                parts[worker][tpl] += 1
+        return parts
+
+    def _receive(self, consumer):
+        """The tuples the evaluating worker receives from the producer of a
+        consumer, which sends what it evaluates on each worker"""
+        producer = consumer.input
+        if self.worker is None:
+            return self.evaluate(producer.input)
+
+        if id(producer) not in self.exchanges:
+            parts = [collections.Counter() for _ in range(self.workers)]
+            receiver = self.worker
+            try:
+                for sender in self._fragment_workers(producer.input):
+                    self.worker = sender
+                    tuples = list(self.evaluate(producer.input))
+                    for index, tpl in enumerate(tuples):
+                        size = tuple_bytes(tpl)
+                        for worker in producer.destinations(
+                                tpl, index, self.workers):
+                            parts[worker][tpl] += 1
+                            self.received_tuples[worker] += 1
+                            self.received_bytes[worker] += size
+            finally:
+                self.worker = receiver
+            self.exchanges[id(producer)] = parts
+        return self.exchanges[id(producer)][self.worker].elements()
+
     def myriashuffleconsumer(self, op):
-        return self.evaluate(op.input)
+        return self._receive(op)
 
     def myriashuffleproducer(self, op):
         return self.evaluate(op.input)
 
     def myriacollectconsumer(self, op):
-        return self.evaluate(op.input)
+        return self._receive(op)
 
     def myriacollectproducer(self, op):
         return self.evaluate(op.input)
 
     def myriabroadcastconsumer(self, op):
-        return self.evaluate(op.input)
+        return self._receive(op)
 
     def myriabroadcastproducer(self, op):
         return self.evaluate(op.input)
@@ -0,0 +1,140 @@
+import collections
+import unittest
+
+from raco.algebra import (GroupBy, Join, Parallel, Scan, ScanTemp, Select,
+                          Sequence, Store, StoreTemp)
+from raco.backends.myria import MyriaLeftDeepTreeAlgebra
+from raco.compile import optimize
+from raco.expression import (COUNTALL, EQ, GT, NumericLiteral,
+                             UnnamedAttributeRef)
+from raco.fakedb import FakeDatabase, tuple_bytes
+from raco.relation_key import RelationKey
+from raco.representation import RepresentationProperties
+from raco.scheme import Scheme
+import raco.types as types
+
+
+class ConcurrentWritesTest(unittest.TestCase):
+
+    schema = Scheme([('a', types.LONG_TYPE), ('b', types.LONG_TYPE)])
+    key = RelationKey('public', 'adhoc', 'numbers')
+
+    def evaluate(self, plan, outputs, processes):
+        db = FakeDatabase(processes=processes)
+        db.ingest(self.key, collections.Counter(
+            (i, i % 5) for i in range(100)), self.schema)
+        db.evaluate(plan)
+        return [db.get_table(RelationKey('public', 'adhoc', name))
+                for name in outputs]
+
+    def select(self, input, value):
+        return Select(GT(UnnamedAttributeRef(0), NumericLiteral(value)),
+                      input)
+
+    def test_parallel_stores(self):
+        outputs = ['OUT%d' % i for i in range(4)]
+        plan = Parallel([
+            Store(RelationKey('public', 'adhoc', name),
+                  self.select(Scan(self.key, self.schema), 20 * i))
+            for i, name in enumerate(outputs)])
+        self.assertEqual(self.evaluate(plan, outputs, 2),
+                         self.evaluate(plan, outputs, 1))
+        self.assertEqual(sum(self.evaluate(plan, outputs, 2)[3].values()),
+                         39)
+
+    def test_sequence_read_after_write(self):
+        first = RelationKey('public', 'adhoc', 'FIRST')
+        plan = Sequence([
+            StoreTemp('t', self.select(Scan(self.key, self.schema), 50)),
+            Store(first, self.select(Scan(self.key, self.schema), 90)),
+            # read the temp and the relation written just before
+            Store(RelationKey('public', 'adhoc', 'SECOND'),
+                  self.select(ScanTemp('t', self.schema), 70)),
+            Store(RelationKey('public', 'adhoc', 'THIRD'),
+                  self.select(Scan(first, self.schema), 95)),
+        ])
+        outputs = ['FIRST', 'SECOND', 'THIRD']
+        expected = self.evaluate(plan, outputs, 1)
+        self.assertEqual(self.evaluate(plan, outputs, 2), expected)
+        self.assertEqual([sum(t.values()) for t in expected], [9, 29, 4])
+
+        groups = list(FakeDatabase._independent_writes(plan.children()))
+        self.assertEqual([len(g) for g in groups], [2, 2])
+
+
+class MultiWorkerTest(unittest.TestCase):
+
+    r_key = RelationKey('public', 'adhoc', 'R')
+    s_key = RelationKey('public', 'adhoc', 'S')
+    output = RelationKey('public', 'adhoc', 'OUTPUT')
+    r_scheme = Scheme([('a', types.LONG_TYPE), ('b', types.LONG_TYPE)])
+    s_scheme = Scheme([('c', types.LONG_TYPE), ('d', types.STRING_TYPE)])
+    s_data = collections.Counter((i % 10, 'x' * i) for i in range(40))
+
+    def setUp(self):
+        self.partitioning = RepresentationProperties(
+            hash_partitioned=(UnnamedAttributeRef(0),))
+        self.dbs = [FakeDatabase(), FakeDatabase(workers=4)]
+
+    def ingest(self, r_size, partitioning=RepresentationProperties()):
+        r_data = collections.Counter((i, i % 7) for i in range(r_size))
+        for db in self.dbs:
+            db.ingest(self.r_key, r_data, self.r_scheme, partitioning)
+            db.ingest(self.s_key, self.s_data, self.s_scheme)
+
+    def evaluate(self, plan):
+        """Evaluate a plan on one and on four workers, returning the
+        database of four workers"""
+        one, four = self.dbs
+        for db in self.dbs:
+            db.evaluate(plan)
+        self.assertEqual(four.get_table(self.output),
+                         one.get_table(self.output))
+        return four
+
+    def join(self, r_size, partitioning=RepresentationProperties()):
+        return Store(self.output, Join(
+            EQ(UnnamedAttributeRef(0), UnnamedAttributeRef(2)),
+            Scan(self.r_key, self.r_scheme, r_size,
+                 partitioning=partitioning),
+            Scan(self.s_key, self.s_scheme, len(self.s_data))))
+
+    def test_num_servers(self):
+        self.assertEqual([db.get_num_servers() for db in self.dbs], [1, 4])
+
+    def test_shuffle(self):
+        self.ingest(100)
+        plan = optimize(self.join(100), MyriaLeftDeepTreeAlgebra())
+        db = self.evaluate(plan)
+        self.assertEqual(sum(db.received_tuples), 140)
+        self.assertEqual(sum(db.received_bytes),
+                         100 * 16 + sum(tuple_bytes(t)
+                                        for t in self.s_data.elements()))
+
+    def test_partitioned_relation(self):
+        # R is hash partitioned on the join column, so only S is shuffled
+        self.ingest(100, self.partitioning)
+        plan = optimize(self.join(100, self.partitioning),
+                        MyriaLeftDeepTreeAlgebra())
+        db = self.evaluate(plan)
+        self.assertEqual(sum(db.received_tuples), 40)
+
+    def test_broadcast(self):
+        self.ingest(1000)
+        plan = optimize(self.join(1000),
+                        MyriaLeftDeepTreeAlgebra(self.dbs[1]))
+        db = self.evaluate(plan)
+        s_bytes = sum(tuple_bytes(t) for t in self.s_data.elements())
+        self.assertEqual(db.received_tuples, [40] * 4)
+        self.assertEqual(db.received_bytes, [s_bytes] * 4)
+
+    def test_collect(self):
+        self.ingest(100)
+        plan = optimize(Store(self.output, GroupBy(
+            [], [COUNTALL()], Scan(self.r_key, self.r_scheme))),
+            MyriaLeftDeepTreeAlgebra())
+        db = self.evaluate(plan)
+        self.assertEqual(db.get_table(self.output),
+                         collections.Counter([(100,)]))
+        # the counts of the four workers go to the first
+        self.assertEqual(db.received_tuples, [4, 0, 0, 0])
@@ -0,0 +1,337 @@
+"""
+Cost-based join ordering.
+
+A tree of logical Joins and CrossProducts is flattened into a join graph:
+the inputs of the tree (its relations) and the conjuncts of its join
+conditions, each conjunct connecting the relations whose columns it
+references. Join orders are enumerated by dynamic programming over
+connected subgraphs for up to DP_LIMIT relations and greedily beyond that.
+
+A plan is costed by the sizes of its intermediate results plus the sizes of
+the inputs that hash tables are built on. The build side of a hash join is
+its right input, so every join is given its smaller input on the right.
+"""
+
+import copy
+import itertools
+
+from raco import algebra, scheme, statistics
+from raco.algebra import DEFAULT_CARDINALITY
+from raco.expression import (UnnamedAttributeRef, EQ, AND, extract_conjuncs,
+                             accessed_columns, reindex_expr,
+                             only_unnamed_refs)
+
+# largest number of relations ordered by dynamic programming
+DP_LIMIT = 12
+
+# selectivity of a join conjunct that is not an equality of two columns
+DEFAULT_SELECTIVITY = 1.0 / 3
+
+
+def is_join(op):
+    """Is op a logical join that may be reordered?"""
+    return type(op) in (algebra.Join, algebra.CrossProduct)
+
+
+def estimate_cardinality(op):
+    try:
+        return max(op.num_tuples(), 1)
+    except NotImplementedError:
+        return DEFAULT_CARDINALITY
+
+
+def bits(mask):
+    """The relations in a set of relations"""
+    i = 0
+    while mask:
+        if mask & 1:
+            yield i
+        mask >>= 1
+        i += 1
+
+
+def popcount(mask):
+    return bin(mask).count('1')
+
+
+class JoinGraph(object):
+
+    """The relations and join conjuncts of a tree of joins"""
+
+    def __init__(self, op):
+        assert is_join(op)
+        self.root = op
+        # the inputs of the tree, left to right
+        self.relations = []
+        # the position of the first column of each relation in the output
+        self.offsets = []
+        # each conjunct with columns numbered as in the output of the tree
+        self.conjuncts = []
+        self.orderable = True
+        # the shape of the tree: a relation index or a (left, right) pair
+        self.plan = self._flatten(op, 0)
+
+        self.cardinalities = [estimate_cardinality(r)
+                              for r in self.relations]
+        self.statistics = [r.column_statistics() for r in self.relations]
+        # statistics of the columns of the output
+        self.column_statistics = []
+        for r, stats in zip(self.relations, self.statistics):
+            self.column_statistics.extend(stats or [None] * len(r.scheme()))
+        self.masks = [self._relations_of(c) for c in self.conjuncts]
+        self.selectivities = [self.selectivity(c) for c in self.conjuncts]
+        self._cardinality = {}
+
+    def _flatten(self, op, offset):
+        if not is_join(op):
+            if not isinstance(op.scheme(), scheme.Scheme):
+                self.orderable = False
+            self.relations.append(op)
+            self.offsets.append(offset)
+            return len(self.relations) - 1
+
+        left = self._flatten(op.left, offset)
+        right = self._flatten(op.right, offset + len(op.left.scheme()))
+        if isinstance(op, algebra.Join):
+            if not only_unnamed_refs(op.condition):
+                self.orderable = False
+                return left, right
+            condition = copy.deepcopy(op.condition)
+            for ex in condition.walk():
+                if isinstance(ex, UnnamedAttributeRef):
+                    ex.position += offset
+            self.conjuncts.extend(extract_conjuncs(condition))
+        return left, right
+
+    def relation_of(self, column):
+        """The relation that a column of the output comes from"""
+        for i in reversed(range(len(self.offsets))):
+            if self.offsets[i] <= column:
+                return i
+
+    def _relations_of(self, conjunct):
+        mask = 0
+        for column in accessed_columns(conjunct):
+            mask |= 1 << self.relation_of(column)
+        # a conjunct of constants is evaluated by the first join
+        return mask or 1
+
+    def distinct_values(self, column):
+        """Estimated number of distinct values of a column of the output.
+        Without statistics, each column is assumed to be a key of its
+        relation."""
+        i = self.relation_of(column)
+        stats = self.statistics[i]
+        if stats is not None and stats[column - self.offsets[i]] is not None:
+            return stats[column - self.offsets[i]].distinct
+        return self.cardinalities[i]
+
+    def selectivity(self, conjunct):
+        """Estimated fraction of tuples of the cross product of the
+        relations a conjunct references that satisfy it"""
+        if isinstance(conjunct, EQ) and \
+                isinstance(conjunct.left, UnnamedAttributeRef) and \
+                isinstance(conjunct.right, UnnamedAttributeRef):
+            return 1.0 / max(self.distinct_values(conjunct.left.position),
+                             self.distinct_values(conjunct.right.position),
+                             1)
+        selectivity = statistics.estimate_selectivity(
+            conjunct, self.column_statistics)
+        if selectivity is None:
+            return DEFAULT_SELECTIVITY
+        return selectivity
+
+    def cardinality(self, mask):
+        """Estimated number of tuples in the join of a set of relations"""
+        if mask not in self._cardinality:
+            card = 1.0
+            for i in bits(mask):
+                card *= self.cardinalities[i]
+            for c, s in zip(self.masks, self.selectivities):
+                if c & mask == c:
+                    card *= s
+            self._cardinality[mask] = max(card, 1.0)
+        return self._cardinality[mask]
+
+    def connected(self, mask1, mask2):
+        """Is there a join conjunct between two sets of relations?"""
+        both = mask1 | mask2
+        return any(c & both == c and c & mask1 and c & mask2
+                   for c in self.masks)
+
+    @staticmethod
+    def mask_of(plan):
+        if isinstance(plan, tuple):
+            return JoinGraph.mask_of(plan[0]) | JoinGraph.mask_of(plan[1])
+        return 1 << plan
+
+    def cost(self, plan):
+        """Sum of the sizes of the intermediate results of a plan and of
+        the right (build) inputs of its joins"""
+        if not isinstance(plan, tuple):
+            return 0
+        left, right = plan
+        return (self.cost(left) + self.cost(right) +
+                self.cardinality(self.mask_of(plan)) +
+                self.cardinality(self.mask_of(right)))
+
+    def _join(self, left, right):
+        """A join of two plans with the smaller one on the build side"""
+        if self.cardinality(self.mask_of(left)) < \
+                self.cardinality(self.mask_of(right)):
+            return right, left
+        return left, right
+
+    def best_plan(self, bushy=True):
+        """The cheapest plan for the whole tree. Left-deep plans join one
+        relation at a time, on either side; bushy plans may join two
+        intermediate results."""
+        if len(self.relations) <= DP_LIMIT:
+            return self._dynamic_programming(bushy)
+        return self._greedy(bushy)
+
+    def _dynamic_programming(self, bushy):
+        n = len(self.relations)
+        best = dict((1 << i, (0, i)) for i in range(n))
+        for size in range(2, n + 1):
+            for subset in itertools.combinations(range(n), size):
+                mask = sum(1 << i for i in subset)
+                if bushy:
+                    splits = self._submasks(mask)
+                else:
+                    splits = (1 << i for i in subset)
+                for left in splits:
+                    right = mask ^ left
+                    if left not in best or right not in best or \
+                            not self.connected(left, right):
+                        continue
+                    plan = self._join(best[left][1], best[right][1])
+                    cost = (best[left][0] + best[right][0] +
+                            self.cardinality(mask) +
+                            self.cardinality(self.mask_of(plan[1])))
+                    if mask not in best or cost < best[mask][0]:
+                        best[mask] = (cost, plan)
+
+        full = (1 << n) - 1
+        if full in best:
+            return best[full][1]
+
+        # cross products of the connected components, smallest first
+        components = []
+        for mask in sorted(best, key=popcount, reverse=True):
+            if not any(mask & c for c in components):
+                components.append(mask)
+        components.sort(key=self.cardinality)
+        plan = best[components[0]][1]
+        for c in components[1:]:
+            plan = self._join(plan, best[c][1])
+        return plan
+
+    @staticmethod
+    def _submasks(mask):
+        """Each split of mask into two halves, once"""
+        sub = (mask - 1) & mask
+        while sub:
+            if sub < mask ^ sub:
+                yield sub
+            sub = (sub - 1) & mask
+
+    def _greedy(self, bushy):
+        """Repeatedly join the two plans with the smallest result,
+        preferring plans that are connected by a conjunct"""
+        plans = range(len(self.relations))
+        while len(plans) > 1:
+            def size(pair):
+                m1, m2 = [self.mask_of(p) for p in pair]
+                return (not self.connected(m1, m2),
+                        self.cardinality(m1 | m2))
+
+            pairs = itertools.combinations(plans, 2)
+            if not bushy:
+                joined = [p for p in plans if isinstance(p, tuple)]
+                pairs = [(p1, p2) for (p1, p2) in pairs
+                         if (p1 in joined or p2 in joined) or not joined]
+            p1, p2 = min(pairs, key=size)
+            plans = [p for p in plans if p is not p1 and p is not p2]
+            plans.append(self._join(p1, p2))
+        return plans[0]
+
+    def build(self, plan):
+        """The operator tree of a plan, under an Apply that restores the
+        column order of the original tree"""
+        order = list(self._leaves(plan))
+        positions = {}
+        position = 0
+        for i in order:
+            width = len(self.relations[i].scheme())
+            for col in range(width):
+                positions[self.offsets[i] + col] = position + col
+            position += width
+
+        unplaced = range(len(self.conjuncts))
+        op = self._build(plan, positions, unplaced, 0)
+        assert not unplaced
+
+        sch = self.root.scheme()
+        emitters = [(sch.getName(i), UnnamedAttributeRef(positions[i]))
+                    for i in range(len(sch))]
+        return algebra.Apply(emitters=emitters, input=op)
+
+    def _leaves(self, plan):
+        if isinstance(plan, tuple):
+            for p in plan:
+                for i in self._leaves(p):
+                    yield i
+        else:
+            yield plan
+
+    def _build(self, plan, positions, unplaced, base):
+        if not isinstance(plan, tuple):
+            return self.relations[plan]
+
+        left = self._build(plan[0], positions, unplaced, base)
+        right = self._build(plan[1], positions, unplaced,
+                            base + len(left.scheme()))
+
+        # conjuncts are evaluated by the lowest join that covers them
+        mask = self.mask_of(plan)
+        here = [i for i in unplaced if self.masks[i] & mask == self.masks[i]]
+        for i in here:
+            unplaced.remove(i)
+        if not here:
+            op = algebra.CrossProduct(left, right)
+        else:
+            index_map = dict((old, new - base)
+                             for old, new in positions.items())
+            conjuncts = []
+            for i in here:
+                conjunct = copy.deepcopy(self.conjuncts[i])
+                reindex_expr(conjunct, index_map)
+                conjuncts.append(conjunct)
+            op = algebra.Join(reduce(AND, conjuncts), left, right)
+        op._join_ordered = True
+        return op
+
+
+def order_joins(op, bushy=True):
+    """Reorder a tree of joins if a cheaper order is estimated to exist.
+
+    @param op: a logical Join or CrossProduct
+    @param bushy: whether joins of two intermediate results are allowed
+    @return op, or an Apply over the reordered joins that produces the
+        same columns
+    """
+    graph = JoinGraph(op)
+    if graph.orderable:
+        plan = graph.best_plan(bushy)
+        if graph.cost(plan) < graph.cost(graph.plan):
+            return graph.build(plan)
+
+    # do not reconsider the joins below
+    def mark(join):
+        if is_join(join):
+            join._join_ordered = True
+            mark(join.left)
+            mark(join.right)
+    mark(op)
+    return op
@@ -0,0 +1,94 @@
+import collections
+import unittest
+
+from raco import joinorder
+from raco.algebra import Apply, CrossProduct, Join, Scan
+from raco.expression import EQ, UnnamedAttributeRef
+from raco.fakedb import FakeDatabase
+from raco.relation_key import RelationKey
+from raco.rules import OrderJoins
+from raco.scheme import Scheme
+import raco.types as types
+
+
+def eq(col0, col1):
+    return EQ(UnnamedAttributeRef(col0), UnnamedAttributeRef(col1))
+
+
+class JoinOrderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db = FakeDatabase()
+
+    def relation(self, name, cardinality, num_tuples=4):
+        """A two column relation with estimated cardinality and, for
+        evaluation, num_tuples tuples"""
+        key = RelationKey('public', 'adhoc', name)
+        sch = Scheme([(name + '_a', types.LONG_TYPE),
+                      (name + '_b', types.LONG_TYPE)])
+        self.db.ingest(key, collections.Counter(
+            [(i, (i + 1) % num_tuples) for i in range(num_tuples)]), sch)
+        return Scan(key, sch, cardinality)
+
+    def chain(self, relations):
+        """Join each relation to the next on b = a, left deep in order"""
+        op = relations[0]
+        for rel in relations[1:]:
+            width = len(op.scheme())
+            op = Join(eq(width - 1, width), op, rel)
+        return op
+
+    def check_same_result(self, op):
+        expected = self.db.evaluate_to_bag(op)
+        ordered = OrderJoins()(op)
+        self.assertEqual(ordered.scheme(), op.scheme())
+        self.assertEqual(self.db.evaluate_to_bag(ordered), expected)
+        return ordered
+
+    @staticmethod
+    def joins(op):
+        return [j for j in op.walk() if isinstance(j, (Join, CrossProduct))]
+
+    def test_build_smaller_input(self):
+        small, big = self.relation('S', 10), self.relation('B', 1000)
+        op = self.check_same_result(Join(eq(1, 2), small, big))
+        self.assertIsInstance(op, Apply)
+        [join] = self.joins(op)
+        self.assertEqual((join.left, join.right), (big, small))
+        self.assertEqual(join.condition, eq(3, 0))
+
+    def test_keep_equal_cost_order(self):
+        op = self.chain([self.relation(name, 100) for name in 'ABC'])
+        self.assertIs(OrderJoins()(op), op)
+
+    def test_join_selective_relations_first(self):
+        # joining C first keeps the intermediate result small
+        a, b, c = (self.relation('A', 1000), self.relation('B', 1000),
+                   self.relation('C', 10))
+        op = self.check_same_result(self.chain([a, b, c]))
+        top = op.input
+        self.assertEqual(top.left, a)
+        self.assertEqual(set(top.right.children()), set([b, c]))
+
+    def test_cross_product_of_components(self):
+        a, b, c, d = [self.relation(name, card)
+                      for name, card in zip('ABCD', [10, 1000, 100, 5])]
+        op = CrossProduct(Join(eq(1, 2), a, b), Join(eq(1, 2), c, d))
+        self.check_same_result(op)
+
+    def test_left_deep(self):
+        relations = [self.relation(name, card) for name, card
+                     in zip('ABCDEF', [1000, 10, 500, 20, 100, 30])]
+        op = OrderJoins(bushy=False)(self.chain(relations))
+        for join in self.joins(op):
+            self.assertTrue(not isinstance(join.left, Join) or
+                            not isinstance(join.right, Join))
+
+    def test_greedy(self):
+        n = joinorder.DP_LIMIT + 2
+        relations = [self.relation('R%d' % i, 10 ** (i % 4))
+                     for i in range(n)]
+        op = self.check_same_result(self.chain(relations))
+        self.assertEqual(len(self.joins(op)), n - 1)
+        self.assertTrue(all(getattr(j, '_join_ordered', False)
+                            for j in self.joins(op)))
@@ -2,7 +2,7 @@ from raco.algebra import *
 from raco.myrial.exceptions import MyrialCompileException
 
 import bisect
-import copy
+import collections
 import itertools
 import logging
 import networkx as nx
@@ -95,38 +95,96 @@ class ControlFlowGraph(object):
 
         http://www.cs.colostate.edu/~mstrout/CS553/slides/lecture03.pdf
 
+        A worklist holds the nodes whose live sets may be stale. It starts
+        with every node in postorder (the program backwards), and a node
+        whose live-in set grows adds its predecessors.
+
         :returns: A tuple containing live_in, live_out dictionaries.  The keys
         are variable names (strings) and the values are string sets.
         """
 
-        # All variables that are accessed are live-in at a node
-        live_in = {i: copy.copy(self.graph.node[i]['uses'])
-                   for i in self.graph}
+        live_in = {i: set() for i in self.graph}
         live_out = {i: set() for i in self.graph}
 
-        while True:
-            # Create a copy of live_in, live_out that we will compare against
-            # to detect loop termination. This is shallower than a full deep
-            # copy, but we need to copy the value sets in this dictionary as
-            # they are mutated in the loop below. Make the sets frozen to
-            # ensure they are really immutable.
-            live_in_prev = {i: frozenset(s) for i, s in live_in.items()}
-            live_out_prev = {i: frozenset(s) for i, s in live_out.items()}
-
-            for i in self.graph:
-                # live out variables that are not defined are live-in
-                def_var = self.graph.node[i]['def_var']
-                def_set = set()
-                if def_var is not None:
-                    def_set.add(def_var)
-                live_in[i].update(live_out_prev[i] - def_set)
+        worklist = collections.deque(reversed(self.sorted_vertices))
+        pending = set(worklist)
+        while worklist:
+            i = worklist.popleft()
+            pending.remove(i)
+
+            # variables that are live-in at a successor are live-out
+            for successor in self.graph.successors(i):
+                live_out[i].update(live_in[successor])
+
+            # All variables that are accessed are live-in at a node, as are
+            # live out variables that are not defined
+            node = self.graph.node[i]
+            new_in = node['uses'] | (live_out[i] - {node['def_var']})
+            if new_in == live_in[i]:
+                continue
+            live_in[i] = new_in
+            for p in self.graph.predecessors(i):
+                if p not in pending:
+                    pending.add(p)
+                    worklist.append(p)
+
+        return live_in, live_out
+
+    def __update_liveness(self, live_in, live_out, variables, frontier):
+        """Recompute the liveness of variables after a node that used them
+        was deleted.
 
-                # variables that are live-in at a successor are live-out
-                for successor in self.graph.successors(i):
-                    live_out[i].update(live_in_prev[successor])
+        frontier holds the predecessors of the deleted node. Only the nodes
+        that reach the frontier while a variable is live may lose it, so
+        only their live sets are recomputed.
 
-            if live_in == live_in_prev and live_out == live_out_prev:
-                return live_in, live_out
+        :returns: The set of nodes whose live sets were recomputed.
+        """
+
+        g = self.graph
+        all_stale = set()
+        for var in variables:
+            stale = set()
+            stack = list(frontier)
+            while stack:
+                n = stack.pop()
+                if n in stale:
+                    continue
+                stale.add(n)
+                if var in live_in[n]:
+                    stack.extend(g.predecessors(n))
+
+            def reaches_live(n):
+                return any(s not in stale and var in live_in[s]
+                           for s in g.successors(n))
+
+            # var is live-in at the stale nodes that use it, or that reach a
+            # use of it without defining it
+            live = set()
+            stack = [n for n in stale
+                     if var in g.node[n]['uses'] or
+                     (g.node[n]['def_var'] != var and reaches_live(n))]
+            while stack:
+                n = stack.pop()
+                if n in live:
+                    continue
+                live.add(n)
+                stack.extend(p for p in g.predecessors(n)
+                             if p in stale and g.node[p]['def_var'] != var)
+
+            for n in stale:
+                if reaches_live(n) or any(s in live for s in g.successors(n)):
+                    live_out[n].add(var)
+                else:
+                    live_out[n].discard(var)
+            for n in stale:
+                if n in live:
+                    live_in[n].add(var)
+                else:
+                    live_in[n].discard(var)
+            all_stale |= stale
+
+        return all_stale
 
     def __delete_node(self, node):
         """Remove a node from the control flow graph.
@@ -197,13 +255,14 @@ class ControlFlowGraph(object):
         is reached.
         """
 
+        # Inlining A into B leaves every live set unchanged, except that B
+        # takes over the live-in set of A, so liveness is computed once.
+        live_in, live_out = self.compute_liveness()
+
         _continue = True
         while _continue:
-            live_in, live_out = self.compute_liveness()
             _continue = False
 
-            # TODO XXX O(N^2) algorithm
-
             # Walk through the program backwards, and try inlining line A into
             # line B according to the above logic.
             #
@@ -236,6 +295,8 @@ class ControlFlowGraph(object):
                     continue
 
                 self.__inline_node(nodeB, nodeA)
+                live_in[nodeB] = live_in.pop(nodeA)
+                del live_out[nodeA]
                 _continue = True
                 inlined_into = nodeB
 
@@ -243,24 +304,31 @@ class ControlFlowGraph(object):
         """Dead code elimination.
 
         Specifically: delete CFG nodes that define a variable that is not in
-        the live_out set. Recurse until convergence.
+        the live_out set. Deleting a node can only make the variables it uses
+        dead, so only their liveness is recomputed, and the nodes whose live
+        sets change are checked again, until convergence.
         """
 
-        _continue = True
-        while _continue:
-            _continue = False
-            live_in, live_out = self.compute_liveness()
-
-            for node in self.graph:
-                out_set = live_out[node]
-                def_var = self.graph.node[node]['def_var']
-
-                # Only delete nodes that 1) Define a variable (and therefore
-                # aren't STORE, etc.); 2) Are not required downstream.
-                if def_var and def_var not in out_set:
-                    self.__delete_node(node)
-                    _continue = True
-                    break
+        live_in, live_out = self.compute_liveness()
+
+        def is_dead(node):
+            # Only delete nodes that 1) Define a variable (and therefore
+            # aren't STORE, etc.); 2) Are not required downstream.
+            def_var = self.graph.node[node]['def_var']
+            return def_var and def_var not in live_out[node]
+
+        dead = set(n for n in self.graph if is_dead(n))
+        while dead:
+            node = dead.pop()
+            uses = self.graph.node[node]['uses']
+            predecessors = self.graph.predecessors(node)
+
+            self.__delete_node(node)
+            del live_in[node]
+            del live_out[node]
+            stale = self.__update_liveness(live_in, live_out, uses,
+                                           predecessors)
+            dead.update(n for n in stale if is_dead(n))
 
     def dead_loop_elimination(self):
         """Delete entire do/while loops whose results are not consumed.
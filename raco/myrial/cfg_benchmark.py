@@ -0,0 +1,103 @@
+"""Compile-time benchmark of the control flow graph optimizations.
+
+Generates long synthetic MyriaL programs -- chains of selections and joins,
+dead assignments, do/while loops and stores -- and times dead code
+elimination and chaining on their control flow graphs:
+
+    python -m raco.myrial.cfg_benchmark --statements 500 1000 2000
+"""
+
+import argparse
+import collections
+import random
+import time
+
+from raco import types
+from raco.fakedb import FakeDatabase
+import raco.myrial.interpreter as interpreter
+import raco.myrial.parser as parser
+import raco.scheme as scheme
+
+POINTS_KEY = 'public:adhoc:points'
+POINTS_SCHEMA = scheme.Scheme([('id', types.LONG_TYPE),
+                               ('x', types.DOUBLE_TYPE),
+                               ('y', types.DOUBLE_TYPE)])
+
+
+def synthetic_program(num_statements, seed=0):
+    """A MyriaL program of about num_statements statements"""
+    rng = random.Random(seed)
+    lines = ['v0 = SCAN(%s);' % POINTS_KEY]
+    live = ['v0']
+    i = 0
+    while len(lines) < num_statements:
+        i += 1
+        prev = live[-1]
+        kind = rng.random()
+        if kind < 0.4:
+            lines.append('v%d = [FROM %s WHERE x > %d EMIT *];'
+                         % (i, prev, i))
+        elif kind < 0.6:
+            other = rng.choice(live)
+            lines.append('v%d = [FROM %s AS a, %s AS b WHERE a.id == b.id '
+                         'EMIT a.id, a.x, b.y];' % (i, prev, other))
+        elif kind < 0.75:
+            # never used
+            lines.append('d%d = [FROM %s EMIT id, x, y];' % (i, prev))
+            continue
+        elif kind < 0.8:
+            lines.append('STORE(%s, OUTPUT%d);' % (prev, i))
+            continue
+        elif kind < 0.85:
+            lines += ['DO',
+                      '  v%d = [FROM %s WHERE x * y > %d EMIT *];'
+                      % (i, prev, i),
+                      '  c%d = [FROM v%d EMIT COUNT(*) > 0 AS cnt];' % (i, i),
+                      'WHILE c%d;' % i]
+        else:
+            lines.append('v%d = DISTINCT(%s);' % (i, prev))
+        live.append('v%d' % i)
+    lines.append('STORE(%s, OUTPUT);' % live[-1])
+    return '\n'.join(lines)
+
+
+def time_program(query, repeat=1):
+    """Seconds to evaluate the statements of query, and the best of repeat
+    runs of the control flow graph optimizations"""
+    db = FakeDatabase()
+    db.ingest(POINTS_KEY, collections.Counter(), POINTS_SCHEMA)
+
+    best = None
+    for _ in range(repeat):
+        # evaluation modifies the statements
+        statements = parser.Parser().parse(query)
+        processor = interpreter.StatementProcessor(db)
+        start = time.time()
+        processor.evaluate(statements)
+        evaluated = time.time()
+        processor.get_logical_plan()
+        elapsed = time.time() - evaluated
+        best = elapsed if best is None else min(best, elapsed)
+    return evaluated - start, best
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    arg_parser.add_argument('--statements', type=int, nargs='+',
+                            default=[250, 500, 1000, 2000],
+                            help='program sizes to time')
+    arg_parser.add_argument('--repeat', type=int, default=3,
+                            help='runs per program size')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args(argv)
+
+    print '%10s %10s %12s %12s' % ('statements', 'nodes', 'evaluate (s)',
+                                   'cfg opt (s)')
+    for n in args.statements:
+        query = synthetic_program(n, args.seed)
+        evaluate, cfg = time_program(query, args.repeat)
+        print '%10d %10d %12.3f %12.3f' % (n, query.count(';'), evaluate, cfg)
+
+
+if __name__ == '__main__':
+    main()
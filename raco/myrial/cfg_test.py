@@ -2,6 +2,7 @@
 
 import collections
 
+from raco.myrial import cfg_benchmark
 import raco.myrial.myrial_test as myrial_test
 import raco.scheme as scheme
 from raco import types
@@ -224,3 +225,18 @@ class CFGTest(myrial_test.MyrialTestCase):
 
         self.processor.cfg.apply_chaining()
         self.assertEquals(set(self.processor.cfg.graph.nodes()), {4, 6, 7})
+
+    def test_dead_code_elim_long_program(self):
+        query = cfg_benchmark.synthetic_program(300)
+        statements = self.parser.parse(query)
+        self.processor.evaluate(statements)
+        cfg = self.processor.cfg
+        defs = [n for n in cfg.graph if cfg.graph.node[n]['def_var']]
+
+        cfg.dead_code_elimination()
+        self.assertLess(len(cfg.graph), len(statements))
+        # every remaining definition is used
+        _, live_out = cfg.compute_liveness()
+        for n in defs:
+            if n in cfg.graph:
+                self.assertIn(cfg.graph.node[n]['def_var'], live_out[n])
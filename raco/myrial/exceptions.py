@@ -126,6 +126,15 @@ class NestedTupleExpressionException(MyrialCompileException):
         return "Illegal use of tuple expression on line %d" % self.lineno
 
 
+class NestedFlatmapException(MyrialCompileException):
+    def __init__(self, lineno):
+        self.lineno = lineno
+
+    def __str__(self):
+        return ("Flatmap function not outermost in emit expression on "
+                "line %d" % self.lineno)
+
+
 class InvalidEmitList(MyrialCompileException):
     def __init__(self, function, lineno):
         self.function = function
@@ -53,6 +53,15 @@ def check_assignment_compatability(before, after):
     check_binop_compatability("assignment", before, after)
 
 
+def apply_emitters(emit_args, op):
+    """Apply emit expressions to op; a FlatMap evaluates emit expressions
+    that return many values per tuple"""
+    if any(raco.expression.expression_contains_flatmap(ex)
+           for name, ex in emit_args):
+        return raco.algebra.FlatMap(emit_args, op)
+    return raco.algebra.Apply(emit_args, op)
+
+
 class ExpressionProcessor(object):
 
     """Convert syntactic expressions into relational algebra operations."""
@@ -99,9 +108,10 @@ class ExpressionProcessor(object):
         """Scan a database table."""
         assert isinstance(rel_key, relation_key.RelationKey)
         scheme = self._get_scan_scheme(rel_key)
-        return raco.algebra.Scan(rel_key, scheme,
-                                 self.catalog.num_tuples(rel_key),
-                                 self.catalog.partitioning(rel_key))
+        return raco.algebra.Scan(
+            rel_key, scheme, self.catalog.num_tuples(rel_key),
+            self.catalog.partitioning(rel_key),
+            statistics=self.catalog.column_statistics(rel_key))
 
     def samplescan(self, rel_key, samp_size, is_pct, samp_type):
         """Sample a base relation."""
@@ -135,7 +145,7 @@ class ExpressionProcessor(object):
         emit_args = [(name, multiway.rewrite_refs(sexpr, from_args, info))
                      for (name, sexpr) in emit_args]
 
-        return raco.algebra.Apply(emitters=emit_args, input=op)
+        return apply_emitters(emit_args, op)
 
     @staticmethod
     def empty(_scheme):
@@ -251,7 +261,7 @@ class ExpressionProcessor(object):
             if not (len(from_args) == 1 and len(emit_clause) == 1 and
                     isinstance(emit_clause[0],
                                (TableWildcardEmitArg, FullWildcardEmitArg))):
-                op = raco.algebra.Apply(emit_args, op)
+                op = apply_emitters(emit_args, op)
 
         if orderby_clause:
             if limit_clause is None:
@@ -591,7 +601,7 @@ class StatementProcessor(object):
             if kwargs.get('multiway_join', False):
                 target_phys_algebra = MyriaHyperCubeAlgebra(self.catalog)
             else:
-                target_phys_algebra = MyriaLeftDeepTreeAlgebra()
+                target_phys_algebra = MyriaLeftDeepTreeAlgebra(self.catalog)
 
         return self.__get_physical_plan_for__(target_phys_algebra, **kwargs)
 
@@ -1,4 +1,6 @@
 import collections
+import copy
+import itertools
 import random
 import sys
 import re
@@ -14,13 +16,15 @@ from raco.backends.myria import (
     MyriaBroadcastConsumer, MyriaQueryScan, MyriaSplitConsumer, MyriaUnionAll,
     MyriaBroadcastProducer, MyriaScan, MyriaSelect, MyriaSplitProducer,
     MyriaDupElim, MyriaGroupBy, MyriaIDBController, MyriaSymmetricHashJoin,
-    compile_to_json)
+    MyriaBloomFilterProbe, compile_to_json, fragment_memory_estimates)
 from raco.backends.myria import (MyriaLeftDeepTreeAlgebra,
                                  MyriaHyperCubeAlgebra)
-from raco.compile import optimize
+from raco.compile import optimize, optimize_by_rules
+from raco.rules import ChooseDistinctStrategy
 from raco import relation_key
 from raco.catalog import FakeCatalog
 
+import raco.fakedb
 import raco.scheme as scheme
 import raco.myrial.myrial_test as myrial_test
 from raco import types
@@ -68,10 +72,13 @@ class OptimizerTest(myrial_test.MyrialTestCase):
         self.db.ingest(self.broad_key, self.broad_data,
                        self.broad_scheme, self.broad_partition)
 
-    @staticmethod
-    def logical_to_physical(lp, **kwargs):
+    # servers of the catalog that hypercube plans are optimized for
+    hypercube_servers = 64
+
+    def logical_to_physical(self, lp, **kwargs):
         if kwargs.get('hypercube', False):
-            algebra = MyriaHyperCubeAlgebra(FakeCatalog(64))
+            algebra = MyriaHyperCubeAlgebra(
+                FakeCatalog(self.hypercube_servers))
         else:
             algebra = MyriaLeftDeepTreeAlgebra()
         return optimize(lp, algebra, **kwargs)
@@ -483,8 +490,106 @@ class OptimizerTest(myrial_test.MyrialTestCase):
             if isinstance(op, Distinct):
                 self.assertIsInstance(op.input, MyriaShuffleConsumer)
                 self.assertIsInstance(op.input.input, MyriaShuffleProducer)
+                self.assertEquals(op.strategy, Distinct.Strategy.Hash)
                 break
 
+    def test_sort_distinct_over_memory_budget(self):
+        query = """
+        T = DISTINCT(SCAN(public:adhoc:Z));
+        STORE(T, OUTPUT);
+        """
+
+        lp = self.get_logical_plan(query)
+        pp = self.logical_to_physical(copy.deepcopy(lp), memory_budget=1)
+        # Myria always eliminates duplicates with a hash table
+        self.assertEquals([op.strategy for op in pp.walk()
+                           if isinstance(op, MyriaDupElim)],
+                          [Distinct.Strategy.Hash] * 2)
+
+        pp = optimize_by_rules(pp, [ChooseDistinctStrategy(memory_budget=1)])
+        dupelims = [op for op in pp.walk() if isinstance(op, MyriaDupElim)]
+        self.assertEquals(len(dupelims), 2)  # distributed
+        for op in dupelims:
+            self.assertEquals(op.strategy, Distinct.Strategy.Sort)
+            self.assertGreater(op.memory_estimate(), 1)
+
+        self.db.evaluate(pp)
+        result = self.db.get_table('OUTPUT')
+        self.assertEquals(result, collections.Counter(set(self.z_data)))
+
+        # a budget that holds the hash table keeps it
+        pp = optimize_by_rules(pp, [ChooseDistinctStrategy(
+            memory_budget=1 << 30)])
+        self.assertNotIn(Distinct.Strategy.Sort,
+                         [op.strategy for op in pp.walk()
+                          if isinstance(op, MyriaDupElim)])
+
+    def test_memory_budget_builds_smaller_join_side(self):
+        query = """
+        X = SCAN(public:adhoc:X);
+        Z = SCAN(public:adhoc:Z);
+        J = [FROM X, Z WHERE X.a = Z.src EMIT X.b, Z.dst];
+        STORE(J, OUTPUT);
+        """
+
+        lp = self.get_logical_plan(query)
+        pp = self.logical_to_physical(copy.deepcopy(lp))
+        joins = [op for op in pp.walk()
+                 if isinstance(op, MyriaSymmetricHashJoin)]
+        self.assertEquals([j.pull_order_policy for j in joins],
+                          ['ALTERNATE'])
+        both = joins[0].memory_estimate()
+
+        pp = self.logical_to_physical(copy.deepcopy(lp), memory_budget=1)
+        joins = [op for op in pp.walk()
+                 if isinstance(op, MyriaSymmetricHashJoin)]
+        self.assertEquals(len(joins), 1)
+        join = joins[0]
+        # Z, the smaller input, is the only hash table built
+        z_side = 'LEFT_EOS' if join.left.scheme() == self.z_scheme \
+            else 'RIGHT_EOS'
+        self.assertEquals(join.pull_order_policy, z_side)
+        self.assertLess(join.memory_estimate(), both)
+
+        self.db.evaluate(pp)
+        expected = collections.Counter(
+            [(b, dst) for (a, b, c) in self.x_data.elements()
+             for (src, dst) in self.z_data.elements() if a == src])
+        self.assertEquals(self.db.get_table('OUTPUT'), expected)
+
+    def test_memory_budget_forces_splits(self):
+        query = """
+        X = SCAN(public:adhoc:X);
+        Y = SCAN(public:adhoc:Y);
+        J = [FROM X, Y WHERE X.a = Y.d EMIT X.b, COUNT(*)];
+        STORE(J, OUTPUT);
+        """
+
+        lp = self.get_logical_plan(query)
+        pp = self.logical_to_physical(copy.deepcopy(lp), add_splits=False,
+                                      memory_budget=1 << 30)
+        self.assertEquals(self.get_count(pp, MyriaSplitProducer), 0)
+        unsplit = fragment_memory_estimates(pp)
+
+        pp = self.logical_to_physical(copy.deepcopy(lp), add_splits=False,
+                                      memory_budget=1)
+        self.assertGreater(self.get_count(pp, MyriaSplitProducer), 0)
+        split = fragment_memory_estimates(pp)
+        self.assertGreater(len(split), len(unsplit))
+        self.assertLess(max(m for _, m in split),
+                        max(m for _, m in unsplit))
+        # every operator is in exactly one fragment
+        self.assertEquals(sum(len(f) for f, _ in split),
+                          len(list(pp.walk())))
+
+        self.db.evaluate(pp)
+        expected = collections.Counter(
+            [(b, d) for (a, b, c) in self.x_data.elements()
+             for (d, e, f) in self.y_data.elements() if a == d])
+        counts = collections.Counter(b for b, _ in expected.elements())
+        self.assertEquals(self.db.get_table('OUTPUT'),
+                          collections.Counter(counts.items()))
+
     def test_shuffle_before_difference(self):
         query = """
         T = DIFF(SCAN(public:adhoc:Z), SCAN(public:adhoc:Z));
@@ -547,8 +652,31 @@ class OptimizerTest(myrial_test.MyrialTestCase):
         store(out, OUTPUT);
         """.format(x=self.x_key, y=self.y_key, z=self.z_key)
 
+        # OrderJoins moves the smaller z to the right, which is broadcast,
+        # and restores the column order above the cross product
         pp = self.get_physical_plan(query)
         counter = 0
+        for op in pp.walk():
+            if isinstance(op, CrossProduct):
+                counter += 1
+                self.assertIsInstance(op.right, MyriaBroadcastConsumer)
+                self.assertEquals(op.right.scheme(), self.z_scheme)
+        self.assertEquals(counter, 1)
+        self.assertEquals(pp.scheme(), self.z_scheme + self.y_scheme)
+
+    def test_broadcast_cardinality_left_unordered(self):
+        # x and y have the same cardinality, z is smaller
+        query = """
+        x = scan({x});
+        y = scan({y});
+        z = scan({z});
+        out = [from z, y emit *];
+        store(out, OUTPUT);
+        """.format(x=self.x_key, y=self.y_key, z=self.z_key)
+
+        # without OrderJoins, the smaller input on the left is broadcast
+        pp = self.get_physical_plan(query, no_OrderJoins=True)
+        counter = 0
         for op in pp.walk():
             if isinstance(op, CrossProduct):
                 counter += 1
@@ -565,8 +693,32 @@ class OptimizerTest(myrial_test.MyrialTestCase):
         store(out, OUTPUT);
         """.format(x=self.x_key, y=self.y_key, z=self.z_key)
 
+        # OrderJoins moves the single count to the right, which is
+        # broadcast
         pp = self.get_physical_plan(query)
         counter = 0
+        for op in pp.walk():
+            if isinstance(op, CrossProduct):
+                counter += 1
+                self.assertIsInstance(op.right, MyriaBroadcastConsumer)
+                self.assertEquals(self.get_count(op.right, GroupBy), 2)
+        self.assertEquals(counter, 1)
+        self.assertEquals(pp.scheme().get_names()[1:],
+                          self.z_scheme.get_names())
+
+    def test_broadcast_cardinality_with_agg_unordered(self):
+        # x and y have the same cardinality, z is smaller
+        query = """
+        x = scan({x});
+        y = countall(scan({y}));
+        z = scan({z});
+        out = [from y, z emit *];
+        store(out, OUTPUT);
+        """.format(x=self.x_key, y=self.y_key, z=self.z_key)
+
+        # without OrderJoins, the count on the left is broadcast
+        pp = self.get_physical_plan(query, no_OrderJoins=True)
+        counter = 0
         for op in pp.walk():
             if isinstance(op, CrossProduct):
                 counter += 1
@@ -1031,6 +1183,10 @@ class OptimizerTest(myrial_test.MyrialTestCase):
         self.assertEquals(self.get_count(pp, MyriaShuffleConsumer), 0)
         self.assertEquals(self.get_count(pp, MyriaShuffleProducer), 0)
         self.assertEquals(self.get_count(pp, MyriaDupElim), 1)
+        strategies = optimize_by_rules(pp, [ChooseDistinctStrategy()])
+        self.assertEquals([op.strategy for op in strategies.walk()
+                           if isinstance(op, MyriaDupElim)],
+                          [Distinct.Strategy.Partitioned])
 
         self.db.evaluate(pp)
         result = self.db.get_table('OUTPUT')
@@ -1232,11 +1388,210 @@ class OptimizerTest(myrial_test.MyrialTestCase):
 
         self.assertEquals(self.get_count(pp, MyriaBroadcastProducer), 0)
         self.assertEquals(self.get_count(pp, MyriaBroadcastConsumer), 0)
-        self.assertEquals(self.get_count(pp, MyriaShuffleProducer), 1)
-        self.assertEquals(self.get_count(pp, MyriaShuffleConsumer), 1)
+        # every worker has all of b, so x is joined where it is
+        self.assertEquals(self.get_count(pp, MyriaShuffleProducer), 0)
+        self.assertEquals(self.get_count(pp, MyriaShuffleConsumer), 0)
         self.assertEquals(pp.partitioning().broadcasted,
                           RepresentationProperties().broadcasted)
 
+    def test_broadcast_small_join_input(self):
+        query = """
+        x = scan({x});
+        z = scan({z});
+        out = [from x, z where x.a == z.src emit *];
+        store(out, OUTPUT);
+        """.format(x=self.x_key, z=self.z_key)
+        lp = self.get_logical_plan(query)
+
+        # sending z's 4 tuples to each of 2 servers beats shuffling
+        algebra = MyriaLeftDeepTreeAlgebra(FakeCatalog(2))
+        pp = optimize(copy.deepcopy(lp), algebra)
+        self.assertEquals(self.get_count(pp, MyriaBroadcastProducer), 1)
+        self.assertEquals(self.get_count(pp, MyriaShuffleProducer), 0)
+        [join] = [op for op in pp.walk()
+                  if isinstance(op, MyriaSymmetricHashJoin)]
+        self.assertIsInstance(join.right, MyriaBroadcastConsumer)
+
+        # but not to each of 64 servers
+        algebra = MyriaLeftDeepTreeAlgebra(FakeCatalog(64))
+        pp = optimize(copy.deepcopy(lp), algebra)
+        self.assertEquals(self.get_count(pp, MyriaBroadcastProducer), 0)
+        self.assertEquals(self.get_count(pp, MyriaShuffleProducer), 2)
+
+    def test_copartitioned_join_not_broadcast(self):
+        query = """
+        p1 = scan({part});
+        p2 = scan({part});
+        out = [from p1, p2 where p1.h == p2.h emit *];
+        store(out, OUTPUT);
+        """.format(part=self.part_key)
+        lp = self.get_logical_plan(query)
+        pp = optimize(lp, MyriaLeftDeepTreeAlgebra(FakeCatalog(2)))
+        self.assertEquals(self.get_count(pp, MyriaBroadcastProducer), 0)
+        self.assertEquals(self.get_count(pp, MyriaShuffleProducer), 0)
+
+    def test_bloom_filter_before_shuffle(self):
+        query = """
+        x = scan({x});
+        z = scan({z});
+        out = [from x, z where x.a == z.src emit *];
+        store(out, OUTPUT);
+        """.format(x=self.x_key, z=self.z_key)
+        lp = self.get_logical_plan(query)
+        expected = self.db.evaluate_to_bag(
+            self.logical_to_physical(copy.deepcopy(lp)).input)
+
+        pp = self.logical_to_physical(lp, bloom_filters=True)
+        self.assertEquals(self.get_count(pp, MyriaBroadcastProducer), 1)
+        self.assertEquals(self.get_count(pp, MyriaShuffleProducer), 2)
+
+        # x is filtered by the keys of z before it is shuffled
+        [probe] = [op.input for op in pp.walk()
+                   if isinstance(op, MyriaShuffleProducer) and
+                   isinstance(op.input, MyriaBloomFilterProbe)]
+        self.assertIsInstance(probe.left, MyriaScan)
+        self.assertEquals(probe.left.relation_key, self.x_key)
+        self.assertIsInstance(probe.right, MyriaBroadcastConsumer)
+        self.assertEquals(self.db.evaluate_to_bag(pp.input), expected)
+
+        plan = compile_to_json(query, lp, pp, 'myrial')
+        ops = [op for frag in plan['plan']['fragments']
+               for op in frag['operators']]
+        [build] = [op for op in ops if op['opType'] == 'BloomFilterBuild']
+        [probe] = [op for op in ops if op['opType'] == 'BloomFilterProbe']
+        self.assertEquals(build['argColumns'], [0])
+        self.assertEquals(probe['argColumns'], [0])
+        self.assertEquals(build['numBits'], probe['numBits'])
+
+    def test_no_bloom_filter_of_random_input(self):
+        """The filter and the join would see different random samples"""
+        query = """
+        x = scan({x});
+        z = [from scan({z}) as z where random() < 0.5 emit *];
+        out = [from x, z where x.a == z.src emit *];
+        store(out, OUTPUT);
+        """.format(x=self.x_key, z=self.z_key)
+        pp = self.logical_to_physical(self.get_logical_plan(query),
+                                      bloom_filters=True)
+        self.assertEquals(self.get_count(pp, MyriaBloomFilterProbe), 0)
+
+    def test_skewed_join_shuffle(self):
+        # half of the tuples of skew have the key 1
+        skew_key = relation_key.RelationKey.from_string("public:adhoc:skew")
+        self.db.ingest(skew_key, collections.Counter(
+            [(1, i) for i in range(20)] + [(i, i) for i in range(20)]),
+            self.z_scheme)
+        query = """
+        x = scan({x});
+        s = scan({s});
+        out = [from x, s where x.a == s.src emit *];
+        store(out, OUTPUT);
+        """.format(x=self.x_key, s=skew_key)
+        lp = self.get_logical_plan(query)
+        pp = optimize(lp, MyriaLeftDeepTreeAlgebra(FakeCatalog(4)))
+        [join] = [op for op in pp.walk()
+                  if isinstance(op, MyriaSymmetricHashJoin)]
+        expected = self.db.evaluate_to_bag(join)
+        producers = [c.input for c in join.children()]
+        self.assertTrue(all(p.shuffle_type == Shuffle.ShuffleType.SkewedHash
+                            for p in producers))
+        self.assertEquals([p.heavy_hitters for p in producers], [[(1,)]] * 2)
+        # skew's key 1 is sent round robin, x's is broadcast
+        [split] = [p for p in producers if not p.broadcast_heavy_hitters]
+        self.assertEquals(split.input.relation_key, skew_key)
+
+        # the joins of what each worker receives make up the whole join
+        workers = zip(*[self.db.distribute(p, 4) for p in producers])
+        self.assertTrue(all(sum(part[producers.index(split)].values()) < 20
+                            for part in workers))
+        sch = join.left.scheme() + join.right.scheme()
+        actual = collections.Counter()
+        for left, right in workers:
+            for (lt, lc), (rt, rc) in itertools.product(left.items(),
+                                                        right.items()):
+                if join.condition.evaluate(lt + rt, sch):
+                    tpl = lt + rt
+                    actual[tuple(tpl[c.position]
+                                 for c in join.output_columns)] += lc * rc
+        self.assertEquals(actual, expected)
+
+        plan = compile_to_json(query, lp, pp, 'myrial')
+        dfs = [op['distributeFunction']
+               for frag in plan['plan']['fragments']
+               for op in frag['operators']
+               if op['opType'] == 'ShuffleProducer']
+        self.assertEquals(sorted(df['heavyHitterDistribution'] for df in dfs),
+                          ['Broadcast', 'RoundRobin'])
+        self.assertEquals(dfs[0]['heavyHitters'], [[1]])
+
+    def test_pre_aggregate_below_join(self):
+        # many tuples of facts share each of their few join keys
+        facts_key = relation_key.RelationKey.from_string(
+            "public:adhoc:facts")
+        self.db.ingest(facts_key, collections.Counter(
+            [(i % 3, i, i % 5) for i in range(60)]), self.x_scheme)
+        query = """
+        f = scan({f});
+        y = scan({y});
+        out = [from f, y where f.a == y.d
+               emit y.e, sum(f.b) as s, count(*) as n, avg(f.c) as m];
+        store(out, OUTPUT);
+        """.format(f=facts_key, y=self.y_key)
+        lp = self.get_logical_plan(query)
+        pp = optimize(copy.deepcopy(lp),
+                      MyriaLeftDeepTreeAlgebra(FakeCatalog(4)))
+        [join] = [op for op in pp.walk()
+                  if isinstance(op, MyriaSymmetricHashJoin)]
+        partial = [op for op in join.walk() if isinstance(op, GroupBy)]
+        self.assertEquals(len(partial), 1)
+        self.assertLessEqual(partial[0].num_tuples(), 3)
+
+        no_pre_agg = optimize(copy.deepcopy(lp),
+                              MyriaLeftDeepTreeAlgebra(FakeCatalog(4)),
+                              no_PreAggregateBelowJoin=True)
+        self.assertEquals(self.get_count(no_pre_agg, GroupBy),
+                          self.get_count(pp, GroupBy) - 1)
+
+        self.db.evaluate(no_pre_agg)
+        expected = self.db.get_table('OUTPUT')
+        self.db.evaluate(pp)
+        self.assertEquals(self.db.get_table('OUTPUT'), expected)
+        self.assertEquals(self.db.get_scheme('OUTPUT').get_names(),
+                          ['e', 's', 'n', 'm'])
+
+    def test_common_subexpression_elimination(self):
+        query = """
+        a = [from scan({x}) as x, scan({y}) as y
+             where x.a == y.d and x.b > 3 emit x.a, y.e];
+        store(a, OUTPUT1);
+        b = [from scan({x}) as x, scan({y}) as y
+             where x.a == y.d and x.b > 3 emit x.c, y.f];
+        store(b, OUTPUT2);
+        c = [from scan({x}) as x emit *];
+        store(c, OUTPUT3);
+        d = [from scan({x}) as x emit *];
+        store(d, OUTPUT4);
+        """.format(x=self.x_key, y=self.y_key)
+        lp = self.get_logical_plan(query)
+        pp = self.logical_to_physical(copy.deepcopy(lp))
+
+        # the join is computed once, the scans of x are not shared
+        [temp] = [op for op in pp.walk()
+                  if isinstance(op, StoreTemp) and op.name.startswith('__')]
+        self.assertEquals(self.get_count(temp, Join), 1)
+        self.assertEquals(self.get_count(pp, Join), 1)
+        self.assertEquals(
+            len([op for op in pp.walk() if isinstance(op, ScanTemp) and
+                 op.name == temp.name]), 2)
+        self.assertEquals(self.get_count(pp, Scan), 4)
+
+        outputs = ['OUTPUT%d' % i for i in range(1, 5)]
+        self.db.evaluate(pp)
+        shared = [self.db.get_table(o) for o in outputs]
+        self.db.evaluate(self.logical_to_physical(
+            lp, no_CommonSubexpressionElimination=True))
+        self.assertEquals(shared, [self.db.get_table(o) for o in outputs])
+
     def test_flatten_unionall(self):
         """Test flattening a chain of UnionAlls"""
         query = """
@@ -1463,3 +1818,12 @@ class OptimizerTest(myrial_test.MyrialTestCase):
         self.assertIsInstance(pp.input.input, MyriaShuffleProducer)
         self.assertIsInstance(pp.input.input.input, Select)
         self.assertIsInstance(pp.input.input.input.input, FileScan)
+
+
+class MultiWorkerOptimizerTest(OptimizerTest):
+    """Evaluate the physical plans on four simulated workers"""
+
+    hypercube_servers = 4
+
+    def create_db(self):
+        return raco.fakedb.FakeDatabase(workers=4)
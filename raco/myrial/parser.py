@@ -77,6 +77,14 @@ def check_no_tuple_expression(ex, lineno):
         raise NestedTupleExpressionException(lineno)
 
 
+def check_no_nested_flatmap(ex, lineno):
+    """Flatmap functions are only evaluated as the outermost expression of
+    an emit argument, which the FlatMap operator expands into many tuples"""
+    if any(sexpr.expression_contains_flatmap(sx)
+           for sx in ex.get_children()):
+        raise NestedFlatmapException(lineno)
+
+
 def check_simple_expression(ex, lineno):
     check_no_tuple_expression(ex, lineno)
     sexpr.check_no_aggregate(ex, lineno)
@@ -793,6 +801,8 @@ class Parser(object):
         """opt_where_clause : WHERE sexpr
                             | empty"""
         if len(p) == 3:
+            if sexpr.expression_contains_flatmap(p[2]):
+                raise NestedFlatmapException(p.lineno(1))
             p[0] = p[2]
         else:
             p[0] = None
@@ -861,6 +871,10 @@ class Parser(object):
         for ssx in emitters:
             check_no_tuple_expression(ssx, p.lineno(0))
 
+        # Verify that flatmap functions are not nested in other expressions
+        for ssx in emitters:
+            check_no_nested_flatmap(ssx, p.lineno(0))
+
         p[0] = emitarg.NaryEmitArg(names, emitters, Parser.statemods)
         Parser.statemods = []
 
@@ -0,0 +1,223 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftORleftANDrightNOTleftEQEQUALSNEGTLTLEGELIKEleftPLUSMINUSleftTIMESDIVIDEIDIVIDEMODrightUMINUSALTERNATE AND APPLY AS ASC ASYNC BLOB BLOB_LITERAL BOOLEAN BROADCAST BUILD_EDB CASE COLON COMMA CONST CONVERGENCE COUNT COUNTALL CROSS CSV DEF DESC DIFF DISTINCT DIVIDE DO DOLLAR DOT DUMP ELSE EMIT EMPTY END EQ EQUALS EXPORT FALSE FLOAT FLOAT_LITERAL FROM GE GE2 GT HASH ID IDIVIDE INT INTEGER_LITERAL INTERSECT JOIN LARROW LBRACE LBRACKET LE LE2 LIKE LIMIT LOAD LPAREN LT MINUS MOD NE NE2 NE3 NOT OPP OR ORDERBY PLUS PULL_EDB PULL_IDB RBRACE RBRACKET ROUND_ROBIN RPAREN SAMPLESCAN SCAN SCHEMA SELECT SEMI SINK STORE STRING STRING_LITERAL SYNC THEN TIMES TIPSY TRUE UDA UNION UNIONALL UNTIL WHEN WHERE WHILE WORKER_IDtranslation_unit_list : translation_unit_list translation_unit\n                                 | translation_unittranslation_unit : statement\n                            | constant\n                            | udf\n                            | apply\n                            | uda\n                            | decomposable_udaunreserved_id : IDunreserved_id_list : unreserved_id_list COMMA unreserved_id\n                              | unreserved_idudf : DEF unreserved_id LPAREN optional_arg_list RPAREN COLON sexpr SEMIudf : DEF unreserved_id LPAREN optional_arg_list RPAREN COLON table_literal SEMIconstant : CONST unreserved_id COLON sexpr SEMIoptional_arg_list : function_arg_list\n                             | emptyrecursion_mode : SYNC\n                          | ASYNC\n                          | emptypull_order_policy : ALTERNATE\n                             | PULL_IDB\n                             | PULL_EDB\n                             | BUILD_EDB\n                             | emptyfunction_arg_list : function_arg_list COMMA unreserved_id\n                             | unreserved_idstatefunc_emit_list : LBRACKET sexpr_list RBRACKET SEMI\n                               | sexpr SEMI\n                               | emptydecomposable_uda : UDA TIMES unreserved_id LBRACE unreserved_id COMMA unreserved_id RBRACE SEMIuda : UDA unreserved_id LPAREN optional_arg_list RPAREN LBRACE         table_literal SEMI LBRACKET sexpr_list RBRACKET SEMI statefunc_emit_list RBRACE SEMIapply : APPLY unreserved_id LPAREN optional_arg_list RPAREN LBRACE         table_literal SEMI LBRACKET sexpr_list RBRACKET SEMI statefunc_emit_list RBRACE SEMIstatement : unreserved_id EQUALS rvalue SEMIidbassign : unreserved_id EQUALS LBRACKET emit_arg_list             RBRACKET LARROW rvalue SEMIstatement : SEMIrvalue : expression\n                  | select_from_whereidbassign_list : idbassign_list idbassign\n                          | idbassignstatement_list : statement_list statement\n                          | statementstatement : DO statement_list WHILE expression SEMIstatement : DO idbassign_list UNTIL CONVERGENCE recursion_mode pull_order_policy SEMIstatement : STORE LPAREN unreserved_id COMMA relation_key optional_part_info RPAREN SEMIstatement : SINK LPAREN unreserved_id RPAREN SEMIstatement : EXPORT LPAREN unreserved_id COMMA STRING_LITERAL RPAREN SEMIstatement : DUMP LPAREN unreserved_id RPAREN SEMIoptional_part_info : COMMA LBRACKET column_ref_list RBRACKET\n                              | COMMA HASH LPAREN column_ref_list RPAREN\n                              | COMMA BROADCAST LPAREN RPAREN\n                              | COMMA ROUND_ROBIN LPAREN RPAREN\n                              | emptyexpression : unreserved_idsexpr_list : sexpr_list COMMA sexpr\n                      | sexprexpression : table_literaltable_literal : LBRACKET emit_arg_list RBRACKETexpression : EMPTY LPAREN column_def_list RPARENexpression : SCAN LPAREN relation_key RPARENexpression : SAMPLESCAN LPAREN relation_key COMMA INTEGER_LITERAL RPAREN\n                      | SAMPLESCAN LPAREN relation_key COMMA INTEGER_LITERAL MOD RPAREN\n                      | SAMPLESCAN LPAREN relation_key COMMA FLOAT_LITERAL MOD RPAREN\n                      | SAMPLESCAN LPAREN relation_key COMMA INTEGER_LITERAL COMMA string_arg RPAREN\n                      | SAMPLESCAN LPAREN relation_key COMMA INTEGER_LITERAL MOD COMMA string_arg RPAREN\n                      | SAMPLESCAN LPAREN relation_key COMMA FLOAT_LITERAL MOD COMMA string_arg RPARENexpression : LOAD LPAREN STRING_LITERAL COMMA file_parser_fun RPARENrelation_key : string_arg\n                        | string_arg COLON string_arg\n                        | string_arg COLON string_arg COLON string_argcolumn_def_list : column_def_list COMMA column_def\n                           | column_defcolumn_def : unreserved_id COLON type_nameschema_fun : SCHEMA LPAREN column_def_list RPARENfile_parser_fun : CSV LPAREN    schema_fun COMMA option_list RPAREN\n | CSV LPAREN schema_fun RPAREN\n | OPP LPAREN RPAREN\n | TIPSY LPAREN implicit_tipsy_schema empty option_list RPAREN\n | TIPSY LPAREN implicit_tipsy_schema RPARENimplicit_tipsy_schema : emptyoption_list : option_list COMMA option\n                           | optionoption : unreserved_id EQUALS literal_argliteral_arg : STRING_LITERAL\n                       | INTEGER_LITERAL\n                       | FLOAT_LITERAL\n                       | BLOB_LITERAL\n                       | TRUE\n                       | FALSEtype_name : STRING\n                     | INT\n                     | BOOLEAN\n                     | FLOAT\n                     | BLOBstring_arg : unreserved_id\n                      | STRING_LITERALexpression : LBRACKET FROM from_arg_list opt_where_clause         EMIT emit_arg_list opt_orderby_clause opt_limit RBRACKETfrom_arg_list : from_arg_list COMMA from_arg\n                         | from_argfrom_arg : expression optional_as unreserved_id\n                    | unreserved_idoptional_as : AS\n                       | emptyopt_where_clause : WHERE sexpr\n                            | emptyopt_orderby_clause : ORDERBY orderby_arg_list\n                              | emptyorderby_arg_list : orderby_arg_list COMMA orderby_arg\n                            | orderby_argorderby_arg : column_ref ASC\n                        | column_ref DESC\n                        | column_refemit_arg_list : emit_arg_list COMMA emit_arg\n                         | emit_argemit_arg : sexpr AS LBRACKET unreserved_id_list RBRACKET\n                    | sexpr AS unreserved_id\n                    | sexpremit_arg : unreserved_id DOT TIMESemit_arg : TIMESexpression : LPAREN select_from_where RPARENselect_from_where : SELECT opt_distinct emit_arg_list FROM from_arg_list          opt_where_clause opt_orderby_clause opt_limitopt_distinct : DISTINCT\n                        | emptyopt_limit : LIMIT INTEGER_LITERAL\n                     | emptyexpression : LIMIT LPAREN expression COMMA INTEGER_LITERAL RPARENexpression : DISTINCT LPAREN expression RPARENexpression : COUNTALL LPAREN expression RPARENexpression : setop LPAREN expression COMMA expression RPARENexpression : UNIONALL LPAREN expression_list RPARENexpression_list : expression COMMA expression_list\n                           | expressionsetop : INTERSECT\n                 | DIFF\n                 | UNIONexpression : expression PLUS expressionexpression : CROSS LPAREN expression COMMA expression RPARENexpression : JOIN LPAREN join_argument COMMA join_argument RPARENjoin_argument : expression COMMA LPAREN column_ref_list RPARENjoin_argument : expression COMMA column_refcolumn_ref_list : column_ref_list COMMA column_ref\n                           | column_refcolumn_ref : unreserved_idcolumn_ref : DOLLAR INTEGER_LITERALsexpr : INTEGER_LITERALsexpr : STRING_LITERALsexpr : FLOAT_LITERALsexpr : TRUE\n                 | FALSEsexpr : BLOB_LITERALsexpr : unreserved_idsexpr : DOLLAR INTEGER_LITERALsexpr : unreserved_id DOT column_refsexpr : LPAREN sexpr RPARENsexpr : MINUS sexpr %prec UMINUSsexpr : WORKER_ID LPAREN RPARENsexpr : sexpr PLUS sexpr\n                   | sexpr MINUS sexpr\n                   | sexpr TIMES sexpr\n                   | sexpr DIVIDE sexpr\n                   | sexpr IDIVIDE sexpr\n                   | sexpr MOD sexpr\n                   | sexpr GT sexpr\n                   | sexpr LT sexpr\n                   | sexpr GE sexpr\n                   | sexpr GE2 sexpr\n                   | sexpr LE sexpr\n                   | sexpr LE2 sexpr\n                   | sexpr NE sexpr\n                   | sexpr NE2 sexpr\n                   | sexpr NE3 sexpr\n                   | sexpr EQ sexpr\n                   | sexpr EQUALS sexpr\n                   | sexpr AND sexpr\n                   | sexpr OR sexpr\n                   | sexpr LIKE sexprsexpr : NOT sexprsexpr : ID LPAREN function_param_list RPARENsexpr : ID LPAREN RPARENfunction_param_list : function_param_list COMMA sexpr\n                               | sexprsexpr : COUNTALL LPAREN RPARENsexpr : COUNT LPAREN count_arg RPARENsexpr : type_name LPAREN sexpr RPARENcount_arg : TIMES\n                     | sexprsexpr : TIMES unreserved_id optional_column_refwhen_expr : WHEN sexpr THEN sexprwhen_expr_list : when_expr_list when_expr\n                          | when_expr\n        sexpr : CASE when_expr_list ELSE sexpr ENDoptional_column_ref : DOT column_ref\n                               | emptyempty :'
+    
+_lr_action_items = {'LBRACKET':([34,40,41,74,112,117,119,121,125,127,131,132,133,192,264,266,267,272,276,289,292,296,297,298,302,352,377,441,448,],[54,76,54,136,54,54,54,54,54,54,54,54,54,275,314,314,318,54,54,54,54,54,54,314,54,380,403,451,451,]),'INTEGER_LITERAL':([44,54,59,76,81,89,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,261,264,277,284,291,304,309,314,327,380,403,413,425,441,443,448,451,],[94,94,-193,94,94,172,94,94,-121,-122,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,94,310,94,94,329,334,94,94,94,94,94,94,431,94,94,458,94,94,]),'LIMIT':([16,34,40,41,80,85,86,93,94,95,96,99,112,114,115,116,117,118,119,121,125,127,131,132,133,165,172,173,178,194,195,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,259,260,262,272,273,274,276,278,283,289,292,296,297,302,305,306,307,308,310,325,326,328,332,347,362,363,365,389,390,391,409,410,411,427,428,442,],[-9,55,55,55,-147,-146,-149,-9,-144,-148,-145,-150,55,-116,-113,-118,55,-150,55,55,55,55,55,55,55,-154,-151,-193,-176,-98,-100,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-178,-152,-142,55,-112,-115,55,-104,-117,55,55,55,55,55,-183,-182,-191,-177,-143,-97,-103,-99,-193,-190,-114,-193,-193,413,-106,413,-108,-111,-105,-109,-110,-107,]),'TRUE':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,304,309,314,327,380,403,425,441,443,448,451,],[80,80,-193,80,80,80,80,-121,-122,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,80,457,80,80,]),'MINUS':([16,44,54,59,76,79,80,81,85,86,92,93,94,95,96,99,102,114,118,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,165,168,169,171,172,173,175,176,178,191,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,245,246,247,248,249,252,254,255,256,257,259,260,262,264,277,303,304,305,306,307,308,309,310,313,314,326,327,347,348,349,380,403,405,425,440,441,448,450,451,],[-9,81,81,-193,81,145,-147,81,-146,-149,81,-9,-144,-148,-145,-150,81,145,-150,-121,-122,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,81,-154,81,81,81,-151,-193,145,81,145,81,145,-157,-160,145,145,145,-156,145,145,-159,145,-158,145,145,145,145,145,145,145,-161,81,145,145,-181,145,-186,-192,-155,-153,145,-178,-152,-142,81,81,145,81,-183,-182,-191,-177,81,-143,145,81,145,81,-190,145,145,81,81,145,81,145,81,81,145,81,]),'RPAREN':([16,43,46,47,48,51,70,72,80,82,85,86,93,94,95,96,97,98,99,100,101,105,106,107,108,109,130,134,165,170,172,173,174,175,176,178,179,184,185,186,187,188,190,194,195,200,201,202,204,206,207,209,212,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,247,248,249,250,251,252,254,255,256,257,258,259,260,262,265,268,269,271,278,286,288,290,293,305,306,307,308,310,321,322,325,326,328,329,330,331,332,334,335,337,340,342,343,347,349,353,355,357,360,364,365,366,367,369,370,371,372,374,375,376,381,382,383,385,386,390,391,393,394,396,397,398,399,400,402,407,408,409,410,411,414,415,416,417,418,419,421,427,428,430,431,432,433,434,436,437,438,442,444,446,447,453,454,455,456,457,458,459,460,],[-9,78,104,-193,-193,-56,-53,-193,-147,-89,-146,-149,-9,-144,-148,-145,-90,-92,-150,-91,-93,181,-26,-15,-16,183,209,214,-154,248,-151,-193,255,256,259,-176,263,-193,-95,-94,-67,271,-57,-98,-100,-71,286,288,290,-131,293,-119,-135,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,305,-181,-185,306,-184,-186,-192,-155,-153,-180,308,-178,-152,-142,-25,-52,320,-59,-104,-58,-126,-127,-129,-183,-182,-191,-177,-143,-68,360,-97,-103,-99,364,-72,-70,-193,367,-130,371,-139,375,376,-190,-179,381,-141,385,-136,-125,-193,393,-60,396,-193,-66,399,402,-137,-128,-50,407,-48,-51,-69,-106,-193,-62,417,-61,419,-79,-76,421,-138,-49,-140,-108,-111,-105,-124,-120,432,-63,433,-78,-75,-109,-110,-96,-123,-65,-64,-81,444,446,447,-107,-77,-74,-73,-88,-83,-85,-86,-87,-84,-82,-80,]),'BROADCAST':([267,],[316,]),'PLUS':([16,51,69,70,77,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,189,190,195,196,198,202,204,206,209,210,212,213,223,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,271,286,288,290,293,303,305,306,307,308,310,313,322,326,343,347,348,349,360,364,367,371,375,376,393,396,405,417,430,432,433,440,450,],[-9,-56,132,-53,132,151,-147,-146,-149,-9,-144,-148,-145,-150,151,-150,-154,-151,-193,151,151,132,-57,-53,132,132,132,132,132,-119,132,-135,132,-57,151,-157,-160,151,151,151,-156,151,151,-159,151,-158,151,151,151,151,151,151,151,-161,151,151,-181,151,-186,-192,-155,-153,151,-178,-152,-142,-59,-58,-126,-127,-129,151,-183,-182,-191,-177,-143,151,132,151,132,-190,151,151,-136,-125,-60,-66,-137,-128,-62,-61,151,-63,-96,-65,-64,151,151,]),'PULL_EDB':([75,137,138,139,140,],[-193,220,-17,-18,-19,]),'GT':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,153,-147,-146,-149,-9,-144,-148,-145,-150,153,-150,-154,-151,-193,153,153,153,-157,-160,-166,-168,-163,-156,153,-162,-159,-172,-158,-164,-171,153,-175,153,153,153,-161,153,153,-181,153,-186,-192,-155,-153,153,-178,-152,-142,153,-183,-182,-191,-177,-143,153,153,-190,153,153,153,153,153,]),'RBRACE':([16,345,441,448,449,452,461,463,469,],[-9,378,-193,-193,462,-29,465,-28,-27,]),'GE':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,157,-147,-146,-149,-9,-144,-148,-145,-150,157,-150,-154,-151,-193,157,157,157,-157,-160,-166,-168,-163,-156,157,-162,-159,-172,-158,-164,-171,157,-175,157,157,157,-161,157,157,-181,157,-186,-192,-155,-153,157,-178,-152,-142,157,-183,-182,-191,-177,-143,157,157,-190,157,157,157,157,157,]),'JOIN':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,68,]),'WHERE':([16,193,194,195,325,328,332,],[-9,277,-98,-100,-97,-99,277,]),'PULL_IDB':([75,137,138,139,140,],[-193,219,-17,-18,-19,]),'WHILE':([9,22,25,42,129,142,143,180,301,311,358,],[-35,-41,41,-40,-33,-42,-47,-45,-43,-46,-44,]),'OR':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,161,-147,-146,-149,-9,-144,-148,-145,-150,161,-150,-154,-151,-193,161,-176,161,-157,-160,-166,-168,-163,-156,161,-162,-159,-172,-158,-164,-171,-173,-175,-174,161,161,-161,161,161,-181,161,-186,-192,-155,-153,161,-178,-152,-142,161,-183,-182,-191,-177,-143,161,161,-190,161,161,161,161,161,]),'ORDERBY':([16,80,85,86,93,94,95,96,99,114,115,116,118,165,172,173,178,194,195,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,259,260,262,273,274,278,283,305,306,307,308,310,325,326,328,332,347,362,363,365,],[-9,-147,-146,-149,-9,-144,-148,-145,-150,-116,-113,-118,-150,-154,-151,-193,-176,-98,-100,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-178,-152,-142,-112,-115,-104,-117,-183,-182,-191,-177,-143,-97,-103,-99,-193,-190,-114,388,388,]),'SYNC':([75,],[138,]),'ROUND_ROBIN':([267,],[319,]),'DIFF':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,]),'DEF':([0,6,7,9,10,11,12,13,14,20,31,129,142,143,148,180,301,311,350,351,358,404,466,468,],[8,-6,-4,-35,8,-3,-2,-7,-5,-8,-1,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'DISTINCT':([34,40,41,59,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[58,58,58,122,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,]),'LARROW':([223,300,],[302,302,]),'COLON':([16,27,181,185,186,187,199,321,],[-9,44,264,-95,-94,270,285,359,]),'BLOB_LITERAL':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,304,309,314,327,380,403,425,441,443,448,451,],[86,86,-193,86,86,86,86,-121,-122,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,86,456,86,86,]),'CONVERGENCE':([39,],[75,]),'$end':([6,7,9,10,11,12,13,14,20,31,129,142,143,148,180,301,311,350,351,358,404,466,468,],[-6,-4,-35,0,-3,-2,-7,-5,-8,-1,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'LOAD':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,63,]),'GE2':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,152,-147,-146,-149,-9,-144,-148,-145,-150,152,-150,-154,-151,-193,152,-176,152,-157,-160,-166,-168,-163,-156,152,-162,-159,-172,-158,-164,-171,-173,-175,-174,152,152,-161,152,152,-181,152,-186,-192,-155,-153,152,-178,-152,-142,152,-183,-182,-191,-177,-143,152,152,-190,152,152,152,152,152,]),'END':([16,80,85,86,93,94,95,96,99,165,172,173,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,259,260,262,303,305,306,307,308,310,347,],[-9,-147,-146,-149,-9,-144,-148,-145,-150,-154,-151,-193,-176,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-178,-152,-142,347,-183,-182,-191,-177,-143,-190,]),'DIVIDE':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,154,-147,-146,-149,-9,-144,-148,-145,-150,154,-150,-154,-151,-193,154,154,154,154,-160,154,154,154,154,154,154,-159,154,-158,154,154,154,154,154,154,154,-161,154,154,-181,154,-186,-192,-155,-153,154,-178,-152,-142,154,-183,-182,-191,-177,-143,154,154,-190,154,154,154,154,154,]),'UNION':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,64,]),'ALTERNATE':([75,137,138,139,140,],[-193,218,-17,-18,-19,]),'EQUALS':([16,18,24,38,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,435,440,450,],[-9,34,40,74,155,-147,-146,-149,-9,-144,-148,-145,-150,155,-150,-154,-151,-193,155,155,155,-157,-160,-166,-168,-163,-156,155,-162,-159,-172,-158,-164,-171,155,-175,155,155,155,-161,155,155,-181,155,-186,-192,-155,-153,155,-178,-152,-142,155,-183,-182,-191,-177,-143,155,155,-190,155,155,155,443,155,155,]),'ELSE':([16,80,85,86,93,94,95,96,99,165,166,167,172,173,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,244,248,252,254,255,256,259,260,262,305,306,307,308,310,347,348,],[-9,-147,-146,-149,-9,-144,-148,-145,-150,-154,-189,245,-151,-193,-176,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-188,-181,-186,-192,-155,-153,-178,-152,-142,-183,-182,-191,-177,-143,-190,-187,]),'WORKER_ID':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,304,309,314,327,380,403,425,441,448,451,],[91,91,-193,91,91,91,91,-121,-122,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,91,]),'CSV':([294,],[339,]),'EQ':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,158,-147,-146,-149,-9,-144,-148,-145,-150,158,-150,-154,-151,-193,158,158,158,-157,-160,-166,-168,-163,-156,158,-162,-159,-172,-158,-164,-171,158,-175,158,158,158,-161,158,158,-181,158,-186,-192,-155,-153,158,-178,-152,-142,158,-183,-182,-191,-177,-143,158,158,-190,158,158,158,158,158,]),'UNTIL':([21,23,37,379,],[39,-39,-38,-34,]),'AND':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,159,-147,-146,-149,-9,-144,-148,-145,-150,159,-150,-154,-151,-193,159,-176,159,-157,-160,-166,-168,-163,-156,159,-162,-159,-172,-158,-164,-171,-173,-175,159,159,159,-161,159,159,-181,159,-186,-192,-155,-153,159,-178,-152,-142,159,-183,-182,-191,-177,-143,159,159,-190,159,159,159,159,159,]),'LBRACE':([16,73,183,214,],[-9,135,266,298,]),'OPP':([294,],[338,]),'TIPSY':([294,],[336,]),'INT':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,285,304,309,314,327,380,403,425,441,448,451,],[97,97,-193,97,97,97,97,-121,-122,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,97,]),'BLOB':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,285,304,309,314,327,380,403,425,441,448,451,],[101,101,-193,101,101,101,101,-121,-122,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,101,]),'NOT':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,304,309,314,327,380,403,425,441,448,451,],[102,102,-193,102,102,102,102,-121,-122,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,102,]),'MOD':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,333,334,347,348,349,405,440,450,],[-9,164,-147,-146,-149,-9,-144,-148,-145,-150,164,-150,-154,-151,-193,164,164,164,164,-160,164,164,164,164,164,164,-159,164,-158,164,164,164,164,164,164,164,-161,164,164,-181,164,-186,-192,-155,-153,164,-178,-152,-142,164,-183,-182,-191,-177,-143,164,164,366,369,-190,164,164,164,164,164,]),'THEN':([16,80,85,86,93,94,95,96,99,165,172,173,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,248,252,254,255,256,259,260,262,305,306,307,308,310,347,],[-9,-147,-146,-149,-9,-144,-148,-145,-150,-154,-151,-193,-176,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,304,-181,-186,-192,-155,-153,-178,-152,-142,-183,-182,-191,-177,-143,-190,]),'LPAREN':([2,4,5,16,17,30,32,34,35,40,41,44,50,52,53,54,55,56,57,58,59,60,61,62,63,64,68,71,76,81,82,84,87,88,91,92,93,97,98,100,101,102,112,117,119,121,122,123,124,125,127,131,132,133,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,272,276,277,289,292,295,296,297,302,304,309,314,316,317,319,327,336,338,339,380,401,403,425,441,448,451,],[26,28,29,-9,33,47,48,67,72,67,67,92,-132,111,112,92,119,-133,120,121,-193,125,126,127,128,-134,131,133,92,92,-89,169,170,171,174,92,176,-90,-92,-91,-93,92,67,67,67,67,-121,-122,92,67,67,67,67,67,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,92,67,67,92,67,67,341,67,67,67,92,92,92,353,354,357,92,370,372,373,92,423,92,92,92,92,92,]),'DUMP':([0,1,6,7,9,10,11,12,13,14,20,22,25,31,42,129,142,143,148,180,301,311,350,351,358,404,466,468,],[2,2,-6,-4,-35,2,-3,-2,-7,-5,-8,-41,2,-1,-40,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'CROSS':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,53,]),'LE2':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,144,-147,-146,-149,-9,-144,-148,-145,-150,144,-150,-154,-151,-193,144,-176,144,-157,-160,-166,-168,-163,-156,144,-162,-159,-172,-158,-164,-171,-173,-175,-174,144,144,-161,144,144,-181,144,-186,-192,-155,-153,144,-178,-152,-142,144,-183,-182,-191,-177,-143,144,144,-190,144,144,144,144,144,]),'DOT':([16,93,99,118,173,],[-9,-9,177,197,253,]),'CASE':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,304,309,314,327,380,403,425,441,448,451,],[83,83,-193,83,83,83,83,-121,-122,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,83,]),'NE':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,149,-147,-146,-149,-9,-144,-148,-145,-150,149,-150,-154,-151,-193,149,149,149,-157,-160,-166,-168,-163,-156,149,-162,-159,-172,-158,-164,-171,149,-175,149,149,149,-161,149,149,-181,149,-186,-192,-155,-153,149,-178,-152,-142,149,-183,-182,-191,-177,-143,149,149,-190,149,149,149,149,149,]),'FLOAT_LITERAL':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,291,304,309,314,327,380,403,425,441,443,448,451,],[85,85,-193,85,85,85,85,-121,-122,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,85,333,85,85,85,85,85,85,85,85,455,85,85,]),'ASC':([16,262,310,410,],[-9,-142,-143,427,]),'COUNTALL':([34,40,41,44,54,59,76,81,92,102,112,117,119,121,122,123,124,125,127,131,132,133,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,272,276,277,289,292,296,297,302,304,309,314,327,380,403,425,441,448,451,],[60,60,60,87,87,-193,87,87,87,87,60,60,60,60,-121,-122,87,60,60,60,60,60,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,87,60,60,87,60,60,60,60,60,87,87,87,87,87,87,87,87,87,87,]),'APPLY':([0,6,7,9,10,11,12,13,14,20,31,129,142,143,148,180,301,311,350,351,358,404,466,468,],[15,-6,-4,-35,15,-3,-2,-7,-5,-8,-1,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'BUILD_EDB':([75,137,138,139,140,],[-193,222,-17,-18,-19,]),'EMIT':([16,80,85,86,93,94,95,96,99,165,172,173,178,193,194,195,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,259,260,262,278,279,305,306,307,308,310,325,326,328,347,],[-9,-147,-146,-149,-9,-144,-148,-145,-150,-154,-151,-193,-176,-193,-98,-100,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-178,-152,-142,-104,327,-183,-182,-191,-177,-143,-97,-103,-99,-190,]),'SCHEMA':([373,],[401,]),'HASH':([267,],[317,]),'SELECT':([34,40,67,302,],[59,59,59,59,]),'ASYNC':([75,],[139,]),'FALSE':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,304,309,314,327,380,403,425,441,443,448,451,],[95,95,-193,95,95,95,95,-121,-122,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,95,453,95,95,]),'LIKE':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,160,-147,-146,-149,-9,-144,-148,-145,-150,160,-150,-154,-151,-193,160,160,160,-157,-160,-166,-168,-163,-156,160,-162,-159,-172,-158,-164,-171,160,-175,160,160,160,-161,160,160,-181,160,-186,-192,-155,-153,160,-178,-152,-142,160,-183,-182,-191,-177,-143,160,160,-190,160,160,160,160,160,]),'BOOLEAN':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,285,304,309,314,327,380,403,425,441,448,451,],[100,100,-193,100,100,100,100,-121,-122,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,100,]),'NE2':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,162,-147,-146,-149,-9,-144,-148,-145,-150,162,-150,-154,-151,-193,162,-176,162,-157,-160,-166,-168,-163,-156,162,-162,-159,-172,-158,-164,-171,-173,-175,-174,162,162,-161,162,162,-181,162,-186,-192,-155,-153,162,-178,-152,-142,162,-183,-182,-191,-177,-143,162,162,-190,162,162,162,162,162,]),'NE3':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,163,-147,-146,-149,-9,-144,-148,-145,-150,163,-150,-154,-151,-193,163,-176,163,-157,-160,-166,-168,-163,-156,163,-162,-159,-172,-158,-164,-171,-173,-175,-174,163,163,-161,163,163,-181,163,-186,-192,-155,-153,163,-178,-152,-142,163,-183,-182,-191,-177,-143,163,163,-190,163,163,163,163,163,]),'DO':([0,1,6,7,9,10,11,12,13,14,20,22,25,31,42,129,142,143,148,180,301,311,350,351,358,404,466,468,],[1,1,-6,-4,-35,1,-3,-2,-7,-5,-8,-41,1,-1,-40,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'CONST':([0,6,7,9,10,11,12,13,14,20,31,129,142,143,148,180,301,311,350,351,358,404,466,468,],[3,-6,-4,-35,3,-3,-2,-7,-5,-8,-1,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'SCAN':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,52,]),'COUNT':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,304,309,314,327,380,403,425,441,448,451,],[88,88,-193,88,88,88,88,-121,-122,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,88,]),'EXPORT':([0,1,6,7,9,10,11,12,13,14,20,22,25,31,42,129,142,143,148,180,301,311,350,351,358,404,466,468,],[4,4,-6,-4,-35,4,-3,-2,-7,-5,-8,-41,4,-1,-40,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'SINK':([0,1,6,7,9,10,11,12,13,14,20,22,25,31,42,129,142,143,148,180,301,311,350,351,358,404,466,468,],[5,5,-6,-4,-35,5,-3,-2,-7,-5,-8,-41,5,-1,-40,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'IDIVIDE':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,146,-147,-146,-149,-9,-144,-148,-145,-150,146,-150,-154,-151,-193,146,146,146,146,-160,146,146,146,146,146,146,-159,146,-158,146,146,146,146,146,146,146,-161,146,146,-181,146,-186,-192,-155,-153,146,-178,-152,-142,146,-183,-182,-191,-177,-143,146,146,-190,146,146,146,146,146,]),'LE':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,147,-147,-146,-149,-9,-144,-148,-145,-150,147,-150,-154,-151,-193,147,147,147,-157,-160,-166,-168,-163,-156,147,-162,-159,-172,-158,-164,-171,147,-175,147,147,147,-161,147,147,-181,147,-186,-192,-155,-153,147,-178,-152,-142,147,-183,-182,-191,-177,-143,147,147,-190,147,147,147,147,147,]),'SEMI':([0,1,6,7,9,10,11,12,13,14,16,20,22,25,31,42,51,65,66,69,70,75,77,78,79,80,85,86,93,94,95,96,99,104,129,137,138,139,140,142,143,148,165,172,173,178,180,190,194,195,209,212,217,218,219,220,221,222,223,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,259,260,262,263,271,278,286,288,290,293,301,305,306,307,308,310,311,312,313,315,320,325,326,328,332,344,346,347,350,351,358,360,364,365,367,371,375,376,378,390,391,393,396,404,409,410,411,414,415,417,426,427,428,430,431,432,433,439,442,450,462,465,466,467,468,],[9,9,-6,-4,-35,9,-3,-2,-7,-5,-9,-8,-41,9,-1,-40,-56,129,-37,-36,-53,-193,142,143,148,-147,-146,-149,-9,-144,-148,-145,-150,180,-33,-193,-17,-18,-19,-42,-47,-14,-154,-151,-193,-176,-45,-57,-98,-100,-119,-135,301,-20,-21,-22,-24,-23,-57,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-178,-152,-142,311,-59,-104,-58,-126,-127,-129,-43,-183,-182,-191,-177,-143,-46,350,351,352,358,-97,-103,-99,-193,377,379,-190,-13,-12,-44,-136,-125,-193,-60,-66,-137,-128,404,-106,-193,-62,-61,-30,-108,-111,-105,-124,-120,-63,441,-109,-110,-96,-123,-65,-64,448,-107,463,466,468,-32,469,-31,]),'WHEN':([16,80,83,85,86,93,94,95,96,99,165,166,167,172,173,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,244,248,252,254,255,256,259,260,262,305,306,307,308,310,347,348,],[-9,-147,168,-146,-149,-9,-144,-148,-145,-150,-154,-189,168,-151,-193,-176,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-188,-181,-186,-192,-155,-153,-178,-152,-142,-183,-182,-191,-177,-143,-190,-187,]),'LT':([16,79,80,85,86,93,94,95,96,99,114,118,165,172,173,175,178,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,248,249,252,254,255,256,257,259,260,262,303,305,306,307,308,310,313,326,347,348,349,405,440,450,],[-9,150,-147,-146,-149,-9,-144,-148,-145,-150,150,-150,-154,-151,-193,150,150,150,-157,-160,-166,-168,-163,-156,150,-162,-159,-172,-158,-164,-171,150,-175,150,150,150,-161,150,150,-181,150,-186,-192,-155,-153,150,-178,-152,-142,150,-183,-182,-191,-177,-143,150,150,-190,150,150,150,150,150,]),'COMMA':([16,45,49,51,70,80,82,85,86,93,94,95,96,97,98,99,100,101,106,107,113,114,115,116,118,141,165,172,173,178,184,185,186,187,189,190,193,194,195,198,200,201,203,205,206,208,209,210,211,212,213,215,216,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,257,258,259,260,262,265,271,273,274,283,286,288,290,293,305,306,307,308,310,321,323,324,325,328,330,331,332,334,340,347,349,355,356,360,362,363,364,366,367,369,371,374,375,376,382,386,387,393,396,400,402,405,406,408,409,410,411,417,424,427,428,430,432,433,434,436,437,438,440,442,447,453,454,455,456,457,458,459,460,464,],[-9,103,110,-56,-53,-147,-89,-146,-149,-9,-144,-148,-145,-90,-92,-150,-91,-93,-26,182,191,-116,-113,-118,-150,191,-154,-151,-193,-176,267,-95,-94,-67,272,-57,276,-98,-100,284,-71,287,191,291,292,294,-119,295,296,-135,297,299,191,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-180,309,-178,-152,-142,-25,-59,-112,-115,-117,-58,-126,-127,-129,-183,-182,-191,-177,-143,-68,361,-11,-97,-99,-72,-70,276,368,-139,-190,-179,-141,384,-136,-114,191,-125,392,-60,395,-66,384,-137,-128,384,-69,-10,-62,-61,422,-138,-55,425,-140,-108,-111,429,-63,425,-109,-110,-96,-65,-64,-81,445,445,287,-54,-107,-73,-88,-83,-85,-86,-87,-84,-82,-80,425,]),'EMPTY':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,57,]),'SAMPLESCAN':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,]),'UNIONALL':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,62,]),'STRING':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,285,304,309,314,327,380,403,425,441,448,451,],[82,82,-193,82,82,82,82,-121,-122,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,82,]),'DOLLAR':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,177,191,197,245,253,264,277,295,304,309,314,318,327,341,354,380,384,388,403,425,429,441,448,451,],[89,89,-193,89,89,89,89,-121,-122,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,89,261,89,261,89,261,89,89,261,89,89,89,261,89,261,261,89,261,261,89,89,261,89,89,89,]),'TIMES':([16,19,44,54,59,76,79,80,81,85,86,92,93,94,95,96,99,102,114,118,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,165,168,169,171,172,173,175,176,178,191,197,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,245,246,247,248,249,252,254,255,256,257,259,260,262,264,277,303,304,305,306,307,308,309,310,313,314,326,327,347,348,349,380,403,405,425,440,441,448,450,451,],[-9,36,90,116,-193,116,156,-147,90,-146,-149,90,-9,-144,-148,-145,-150,90,156,-150,-121,-122,116,116,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,90,-154,90,90,251,-151,-193,156,90,156,116,283,156,156,-160,156,156,156,156,156,156,-159,156,-158,156,156,156,156,156,156,156,-161,90,156,156,-181,156,-186,-192,-155,-153,156,-178,-152,-142,90,90,156,90,-183,-182,-191,-177,90,-143,156,116,156,116,-190,156,156,90,90,156,90,156,90,90,156,90,]),'AS':([16,51,70,80,85,86,93,94,95,96,99,114,118,165,172,173,178,190,195,196,209,212,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,259,260,262,271,286,288,290,293,305,306,307,308,310,347,360,364,367,371,375,376,393,396,417,430,432,433,],[-9,-56,-53,-147,-146,-149,-9,-144,-148,-145,-150,192,-150,-154,-151,-193,-176,-57,-53,281,-119,-135,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-178,-152,-142,-59,-58,-126,-127,-129,-183,-182,-191,-177,-143,-190,-136,-125,-60,-66,-137,-128,-62,-61,-63,-96,-65,-64,]),'INTERSECT':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,50,]),'ID':([0,1,3,6,7,8,9,10,11,12,13,14,15,16,19,20,21,22,23,25,26,28,29,31,33,34,36,37,40,41,42,44,47,48,51,54,59,70,72,76,81,90,92,102,110,111,112,116,117,119,120,121,122,123,124,125,126,127,129,131,132,133,135,136,142,143,144,145,146,147,148,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,177,180,182,190,191,192,195,196,197,209,212,245,251,253,264,270,271,272,275,276,277,280,281,282,286,287,288,289,290,292,293,295,296,297,299,301,302,304,309,311,314,318,327,341,350,351,354,358,359,360,361,364,367,368,370,371,375,376,379,380,384,388,392,393,395,396,397,398,403,404,417,420,422,423,425,429,430,432,433,441,445,448,451,466,468,],[16,16,16,-6,-4,16,-35,16,-3,-2,-7,-5,16,-9,16,-8,16,-41,-39,16,16,16,16,-1,16,16,16,-38,16,16,-40,93,16,16,-56,93,-193,-53,16,93,93,16,93,93,16,16,16,16,16,16,16,16,-121,-122,93,16,16,16,-33,16,16,16,16,93,-42,-47,93,93,93,93,-14,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,93,16,-45,16,-57,93,16,-53,-193,16,-119,-135,93,16,16,93,16,-59,16,16,16,93,16,-101,-102,-58,16,-126,16,-127,16,-129,16,16,16,16,-43,16,93,93,-46,93,16,93,16,-13,-12,16,-44,16,-136,16,-125,-60,16,-193,-66,-137,-128,-34,93,16,16,16,-62,16,-61,-193,-79,93,-30,-63,16,16,16,93,16,-96,-65,-64,93,16,93,93,-32,-31,]),'STORE':([0,1,6,7,9,10,11,12,13,14,20,22,25,31,42,129,142,143,148,180,301,311,350,351,358,404,466,468,],[17,17,-6,-4,-35,17,-3,-2,-7,-5,-8,-41,17,-1,-40,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'DESC':([16,262,310,410,],[-9,-142,-143,428,]),'FROM':([16,54,76,80,85,86,93,94,95,96,99,114,115,116,118,165,172,173,178,203,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,259,260,262,273,274,283,305,306,307,308,310,347,362,],[-9,117,117,-147,-146,-149,-9,-144,-148,-145,-150,-116,-113,-118,-150,-154,-151,-193,-176,289,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-178,-152,-142,-112,-115,-117,-183,-182,-191,-177,-143,-190,-114,]),'STRING_LITERAL':([44,54,59,76,81,92,102,103,110,111,122,123,124,126,128,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,270,277,304,309,314,327,359,368,380,392,395,403,425,441,443,448,451,],[96,96,-193,96,96,96,96,179,185,185,-121,-122,96,185,208,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,96,185,96,96,96,96,96,185,185,96,185,185,96,96,96,454,96,96,]),'FLOAT':([44,54,59,76,81,92,102,122,123,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,285,304,309,314,327,380,403,425,441,448,451,],[98,98,-193,98,98,98,98,-121,-122,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,98,]),'UDA':([0,6,7,9,10,11,12,13,14,20,31,129,142,143,148,180,301,311,350,351,358,404,466,468,],[19,-6,-4,-35,19,-3,-2,-7,-5,-8,-1,-33,-42,-47,-14,-45,-43,-46,-13,-12,-44,-30,-32,-31,]),'RBRACKET':([16,80,85,86,93,94,95,96,99,113,114,115,116,118,141,165,172,173,178,216,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,248,252,254,255,256,259,260,262,273,274,283,305,306,307,308,310,323,324,347,355,356,362,363,387,389,390,405,406,408,409,410,411,412,414,424,427,428,431,440,442,464,],[-9,-147,-146,-149,-9,-144,-148,-145,-150,190,-116,-113,-118,-150,223,-154,-151,-193,-176,300,-167,-157,-160,-166,-168,-163,-156,-165,-162,-159,-172,-158,-164,-171,-173,-175,-174,-169,-170,-161,-181,-186,-192,-155,-153,-178,-152,-142,-112,-115,-117,-183,-182,-191,-177,-143,362,-11,-190,-141,383,-114,-193,-10,-193,-106,-55,426,-140,-108,-111,-105,430,-124,439,-109,-110,-123,-54,-107,467,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'recursion_mode':([75,],[137,]),'idbassign_list':([1,],[21,]),'constant':([0,10,],[7,7,]),'table_literal':([34,40,41,112,117,119,121,125,127,131,132,133,264,266,272,276,289,292,296,297,298,302,],[51,51,51,51,51,51,51,51,51,51,51,51,312,315,51,51,51,51,51,51,344,51,]),'emit_arg_list':([54,76,124,136,314,327,],[113,141,203,216,113,363,]),'statefunc_emit_list':([441,448,],[449,461,]),'opt_where_clause':([193,332,],[279,365,]),'sexpr':([44,54,76,81,92,102,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,304,309,314,327,380,403,425,441,448,451,],[79,114,114,165,175,178,114,114,224,225,226,227,228,229,230,231,232,233,234,235,236,237,238,239,240,241,242,243,246,247,249,257,114,303,313,326,348,349,114,114,405,405,440,450,450,405,]),'count_arg':([171,],[250,]),'column_def_list':([120,423,],[201,438,]),'apply':([0,10,],[6,6,]),'from_arg':([117,276,289,],[194,325,194,]),'from_arg_list':([117,289,],[193,332,]),'emit_arg':([54,76,124,136,191,314,327,],[115,115,115,115,273,115,115,]),'pull_order_policy':([137,],[217,]),'column_ref':([177,197,253,295,318,341,354,384,388,429,],[260,260,307,340,355,355,355,408,410,410,]),'option_list':([420,422,],[436,437,]),'translation_unit_list':([0,],[10,]),'type_name':([44,54,76,81,92,102,124,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,191,245,264,277,285,304,309,314,327,380,403,425,441,448,451,],[84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,84,330,84,84,84,84,84,84,84,84,84,84,]),'column_def':([120,287,423,],[200,331,200,]),'statement':([0,1,10,25,],[11,22,11,42,]),'literal_arg':([443,],[459,]),'empty':([47,48,59,72,75,137,173,184,193,196,332,363,365,370,389,391,397,441,448,],[108,108,123,108,140,221,254,268,278,282,278,390,390,398,414,414,420,452,452,]),'schema_fun':([373,],[400,]),'optional_column_ref':([173,],[252,]),'optional_as':([196,],[280,]),'when_expr':([83,167,],[166,244,]),'relation_key':([110,111,126,],[184,188,205,]),'option':([420,422,445,],[434,434,460,]),'function_param_list':([176,],[258,]),'unreserved_id_list':([275,],[323,]),'implicit_tipsy_schema':([370,],[397,]),'rvalue':([34,40,302,],[65,65,346,]),'column_ref_list':([318,341,354,],[356,374,382,]),'optional_arg_list':([47,48,72,],[105,109,134,]),'function_arg_list':([47,48,72,],[107,107,107,]),'opt_limit':([389,391,],[412,415,]),'uda':([0,10,],[13,13,]),'udf':([0,10,],[14,14,]),'select_from_where':([34,40,67,302,],[66,66,130,66,]),'sexpr_list':([380,403,451,],[406,424,464,]),'orderby_arg_list':([388,],[411,]),'optional_part_info':([184,],[269,]),'opt_distinct':([59,],[124,]),'orderby_arg':([388,429,],[409,442,]),'idbassign':([1,21,],[23,37,]),'when_expr_list':([83,],[167,]),'string_arg':([110,111,126,270,359,368,392,395,],[187,187,187,321,386,394,416,418,]),'expression_list':([127,292,],[207,335,]),'unreserved_id':([0,1,3,8,10,15,19,21,25,26,28,29,33,34,36,40,41,44,47,48,54,72,76,81,90,92,102,110,111,112,116,117,119,120,121,124,125,126,127,131,132,133,135,136,144,145,146,147,149,150,151,152,153,154,155,156,157,158,159,160,161,162,163,164,168,169,171,176,177,182,191,192,197,245,251,253,264,270,272,275,276,277,280,287,289,292,295,296,297,299,302,304,309,314,318,327,341,354,359,361,368,380,384,388,392,395,403,420,422,423,425,429,441,445,448,451,],[18,24,27,30,18,32,35,38,18,43,45,46,49,70,73,70,70,99,106,106,118,106,118,99,173,99,99,186,186,70,173,195,70,199,70,118,70,186,70,70,70,70,215,118,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,99,262,265,118,274,262,99,173,262,99,186,70,324,195,99,328,199,195,70,262,70,70,345,70,99,99,118,262,118,262,262,186,387,186,99,262,262,186,186,99,435,435,199,99,262,99,435,99,99,]),'opt_orderby_clause':([363,365,],[389,391,]),'file_parser_fun':([294,],[337,]),'translation_unit':([0,10,],[12,31,]),'join_argument':([131,296,],[211,342,]),'setop':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,71,]),'decomposable_uda':([0,10,],[20,20,]),'expression':([34,40,41,112,117,119,121,125,127,131,132,133,272,276,289,292,296,297,302,],[69,69,77,189,196,198,202,204,206,210,212,213,322,196,196,206,210,343,69,]),'statement_list':([1,],[25,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> translation_unit_list","S'",1,None,None,None),
+  ('translation_unit_list -> translation_unit_list translation_unit','translation_unit_list',2,'p_translation_unit_list','parser.py',168),
+  ('translation_unit_list -> translation_unit','translation_unit_list',1,'p_translation_unit_list','parser.py',169),
+  ('translation_unit -> statement','translation_unit',1,'p_translation_unit','parser.py',177),
+  ('translation_unit -> constant','translation_unit',1,'p_translation_unit','parser.py',178),
+  ('translation_unit -> udf','translation_unit',1,'p_translation_unit','parser.py',179),
+  ('translation_unit -> apply','translation_unit',1,'p_translation_unit','parser.py',180),
+  ('translation_unit -> uda','translation_unit',1,'p_translation_unit','parser.py',181),
+  ('translation_unit -> decomposable_uda','translation_unit',1,'p_translation_unit','parser.py',182),
+  ('unreserved_id -> ID','unreserved_id',1,'p_unreserved_id','parser.py',395),
+  ('unreserved_id_list -> unreserved_id_list COMMA unreserved_id','unreserved_id_list',3,'p_unreserved_id_list','parser.py',401),
+  ('unreserved_id_list -> unreserved_id','unreserved_id_list',1,'p_unreserved_id_list','parser.py',402),
+  ('udf -> DEF unreserved_id LPAREN optional_arg_list RPAREN COLON sexpr SEMI','udf',8,'p_udf','parser.py',410),
+  ('udf -> DEF unreserved_id LPAREN optional_arg_list RPAREN COLON table_literal SEMI','udf',8,'p_nary_udf','parser.py',416),
+  ('constant -> CONST unreserved_id COLON sexpr SEMI','constant',5,'p_constant','parser.py',422),
+  ('optional_arg_list -> function_arg_list','optional_arg_list',1,'p_optional_arg_list','parser.py',428),
+  ('optional_arg_list -> empty','optional_arg_list',1,'p_optional_arg_list','parser.py',429),
+  ('recursion_mode -> SYNC','recursion_mode',1,'p_recursion_mode','parser.py',434),
+  ('recursion_mode -> ASYNC','recursion_mode',1,'p_recursion_mode','parser.py',435),
+  ('recursion_mode -> empty','recursion_mode',1,'p_recursion_mode','parser.py',436),
+  ('pull_order_policy -> ALTERNATE','pull_order_policy',1,'p_pull_order_policy','parser.py',441),
+  ('pull_order_policy -> PULL_IDB','pull_order_policy',1,'p_pull_order_policy','parser.py',442),
+  ('pull_order_policy -> PULL_EDB','pull_order_policy',1,'p_pull_order_policy','parser.py',443),
+  ('pull_order_policy -> BUILD_EDB','pull_order_policy',1,'p_pull_order_policy','parser.py',444),
+  ('pull_order_policy -> empty','pull_order_policy',1,'p_pull_order_policy','parser.py',445),
+  ('function_arg_list -> function_arg_list COMMA unreserved_id','function_arg_list',3,'p_function_arg_list','parser.py',450),
+  ('function_arg_list -> unreserved_id','function_arg_list',1,'p_function_arg_list','parser.py',451),
+  ('statefunc_emit_list -> LBRACKET sexpr_list RBRACKET SEMI','statefunc_emit_list',4,'p_statefunc_emit_list','parser.py',459),
+  ('statefunc_emit_list -> sexpr SEMI','statefunc_emit_list',2,'p_statefunc_emit_list','parser.py',460),
+  ('statefunc_emit_list -> empty','statefunc_emit_list',1,'p_statefunc_emit_list','parser.py',461),
+  ('decomposable_uda -> UDA TIMES unreserved_id LBRACE unreserved_id COMMA unreserved_id RBRACE SEMI','decomposable_uda',9,'p_decomposable_uda','parser.py',471),
+  ('uda -> UDA unreserved_id LPAREN optional_arg_list RPAREN LBRACE table_literal SEMI LBRACKET sexpr_list RBRACKET SEMI statefunc_emit_list RBRACE SEMI','uda',15,'p_uda','parser.py',480),
+  ('apply -> APPLY unreserved_id LPAREN optional_arg_list RPAREN LBRACE table_literal SEMI LBRACKET sexpr_list RBRACKET SEMI statefunc_emit_list RBRACE SEMI','apply',15,'p_apply','parser.py',493),
+  ('statement -> unreserved_id EQUALS rvalue SEMI','statement',4,'p_statement_assign','parser.py',506),
+  ('idbassign -> unreserved_id EQUALS LBRACKET emit_arg_list RBRACKET LARROW rvalue SEMI','idbassign',8,'p_idbassign','parser.py',511),
+  ('statement -> SEMI','statement',1,'p_statement_empty','parser.py',517),
+  ('rvalue -> expression','rvalue',1,'p_rvalue','parser.py',524),
+  ('rvalue -> select_from_where','rvalue',1,'p_rvalue','parser.py',525),
+  ('idbassign_list -> idbassign_list idbassign','idbassign_list',2,'p_idbassign_list','parser.py',530),
+  ('idbassign_list -> idbassign','idbassign_list',1,'p_idbassign_list','parser.py',531),
+  ('statement_list -> statement_list statement','statement_list',2,'p_statement_list','parser.py',539),
+  ('statement_list -> statement','statement_list',1,'p_statement_list','parser.py',540),
+  ('statement -> DO statement_list WHILE expression SEMI','statement',5,'p_statement_dowhile','parser.py',548),
+  ('statement -> DO idbassign_list UNTIL CONVERGENCE recursion_mode pull_order_policy SEMI','statement',7,'p_statement_dountilconvergence','parser.py',553),
+  ('statement -> STORE LPAREN unreserved_id COMMA relation_key optional_part_info RPAREN SEMI','statement',8,'p_statement_store','parser.py',559),
+  ('statement -> SINK LPAREN unreserved_id RPAREN SEMI','statement',5,'p_statement_sink','parser.py',564),
+  ('statement -> EXPORT LPAREN unreserved_id COMMA STRING_LITERAL RPAREN SEMI','statement',7,'p_statement_export','parser.py',569),
+  ('statement -> DUMP LPAREN unreserved_id RPAREN SEMI','statement',5,'p_statement_dump','parser.py',574),
+  ('optional_part_info -> COMMA LBRACKET column_ref_list RBRACKET','optional_part_info',4,'p_optional_part_info','parser.py',579),
+  ('optional_part_info -> COMMA HASH LPAREN column_ref_list RPAREN','optional_part_info',5,'p_optional_part_info','parser.py',580),
+  ('optional_part_info -> COMMA BROADCAST LPAREN RPAREN','optional_part_info',4,'p_optional_part_info','parser.py',581),
+  ('optional_part_info -> COMMA ROUND_ROBIN LPAREN RPAREN','optional_part_info',4,'p_optional_part_info','parser.py',582),
+  ('optional_part_info -> empty','optional_part_info',1,'p_optional_part_info','parser.py',583),
+  ('expression -> unreserved_id','expression',1,'p_expression_id','parser.py',596),
+  ('sexpr_list -> sexpr_list COMMA sexpr','sexpr_list',3,'p_sexpr_list','parser.py',601),
+  ('sexpr_list -> sexpr','sexpr_list',1,'p_sexpr_list','parser.py',602),
+  ('expression -> table_literal','expression',1,'p_expression_table_literal','parser.py',610),
+  ('table_literal -> LBRACKET emit_arg_list RBRACKET','table_literal',3,'p_table_literal','parser.py',615),
+  ('expression -> EMPTY LPAREN column_def_list RPAREN','expression',4,'p_expression_empty','parser.py',620),
+  ('expression -> SCAN LPAREN relation_key RPAREN','expression',4,'p_expression_scan','parser.py',625),
+  ('expression -> SAMPLESCAN LPAREN relation_key COMMA INTEGER_LITERAL RPAREN','expression',6,'p_expression_samplescan','parser.py',630),
+  ('expression -> SAMPLESCAN LPAREN relation_key COMMA INTEGER_LITERAL MOD RPAREN','expression',7,'p_expression_samplescan','parser.py',631),
+  ('expression -> SAMPLESCAN LPAREN relation_key COMMA FLOAT_LITERAL MOD RPAREN','expression',7,'p_expression_samplescan','parser.py',632),
+  ('expression -> SAMPLESCAN LPAREN relation_key COMMA INTEGER_LITERAL COMMA string_arg RPAREN','expression',8,'p_expression_samplescan','parser.py',633),
+  ('expression -> SAMPLESCAN LPAREN relation_key COMMA INTEGER_LITERAL MOD COMMA string_arg RPAREN','expression',9,'p_expression_samplescan','parser.py',634),
+  ('expression -> SAMPLESCAN LPAREN relation_key COMMA FLOAT_LITERAL MOD COMMA string_arg RPAREN','expression',9,'p_expression_samplescan','parser.py',635),
+  ('expression -> LOAD LPAREN STRING_LITERAL COMMA file_parser_fun RPAREN','expression',6,'p_expression_load','parser.py',648),
+  ('relation_key -> string_arg','relation_key',1,'p_relation_key','parser.py',654),
+  ('relation_key -> string_arg COLON string_arg','relation_key',3,'p_relation_key','parser.py',655),
+  ('relation_key -> string_arg COLON string_arg COLON string_arg','relation_key',5,'p_relation_key','parser.py',656),
+  ('column_def_list -> column_def_list COMMA column_def','column_def_list',3,'p_column_def_list','parser.py',662),
+  ('column_def_list -> column_def','column_def_list',1,'p_column_def_list','parser.py',663),
+  ('column_def -> unreserved_id COLON type_name','column_def',3,'p_column_def','parser.py',672),
+  ('schema_fun -> SCHEMA LPAREN column_def_list RPAREN','schema_fun',4,'p_schema_fun','parser.py',677),
+  ('file_parser_fun -> CSV LPAREN schema_fun COMMA option_list RPAREN','file_parser_fun',6,'p_file_parser_fun','parser.py',682),
+  ('file_parser_fun -> CSV LPAREN schema_fun RPAREN','file_parser_fun',4,'p_file_parser_fun','parser.py',683),
+  ('file_parser_fun -> OPP LPAREN RPAREN','file_parser_fun',3,'p_file_parser_fun','parser.py',684),
+  ('file_parser_fun -> TIPSY LPAREN implicit_tipsy_schema empty option_list RPAREN','file_parser_fun',6,'p_file_parser_fun','parser.py',685),
+  ('file_parser_fun -> TIPSY LPAREN implicit_tipsy_schema RPAREN','file_parser_fun',4,'p_file_parser_fun','parser.py',686),
+  ('implicit_tipsy_schema -> empty','implicit_tipsy_schema',1,'p_tipsy_schema','parser.py',698),
+  ('option_list -> option_list COMMA option','option_list',3,'p_option_list','parser.py',719),
+  ('option_list -> option','option_list',1,'p_option_list','parser.py',720),
+  ('option -> unreserved_id EQUALS literal_arg','option',3,'p_option','parser.py',729),
+  ('literal_arg -> STRING_LITERAL','literal_arg',1,'p_literal_arg','parser.py',734),
+  ('literal_arg -> INTEGER_LITERAL','literal_arg',1,'p_literal_arg','parser.py',735),
+  ('literal_arg -> FLOAT_LITERAL','literal_arg',1,'p_literal_arg','parser.py',736),
+  ('literal_arg -> BLOB_LITERAL','literal_arg',1,'p_literal_arg','parser.py',737),
+  ('literal_arg -> TRUE','literal_arg',1,'p_literal_arg','parser.py',738),
+  ('literal_arg -> FALSE','literal_arg',1,'p_literal_arg','parser.py',739),
+  ('type_name -> STRING','type_name',1,'p_type_name','parser.py',744),
+  ('type_name -> INT','type_name',1,'p_type_name','parser.py',745),
+  ('type_name -> BOOLEAN','type_name',1,'p_type_name','parser.py',746),
+  ('type_name -> FLOAT','type_name',1,'p_type_name','parser.py',747),
+  ('type_name -> BLOB','type_name',1,'p_type_name','parser.py',748),
+  ('string_arg -> unreserved_id','string_arg',1,'p_string_arg','parser.py',753),
+  ('string_arg -> STRING_LITERAL','string_arg',1,'p_string_arg','parser.py',754),
+  ('expression -> LBRACKET FROM from_arg_list opt_where_clause EMIT emit_arg_list opt_orderby_clause opt_limit RBRACKET','expression',9,'p_expression_bagcomp','parser.py',759),
+  ('from_arg_list -> from_arg_list COMMA from_arg','from_arg_list',3,'p_from_arg_list','parser.py',765),
+  ('from_arg_list -> from_arg','from_arg_list',1,'p_from_arg_list','parser.py',766),
+  ('from_arg -> expression optional_as unreserved_id','from_arg',3,'p_from_arg','parser.py',774),
+  ('from_arg -> unreserved_id','from_arg',1,'p_from_arg','parser.py',775),
+  ('optional_as -> AS','optional_as',1,'p_optional_as','parser.py',786),
+  ('optional_as -> empty','optional_as',1,'p_optional_as','parser.py',787),
+  ('opt_where_clause -> WHERE sexpr','opt_where_clause',2,'p_opt_where_clause','parser.py',792),
+  ('opt_where_clause -> empty','opt_where_clause',1,'p_opt_where_clause','parser.py',793),
+  ('opt_orderby_clause -> ORDERBY orderby_arg_list','opt_orderby_clause',2,'p_opt_orderby_clause','parser.py',801),
+  ('opt_orderby_clause -> empty','opt_orderby_clause',1,'p_opt_orderby_clause','parser.py',802),
+  ('orderby_arg_list -> orderby_arg_list COMMA orderby_arg','orderby_arg_list',3,'p_explicit_orderby_list','parser.py',810),
+  ('orderby_arg_list -> orderby_arg','orderby_arg_list',1,'p_explicit_orderby_list','parser.py',811),
+  ('orderby_arg -> column_ref ASC','orderby_arg',2,'p_explicit_orderby_arg','parser.py',819),
+  ('orderby_arg -> column_ref DESC','orderby_arg',2,'p_explicit_orderby_arg','parser.py',820),
+  ('orderby_arg -> column_ref','orderby_arg',1,'p_explicit_orderby_arg','parser.py',821),
+  ('emit_arg_list -> emit_arg_list COMMA emit_arg','emit_arg_list',3,'p_emit_arg_list','parser.py',831),
+  ('emit_arg_list -> emit_arg','emit_arg_list',1,'p_emit_arg_list','parser.py',832),
+  ('emit_arg -> sexpr AS LBRACKET unreserved_id_list RBRACKET','emit_arg',5,'p_emit_arg_explicit','parser.py',840),
+  ('emit_arg -> sexpr AS unreserved_id','emit_arg',3,'p_emit_arg_explicit','parser.py',841),
+  ('emit_arg -> sexpr','emit_arg',1,'p_emit_arg_explicit','parser.py',842),
+  ('emit_arg -> unreserved_id DOT TIMES','emit_arg',3,'p_emit_arg_table_wildcard','parser.py',868),
+  ('emit_arg -> TIMES','emit_arg',1,'p_emit_arg_full_wildcard','parser.py',873),
+  ('expression -> LPAREN select_from_where RPAREN','expression',3,'p_expression_select_from_where','parser.py',878),
+  ('select_from_where -> SELECT opt_distinct emit_arg_list FROM from_arg_list opt_where_clause opt_orderby_clause opt_limit','select_from_where',8,'p_select_from_where','parser.py',883),
+  ('opt_distinct -> DISTINCT','opt_distinct',1,'p_opt_distinct','parser.py',891),
+  ('opt_distinct -> empty','opt_distinct',1,'p_opt_distinct','parser.py',892),
+  ('opt_limit -> LIMIT INTEGER_LITERAL','opt_limit',2,'p_opt_limit','parser.py',898),
+  ('opt_limit -> empty','opt_limit',1,'p_opt_limit','parser.py',899),
+  ('expression -> LIMIT LPAREN expression COMMA INTEGER_LITERAL RPAREN','expression',6,'p_expression_limit','parser.py',907),
+  ('expression -> DISTINCT LPAREN expression RPAREN','expression',4,'p_expression_distinct','parser.py',912),
+  ('expression -> COUNTALL LPAREN expression RPAREN','expression',4,'p_expression_countall','parser.py',917),
+  ('expression -> setop LPAREN expression COMMA expression RPAREN','expression',6,'p_expression_binary_set_operation','parser.py',922),
+  ('expression -> UNIONALL LPAREN expression_list RPAREN','expression',4,'p_expression_unionall','parser.py',927),
+  ('expression_list -> expression COMMA expression_list','expression_list',3,'p_expression_list','parser.py',932),
+  ('expression_list -> expression','expression_list',1,'p_expression_list','parser.py',933),
+  ('setop -> INTERSECT','setop',1,'p_setop','parser.py',941),
+  ('setop -> DIFF','setop',1,'p_setop','parser.py',942),
+  ('setop -> UNION','setop',1,'p_setop','parser.py',943),
+  ('expression -> expression PLUS expression','expression',3,'p_expression_unionall_plus_inline','parser.py',948),
+  ('expression -> CROSS LPAREN expression COMMA expression RPAREN','expression',6,'p_expression_cross','parser.py',953),
+  ('expression -> JOIN LPAREN join_argument COMMA join_argument RPAREN','expression',6,'p_expression_join','parser.py',958),
+  ('join_argument -> expression COMMA LPAREN column_ref_list RPAREN','join_argument',5,'p_join_argument_list','parser.py',965),
+  ('join_argument -> expression COMMA column_ref','join_argument',3,'p_join_argument_single','parser.py',970),
+  ('column_ref_list -> column_ref_list COMMA column_ref','column_ref_list',3,'p_column_ref_list','parser.py',977),
+  ('column_ref_list -> column_ref','column_ref_list',1,'p_column_ref_list','parser.py',978),
+  ('column_ref -> unreserved_id','column_ref',1,'p_column_ref_string','parser.py',986),
+  ('column_ref -> DOLLAR INTEGER_LITERAL','column_ref',2,'p_column_ref_index','parser.py',991),
+  ('sexpr -> INTEGER_LITERAL','sexpr',1,'p_sexpr_integer_literal','parser.py',999),
+  ('sexpr -> STRING_LITERAL','sexpr',1,'p_sexpr_string_literal','parser.py',1004),
+  ('sexpr -> FLOAT_LITERAL','sexpr',1,'p_sexpr_float_literal','parser.py',1009),
+  ('sexpr -> TRUE','sexpr',1,'p_sexpr_boolean_literal','parser.py',1014),
+  ('sexpr -> FALSE','sexpr',1,'p_sexpr_boolean_literal','parser.py',1015),
+  ('sexpr -> BLOB_LITERAL','sexpr',1,'p_sexpr_blob_literal','parser.py',1021),
+  ('sexpr -> unreserved_id','sexpr',1,'p_sexpr_id','parser.py',1026),
+  ('sexpr -> DOLLAR INTEGER_LITERAL','sexpr',2,'p_sexpr_index','parser.py',1036),
+  ('sexpr -> unreserved_id DOT column_ref','sexpr',3,'p_sexpr_id_dot_ref','parser.py',1041),
+  ('sexpr -> LPAREN sexpr RPAREN','sexpr',3,'p_sexpr_group','parser.py',1046),
+  ('sexpr -> MINUS sexpr','sexpr',2,'p_sexpr_uminus','parser.py',1051),
+  ('sexpr -> WORKER_ID LPAREN RPAREN','sexpr',3,'p_sexpr_worker_id','parser.py',1056),
+  ('sexpr -> sexpr PLUS sexpr','sexpr',3,'p_sexpr_binop','parser.py',1061),
+  ('sexpr -> sexpr MINUS sexpr','sexpr',3,'p_sexpr_binop','parser.py',1062),
+  ('sexpr -> sexpr TIMES sexpr','sexpr',3,'p_sexpr_binop','parser.py',1063),
+  ('sexpr -> sexpr DIVIDE sexpr','sexpr',3,'p_sexpr_binop','parser.py',1064),
+  ('sexpr -> sexpr IDIVIDE sexpr','sexpr',3,'p_sexpr_binop','parser.py',1065),
+  ('sexpr -> sexpr MOD sexpr','sexpr',3,'p_sexpr_binop','parser.py',1066),
+  ('sexpr -> sexpr GT sexpr','sexpr',3,'p_sexpr_binop','parser.py',1067),
+  ('sexpr -> sexpr LT sexpr','sexpr',3,'p_sexpr_binop','parser.py',1068),
+  ('sexpr -> sexpr GE sexpr','sexpr',3,'p_sexpr_binop','parser.py',1069),
+  ('sexpr -> sexpr GE2 sexpr','sexpr',3,'p_sexpr_binop','parser.py',1070),
+  ('sexpr -> sexpr LE sexpr','sexpr',3,'p_sexpr_binop','parser.py',1071),
+  ('sexpr -> sexpr LE2 sexpr','sexpr',3,'p_sexpr_binop','parser.py',1072),
+  ('sexpr -> sexpr NE sexpr','sexpr',3,'p_sexpr_binop','parser.py',1073),
+  ('sexpr -> sexpr NE2 sexpr','sexpr',3,'p_sexpr_binop','parser.py',1074),
+  ('sexpr -> sexpr NE3 sexpr','sexpr',3,'p_sexpr_binop','parser.py',1075),
+  ('sexpr -> sexpr EQ sexpr','sexpr',3,'p_sexpr_binop','parser.py',1076),
+  ('sexpr -> sexpr EQUALS sexpr','sexpr',3,'p_sexpr_binop','parser.py',1077),
+  ('sexpr -> sexpr AND sexpr','sexpr',3,'p_sexpr_binop','parser.py',1078),
+  ('sexpr -> sexpr OR sexpr','sexpr',3,'p_sexpr_binop','parser.py',1079),
+  ('sexpr -> sexpr LIKE sexpr','sexpr',3,'p_sexpr_binop','parser.py',1080),
+  ('sexpr -> NOT sexpr','sexpr',2,'p_sexpr_not','parser.py',1085),
+  ('sexpr -> ID LPAREN function_param_list RPAREN','sexpr',4,'p_sexpr_function_k_args','parser.py',1190),
+  ('sexpr -> ID LPAREN RPAREN','sexpr',3,'p_sexpr_function_zero_args','parser.py',1195),
+  ('function_param_list -> function_param_list COMMA sexpr','function_param_list',3,'p_function_param_list','parser.py',1200),
+  ('function_param_list -> sexpr','function_param_list',1,'p_function_param_list','parser.py',1201),
+  ('sexpr -> COUNTALL LPAREN RPAREN','sexpr',3,'p_sexpr_countall','parser.py',1209),
+  ('sexpr -> COUNT LPAREN count_arg RPAREN','sexpr',4,'p_sexpr_count','parser.py',1214),
+  ('sexpr -> type_name LPAREN sexpr RPAREN','sexpr',4,'p_sexpr_cast','parser.py',1222),
+  ('count_arg -> TIMES','count_arg',1,'p_count_arg','parser.py',1227),
+  ('count_arg -> sexpr','count_arg',1,'p_count_arg','parser.py',1228),
+  ('sexpr -> TIMES unreserved_id optional_column_ref','sexpr',3,'p_sexpr_unbox','parser.py',1233),
+  ('when_expr -> WHEN sexpr THEN sexpr','when_expr',4,'p_when_expr','parser.py',1238),
+  ('when_expr_list -> when_expr_list when_expr','when_expr_list',2,'p_when_expr_list','parser.py',1243),
+  ('when_expr_list -> when_expr','when_expr_list',1,'p_when_expr_list','parser.py',1244),
+  ('sexpr -> CASE when_expr_list ELSE sexpr END','sexpr',5,'p_sexpr_case','parser.py',1253),
+  ('optional_column_ref -> DOT column_ref','optional_column_ref',2,'p_optional_column_ref','parser.py',1258),
+  ('optional_column_ref -> empty','optional_column_ref',1,'p_optional_column_ref','parser.py',1259),
+  ('empty -> <empty>','empty',0,'p_empty','parser.py',1267),
+]
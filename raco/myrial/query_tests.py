@@ -2975,6 +2975,50 @@ class TestQueryFunctions(myrial_test.MyrialTestCase, FakeData):
         expected = collections.Counter([(32, 5)])
         self.check_result(query, expected, output="powersOfTwo")
 
+    def test_flatmap_split(self):
+        query = """
+        emp = scan(%s);
+        out = [from emp emit id, split(name, " ") as token];
+        store(out, OUTPUT);
+        """ % self.emp_key
+
+        plan = self.get_logical_plan(query)
+        self.assertTrue(any(isinstance(op, raco.algebra.FlatMap)
+                            for op in plan.walk()))
+
+        expected = collections.Counter(
+            (id, token) for (id, _, name, _) in self.emp_table.elements()
+            for token in name.split(" "))
+        self.check_result(query, expected)
+
+    def test_flatmap_cross_product(self):
+        query = """
+        dept = scan(%s);
+        out = [from dept emit id, sequence(manager) as i,
+                              ngram(name, 4) as gram];
+        store(out, OUTPUT);
+        """ % self.dept_key
+
+        expected = collections.Counter(
+            (id, i, name[j:j + 4])
+            for (id, name, manager) in self.dept_table.elements()
+            for i in range(manager)
+            for j in range(len(name) - 3))
+        self.check_result(query, expected)
+
+    def test_nested_flatmap(self):
+        for clauses in ['emit len(split(name, " "))',
+                        'emit count(split(name, " "))',
+                        'emit split(split(name, " "), "a")',
+                        'where sequence(id) > 0 emit id']:
+            query = """
+            emp = scan(%s);
+            out = [from emp %s];
+            store(out, OUTPUT);
+            """ % (self.emp_key, clauses)
+            with self.assertRaises(NestedFlatmapException):
+                self.check_result(query, collections.Counter())
+
     def test_pyUDF_dotted_arguments(self):
         query = """
         T1=scan(%s);
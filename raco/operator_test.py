@@ -117,6 +117,26 @@ class OperatorTest(unittest.TestCase):
         self.assertEqual([x[0] for x in res],
                          [x[3] for x in TestQueryFunctions.emp_table])
 
+    def test_flatmap_bitset_and_split(self):
+        key = RelationKey.from_string("public:adhoc:blobs")
+        sch = scheme.Scheme([("id", types.LONG_TYPE),
+                             ("bits", types.BLOB_TYPE),
+                             ("text", types.STRING_TYPE)])
+        self.db.ingest(key, collections.Counter([(1, b"\x05", "a,b,,c,,")]),
+                       sch)
+        scan = Scan(key, sch)
+
+        bitset = FlatMap([("bit", BITSET(NamedAttributeRef("bits")))], scan)
+        self.assertEqual(list(self.db.evaluate(bitset)),
+                         [(b,) for b in [True, False, True] + [False] * 5])
+
+        # trailing empty strings are dropped
+        split = FlatMap([("id", NamedAttributeRef("id")),
+                         ("token", SPLIT(NamedAttributeRef("text"),
+                                         StringLiteral(",")))], scan)
+        self.assertEqual(list(self.db.evaluate(split)),
+                         [(1, "a"), (1, "b"), (1, ""), (1, "c")])
+
     def test_projecting_join_scheme(self):
         emp = Scan(TestQueryFunctions.emp_key, TestQueryFunctions.emp_schema)
         emp1 = Scan(TestQueryFunctions.emp_key, TestQueryFunctions.emp_schema)
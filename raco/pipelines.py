@@ -2,6 +2,7 @@
 import abc
 from raco.utility import emitlist
 from algebra import gensym, Operator
+from raco import profiling
 import re
 
 import logging
@@ -73,6 +74,12 @@ class CompileState(object):
         self.loop_recycle_codes = set()
         self.loop_pipeline_codes = []
 
+        # [(name, code)] of values written to the profile
+        self.profile_values = []
+        # {id(op): operator id} of the operators counting tuples
+        # when profiling; see raco.profiling
+        self.profile_op_ids = {}
+
     def recordCodeWhenInLoop(self, code):
         if self.in_loop:
             self.loop_recycle_codes.add(code)
@@ -158,6 +165,10 @@ class CompileState(object):
     def addCleanups(self, i):
         self.cleanups += i
 
+    def addProfileValue(self, name, code):
+        if (name, code) not in self.profile_values:
+            self.profile_values.append((name, code))
+
     def addSeqWaitStatement(self, c):
         self.sequence_wait_statements.add(c)
 
@@ -424,7 +435,59 @@ class Pipelined(object):
         """Denotation for consuming a tuple"""
         return
 
-    def compilePipeline(self, compiler='push', **kwargs):
+    def profile_sizes(self):
+        """
+        @return [(label, code)] of sizes of data structures
+        built by this operator, to be recorded when profiling
+        """
+        return []
+
+    def profileTuplesOut(self, state, count=None):
+        """
+        @param count: code for the number of tuples, if not one
+        @return code counting the tuples this operator passes to its
+        parent, or '' when not profiling
+        """
+        op_ids = state.profile_op_ids
+        parent = self.parent()
+        if id(self) not in op_ids or id(parent) not in op_ids:
+            return ''
+
+        lang = state.language
+        counter = profiling.tuples_in_name(op_ids[id(parent)],
+                                           op_ids[id(self)])
+        state.addDeclarations([lang.profile_counter_declaration(counter)])
+        state.addProfileValue(counter, counter)
+        return lang.profile_increment(counter, count)
+
+    def consumeInParent(self, t, state):
+        """Code of the parent consuming tuple t from this operator"""
+        code = self.parent().consume(t, self, state)
+        # None when the parent takes over a whole relation
+        if code is None:
+            return None
+        return self.profileTuplesOut(state) + code
+
+    def _addProfileWriter(self, state, ops, path):
+        lang = self.language()
+        for op_id, op in enumerate(ops):
+            for label, code in op.profile_sizes():
+                state.addProfileValue(
+                    profiling.operator_value_name(op_id, label), code)
+
+        for ident in range(state.pipeline_count):
+            code = lang.profile_pipeline_runtime(ident)
+            if code is not None:
+                state.addProfileValue(
+                    profiling.pipeline_runtime_name(ident), code)
+
+        state.addCleanups([lang.profile_write(path, state.profile_values)])
+
+    def compilePipeline(self, compiler='push', profile=False, **kwargs):
+        """
+        @param profile: True or a file name to instrument the
+        generated code; see raco.profiling
+        """
         # run analyses
         self.run_analyses(**kwargs)
 
@@ -433,6 +496,13 @@ class Pipelined(object):
                          }[compiler]
         state = compilerstate(self.language())
 
+        if profile:
+            assert compiler == 'push', \
+                "profiling is only supported by the push compiler"
+            ops = profiling.profiled_operators(self)
+            state.profile_op_ids = dict(
+                (id(op), i) for i, op in enumerate(ops))
+
         state.addCode(
             self.language().comment("Compiled subplan for %s" % self))
 
@@ -440,6 +510,11 @@ class Pipelined(object):
 
         # state.addCode( self.language().log("Evaluating subplan %s" % self) )
 
+        if profile:
+            if profile is True:
+                profile = profiling.DEFAULT_PROFILE_FILE
+            self._addProfileWriter(state, ops, profile)
+
         return state
 
 
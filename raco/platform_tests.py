@@ -218,7 +218,7 @@ class MyriaLPlatformTests(object):
         return '\n'.join(code)
 
     def check_sub_tables(self, query, name, **kwargs):
-        self.check(query % self.tables, name, **kwargs)
+        return self.check(query % self.tables, name, **kwargs)
 
     def test_scan(self):
         self.check_sub_tables("""
@@ -678,6 +678,35 @@ class MyriaLPlatformTests(object):
         STORE(out, OUTPUT);
         """, "aggregate_count_group_one", compiler='iterator')
 
+    def test_columnar_apply(self):
+        self.check_sub_tables("""
+        T2 = SCAN(%(T2)s);
+        interm = [FROM T2 EMIT $0, $1];
+        out = [FROM interm EMIT $1];
+        STORE(out, OUTPUT);
+        """, "apply", columnar=True)
+
+    def test_columnar_select_group(self):
+        self.check_sub_tables("""
+        T3 = SCAN(%(T3)s);
+        out = [FROM T3 WHERE b < 4 EMIT c, SUM(b)];
+        STORE(out, OUTPUT);
+        """, "columnar_select_group", columnar=True)
+
+    def test_batched_select(self):
+        self.check_sub_tables("""
+        T2 = SCAN(%(T2)s);
+        out = [FROM T2 WHERE a<9 and b<9 EMIT a,b];
+        STORE(out, OUTPUT);
+        """, "two_var_select", batched=True)
+
+    def test_batched_select_apply(self):
+        self.check_sub_tables("""
+        T2 = SCAN(%(T2)s);
+        out = [FROM T2 WHERE a < 5 EMIT a+b, b];
+        STORE(out, OUTPUT);
+        """, "batched_select_apply", batched=True)
+
     def test_symmetric_hash_join(self):
         self.check_sub_tables("""
         R2 = SCAN(%(R2)s);
@@ -0,0 +1,112 @@
+"""
+Runtime profiles of generated code.
+
+Compiling with profile=True (see Pipelined.compilePipeline) makes the
+generated program count the tuples each operator consumes, record hash
+table sizes and pipeline runtimes. The values are named by operator id,
+the position of the operator in a preorder walk of the compiled plan,
+so a profile can be mapped back onto the plan with annotate_plan.
+
+The C++ backend writes the values as a JSON object to a file.
+Grappa reports them as metrics in the STATS{...}STATS block it prints.
+"""
+
+import json
+import re
+
+from raco import algebra
+
+PREFIX = 'raco_prof_'
+DEFAULT_PROFILE_FILE = 'profile.json'
+
+_op_pattern = re.compile(PREFIX + r'op(\d+)_(\w+)$')
+_pipeline_pattern = re.compile(PREFIX + r'pipeline_(\d+)_runtime$')
+_tuples_pattern = re.compile(r'in_(\d+)$')
+_stats_pattern = re.compile(r'STATS(\{.*?\})STATS', re.DOTALL)
+
+
+def tuples_in_name(op_id, src_id):
+    """counter of the tuples op_id consumed from src_id"""
+    return '{0}op{1}_in_{2}'.format(PREFIX, op_id, src_id)
+
+
+def operator_value_name(op_id, label):
+    return '{0}op{1}_{2}'.format(PREFIX, op_id, label)
+
+
+def pipeline_runtime_name(pipeline_id):
+    return '{0}pipeline_{1}_runtime'.format(PREFIX, pipeline_id)
+
+
+def profiled_operators(plan):
+    """
+    @return operators of plan in operator id order
+    """
+    # same unwrapping as raco.compile.compile
+    if not hasattr(plan, 'language') and \
+            isinstance(plan, (algebra.Sequence, algebra.Parallel)) and \
+            len(plan.args) == 1:
+        plan = plan.args[0]
+    return list(plan.walk())
+
+
+def parse_profile(text):
+    """
+    @param text: a JSON profile or the output of a Grappa query
+    @return dict of profile value name -> value
+    """
+    match = _stats_pattern.search(text)
+    if match:
+        text = match.group(1)
+    values = json.loads(text)
+    return dict((k, v) for k, v in values.items() if k.startswith(PREFIX))
+
+
+def load_profile(path=DEFAULT_PROFILE_FILE):
+    with open(path) as f:
+        return parse_profile(f.read())
+
+
+class Profile(object):
+    """Profile values grouped by operator and pipeline"""
+
+    def __init__(self, values):
+        self.operators = {}
+        self.pipelines = {}
+
+        for name, value in values.items():
+            m = _pipeline_pattern.match(name)
+            if m:
+                self.pipelines[int(m.group(1))] = value
+                continue
+
+            m = _op_pattern.match(name)
+            if not m:
+                continue
+            op_id, label = int(m.group(1)), m.group(2)
+            op = self.operators.setdefault(op_id, {})
+
+            m = _tuples_pattern.match(label)
+            if m:
+                # tuples op_id takes in are tuples its child puts out
+                op['tuples_in'] = op.get('tuples_in', 0) + value
+                src = self.operators.setdefault(int(m.group(1)), {})
+                src['tuples_out'] = src.get('tuples_out', 0) + value
+            else:
+                op[label] = value
+
+
+def annotate_plan(plan, values):
+    """
+    Attach the observed values of a profile to the operators of the plan
+    it was compiled from, as op.observed. raco.viz shows these alongside
+    the estimated cardinality.
+
+    @param plan: the physical plan given to raco.compile.compile
+    @param values: result of load_profile or parse_profile
+    @return the Profile
+    """
+    profile = Profile(values)
+    for op_id, op in enumerate(profiled_operators(plan)):
+        op.observed = profile.operators.get(op_id, {})
+    return profile
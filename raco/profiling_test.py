@@ -0,0 +1,51 @@
+import unittest
+
+from raco import profiling
+from raco.algebra import Apply, Store, Scan
+from raco.expression import UnnamedAttributeRef
+from raco.relation_key import RelationKey
+from raco.scheme import Scheme
+import raco.types as types
+import raco.viz as viz
+
+
+class ProfilingTest(unittest.TestCase):
+
+    def test_parse_json(self):
+        values = profiling.parse_profile("""{
+          "raco_prof_op0_in_1": 6,
+          "raco_prof_pipeline_0_runtime": 0.5
+        }""")
+        self.assertEqual(values, {"raco_prof_op0_in_1": 6,
+                                  "raco_prof_pipeline_0_runtime": 0.5})
+
+    def test_parse_grappa_stats(self):
+        values = profiling.parse_profile("""
+        I0000 00:00:00.000000 query done
+        STATS{
+          "query_runtime": 1.5,
+          "raco_prof_op1_in_2": 30
+        }STATS
+        """)
+        self.assertEqual(values, {"raco_prof_op1_in_2": 30})
+
+    def test_annotate_plan(self):
+        key = RelationKey("public", "adhoc", "T2")
+        scan = Scan(key, Scheme([("a", types.LONG_TYPE),
+                                 ("b", types.LONG_TYPE)]))
+        apply = Apply([("b", UnnamedAttributeRef(1))], scan)
+        plan = Store(RelationKey("public", "adhoc", "OUTPUT"), apply)
+
+        profile = profiling.annotate_plan(plan, {
+            "raco_prof_op0_in_1": 6,
+            "raco_prof_op1_in_2": 6,
+            "raco_prof_op1_hash_table_size": 3,
+            "raco_prof_pipeline_1_runtime": 0.25})
+
+        self.assertEqual(plan.observed, {"tuples_in": 6})
+        self.assertEqual(apply.observed, {"tuples_in": 6,
+                                          "tuples_out": 6,
+                                          "hash_table_size": 3})
+        self.assertEqual(scan.observed, {"tuples_out": 6})
+        self.assertEqual(profile.pipelines, {1: 0.25})
+        self.assertIn("tuples_out=6", viz.operator_to_dot(plan))
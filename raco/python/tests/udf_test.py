@@ -1,13 +1,17 @@
 # coding=utf-8
 """ Tests for expressions with UDFs """
 from collections import Counter
+import copy
 
 from python_test import PythonTestCase
-from raco.algebra import Apply
+from raco.algebra import Apply, Select
+from raco.expression import (AND, Case, GT, MINUS, NumericLiteral, PYUDF,
+                             UnnamedAttributeRef)
 from raco.backends.myria.connection import FunctionTypes
 from raco.python import convert
 from raco.python.exceptions import PythonArgumentException
-from raco.types import STRING_TYPE, BOOLEAN_TYPE, LONG_TYPE, INT_TYPE
+from raco.types import (STRING_TYPE, BOOLEAN_TYPE, LONG_TYPE, INT_TYPE,
+                        DOUBLE_TYPE)
 
 
 class TestUDF(PythonTestCase):
@@ -20,12 +24,14 @@ class TestUDF(PythonTestCase):
         return self.check_result(plan, expected)
 
     @staticmethod
-    def _make_udf(name, source, out_type, arity):
-        return {'name': name,
-                'source': source,
-                'outputType': out_type,
-                'inputSchema': [INT_TYPE for _ in xrange(arity)],
-                'lang': FunctionTypes.PYTHON}
+    def _make_udf(name, source, out_type, arity, **kwargs):
+        udf = {'name': name,
+               'source': source,
+               'outputType': out_type,
+               'inputSchema': [INT_TYPE for _ in xrange(arity)],
+               'lang': FunctionTypes.PYTHON}
+        udf.update(kwargs)
+        return udf
 
     def test_invocation(self):
         self._execute(
@@ -72,3 +78,61 @@ class TestUDF(PythonTestCase):
             """lambda t: udf(t[2])""",
             Counter({('D',): 2, ('A',): 1, ('V',): 1, ('B',): 1,
                     ('M',): 1, ('S',): 1}))
+
+    def test_vectorized(self):
+        self._execute(
+            [self._make_udf('udf', 'lambda xs: [x == 5 for x in xs]',
+                            LONG_TYPE, 1, vectorized=True)],
+            """lambda t: udf(t[0]) + 1""",
+            Counter([(1,)] * 6 + [(2,)]))
+
+    def test_vectorized_called_per_batch(self):
+        # each call sees every tuple of the relation
+        self._execute(
+            [self._make_udf('udf', 'lambda xs, ys: [len(xs)] * len(ys)',
+                            LONG_TYPE, 2, vectorized=True)],
+            """lambda t: udf(t[0], t[1])""",
+            Counter([(len(self.emp_table),)] * len(self.emp_table)))
+
+    def test_vectorized_select(self):
+        udf = PYUDF('udf', BOOLEAN_TYPE, UnnamedAttributeRef(0),
+                    source='lambda xs: [x < 3 for x in xs]', vectorized=True)
+        plan = self.get_query(Select(udf, self.scan))
+        self.check_result(plan, Counter(t for t in self.emp_table.elements()
+                                        if t[0] < 3))
+
+    def test_process_pool(self):
+        self._execute(
+            [self._make_udf('udf', 'lambda i: i * i', LONG_TYPE, 1,
+                            processes=2)],
+            """lambda t: udf(t[0])""",
+            Counter((t[0] * t[0],) for t in self.emp_table.elements()))
+
+    def test_guarded_udf(self):
+        # the UDF must not be called on tuples that the CASE or AND exclude
+        for kwargs in [{'vectorized': True}, {'processes': 2}]:
+            source = ('lambda xs: [1.0 / x for x in xs]'
+                      if kwargs.get('vectorized') else 'lambda x: 1.0 / x')
+            udf = PYUDF('udf', DOUBLE_TYPE,
+                        MINUS(UnnamedAttributeRef(0), NumericLiteral(3)),
+                        source=source, **kwargs)
+            guard = GT(UnnamedAttributeRef(0), NumericLiteral(3))
+
+            case = Case([(guard, udf)], NumericLiteral(-1.0))
+            plan = self.get_query(Apply([('out', case)], self.scan))
+            self.check_result(plan, Counter(
+                (1.0 / (t[0] - 3) if t[0] > 3 else -1.0,)
+                for t in self.emp_table.elements()))
+
+            # unoptimized, since the optimizer reorders conjunctions
+            cond = AND(guard, GT(copy.deepcopy(udf), NumericLiteral(0.3)))
+            self.assertEqual(
+                Counter(self.db.evaluate(Select(cond, self.scan))),
+                Counter(t for t in self.emp_table.elements()
+                        if t[0] > 3 and 1.0 / (t[0] - 3) > 0.3))
+
+    def test_compiled_once(self):
+        source = 'lambda i: i + 1'
+        udf = PYUDF('udf', LONG_TYPE, UnnamedAttributeRef(0), source=source)
+        self.assertIs(PYUDF('other', LONG_TYPE, source=source).func, udf.func)
+        self.assertIs(copy.deepcopy(udf).func, udf.func)
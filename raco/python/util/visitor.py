@@ -244,7 +244,9 @@ class ExpressionVisitor(ast.NodeVisitor):
         source = udf.get('source', None)
         return PYUDF(name, output_type,
                      *map(self.visit, node.args),
-                     source=source)
+                     source=source,
+                     vectorized=udf.get('vectorized', False),
+                     processes=udf.get('processes', None))
 
     def visit_Str(self, node):
         """ Visitor for string literals """
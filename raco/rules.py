@@ -1,6 +1,8 @@
+import collections
+import copy
 import re
 
-from raco import algebra, expression
+from raco import algebra, bloomfilter, expression, joinorder, statistics
 from raco.representation import RepresentationProperties
 from .expression import (accessed_columns, UnnamedAttributeRef,
                          rebase_local_aggregate_output, rebase_finalizer,
@@ -164,6 +166,27 @@ class JoinToProjectingJoin(Rule):
         return "Join => ProjectingJoin"
 
 
+def has_random(ex):
+    """Whether the expression ex computes a random value"""
+    return any(isinstance(e, RANDOM) for e in ex.walk())
+
+
+def is_nondeterministic(op):
+    """Whether op may output different tuples each time it is evaluated,
+    because it samples a relation or computes a random value"""
+    for o in op.walk():
+        if isinstance(o, algebra.SampleScan):
+            return True
+        exprs = [e for _, e in getattr(o, 'emitters', None) or []]
+        if getattr(o, 'condition', None) is not None:
+            exprs.append(o.condition)
+        if isinstance(o, algebra.GroupBy):
+            exprs += o.grouping_list + o.aggregate_list
+        if any(has_random(ex) for ex in exprs):
+            return True
+    return False
+
+
 def is_simple_agg_expr(agg):
     """A simple aggregate expression is an aggregate whose input is an
     AttributeRef."""
@@ -330,6 +353,46 @@ class EmptyGroupByToDistinct(Rule):
         return "GroupBy(no groupings) => Distinct"
 
 
+class ChooseDistinctStrategy(Rule):
+
+    """Picks the duplicate elimination algorithm of each Distinct: a local
+    hash table per partition when its input is already hash partitioned,
+    a hash table otherwise, and an external sort when the hash table of the
+    distinct tuples is estimated to exceed memory_budget bytes per server.
+
+    The strategy is advisory. FakeDatabase sorts for Sort, but Myria's
+    DupElim and the Grappa groupby always build a hash table, so their
+    algebras do not run this rule."""
+
+    def __init__(self, num_servers=1, memory_budget=None):
+        self.num_servers = num_servers
+        self.memory_budget = memory_budget
+        super(ChooseDistinctStrategy, self).__init__()
+
+    def fire(self, expr):
+        if not isinstance(expr, algebra.Distinct):
+            return expr
+
+        strategy = algebra.Distinct.Strategy.Hash
+        if expr.input.partitioning().hash_partitioned and \
+                not isinstance(expr.input, algebra.Shuffle):
+            strategy = algebra.Distinct.Strategy.Partitioned
+        expr.strategy = strategy
+
+        if self.memory_budget is not None:
+            try:
+                memory = expr.memory_estimate(self.num_servers)
+            except NotImplementedError:
+                # without cardinalities, keep the hash table
+                return expr
+            if memory > self.memory_budget:
+                expr.strategy = algebra.Distinct.Strategy.Sort
+        return expr
+
+    def __str__(self):
+        return "Distinct => Distinct(Hash|Sort|Partitioned)"
+
+
 class CountToCountall(Rule):
 
     """Since Raco does not support NULLs at the moment, it is safe to always
@@ -368,6 +431,147 @@ class RemoveTrivialSequences(Rule):
             return expr
 
 
+class CommonSubexpressionElimination(Rule):
+
+    """Compute the subplans that several statements of a Sequence share
+    once: store each into a temporary relation before its first use, and
+    scan that relation in its place.
+
+    A subplan is shared when recomputing it costs more than writing its
+    result once and reading it at each use, as estimated from the number of
+    tuples that its operators read. Scans and other cheap subplans are
+    recomputed. Statements inside loops, and subplans that read relations
+    or temporaries that the program writes or assigns more than once, are
+    not considered."""
+
+    # operators whose equality compares all of their arguments
+    shareable = (algebra.Scan, algebra.FileScan, algebra.ScanTemp,
+                 algebra.Select, algebra.Apply, algebra.Project,
+                 algebra.Distinct, algebra.GroupBy, algebra.OrderBy,
+                 algebra.Limit, algebra.CrossProduct, algebra.Join,
+                 algebra.ProjectingJoin, algebra.Difference,
+                 algebra.Intersection)
+
+    def __init__(self, prefix='__cse'):
+        self.prefix = prefix
+        super(CommonSubexpressionElimination, self).__init__()
+
+    @staticmethod
+    def expressions(op):
+        if isinstance(op, (algebra.Select, algebra.Join)):
+            return [op.condition]
+        if isinstance(op, algebra.Apply):
+            return [e for _, e in op.emitters]
+        if isinstance(op, algebra.GroupBy):
+            return op.grouping_list + op.aggregate_list
+        return []
+
+    @staticmethod
+    def work(op):
+        """Estimated number of tuples that the operators of op read"""
+        if not op.children():
+            return joinorder.estimate_cardinality(op)
+        return sum(joinorder.estimate_cardinality(c) +
+                   CommonSubexpressionElimination.work(c)
+                   for c in op.children())
+
+    def fire(self, expr):
+        if not isinstance(expr, algebra.Sequence):
+            return expr
+
+        written = set()
+        assigned = collections.Counter()
+        for op in expr.walk():
+            if isinstance(op, algebra.Store):
+                written.add(op.relation_key)
+            elif isinstance(op, (algebra.StoreTemp, algebra.AppendTemp)):
+                assigned[op.name] += 1
+
+        def eligible(op):
+            if type(op) not in self.shareable:
+                return False
+            if isinstance(op, algebra.Scan):
+                return op.relation_key not in written
+            if isinstance(op, algebra.ScanTemp):
+                return assigned[op.name] == 1
+            return not any(has_random(ex) for ex in self.expressions(op))
+
+        # for each shareable subplan, the statement that holds it and its
+        # parent; subplans are grouped by equality
+        statement_of = {}
+        parent_of = {}
+        groups = collections.defaultdict(list)
+
+        def collect(op, parent, statement):
+            subtree_eligible = True
+            for c in op.children():
+                subtree_eligible &= collect(c, op, statement)
+            subtree_eligible &= eligible(op)
+            if subtree_eligible and parent is not None:
+                statement_of[id(op)] = statement
+                parent_of[id(op)] = parent
+                for group in groups[hash(op)]:
+                    if group[0] == op:
+                        group.append(op)
+                        break
+                else:
+                    groups[hash(op)].append([op])
+            return subtree_eligible
+
+        statements = list(expr.args)
+        for statement in statements:
+            if not isinstance(statement, (algebra.DoWhile,
+                                          algebra.UntilConvergence)):
+                collect(statement, None, statement)
+
+        def size(op):
+            return 1 + sum(size(c) for c in op.children())
+
+        # share the largest subplans first; the subplans inside the first
+        # use of a shared subplan move into its StoreTemp
+        removed = set()
+        candidates = [g for gs in groups.values() for g in gs if len(g) > 1]
+        candidates.sort(key=lambda g: -size(g[0]))
+        count = 0
+        for group in candidates:
+            uses = [op for op in group if id(op) not in removed]
+            if len(uses) < 2:
+                continue
+            out = joinorder.estimate_cardinality(uses[0])
+            if (len(uses) - 1) * self.work(uses[0]) <= (len(uses) + 1) * out:
+                continue
+
+            name = '%s%d' % (self.prefix, count)
+            while name in assigned:
+                count += 1
+                name = '%s%d' % (self.prefix, count)
+            count += 1
+            assigned[name] = 1
+
+            first = min(i for i, st in enumerate(statements)
+                        if any(st is statement_of[id(op)] for op in uses))
+            store = algebra.StoreTemp(name, uses[0])
+            statements.insert(first, store)
+
+            for op in uses:
+                scan = algebra.ScanTemp(name, op.scheme())
+                scan.analyzed_num_tuples = out
+                parent_of[id(op)].apply(
+                    lambda c, op=op, scan=scan: scan if c is op else c)
+                if op is not uses[0]:
+                    removed.update(id(o) for o in op.walk())
+
+            statement_of[id(uses[0])] = store
+            parent_of[id(uses[0])] = store
+            for o in uses[0].walk():
+                if id(o) in statement_of:
+                    statement_of[id(o)] = store
+
+        if count == 0:
+            return expr
+        return algebra.Sequence(statements)
+
+
 class SplitSelects(Rule):
 
     """Replace AND clauses with multiple consecutive selects."""
@@ -426,8 +630,7 @@ class PushSelects(Rule):
         elif isinstance(op, algebra.CompositeBinaryOperator):
             # Joins and cross-products; consider conversion to an equijoin
             # Expressions containing random do not commute across joins
-            has_random = any(isinstance(e, RANDOM) for e in cond.walk())
-            if not has_random:
+            if not has_random(cond):
                 left_len = len(op.left.scheme())
                 accessed = accessed_columns(cond)
                 in_left = [col < left_len for col in accessed]
@@ -821,6 +1024,151 @@ class SwapJoinSides(Rule):
         return "Join(L,R) => Join(R,L)"
 
 
+class SwapJoinSidesOverMemoryBudget(Rule):
+
+    """Swaps the inputs of a join to build the hash table of the smaller
+    one when the hash table of its right input is estimated to exceed
+    memory_budget bytes per server"""
+
+    def __init__(self, memory_budget, num_servers=1):
+        self.memory_budget = memory_budget
+        self.num_servers = num_servers
+        super(SwapJoinSidesOverMemoryBudget, self).__init__()
+
+    def fire(self, expr):
+        if not isinstance(expr, algebra.Join) or \
+                isinstance(expr, algebra.ProjectingJoin) or \
+                hasattr(expr, '__swapped__'):
+            return expr
+
+        try:
+            right = expr.memory_estimate(self.num_servers)
+            left = algebra.hash_table_memory(expr.left, self.num_servers)
+        except NotImplementedError:
+            return expr
+        if right <= self.memory_budget or left >= right:
+            return expr
+        return SwapJoinSides().fire(expr)
+
+    def __str__(self):
+        return "Join(L,R) => Join(R,L) when R exceeds the memory budget"
+
+
+class OrderJoins(Rule):
+    """Choose the order and the build sides of a tree of joins by their
+    estimated cost; see raco.joinorder"""
+
+    def __init__(self, bushy=True):
+        self.bushy = bushy
+        super(OrderJoins, self).__init__()
+
+    def fire(self, expr):
+        # joins swapped by SwapJoinSides keep the order they were given
+        if not joinorder.is_join(expr) or \
+                getattr(expr, '_join_ordered', False) or \
+                hasattr(expr, '__swapped__'):
+            return expr
+        return joinorder.order_joins(expr, self.bushy)
+
+    def __str__(self):
+        return "Join(Join(A,B),C) => cheapest order of A, B, C"
+
+
+class BloomFilterSemiJoin(Rule):
+    """Filter the larger input of an equijoin by a Bloom filter of the join
+    keys of the smaller input, when few of its tuples are estimated to
+    find a match; see raco.bloomfilter"""
+
+    def __init__(self, max_selectivity=0.5,
+                 false_positive_rate=bloomfilter.DEFAULT_FALSE_POSITIVE_RATE,
+                 max_bits=1 << 26, key_types=None):
+        """
+        @param max_selectivity: largest estimated fraction of the larger
+            input, false positives included, that may pass the filter
+        @param max_bits: size of the largest filter to build
+        @param key_types: if given, only joins on keys of these types are
+            filtered
+        """
+        self.max_selectivity = max_selectivity
+        self.false_positive_rate = false_positive_rate
+        self.max_bits = max_bits
+        self.key_types = key_types
+        super(BloomFilterSemiJoin, self).__init__()
+
+    @staticmethod
+    def distinct_keys(op, columns):
+        """Estimated number of distinct keys of op; the statistics of its
+        inputs overestimate it when op filters them"""
+        cardinality = joinorder.estimate_cardinality(op)
+        distinct = statistics.distinct_values(op.column_statistics(), columns)
+        if distinct is None:
+            return cardinality
+        return max(min(distinct, cardinality), 1)
+
+    def fire(self, expr):
+        if type(expr) not in (algebra.Join, algebra.ProjectingJoin):
+            return expr
+        if any(isinstance(c, algebra.BloomFilterProbe) or
+               c.partitioning().broadcasted for c in expr.children()):
+            return expr
+
+        left_len = len(expr.left.scheme())
+        try:
+            left_cols, right_cols = algebra.convertcondition(
+                expr.condition, left_len,
+                expr.left.scheme() + expr.right.scheme())
+        except (NotImplementedError, AttributeError, AssertionError):
+            return expr
+        if not left_cols:
+            return expr
+
+        # filter the larger input by the keys of the smaller one
+        if joinorder.estimate_cardinality(expr.left) >= \
+                joinorder.estimate_cardinality(expr.right):
+            large, large_cols, small, small_cols = \
+                expr.left, left_cols, expr.right, right_cols
+        else:
+            large, large_cols, small, small_cols = \
+                expr.right, right_cols, expr.left, left_cols
+
+        if self.key_types is not None and \
+                any(large.scheme().getType(c) not in self.key_types
+                    for c in large_cols):
+            return expr
+        # the filter evaluates small apart from the join, so both must see
+        # the same tuples
+        if is_nondeterministic(small):
+            return expr
+
+        small_keys = self.distinct_keys(small, small_cols)
+        large_keys = self.distinct_keys(large, large_cols)
+        matching = min(float(small_keys) / large_keys, 1.0)
+        num_bits, num_hashes = bloomfilter.filter_size(
+            small_keys, self.false_positive_rate)
+        if num_bits > self.max_bits:
+            return expr
+        selectivity = matching + (1 - matching) * \
+            bloomfilter.false_positive_rate(small_keys, num_bits, num_hashes)
+        if selectivity > self.max_selectivity:
+            return expr
+
+        build = algebra.BloomFilterBuild(
+            [UnnamedAttributeRef(c) for c in small_cols],
+            num_bits, num_hashes, copy.deepcopy(small))
+        probe = algebra.BloomFilterProbe(
+            [UnnamedAttributeRef(c) for c in large_cols],
+            num_bits, num_hashes, large, build, selectivity)
+        if large is expr.left:
+            expr.left = probe
+        else:
+            expr.right = probe
+        return expr
+
+    def __str__(self):
+        return "Join(large, small) => " \
+               "Join(BloomFilterProbe(large, BloomFilterBuild(small)), small)"
+
+
 # logical groups of catalog transparent rules
 # 1. this must be applied first
 remove_trivial_sequences = [RemoveTrivialSequences()]
@@ -908,7 +1256,9 @@ class DecomposeGroupBy(Rule):
             return out_op
 
         # Do not shuffle and do not decompose if the data is shuffled already
-        if DecomposeGroupBy.check_no_shuffle(op):
+        # or if a GroupBy above combines the groups of every worker
+        if DecomposeGroupBy.check_no_shuffle(op) or \
+                getattr(op, '_partial', False):
             out_op = self._gb_class()
             out_op.copy(op)
             return out_op
@@ -1009,6 +1359,120 @@ class DecomposeGroupBy(Rule):
         return remote_gb
 
 
+class PreAggregateBelowJoin(Rule):
+
+    """Aggregate the input of a join that all aggregates read before the
+    join (eager aggregation), grouping it by its join columns and the
+    grouping columns it holds. The GroupBy above combines the partial
+    aggregates, which the join repeats once per matching tuple, so the
+    partial GroupBy runs on each worker without a shuffle.
+
+    Fires only when statistics estimate that the partial GroupBy outputs
+    at most max_ratio of the tuples of its input."""
+
+    def __init__(self, max_ratio=0.5):
+        self.max_ratio = max_ratio
+        super(PreAggregateBelowJoin, self).__init__()
+
+    @staticmethod
+    def decomposable(agg):
+        return isinstance(agg, expression.BuiltinAggregateExpression) and \
+            agg.is_decomposable()
+
+    def fire(self, op):
+        if op.__class__ != algebra.GroupBy or \
+                getattr(op, '_pre_aggregated', False) or \
+                type(op.input) != algebra.Join or \
+                not all(isinstance(g, expression.AttributeRef)
+                        for g in op.grouping_list) or \
+                not all(self.decomposable(a) for a in op.aggregate_list):
+            return op
+
+        join = op.input
+        join_scheme = join.scheme()
+        left_len = len(join.left.scheme())
+        grouping = [expression.toUnnamed(g, join_scheme).position
+                    for g in op.grouping_list]
+        aggs = [to_unnamed_recursive(copy.deepcopy(a), join_scheme)
+                for a in op.aggregate_list]
+        condition = to_unnamed_recursive(copy.deepcopy(join.condition),
+                                         join_scheme)
+
+        # aggregate the side that the aggregates read
+        agg_columns = set()
+        for a in aggs:
+            agg_columns |= accessed_columns(a)
+        if all(c < left_len for c in agg_columns) and \
+                (agg_columns or join.left.num_tuples() >=
+                 join.right.num_tuples()):
+            side, lo, hi = join.left, 0, left_len
+        elif all(c >= left_len for c in agg_columns):
+            side, lo, hi = join.right, left_len, len(join_scheme)
+        else:
+            return op
+
+        # the columns of side that the partial GroupBy groups by
+        keys = sorted(c for c in accessed_columns(condition) | set(grouping)
+                      if lo <= c < hi)
+        groups = statistics.distinct_values(side.column_statistics(),
+                                            [c - lo for c in keys])
+        if groups is None or \
+                min(groups, side.num_tuples()) > \
+                self.max_ratio * side.num_tuples():
+            return op
+
+        local_emitters = []
+        remote_emitters = []
+        finalizers = []
+        for a in aggs:
+            expression.reindex_expr(
+                a, dict((c, c - lo) for c in accessed_columns(a)))
+            state = a.get_decomposable_state()
+            local_pos = lo + len(keys) + len(local_emitters)
+            remote_pos = len(grouping) + len(remote_emitters)
+            raggs = [rebase_local_aggregate_output(x, local_pos)
+                     for x in state.get_remote_emitters()]
+            finalizer = state.get_finalizer()
+            if finalizer is not None:
+                finalizers.append(rebase_finalizer(finalizer, remote_pos))
+            else:
+                finalizers.extend(UnnamedAttributeRef(remote_pos + i)
+                                  for i in range(len(raggs)))
+            local_emitters.extend(state.get_local_emitters())
+            remote_emitters.extend(raggs)
+
+        partial = algebra.GroupBy([UnnamedAttributeRef(c - lo) for c in keys],
+                                  local_emitters, side)
+        partial._partial = True
+
+        # columns of the join whose position changes
+        shift = len(keys) + len(local_emitters) - (hi - lo)
+        index_map = dict((c, lo + i) for i, c in enumerate(keys))
+        if side is join.left:
+            index_map.update((c, c + shift)
+                             for c in range(hi, len(join_scheme)))
+            new_join = algebra.Join(condition, partial, join.right)
+        else:
+            new_join = algebra.Join(condition, join.left, partial)
+        expression.reindex_expr(condition, index_map)
+
+        top = algebra.GroupBy([UnnamedAttributeRef(index_map.get(g, g))
+                               for g in grouping],
+                              remote_emitters, new_join)
+        top._pre_aggregated = True
+
+        # restore the names, and finalize aggregates such as AVG
+        sch = op.scheme()
+        emitters = [(sch.getName(i), UnnamedAttributeRef(i))
+                    for i in range(len(grouping))]
+        emitters += [(sch.getName(len(grouping) + i), f)
+                     for i, f in enumerate(finalizers)]
+        return algebra.Apply(emitters, top)
+
+    def __str__(self):
+        return "GroupBy(Join(A, B)) => GroupBy(Join(GroupBy(A), B))"
+
+
 # 7. distributed groupby
 # this need to be put after shuffle logic
 def distributed_group_by(
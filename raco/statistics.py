@@ -0,0 +1,342 @@
+"""
+Column statistics and selectivity estimation.
+
+A catalog may describe each column of a relation with ColumnStatistics
+(see Catalog.column_statistics). Scans carry them into query plans, where
+Operator.column_statistics passes them on to the columns each operator
+outputs, and num_tuples uses them to estimate the selectivity of
+predicates, the size of joins and the number of groups.
+
+Statistics are collected from the tuples of a relation or from a sample of
+them, such as one drawn from a CSV file by collect_csv_statistics.
+"""
+
+import bisect
+import collections
+import csv
+import itertools
+import math
+import random
+
+from raco import expression, types
+
+DEFAULT_BUCKETS = 10
+DEFAULT_MOST_COMMON = 5
+DEFAULT_SAMPLE_SIZE = 10000
+
+# selectivities of predicates that statistics do not inform
+DEFAULT_EQ_SELECTIVITY = 0.1
+DEFAULT_RANGE_SELECTIVITY = 1.0 / 3
+DEFAULT_SELECTIVITY = 0.5
+
+# bytes held per value of each type, and per entry of an in-memory hash table
+TYPE_WIDTHS = {
+    types.LONG_TYPE: 8, types.DOUBLE_TYPE: 8, types.DATETIME_TYPE: 8,
+    types.INT_TYPE: 4, types.FLOAT_TYPE: 4, types.BOOLEAN_TYPE: 1}
+DEFAULT_VARIABLE_WIDTH = 32
+HASH_ENTRY_OVERHEAD = 16
+# memory held by an external sort, which spills sorted runs beyond it
+SORT_BUFFER_BYTES = 64 * 1024 * 1024
+
+_comparisons = {
+    expression.LT: '<', expression.LTEQ: '<=',
+    expression.GT: '>', expression.GTEQ: '>='}
+_flipped = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+
+class ColumnStatistics(object):
+
+    """Statistics of the values of a column"""
+
+    def __init__(self, distinct, min=None, max=None, null_fraction=0.0,
+                 histogram=None, most_common=None):
+        """
+        @param distinct: the number of distinct non-null values
+        @param min, max: the smallest and largest values
+        @param null_fraction: the fraction of values that are null
+        @param histogram: equi-depth histogram, as the sorted boundaries of
+            buckets that each hold the same number of values
+        @param most_common: list of (value, fraction of values) pairs
+        """
+        self.distinct = distinct
+        self.min = min
+        self.max = max
+        self.null_fraction = null_fraction
+        self.histogram = histogram or []
+        self.most_common = most_common or []
+
+    def __eq__(self, other):
+        return (isinstance(other, ColumnStatistics) and
+                self.to_dict() == other.to_dict())
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "ColumnStatistics({d!r}, {mn!r}, {mx!r}, {n!r}, {h!r}, " \
+               "{mc!r})".format(d=self.distinct, mn=self.min, mx=self.max,
+                                n=self.null_fraction, h=self.histogram,
+                                mc=self.most_common)
+
+    def to_dict(self):
+        return {'distinct': self.distinct, 'min': self.min, 'max': self.max,
+                'null_fraction': self.null_fraction,
+                'histogram': self.histogram,
+                'most_common': self.most_common}
+
+    @classmethod
+    def from_dict(cls, d):
+        return cls(d['distinct'], d.get('min'), d.get('max'),
+                   d.get('null_fraction', 0.0), d.get('histogram'),
+                   [tuple(p) for p in d.get('most_common', [])])
+
+    def eq_selectivity(self, value):
+        """Estimated fraction of values equal to value"""
+        for v, fraction in self.most_common:
+            if v == value:
+                return fraction
+        if self.min is not None and (value < self.min or value > self.max):
+            return 0.0
+        rest = 1.0 - self.null_fraction - sum(f for _, f in self.most_common)
+        return max(rest, 0.0) / max(self.distinct - len(self.most_common), 1)
+
+    def _fraction_below(self, value):
+        """Estimated fraction of non-null values less than value, or None"""
+        if self.histogram:
+            bounds = self.histogram
+            if value <= bounds[0]:
+                return 0.0
+            if value > bounds[-1]:
+                return 1.0
+            i = bisect.bisect_left(bounds, value) - 1
+            lo, hi = bounds[i], bounds[i + 1]
+            within = 0.5
+            if all(isinstance(v, (int, long, float)) for v in (lo, hi, value)) \
+                    and hi > lo:
+                within = float(value - lo) / (hi - lo)
+            return (i + within) / (len(bounds) - 1)
+
+        if all(isinstance(v, (int, long, float))
+               for v in (self.min, self.max, value)):
+            if value <= self.min:
+                return 0.0
+            if value > self.max:
+                return 1.0
+            return float(value - self.min) / (self.max - self.min)
+        return None
+
+    def range_selectivity(self, op, value):
+        """Estimated fraction of values v for which `v op value` holds,
+        where op is one of <, <=, > and >=; or None"""
+        below = self._fraction_below(value)
+        if below is None:
+            return None
+        equal = self.eq_selectivity(value) / max(1 - self.null_fraction,
+                                                 1e-9)
+        below = {'<': below,
+                 '<=': below + equal,
+                 '>': 1 - below - equal,
+                 '>=': 1 - below}[op]
+        return min(max(below, 0.0), 1.0) * (1 - self.null_fraction)
+
+
+def estimate_distinct(counts, sample_size, total):
+    """Estimate the number of distinct values in a column from the value
+    counts of a sample, with the GEE estimator of Charikar et al.
+
+    @param counts: value -> number of occurrences in the sample
+    @param total: the number of values in the whole column
+    """
+    if not total or total <= sample_size:
+        return len(counts)
+    once = sum(1 for c in counts.values() if c == 1)
+    estimate = math.sqrt(float(total) / sample_size) * once + \
+        len(counts) - once
+    return int(min(round(estimate), total))
+
+
+def column_statistics(values, total=None, num_buckets=DEFAULT_BUCKETS,
+                      num_most_common=DEFAULT_MOST_COMMON):
+    """Statistics of a column from its values or a sample of them
+
+    @param total: the number of values in the whole column, if values is
+        a sample
+    """
+    if not values:
+        return ColumnStatistics(0)
+    non_null = sorted(v for v in values if v is not None)
+    counts = collections.Counter(non_null)
+    n = float(len(values))
+
+    histogram = []
+    if non_null:
+        buckets = min(num_buckets, len(non_null))
+        histogram = [non_null[i * len(non_null) // buckets]
+                     for i in range(buckets)] + [non_null[-1]]
+    most_common = [(v, c / n) for v, c in counts.most_common(num_most_common)
+                   if c > 1]
+
+    return ColumnStatistics(
+        distinct=estimate_distinct(counts, len(values), total),
+        min=non_null[0] if non_null else None,
+        max=non_null[-1] if non_null else None,
+        null_fraction=(n - len(non_null)) / n,
+        histogram=histogram,
+        most_common=most_common)
+
+
+def collect_statistics(tuples, scheme, total=None, **kwargs):
+    """Statistics of each column of a relation
+
+    @param tuples: the tuples of the relation, or a sample of them
+    @param total: the number of tuples in the relation, if tuples is a
+        sample
+    @return list of ColumnStatistics, one per column of scheme
+    """
+    columns = zip(*tuples) or [()] * len(scheme)
+    return [column_statistics(list(c), total, **kwargs) for c in columns]
+
+
+def reservoir_sample(items, sample_size):
+    """Draw a uniform sample of an iterable in one pass
+
+    @return (sample of at most sample_size items, number of items)
+    """
+    sample = []
+    count = 0
+    for item in items:
+        if len(sample) < sample_size:
+            sample.append(item)
+        else:
+            j = random.randint(0, count)
+            if j < sample_size:
+                sample[j] = item
+        count += 1
+    return sample, count
+
+
+def sample_csv(path, scheme, sample_size=DEFAULT_SAMPLE_SIZE, delimiter=',',
+               skip=0):
+    """Draw a uniform sample of the rows of a CSV file
+
+    @return (sample of typed tuples, number of rows in the file)
+    """
+    type_list = scheme.get_types()
+    with open(path, 'r') as fh:
+        reader = csv.reader(fh, delimiter=delimiter)
+        sample, rows = reservoir_sample(
+            itertools.islice(reader, skip, None), sample_size)
+
+    tuples = [tuple(types.parse_string(s, t) for s, t in zip(row, type_list))
+              for row in sample]
+    return tuples, rows
+
+
+def collect_csv_statistics(path, scheme, sample_size=DEFAULT_SAMPLE_SIZE,
+                           delimiter=',', skip=0, **kwargs):
+    """Statistics of each column of a relation stored as a CSV file,
+    collected from a sample of its rows"""
+    tuples, rows = sample_csv(path, scheme, sample_size, delimiter, skip)
+    return collect_statistics(tuples, scheme, total=rows, **kwargs)
+
+
+def _column(ex, stats, scheme):
+    """The statistics of the column an expression refers to, if any"""
+    if not isinstance(ex, expression.AttributeRef):
+        return None
+    try:
+        position = ex.get_position(scheme)
+    except Exception:
+        return None
+    if position is None or position >= len(stats):
+        return None
+    return stats[position]
+
+
+def _selectivity(cond, stats, scheme):
+    """@return (estimated selectivity, whether statistics informed it)"""
+    if isinstance(cond, expression.AND):
+        left, l_informed = _selectivity(cond.left, stats, scheme)
+        right, r_informed = _selectivity(cond.right, stats, scheme)
+        return left * right, l_informed or r_informed
+    if isinstance(cond, expression.OR):
+        left, l_informed = _selectivity(cond.left, stats, scheme)
+        right, r_informed = _selectivity(cond.right, stats, scheme)
+        return left + right - left * right, l_informed or r_informed
+    if isinstance(cond, expression.NOT):
+        sel, informed = _selectivity(cond.input, stats, scheme)
+        return 1 - sel, informed
+
+    if isinstance(cond, (expression.EQ, expression.NEQ)):
+        left = _column(cond.left, stats, scheme)
+        right = _column(cond.right, stats, scheme)
+        sel = None
+        if left is not None and right is not None:
+            sel = 1.0 / max(left.distinct, right.distinct, 1)
+        elif left is not None and isinstance(cond.right, expression.Literal):
+            sel = left.eq_selectivity(cond.right.value)
+        elif right is not None and isinstance(cond.left, expression.Literal):
+            sel = right.eq_selectivity(cond.left.value)
+        if sel is None:
+            sel = DEFAULT_EQ_SELECTIVITY
+            informed = False
+        else:
+            informed = True
+        if isinstance(cond, expression.NEQ):
+            sel = 1 - sel
+        return sel, informed
+
+    if type(cond) in _comparisons:
+        op = _comparisons[type(cond)]
+        column, literal = cond.left, cond.right
+        if isinstance(column, expression.Literal):
+            column, literal, op = literal, column, _flipped[op]
+        column = _column(column, stats, scheme)
+        if column is not None and isinstance(literal, expression.Literal):
+            sel = column.range_selectivity(op, literal.value)
+            if sel is not None:
+                return sel, True
+        return DEFAULT_RANGE_SELECTIVITY, False
+
+    return DEFAULT_SELECTIVITY, False
+
+
+def estimate_selectivity(condition, stats, scheme=None):
+    """Estimate the fraction of tuples that satisfy a condition
+
+    @param stats: list of the ColumnStatistics (or None) of the columns
+        the condition refers to, by position
+    @param scheme: resolves named column references in condition
+    @return the selectivity, or None if no statistics informed it
+    """
+    if not stats or all(s is None for s in stats):
+        return None
+    sel, informed = _selectivity(condition, stats, scheme)
+    if not informed:
+        return None
+    return min(max(sel, 0.0), 1.0)
+
+
+def distinct_values(stats, columns):
+    """Estimated number of distinct combinations of values of columns,
+    or None without statistics for all of them"""
+    if stats is None:
+        return None
+    count = 1
+    for c in columns:
+        if c is None or c >= len(stats) or stats[c] is None:
+            return None
+        count *= max(stats[c].distinct, 1)
+    return count
+
+
+def tuple_width(scheme):
+    """Estimated number of bytes of a tuple of scheme, with strings and
+    blobs of DEFAULT_VARIABLE_WIDTH"""
+    return sum(TYPE_WIDTHS.get(t, DEFAULT_VARIABLE_WIDTH)
+               for t in scheme.get_types())
+
+
+def hash_table_bytes(entries, scheme):
+    """Estimated memory held by a hash table of entries tuples of scheme"""
+    return int(entries) * (tuple_width(scheme) + HASH_ENTRY_OVERHEAD)
@@ -0,0 +1,174 @@
+import collections
+import os
+import tempfile
+import unittest
+
+from raco import statistics
+from raco.algebra import (Apply, Distinct, GroupBy, Join, OrderBy, Scan,
+                          Select, Shuffle, Store, StoreTemp)
+from raco.catalog import FakeCatalog
+from raco.expression import (AND, EQ, GT, LT, NEQ, COUNTALL, NumericLiteral,
+                             StringLiteral, UnnamedAttributeRef)
+from raco.fakedb import FakeDatabase
+from raco.relation_key import RelationKey
+from raco.scheme import Scheme
+from raco.statistics import ColumnStatistics
+import raco.types as types
+
+
+def col(i):
+    return UnnamedAttributeRef(i)
+
+
+class StatisticsTest(unittest.TestCase):
+
+    scheme = Scheme([('a', types.LONG_TYPE), ('b', types.STRING_TYPE)])
+    # a is uniform over 0..99; b is 'x' in half the tuples
+    tuples = [(i, 'x' if i % 2 else str(i)) for i in range(100)]
+
+    def test_collect(self):
+        a, b = statistics.collect_statistics(self.tuples, self.scheme)
+        self.assertEqual((a.distinct, a.min, a.max), (100, 0, 99))
+        self.assertEqual(a.histogram, range(0, 100, 10) + [99])
+        self.assertEqual(a.most_common, [])
+        self.assertEqual(b.distinct, 51)
+        self.assertEqual(b.most_common, [('x', 0.5)])
+
+    def test_selectivity(self):
+        stats = statistics.collect_statistics(self.tuples, self.scheme)
+
+        def estimate(condition):
+            return statistics.estimate_selectivity(condition, stats)
+
+        self.assertAlmostEqual(estimate(LT(col(0), NumericLiteral(25))),
+                               0.25)
+        self.assertAlmostEqual(estimate(GT(NumericLiteral(25), col(0))),
+                               0.25)
+        self.assertAlmostEqual(estimate(EQ(col(1), StringLiteral('x'))), 0.5)
+        self.assertAlmostEqual(estimate(EQ(col(1), StringLiteral('2'))),
+                               0.01)
+        self.assertAlmostEqual(estimate(NEQ(col(1), StringLiteral('x'))),
+                               0.5)
+        self.assertEqual(estimate(EQ(col(0), NumericLiteral(500))), 0)
+        self.assertAlmostEqual(
+            estimate(AND(LT(col(0), NumericLiteral(50)),
+                         EQ(col(1), StringLiteral('x')))), 0.25)
+        # nothing to base an estimate on
+        self.assertIsNone(estimate(EQ(NumericLiteral(1), NumericLiteral(2))))
+        self.assertIsNone(statistics.estimate_selectivity(
+            EQ(col(1), StringLiteral('x')), [stats[0], None]))
+
+    def test_sample_distinct(self):
+        # every sampled value is unique, so most values are never sampled
+        counts = collections.Counter(range(100))
+        self.assertEqual(statistics.estimate_distinct(counts, 100, 10000),
+                         1000)
+        self.assertEqual(statistics.estimate_distinct(counts, 100, 100), 100)
+
+    def test_csv_sample(self):
+        fd, path = tempfile.mkstemp()
+        with os.fdopen(fd, 'w') as fh:
+            for a, b in self.tuples:
+                fh.write('{},{}\n'.format(a, b))
+        try:
+            stats = statistics.collect_csv_statistics(path, self.scheme,
+                                                      sample_size=1000)
+        finally:
+            os.remove(path)
+        self.assertEqual(stats,
+                         statistics.collect_statistics(self.tuples,
+                                                       self.scheme))
+
+    def test_fakedb_statistics(self):
+        db = FakeDatabase()
+        key = RelationKey('public', 'adhoc', 'R')
+        db.ingest(key, collections.Counter(self.tuples), self.scheme)
+        self.assertEqual(db.column_statistics(key),
+                         statistics.collect_statistics(self.tuples,
+                                                       self.scheme))
+        self.assertIsNone(db.column_statistics(
+            RelationKey('public', 'adhoc', 'missing')))
+
+    def test_fakedb_statistics_invalidated(self):
+        db = FakeDatabase()
+        key = RelationKey('public', 'adhoc', 'R')
+        db.ingest(key, collections.Counter(self.tuples), self.scheme)
+        stats = db.column_statistics(key)
+        self.assertIs(db.column_statistics(key), stats)
+
+        tuples = [(a, 'y') for a, _ in self.tuples[:10]]
+        db.ingest(key, collections.Counter(tuples), self.scheme)
+        self.assertEqual(db.column_statistics(key),
+                         statistics.collect_statistics(tuples, self.scheme))
+
+        first = tuples[0][0]
+        db.evaluate(Store(key, Select(EQ(col(0), NumericLiteral(first)),
+                                      Scan(key, self.scheme))))
+        self.assertEqual(db.column_statistics(key),
+                         statistics.collect_statistics(
+                             [t for t in tuples if t[0] == first],
+                             self.scheme))
+
+    def test_operator_estimates(self):
+        key = RelationKey('public', 'adhoc', 'R')
+        catalog = FakeCatalog(1, {'R': 1000}, child_statistics={
+            'R': [ColumnStatistics(1000, 0, 999), ColumnStatistics(10)]})
+        scan = Scan(key, self.scheme, catalog.num_tuples(key),
+                    statistics=catalog.column_statistics(key))
+
+        select = Select(LT(col(0), NumericLiteral(100)), scan)
+        self.assertEqual(select.num_tuples(), 100)
+        groupby = GroupBy([col(1)], [COUNTALL()], scan)
+        self.assertEqual(groupby.num_tuples(), 10)
+        join = Join(EQ(col(1), col(3)), scan, scan)
+        self.assertEqual(join.num_tuples(), 1000 * 1000 / 10)
+        apply = Apply([('b', col(1))], scan)
+        self.assertEqual(apply.column_statistics(), [ColumnStatistics(10)])
+
+        # without statistics, the old estimates
+        scan = Scan(key, self.scheme, 1000)
+        self.assertEqual(Select(LT(col(0), NumericLiteral(100)),
+                                scan).num_tuples(), 500)
+        self.assertEqual(GroupBy([col(1)], [COUNTALL()], scan).num_tuples(),
+                         1000)
+
+    def test_memory_estimates(self):
+        self.assertEqual(statistics.tuple_width(self.scheme),
+                         8 + statistics.DEFAULT_VARIABLE_WIDTH)
+        entry = (statistics.tuple_width(self.scheme) +
+                 statistics.HASH_ENTRY_OVERHEAD)
+
+        key = RelationKey('public', 'adhoc', 'R')
+        catalog = FakeCatalog(4, {'R': 1000}, child_statistics={
+            'R': [ColumnStatistics(100), ColumnStatistics(10)]})
+        scan = Scan(key, self.scheme, catalog.num_tuples(key),
+                    statistics=catalog.column_statistics(key))
+
+        distinct = Distinct(scan)
+        self.assertEqual(distinct.memory_estimate(), 1000 * entry)
+        # a hash table per partition of a hash partitioned input
+        shuffled = Distinct(Shuffle(scan, [col(0)]))
+        self.assertEqual(shuffled.memory_estimate(4), 250 * entry)
+        # an external sort holds at most its buffer
+        distinct.strategy = Distinct.Strategy.Sort
+        self.assertEqual(distinct.memory_estimate(),
+                         1000 * statistics.tuple_width(self.scheme))
+        self.assertEqual(Distinct(Scan(key, self.scheme, 10 ** 9),
+                                  Distinct.Strategy.Sort).memory_estimate(),
+                         statistics.SORT_BUFFER_BYTES)
+
+        groupby = GroupBy([col(1)], [COUNTALL()], scan)
+        self.assertEqual(groupby.memory_estimate(),
+                         10 * (statistics.DEFAULT_VARIABLE_WIDTH + 8 +
+                               statistics.HASH_ENTRY_OVERHEAD))
+
+        # hash joins build the right input
+        small = Select(EQ(col(0), NumericLiteral(10)), scan)
+        self.assertEqual(Join(EQ(col(0), col(2)), scan,
+                              small).memory_estimate(), 10 * entry)
+        width = statistics.tuple_width(self.scheme)
+        self.assertEqual(OrderBy(scan, [0], [True]).memory_estimate(),
+                         1000 * width)
+        self.assertEqual(StoreTemp('T', Shuffle(scan, [col(0)]))
+                         .memory_estimate(4), 250 * width)
+        self.assertEqual(small.memory_estimate(), 0)
@@ -1,6 +1,22 @@
 from raco import algebra
 
 
+def node_label(op):
+    """Short string of op plus, if it was annotated with a runtime profile
+    (see raco.profiling.annotate_plan), the observed and estimated
+    cardinalities"""
+    label = op.shortStr()
+    observed = getattr(op, 'observed', None)
+    if observed:
+        label += r'\n' + ', '.join('%s=%s' % (k, observed[k])
+                                   for k in sorted(observed))
+        try:
+            label += r'\nestimated=%s' % op.num_tuples()
+        except NotImplementedError:
+            pass
+    return label
+
+
 def graph_to_dot(graph, **kwargs):
     """Graph is expected to be a dict of the form { 'nodes' : list(), 'edges' :
     list() }. This function returns a string that will be input to dot."""
@@ -32,7 +48,8 @@ def graph_to_dot(graph, **kwargs):
 }"""
 
     # Nodes:
-    nodes = ['"%s" [label="%s"] ;' % (id(n), n.shortStr().replace(r'"', r'\"'))
+    nodes = ['"%s" [label="%s"] ;' % (id(n),
+                                      node_label(n).replace(r'"', r'\"'))
              for n in graph['nodes']]
     node_str = '\n      '.join(nodes)
 